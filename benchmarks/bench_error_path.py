@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark del camino de error de CalculatorModel.
+
+Compara el rendimiento con tráfico de entradas erróneas entre el camino
+anterior (excepción lanzada por el manejador, capturada con
+``except Exception`` y mensaje formateado en el modelo) y el actual (código
+de error devuelto sin excepciones y mensaje generado en la frontera HTTP).
+
+Uso:
+    python benchmarks/bench_error_path.py [--iterations 100000]
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.models.calculator import CalculatorModel
+from src.models.errors import render_error
+from src.utils.tracing import traced
+
+CASES = {
+    'divide por cero': (1.0, 0.0, 'divide'),
+    'sqrt negativa': (-4.0, None, 'sqrt'),
+    'dominio de power': (-8.0, 0.5, 'power'),
+    'cálculo válido': (6.0, 3.0, 'divide')
+}
+
+
+class LegacyCalculatorModel(CalculatorModel):
+    """Reproduce el camino de error anterior basado en excepciones."""
+
+    @traced('CalculatorModel.perform_calculation')
+    def perform_calculation(self, num1, num2, operation, record_history=True):
+        if operation not in self.VALID_OPERATIONS:
+            return {"error": "Error: Operación no válida"}
+
+        try:
+            expression_format = self.OPERATION_HANDLERS[operation][1]
+            result = self._evaluate(operation, num1, num2)
+            expression = expression_format.format(a=num1, b=num2, r=result)
+            if record_history:
+                self._add_to_history(num1, num2, operation, result, expression)
+            return {"result": result, "expression": expression}
+
+        except Exception as e:
+            error_msg = f"Error en el cálculo: {str(e)}"
+            if record_history:
+                self._add_to_history(num1, num2, operation, None, error_msg, is_error=True)
+            return {"error": error_msg}
+
+    def _evaluate(self, operation, num1, num2):
+        handler = getattr(self, self.OPERATION_HANDLERS[operation][0])
+        if operation in self.UNARY_OPERATIONS:
+            return handler(num1)
+        return handler(num1, num2)
+
+    def _divide(self, a, b):
+        if b == 0:
+            raise ZeroDivisionError("División por cero no permitida")
+        return a / b
+
+    def _power(self, base, exponent):
+        return math.pow(base, exponent)
+
+    def _sqrt(self, number):
+        if number < 0:
+            raise ValueError("No se puede calcular la raíz cuadrada de un número negativo")
+        return math.sqrt(number)
+
+
+def respond_legacy(model, num1, num2, operation, record_history):
+    """Cuerpo de la respuesta con el camino anterior."""
+    return model.perform_calculation(num1, num2, operation, record_history)
+
+
+def respond_current(model, num1, num2, operation, record_history):
+    """Cuerpo de la respuesta con el camino actual (render en la frontera)."""
+    result = model.perform_calculation(num1, num2, operation, record_history)
+    return render_error(result) if 'error_code' in result else result
+
+
+def measure(respond, model, case, iterations: int, record_history: bool,
+            repeats: int = 5) -> float:
+    """Devuelve las operaciones por segundo de un caso (mejor de varias rondas)."""
+    num1, num2, operation = case
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            respond(model, num1, num2, operation, record_history)
+        best = min(best, time.perf_counter() - start)
+    return iterations / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--iterations', type=int, default=100000)
+    args = parser.parse_args()
+
+    # Con historial el coste de registrar la entrada se suma a ambos caminos
+    for record_history in (False, True):
+        print(f"\nHistorial {'activado' if record_history else 'desactivado'}")
+        print(f"{'caso':<18} {'anterior (op/s)':>16} {'actual (op/s)':>14} {'mejora':>8}")
+        for name, case in CASES.items():
+            legacy = measure(respond_legacy, LegacyCalculatorModel(), case,
+                             args.iterations, record_history)
+            current = measure(respond_current, CalculatorModel(), case,
+                              args.iterations, record_history)
+            print(f"{name:<18} {legacy:>16,.0f} {current:>14,.0f} {current / legacy:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la serialización de GET /history.
+
+Compara, con un historial lleno, el camino anterior (copiar la lista y
+volver a serializar cada entrada con ``jsonify``) con el cuerpo cacheado y
+con el cuerpo rearmado tras una escritura (solo se codifica la entrada nueva
+y se unen los fragmentos ya cacheados).
+
+Uso:
+    python benchmarks/bench_history.py [--iterations 2000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('FLASK_DEBUG', 'false')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from flask import current_app, jsonify
+
+from src.app import create_app
+from src.models.calculator import CalculatorModel
+from src.models.errors import error_message
+
+
+def encode_entry(item) -> bytes:
+    """Serializa una entrada igual que la ruta GET /history."""
+    if item['is_error']:
+        item = dict(item, expression=error_message(item))
+    return current_app.json.dumps(item, separators=(',', ':')).encode('utf-8')
+
+
+def legacy_body(model: CalculatorModel) -> bytes:
+    """Cuerpo generado como antes: copia de la lista y jsonify de todas las entradas."""
+    history = [dict(item, expression=error_message(item)) if item['is_error'] else item
+               for item in list(model.get_history())]
+    return jsonify({"history": history}).get_data()
+
+
+def best_of(func, iterations: int) -> float:
+    """Mejor de 5 del tiempo medio (s) por llamada."""
+    best = float('inf')
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        best = min(best, (time.perf_counter() - start) / iterations)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    app = create_app()
+    model = CalculatorModel()
+    for index in range(model.HISTORY_LIMIT):
+        model.perform_calculation(float(index), float(index % 7), 'divide')
+
+    with app.test_request_context('/history'):
+        assert model.get_history_json(encode_entry) == legacy_body(model)
+
+        def after_append():
+            model.perform_calculation(1.0, 2.0, 'add')
+            model.get_history_json(encode_entry)
+
+        def append_only():
+            model.perform_calculation(1.0, 2.0, 'add')
+
+        legacy = best_of(lambda: legacy_body(model), args.iterations)
+        cached = best_of(lambda: model.get_history_json(encode_entry), args.iterations)
+        rebuilt = best_of(after_append, args.iterations) - best_of(append_only, args.iterations)
+
+    print(f"Historial de {model.HISTORY_LIMIT} entradas\n")
+    print(f"{'camino':<32} {'µs/lectura':>12}")
+    print(f"{'jsonify de todas las entradas':<32} {legacy * 1e6:>12.1f}")
+    print(f"{'tras una escritura (fragmentos)':<32} {rebuilt * 1e6:>12.1f}")
+    print(f"{'cuerpo cacheado':<32} {cached * 1e6:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
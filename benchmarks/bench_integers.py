@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark de las operaciones enteras de CalculatorModel.
+
+Compara el cálculo con resultado en decimal de ``integers`` (factorización en
+primos, árbol de productos en Decimal y conversión subcuadrática) con el
+camino directo de la biblioteca estándar (``math.comb``/``math.perm``/``**``
+seguido de ``str()``, con el límite de dígitos de int → str desactivado).
+
+Uso:
+    python benchmarks/bench_integers.py [--repeat 5]
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.models.integers import evaluate_integer
+
+# Caso → (operación, a, b, referencia con la biblioteca estándar)
+CASES = {
+    'C(300000, 40000)': ('ncr', 300000, 40000, lambda: math.comb(300000, 40000)),
+    'C(200000, 100000)': ('ncr', 200000, 100000, lambda: math.comb(200000, 100000)),
+    'P(100000, 20000)': ('npr', 100000, 20000, lambda: math.perm(100000, 20000)),
+    '25000!': ('factorial', 25000, None, lambda: math.factorial(25000)),
+    '3^200000': ('ipow', 3, 200000, lambda: 3 ** 200000),
+    '12345^3000': ('ipow', 12345, 3000, lambda: 12345 ** 3000)
+}
+
+
+def best_of(func, repeat: int) -> float:
+    """Mejor tiempo (ms) de ``repeat`` ejecuciones."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    sys.set_int_max_str_digits(0)
+    print(f"{'caso':<22}{'dígitos':>10}{'stdlib+str (ms)':>18}{'integers (ms)':>16}{'mejora':>10}")
+
+    for name, (operation, a, b, reference) in CASES.items():
+        text, digits = evaluate_integer(operation, a, b)
+        assert text == str(reference()), name
+        naive = best_of(lambda: str(reference()), args.repeat)
+        fast = best_of(lambda: evaluate_integer(operation, a, b), args.repeat)
+        print(f"{name:<22}{digits:>10,}{naive:>18,.1f}{fast:>16,.1f}{naive / fast:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
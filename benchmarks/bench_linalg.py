@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark de las operaciones con vectores y matrices.
+
+Compara una sola petición POST /calculate con vectores o matrices frente a
+la alternativa anterior: una petición escalar por elemento (o por producto
+en el caso del producto escalar y de matrices). Las peticiones se hacen con
+el cliente de pruebas de Flask, sin red, así que la diferencia medida es el
+coste por petición de la aplicación.
+
+Uso:
+    python benchmarks/bench_linalg.py [--size 1000] [--matrix 20]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# El control de admisión y el calentamiento no forman parte de la medida
+os.environ.setdefault('ADMISSION_ENABLED', 'false')
+os.environ.setdefault('WARMUP_MODE', 'off')
+
+from src.app import create_app
+from src.models.linalg import np
+
+
+def elementwise_requests(client, a, b):
+    """Una petición escalar por elemento."""
+    return [client.post('/calculate', json={'num1': x, 'num2': y, 'operation': 'multiply'}).get_json()['result']
+            for x, y in zip(a, b)]
+
+
+def matmul_requests(client, a, b):
+    """Una petición multiply por producto y una add por suma parcial."""
+    result = []
+    for row in a:
+        output = []
+        for column in zip(*b):
+            total = 0.0
+            for x, y in zip(row, column):
+                product = client.post('/calculate', json={'num1': x, 'num2': y, 'operation': 'multiply'})
+                total = client.post('/calculate', json={'num1': total, 'num2': product.get_json()['result'],
+                                                        'operation': 'add'}).get_json()['result']
+            output.append(total)
+        result.append(output)
+    return result
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size', type=int, default=1000, help='elementos del vector')
+    parser.add_argument('--matrix', type=int, default=20, help='dimensión de las matrices cuadradas')
+    args = parser.parse_args()
+
+    app = create_app()
+    client = app.test_client()
+    random.seed(0)
+    a = [random.uniform(-100, 100) for _ in range(args.size)]
+    b = [random.uniform(-100, 100) for _ in range(args.size)]
+    m1 = [[random.uniform(-1, 1) for _ in range(args.matrix)] for _ in range(args.matrix)]
+    m2 = [[random.uniform(-1, 1) for _ in range(args.matrix)] for _ in range(args.matrix)]
+
+    print(f"backend: {'numpy' if np is not None else 'nativo'}")
+    print(f"{'caso':<32}{'peticiones':>11}{'escalar (ms)':>14}{'vectorizado (ms)':>18}{'mejora':>9}")
+
+    expected, scalar_ms = timed(elementwise_requests, client, a, b)
+    response, vector_ms = timed(lambda: client.post('/calculate', json={'num1': a, 'num2': b,
+                                                                         'operation': 'array_multiply'}))
+    assert response.get_json()['result'] == expected
+    print(f"{f'array_multiply ({args.size})':<32}{args.size:>11,}{scalar_ms:>14,.1f}{vector_ms:>18,.2f}"
+          f"{scalar_ms / vector_ms:>8.0f}x")
+
+    expected, scalar_ms = timed(matmul_requests, client, m1, m2)
+    response, vector_ms = timed(lambda: client.post('/calculate', json={'num1': m1, 'num2': m2,
+                                                                         'operation': 'matmul'}))
+    result = response.get_json()['result']
+    assert all(abs(x - y) < 1e-9 for row, other in zip(result, expected) for x, y in zip(row, other))
+    requests = 2 * args.matrix ** 3
+    print(f"{f'matmul ({args.matrix}×{args.matrix})':<32}{requests:>11,}{scalar_ms:>14,.1f}{vector_ms:>18,.2f}"
+          f"{scalar_ms / vector_ms:>8.0f}x")
+
+
+if __name__ == '__main__':
+    main()
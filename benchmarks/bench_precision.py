@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark del coste de cada modo de precisión.
+
+Mide validar y calcular (sin historial) varios casos en los modos 'float',
+'decimal' y 'fraction', y muestra el sobrecoste de cada modo exacto frente a
+float. Los casos con enteros usan el camino rápido de los modos exactos.
+
+Uso:
+    python benchmarks/bench_precision.py [--iterations 50000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.models.calculator import CalculatorModel
+from src.models.precision import PRECISION_MODES
+
+CASES = {
+    'enteros 6 × 3': (6, 3, 'multiply'),
+    'decimales 0.1 + 0.2': (0.1, 0.2, 'add'),
+    'porcentaje 15% de 19.99': (19.99, 15, 'percentage'),
+    'división 1 ÷ 3': (1, 3, 'divide'),
+    'raíz √2': (2, None, 'sqrt')
+}
+
+
+def measure(model, case, precision: str, iterations: int, repeats: int = 5) -> float:
+    """Devuelve los nanosegundos por operación (mejor de varias rondas)."""
+    num1, num2, operation = case
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            validated = model.validate_inputs(num1, num2, operation, precision)
+            model.perform_calculation(validated['num1'], validated['num2'], operation,
+                                      record_history=False, precision=precision)
+        best = min(best, time.perf_counter() - start)
+    return best / iterations * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--iterations', type=int, default=50000)
+    args = parser.parse_args()
+
+    model = CalculatorModel()
+    header = ''.join(f"{mode + ' (ns)':>16}" for mode in PRECISION_MODES)
+    print(f"{'caso':<26}{header}{'decimal/float':>15}{'fraction/float':>16}")
+
+    for name, case in CASES.items():
+        timings = {mode: measure(model, case, mode, args.iterations) for mode in PRECISION_MODES}
+        row = ''.join(f"{timings[mode]:>16,.0f}" for mode in PRECISION_MODES)
+        print(f"{name:<26}{row}"
+              f"{timings['decimal'] / timings['float']:>14.2f}x"
+              f"{timings['fraction'] / timings['float']:>15.2f}x")
+
+
+if __name__ == '__main__':
+    main()
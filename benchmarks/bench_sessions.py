@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memoria de los modelos por sesión.
+
+Simula cientos de miles de sesiones (cada una con algunos cálculos en su
+historial) y mide la memoria asignada con tracemalloc: con el almacén LRU
+acotado, la memoria debe estabilizarse al alcanzar SESSION_MAX_MODELS o, con
+--max-bytes, al alcanzar el presupuesto de memoria (SESSION_MAX_BYTES).
+
+Uso:
+    python benchmarks/bench_sessions.py [--sessions 300000] [--max-sessions 10000]
+                                        [--operations 3] [--max-bytes 0]
+"""
+
+import argparse
+import os
+import secrets
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.models.calculator import CalculatorModel
+from src.models.sessions import SessionModelStore
+
+
+def run(total_sessions: int, max_sessions: int, operations_per_session: int, max_bytes: int = 0):
+    """Crea las sesiones e imprime la memoria en cada punto de control."""
+    store = SessionModelStore(CalculatorModel, max_sessions=max_sessions, max_bytes=max_bytes)
+    checkpoints = {total_sessions * step // 10 for step in range(1, 11)}
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    print(f"{'sesiones':>10} {'en memoria':>11} {'memoria (MB)':>13} {'pico (MB)':>10} {'estimada (MB)':>14}")
+
+    for created in range(1, total_sessions + 1):
+        session_id = secrets.token_urlsafe(16)
+        model = store.get(session_id)
+        for index in range(operations_per_session):
+            model.perform_calculation(float(created), float(index + 1), 'divide')
+        # Lo que hace la aplicación al terminar cada petición
+        store.measure(session_id)
+
+        if created in checkpoints:
+            current, peak = tracemalloc.get_traced_memory()
+            estimated = store.stats()['estimated_bytes']
+            print(f"{created:>10} {len(store):>11} {current / 1e6:>13.1f} {peak / 1e6:>10.1f} "
+                  f"{estimated / 1e6:>14.1f}")
+
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+
+    stats = store.stats()
+    print(f"\n{total_sessions / elapsed:,.0f} sesiones/s; "
+          f"expulsadas por LRU: {stats['evicted_lru']}, por inactividad: {stats['evicted_idle']}, "
+          f"por memoria: {stats['evicted_memory']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sessions', type=int, default=300000)
+    parser.add_argument('--max-sessions', type=int, default=10000)
+    parser.add_argument('--operations', type=int, default=3, help='cálculos por sesión')
+    parser.add_argument('--max-bytes', type=int, default=0, help='presupuesto de memoria (0 sin límite)')
+    args = parser.parse_args()
+    run(args.sessions, args.max_sessions, args.operations, args.max_bytes)
+
+
+if __name__ == '__main__':
+    main()
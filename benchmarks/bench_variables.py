@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark del recálculo incremental de variables y fórmulas.
+
+Construye un grafo grande (muchas cadenas de fórmulas independientes) y mide
+cuánto cuesta cambiar la entrada de cadenas de distinta longitud: el coste
+debe crecer con el tamaño del subgrafo afectado y no con el del grafo. Como
+referencia se mide también el recálculo completo (lo que hacía el cliente al
+volver a enviar todas las operaciones).
+
+Uso:
+    python benchmarks/bench_variables.py [--variables 20000] [--updates 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.models.calculator import CalculatorModel
+from src.models.variables import VariableGraph
+
+AFFECTED_SIZES = (1, 10, 100, 1000)
+
+
+def build_chain(graph: VariableGraph, prefix: str, length: int):
+    """Entrada ``{prefix}_in`` seguida de ``length`` fórmulas encadenadas."""
+    graph.set(f'{prefix}_in', value=1)
+    previous = f'{prefix}_in'
+    for index in range(length):
+        name = f'{prefix}_{index}'
+        graph.set(name, formula=f'add({previous}, 1)')
+        previous = name
+
+
+def build_graph(total_variables: int) -> VariableGraph:
+    """Cadenas de las longitudes medidas más cadenas de relleno hasta el total."""
+    graph = VariableGraph(CalculatorModel(), max_variables=total_variables + 2 * len(AFFECTED_SIZES))
+    for size in AFFECTED_SIZES:
+        build_chain(graph, f'chain{size}', size)
+
+    filler = 0
+    while len(graph) + 11 <= total_variables:
+        build_chain(graph, f'filler{filler}', 10)
+        filler += 1
+    return graph
+
+
+def measure_update(graph: VariableGraph, name: str, updates: int) -> float:
+    """Mejor de 5 del tiempo medio (s) de cambiar una entrada."""
+    best = float('inf')
+    for _ in range(5):
+        start = time.perf_counter()
+        for index in range(updates):
+            # Valores alternos para que el cambio se propague siempre
+            graph.set(name, value=index % 2)
+        best = min(best, (time.perf_counter() - start) / updates)
+    return best
+
+
+def measure_full_recompute(graph: VariableGraph) -> float:
+    """Tiempo (s) de evaluar una vez cada fórmula, como al reenviar todos los cálculos."""
+    formulas = sum(1 for item in graph.get_many().values() if item['formula'] is not None)
+    model = graph.model
+    start = time.perf_counter()
+    for index in range(formulas):
+        model.perform_calculation(float(index), 1.0, 'add', record_history=False)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--variables', type=int, default=20000, help='tamaño total del grafo')
+    parser.add_argument('--updates', type=int, default=200, help='cambios por medición')
+    args = parser.parse_args()
+
+    graph = build_graph(args.variables)
+    print(f"Grafo con {len(graph)} variables\n")
+    print(f"{'afectadas':>10} {'µs/cambio':>12} {'µs/variable':>12}")
+
+    for size in AFFECTED_SIZES:
+        # Número par de cambios: cada uno alterna el valor de la entrada
+        updates = max(2, args.updates * 10 // max(size, 10)) // 2 * 2
+        elapsed = measure_update(graph, f'chain{size}_in', updates)
+        recomputed = size + 1
+        print(f"{recomputed:>10} {elapsed * 1e6:>12.1f} {elapsed * 1e6 / recomputed:>12.2f}")
+
+    full = measure_full_recompute(graph)
+    print(f"\nRecálculo completo ({len(graph)} variables): {full * 1e6:,.0f} µs por cambio")
+
+
+if __name__ == '__main__':
+    main()
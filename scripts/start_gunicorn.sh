@@ -23,4 +23,5 @@ echo "=========================================="
 
 # Ejecutar gunicorn con la configuración que funciona
 export PYTHONPATH=/home/alde/Escritorio/test_app_desktop
-exec gunicorn app:app --bind 127.0.0.1:8000 --workers 4 --access-logfile - --error-logfile -
+# --backlog acota las conexiones en espera: el exceso se rechaza en lugar de encolarse
+exec gunicorn app:app --bind 127.0.0.1:8000 --workers 4 --backlog 128 --access-logfile - --error-logfile -
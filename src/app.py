@@ -4,16 +4,39 @@ Punto de entrada principal que configura y ejecuta la aplicación.
 """
 
 from flask import Flask, render_template, request
+from jinja2 import FileSystemBytecodeCache
+from werkzeug.middleware.proxy_fix import ProxyFix
 from .routes import create_routes
+from .utils.http_cache import ResponseCache
+from .utils.admission import install_admission_control
+from .utils.tracing import install_tracing
+from .utils.warmup import install_warmup
+from .utils.memory import install_memory_diagnostics
+from .models.offload import OffloadExecutor
+from .utils.structured_logging import (
+    JsonFormatter, start_queue_logging, install_access_log, logging_metrics
+)
 import os
+import atexit
+import stat
 import logging
 from logging.handlers import RotatingFileHandler
 
+# Vistas protegidas por el control de admisión
+ADMISSION_ENDPOINTS = ('calculate', 'calculate_cacheable', 'calculate_batch', 'set_variable', 'tabulate')
+
+# Vistas protegidas cuyo cuerpo se lee en streaming (límite STATISTICS_MAX_VALUES,
+# no ADMISSION_MAX_CONTENT_LENGTH)
+ADMISSION_UNSIZED_ENDPOINTS = ('statistics',)
+
 
 def setup_logging(app: Flask):
     """
     Configura el sistema de logging de la aplicación.
 
+    En producción los registros se encolan y un hilo escritor dedicado los
+    guarda como JSON en un fichero rotativo, sin bloquear las peticiones.
+
     Args:
         app (Flask): Instancia de la aplicación Flask
     """
@@ -29,15 +52,100 @@ def setup_logging(app: Flask):
             backupCount=10
         )
 
-        file_handler.setFormatter(logging.Formatter(
-            '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
-        ))
-
+        file_handler.setFormatter(JsonFormatter())
         file_handler.setLevel(logging.INFO)
-        app.logger.addHandler(file_handler)
+
+        # El fichero lo escribe el hilo del QueueListener
+        listener = start_queue_logging(app, file_handler)
+        atexit.register(listener.stop)
+
         app.logger.setLevel(logging.INFO)
         app.logger.info('Calculator application startup')
 
+    # Log de acceso estructurado y muestreado
+    install_access_log(app)
+
+
+def setup_template_cache(app: Flask):
+    """
+    Activa la caché de bytecode de Jinja para que los workers nuevos
+    no tengan que recompilar las plantillas.
+
+    Sin JINJA_CACHE_DIR, Jinja usa un directorio propio del usuario en el
+    directorio temporal (modo 0700, con el propietario comprobado). Un
+    directorio configurado solo se usa si es del usuario y nadie más puede
+    escribir en él: otro usuario podría dejar bytecode que Jinja cargaría.
+
+    Args:
+        app (Flask): Instancia de la aplicación Flask
+    """
+    cache_dir = app.config.get('JINJA_CACHE_DIR')
+    if cache_dir == '':
+        return
+
+    if cache_dir is None:
+        try:
+            bytecode_cache = FileSystemBytecodeCache()
+        except RuntimeError:
+            app.logger.warning('El directorio temporal de caché de plantillas no es seguro')
+            return
+    elif is_private_directory(cache_dir):
+        bytecode_cache = FileSystemBytecodeCache(cache_dir)
+    else:
+        app.logger.warning('El directorio de caché de plantillas no existe o no es privado: %s', cache_dir)
+        return
+
+    # Debe configurarse antes del primer acceso a app.jinja_env
+    app.jinja_options = {
+        **app.jinja_options,
+        'bytecode_cache': bytecode_cache
+    }
+
+
+def is_private_directory(path: str) -> bool:
+    """
+    Crea (si hace falta) y comprueba un directorio privado del usuario actual.
+
+    Args:
+        path (str): Ruta del directorio
+
+    Returns:
+        bool: True si es un directorio (no un enlace) del usuario sin permisos
+        para el grupo ni para otros
+    """
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        info = os.lstat(path)
+    except OSError:
+        return False
+    return (stat.S_ISDIR(info.st_mode) and info.st_uid == os.getuid()
+            and not info.st_mode & (stat.S_IRWXG | stat.S_IRWXO))
+
+
+def setup_offload(app: Flask) -> OffloadExecutor:
+    """
+    Conecta el modelo a un pool de procesos para las operaciones costosas.
+
+    El pool se crea en la primera operación que lo necesite, de modo que
+    los workers que solo atienden operaciones baratas no arrancan procesos.
+
+    Args:
+        app (Flask): Instancia de la aplicación Flask
+
+    Returns:
+        OffloadExecutor: Ejecutor asignado al modelo
+    """
+    executor = OffloadExecutor(
+        max_workers=app.config['OFFLOAD_MAX_WORKERS'],
+        max_pending=app.config['OFFLOAD_MAX_PENDING'],
+        timeout=app.config['OFFLOAD_TIMEOUT']
+    )
+    model = app.extensions['calculator']['model']
+    model.offload_executor = executor
+    model.offload_cost_threshold = app.config['OFFLOAD_COST_THRESHOLD']
+    atexit.register(executor.shutdown)
+    return executor
+
 
 def create_app(config_name: str = "development") -> Flask:
     """
@@ -56,6 +164,73 @@ def create_app(config_name: str = "development") -> Flask:
     # Configuración básica
     app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
     app.config['DEBUG'] = os.environ.get('FLASK_DEBUG', 'True').lower() == 'true'
+    # Caché de bytecode de Jinja: sin definir, directorio privado del usuario
+    # en el directorio temporal; vacío la desactiva
+    app.config['JINJA_CACHE_DIR'] = os.environ.get('JINJA_CACHE_DIR')
+    # Número máximo de cálculos aceptados por POST /calculate/batch
+    app.config['CALCULATE_BATCH_MAX_ITEMS'] = int(os.environ.get('CALCULATE_BATCH_MAX_ITEMS', 100))
+    # Número máximo de valores aceptados por POST /statistics
+    app.config['STATISTICS_MAX_VALUES'] = int(os.environ.get('STATISTICS_MAX_VALUES', 10_000_000))
+    # Logging: muestreo del log de acceso y presupuesto de coste por petición
+    app.config['ACCESS_LOG_SAMPLE_RATE'] = float(os.environ.get('ACCESS_LOG_SAMPLE_RATE', 0.1))
+    app.config['LOG_OVERHEAD_BUDGET_US'] = float(os.environ.get('LOG_OVERHEAD_BUDGET_US', 50))
+    app.config['LOG_QUEUE_SIZE'] = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+    # Trazas: muestreo por cabecera y exportación siempre si la petición es lenta
+    app.config['TRACE_ENABLED'] = os.environ.get('TRACE_ENABLED', 'True').lower() == 'true'
+    app.config['TRACE_SAMPLE_RATE'] = float(os.environ.get('TRACE_SAMPLE_RATE', 0.01))
+    app.config['TRACE_SLOW_THRESHOLD_MS'] = float(os.environ.get('TRACE_SLOW_THRESHOLD_MS', 200))
+    app.config['TRACE_EXPORT_PATH'] = os.environ.get('TRACE_EXPORT_PATH', 'logs/traces.jsonl')
+    # Trazas forzadas por el traceparent del cliente (por segundo) y rotación del fichero
+    app.config['TRACE_FORCED_PER_SECOND'] = float(os.environ.get('TRACE_FORCED_PER_SECOND', 10))
+    app.config['TRACE_EXPORT_MAX_BYTES'] = int(os.environ.get('TRACE_EXPORT_MAX_BYTES', 10240000))
+    app.config['TRACE_EXPORT_BACKUPS'] = int(os.environ.get('TRACE_EXPORT_BACKUPS', 5))
+    # Control de admisión: límites por cliente, globales y de tamaño
+    app.config['ADMISSION_ENABLED'] = os.environ.get('ADMISSION_ENABLED', 'True').lower() == 'true'
+    app.config['ADMISSION_RATE'] = float(os.environ.get('ADMISSION_RATE', 20))
+    app.config['ADMISSION_BURST'] = int(os.environ.get('ADMISSION_BURST', 40))
+    app.config['ADMISSION_MAX_IN_FLIGHT'] = int(os.environ.get('ADMISSION_MAX_IN_FLIGHT', 32))
+    app.config['ADMISSION_QUEUE_TIMEOUT'] = float(os.environ.get('ADMISSION_QUEUE_TIMEOUT', 0.5))
+    app.config['ADMISSION_TARGET_QUEUE_DELAY'] = float(os.environ.get('ADMISSION_TARGET_QUEUE_DELAY', 0.05))
+    app.config['ADMISSION_MAX_CONTENT_LENGTH'] = int(os.environ.get('ADMISSION_MAX_CONTENT_LENGTH', 64 * 1024))
+    app.config['ADMISSION_MAX_CLIENTS'] = int(os.environ.get('ADMISSION_MAX_CLIENTS', 10000))
+    # Proxies inversos de confianza delante de la aplicación: con N > 0 la
+    # dirección del cliente se toma de X-Forwarded-For (límites por cliente)
+    app.config['TRUSTED_PROXIES'] = int(os.environ.get('TRUSTED_PROXIES', 0))
+    if app.config['TRUSTED_PROXIES'] > 0:
+        proxies = app.config['TRUSTED_PROXIES']
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxies, x_proto=proxies, x_host=proxies)
+    # Caché de respuestas para reintentos con Idempotency-Key
+    app.config['IDEMPOTENCY_MAX_ENTRIES'] = int(os.environ.get('IDEMPOTENCY_MAX_ENTRIES', 10000))
+    app.config['IDEMPOTENCY_TTL'] = float(os.environ.get('IDEMPOTENCY_TTL', 300))
+    # Pool de procesos para operaciones costosas (las baratas se evalúan en línea)
+    app.config['OFFLOAD_ENABLED'] = os.environ.get('OFFLOAD_ENABLED', 'True').lower() == 'true'
+    app.config['OFFLOAD_MAX_WORKERS'] = int(os.environ.get('OFFLOAD_MAX_WORKERS', 2))
+    app.config['OFFLOAD_MAX_PENDING'] = int(os.environ.get('OFFLOAD_MAX_PENDING', 8))
+    app.config['OFFLOAD_TIMEOUT'] = float(os.environ.get('OFFLOAD_TIMEOUT', 2.0))
+    app.config['OFFLOAD_COST_THRESHOLD'] = float(os.environ.get('OFFLOAD_COST_THRESHOLD', 1_000_000))
+    # Número máximo de puntos por tabla de POST /tabulate
+    app.config['TABULATE_MAX_POINTS'] = int(os.environ.get('TABULATE_MAX_POINTS', 100_000))
+    # Modelos por sesión: máximo en memoria y expiración por inactividad
+    app.config['SESSION_MAX_MODELS'] = int(os.environ.get('SESSION_MAX_MODELS', 10000))
+    app.config['SESSION_IDLE_TTL'] = float(os.environ.get('SESSION_IDLE_TTL', 1800))
+    # Memoria estimada máxima de todas las sesiones (0 sin límite)
+    app.config['SESSION_MAX_BYTES'] = int(os.environ.get('SESSION_MAX_BYTES', 256 * 1024 * 1024))
+    # Número máximo de variables y fórmulas por sesión
+    app.config['VARIABLES_MAX_PER_SESSION'] = int(os.environ.get('VARIABLES_MAX_PER_SESSION', 1000))
+    # Calentamiento del worker: 'sync' (antes de atender), 'background' u 'off'
+    app.config['WARMUP_MODE'] = os.environ.get('WARMUP_MODE', 'sync').lower()
+    app.config['WARMUP_ITERATIONS'] = int(os.environ.get('WARMUP_ITERATIONS', 10))
+    # Diagnóstico de memoria: /debug/memory desactivado salvo que se habilite;
+    # habilitado exige siempre DEBUG_MEMORY_TOKEN (sin token deniega el acceso)
+    app.config['DEBUG_MEMORY_ENABLED'] = os.environ.get('DEBUG_MEMORY_ENABLED', 'False').lower() == 'true'
+    app.config['DEBUG_MEMORY_TOKEN'] = os.environ.get('DEBUG_MEMORY_TOKEN', '')
+    app.config['DEBUG_MEMORY_MAX_SNAPSHOTS'] = int(os.environ.get('DEBUG_MEMORY_MAX_SNAPSHOTS', 8))
+    app.config['MEMORY_SAMPLE_INTERVAL'] = float(os.environ.get('MEMORY_SAMPLE_INTERVAL', 60))
+    app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
+    # La forma GET de /calculate no registra historial salvo que se indique
+    app.config['CALCULATE_GET_RECORD_HISTORY'] = (
+        os.environ.get('CALCULATE_GET_RECORD_HISTORY', 'False').lower() == 'true'
+    )
 
     # Configuraciones específicas por entorno
     if config_name == "production":
@@ -74,28 +249,64 @@ def create_app(config_name: str = "development") -> Flask:
     # Configurar logging
     setup_logging(app)
 
+    # Configurar caché de plantillas
+    setup_template_cache(app)
+
     # Registrar blueprint principal directamente
     main_bp = create_routes()
     app.register_blueprint(main_bp)
 
+    app.extensions['calculator']['metrics']['logging'] = lambda: logging_metrics(app)
+
+    # RSS y GC periódicos en el log, y tracemalloc bajo demanda en /debug/memory
+    install_memory_diagnostics(app)
+
+    # Operaciones costosas fuera del hilo de la petición
+    if app.config['OFFLOAD_ENABLED']:
+        executor = setup_offload(app)
+        app.extensions['calculator']['metrics']['offload'] = executor.stats
+
+    # Trazas por petición (antes del control de admisión para medir su espera)
+    if app.config['TRACE_ENABLED']:
+        tracer = install_tracing(app)
+        app.extensions['calculator']['metrics']['tracing'] = tracer.stats
+
+    # Control de admisión delante de los endpoints de cálculo
+    if app.config['ADMISSION_ENABLED']:
+        admission = install_admission_control(app, ADMISSION_ENDPOINTS, ADMISSION_UNSIZED_ENDPOINTS)
+        app.extensions['calculator']['metrics']['admission'] = admission.stats
+
+    # Páginas de error renderizadas una sola vez (evita re-renderizar
+    # plantillas grandes durante ráfagas de peticiones de escáneres)
+    error_pages = ResponseCache()
+    error_pages.register('404', lambda: render_template('errors/404.html'), 'text/html',
+                         status=404, cache_control='no-store', conditional=False)
+    error_pages.register('500', lambda: render_template('errors/500.html'), 'text/html',
+                         status=500, cache_control='no-store', conditional=False)
+    app.extensions['calculator']['error_pages'] = error_pages
+
     # Configurar manejadores de errores
     @app.errorhandler(404)
     def not_found(error):
         """Manejo global de errores 404."""
-        app.logger.warning(f'404 error: {request.url}')
-        return render_template('errors/404.html'), 404
+        app.logger.warning('404 error: %s', request.url)
+        return error_pages.respond('404')
 
     @app.errorhandler(500)
     def internal_error(error):
         """Manejo global de errores 500."""
-        app.logger.error(f'500 error: {error}')
-        return render_template('errors/500.html'), 500
+        app.logger.error('500 error: %s', error)
+        return error_pages.respond('500')
 
     @app.errorhandler(Exception)
     def handle_exception(e):
         """Manejo global de excepciones no capturadas."""
-        app.logger.error(f'Unhandled exception: {e}')
-        return render_template('errors/500.html'), 500
+        app.logger.error('Unhandled exception: %s', e, exc_info=e)
+        return error_pages.respond('500')
+
+    # Calentamiento: plantillas, cálculos y peticiones internas antes del
+    # tráfico real (GET /ready responde 503 hasta que termina)
+    install_warmup(app)
 
     return app
 
@@ -127,11 +338,18 @@ def main():
     print("   GET  /              - Interfaz web")
     print("   GET  /favicon.ico   - Favicon")
     print("   POST /calculate     - API de cálculos")
+    print("   GET  /calculate     - Cálculo cacheable por query string")
+    print("   POST /calculate/batch - Varios cálculos en una petición")
+    print("   POST /statistics    - Estadísticas de una serie de números")
+    print("   POST /tabulate      - Tabla de una operación sobre un rango")
     print("   GET  /history       - Historial de operaciones")
     print("   DELETE /history     - Limpiar historial")
+    print("   PUT  /variables/<n> - Variables y fórmulas con recálculo incremental")
     print("   GET  /operations    - Operaciones disponibles")
     print("   GET  /health        - Verificación de salud")
+    print("   GET  /ready         - Preparación (calentamiento terminado)")
     print("   GET  /api/info      - Información de la API")
+    print("   GET  /metrics       - Métricas internas")
     print()
     print("💡 Presiona Ctrl+C para detener el servidor")
     print("=" * 50)
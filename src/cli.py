@@ -0,0 +1,312 @@
+"""
+CLI - Calculadora por lotes desde la línea de comandos
+Aplica la semántica de CalculatorModel a operaciones leídas de stdin o de
+ficheros, sin servidor web, y escribe un resultado por línea en stdout en el
+mismo orden que la entrada.
+
+Formatos de entrada:
+- CSV: columnas num1,num2,operation[,precision] (la cabecera es opcional y
+  permite cualquier orden de columnas y la columna num3 de modpow)
+- NDJSON: un objeto {"num1", "num2", "operation", "precision"} por línea
+  ("num3" para modpow)
+
+La entrada se lee de forma incremental y se reparte en bloques ordenados
+entre un pool de procesos; los bloques grandes amortizan la comunicación
+entre procesos y solo hay un número acotado en vuelo, así que la memoria no
+crece con el tamaño de la entrada. Los bloques con una sola operación y
+operandos float válidos se evalúan de forma vectorizada (numpy si está
+instalado, o funciones nativas sobre columnas).
+
+Uso:
+    python -m src.cli [ficheros...] [--format auto|csv|ndjson] [--output ndjson|csv]
+                      [--workers N] [--chunk-size 20000] [--history historial.ndjson]
+"""
+
+import argparse
+import csv
+import io
+import json
+import math
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from .models.calculator import CalculatorModel
+from .models.errors import ErrorCode, render_error
+from .models.vectorized import VECTOR_KERNELS, evaluate_columns
+
+# Columnas de la entrada CSV sin cabecera
+CSV_COLUMNS = ('num1', 'num2', 'operation', 'precision')
+
+# Columnas de la salida CSV
+OUTPUT_COLUMNS = ('result', 'expression', 'error_code', 'error')
+
+Chunk = Tuple[str, int, Tuple[str, ...], List[str], bool]
+
+# Un único codificador evita el coste de configurar json.dumps en cada línea
+_encode_json = json.JSONEncoder(ensure_ascii=False).encode
+
+_model: Optional[CalculatorModel] = None
+
+
+def _get_model() -> CalculatorModel:
+    """Modelo del proceso actual (uno por worker)."""
+    global _model
+    if _model is None:
+        _model = CalculatorModel()
+    return _model
+
+
+def read_chunks(files: Iterable[TextIO], input_format: str, chunk_size: int,
+                record_history: bool) -> Iterator[Chunk]:
+    """
+    Lee la entrada de forma incremental en bloques de líneas.
+
+    Args:
+        files (iterable): Ficheros de texto abiertos
+        input_format (str): 'auto', 'csv' o 'ndjson'
+        chunk_size (int): Líneas por bloque
+        record_history (bool): Si los workers deben devolver el historial
+
+    Yields:
+        tuple: (formato, número de la primera línea, columnas CSV, líneas, historial)
+    """
+    for stream in files:
+        file_format = input_format
+        columns = CSV_COLUMNS
+        lines: List[str] = []
+        first_line = 1
+
+        for number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            if file_format == 'auto':
+                file_format = 'ndjson' if line.lstrip().startswith('{') else 'csv'
+            if file_format == 'csv' and number == 1:
+                header = next(csv.reader([line]))
+                if header and header[0].strip().lower() in CSV_COLUMNS:
+                    columns = tuple(column.strip().lower() for column in header)
+                    continue
+
+            if not lines:
+                first_line = number
+            lines.append(line)
+            if len(lines) >= chunk_size:
+                yield file_format, first_line, columns, lines, record_history
+                lines = []
+
+        if lines:
+            yield file_format, first_line, columns, lines, record_history
+
+
+def process_chunk(chunk: Chunk) -> Tuple[str, str, Dict[str, int]]:
+    """
+    Evalúa un bloque (se ejecuta en un worker).
+
+    Returns:
+        tuple: (resultados NDJSON, historial NDJSON, contadores del bloque)
+    """
+    file_format, first_line, columns, lines, record_history = chunk
+    rows = _parse_rows(file_format, first_line, columns, lines)
+    counters = {'rows': len(rows), 'errors': 0, 'vectorized': 0}
+
+    if record_history:
+        # El historial del worker debe conservar el bloque completo
+        history_log = _get_model().history
+        history_log.limit = max(history_log.limit, len(rows))
+
+    results = None if record_history else _evaluate_vectorized(rows)
+    if results is not None:
+        counters['vectorized'] = len(rows)
+    else:
+        results = _evaluate_rows(rows, record_history)
+
+    output = []
+    for result in results:
+        if 'error_code' in result:
+            counters['errors'] += 1
+            result = render_error(result)
+        output.append(_encode_json(result))
+
+    history = ''
+    if record_history:
+        model = _get_model()
+        history = ''.join(_encode_json(item) + '\n' for item in model.get_history())
+        model.clear_history()
+
+    return '\n'.join(output) + '\n', history, counters
+
+
+def _parse_rows(file_format: str, first_line: int, columns: Tuple[str, ...],
+                lines: List[str]) -> List[Dict]:
+    """Convierte las líneas de un bloque en filas {'num1', 'num2', 'operation', 'precision'}."""
+    rows = []
+    if file_format == 'ndjson':
+        for offset, line in enumerate(lines):
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            if not isinstance(row, dict):
+                row = {'error_code': ErrorCode.INVALID_RECORD, 'line': first_line + offset}
+            rows.append(row)
+        return rows
+
+    for values in csv.reader(lines):
+        # Los campos vacíos equivalen a campos ausentes
+        rows.append({column: value.strip() for column, value in zip(columns, values) if value.strip()})
+    return rows
+
+
+def _evaluate_rows(rows: List[Dict], record_history: bool) -> List[Dict]:
+    """Evalúa fila a fila con CalculatorModel (validación y cálculo)."""
+    model = _get_model()
+    results = []
+    for row in rows:
+        if 'error_code' in row:
+            results.append(row)
+            continue
+        validated = model.validate_inputs(row.get('num1'), row.get('num2'),
+                                          row.get('operation'), row.get('precision', 'float'),
+                                          row.get('num3'))
+        if 'error_code' in validated:
+            results.append(validated)
+            continue
+        results.append(model.perform_calculation(validated['num1'], validated['num2'],
+                                                 validated['operation'],
+                                                 record_history=record_history,
+                                                 precision=validated['precision'],
+                                                 num3=validated.get('num3')))
+    return results
+
+
+def _evaluate_vectorized(rows: List[Dict]) -> Optional[List[Dict]]:
+    """
+    Evalúa un bloque homogéneo (una sola operación float) por columnas.
+
+    Las filas cuyo resultado no es finito (división por cero, raíz de un
+    negativo, desbordamiento) se reevalúan con el modelo para obtener su
+    código de error exacto.
+
+    Returns:
+        list: Resultados, o None si el bloque no admite el camino vectorizado
+    """
+    if not rows:
+        return []
+    operation = rows[0].get('operation')
+    if operation not in VECTOR_KERNELS:
+        return None
+    for row in rows:
+        if row.get('operation') != operation or row.get('precision', 'float') != 'float':
+            return None
+
+    unary = operation in CalculatorModel.UNARY_OPERATIONS
+    try:
+        a = [float(row['num1']) for row in rows]
+        b = None if unary else [float(row['num2']) for row in rows]
+    except (KeyError, TypeError, ValueError, OverflowError):
+        return None
+    if not all(map(math.isfinite, a)) or (b is not None and not all(map(math.isfinite, b))):
+        return None
+
+    values = evaluate_columns(_get_model(), operation, a, b)
+    template = CalculatorModel.OPERATION_HANDLERS[operation][1]
+    results = []
+    for index, value in enumerate(values):
+        if isinstance(value, str):
+            results.append({"error_code": value})
+        else:
+            num2 = None if unary else b[index]
+            results.append({"result": value,
+                            "expression": template.format(a=a[index], b=num2, r=value)})
+    return results
+
+
+def run_chunks(chunks: Iterable[Chunk], workers: int) -> Iterator[Tuple[str, str, Dict[str, int]]]:
+    """
+    Evalúa los bloques en orden, con como mucho ``2 * workers`` en vuelo.
+
+    Yields:
+        tuple: Resultado de ``process_chunk`` de cada bloque, en orden
+    """
+    if workers <= 1:
+        for chunk in chunks:
+            yield process_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(process_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _ndjson_to_csv(text: str) -> str:
+    """Convierte los resultados NDJSON de un bloque a filas CSV."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    for line in text.splitlines():
+        record = json.loads(line)
+        writer.writerow([record.get(column, '') for column in OUTPUT_COLUMNS])
+    return buffer.getvalue()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de ``python -m src.cli``."""
+    parser = argparse.ArgumentParser(description='Calculadora por lotes (CSV/NDJSON) con CalculatorModel')
+    parser.add_argument('files', nargs='*', help="ficheros de entrada ('-' o ninguno para stdin)")
+    parser.add_argument('--format', choices=('auto', 'csv', 'ndjson'), default='auto',
+                        help='formato de entrada (auto: NDJSON si la línea empieza por {)')
+    parser.add_argument('--output', choices=('ndjson', 'csv'), default='ndjson',
+                        help='formato de salida')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='procesos (1 evalúa en el proceso actual)')
+    parser.add_argument('--chunk-size', type=int, default=20000, help='líneas por bloque')
+    parser.add_argument('--history', metavar='FICHERO',
+                        help='guarda el historial de cada operación en NDJSON (desactiva el camino vectorizado)')
+    args = parser.parse_args(argv)
+
+    streams = [sys.stdin if name == '-' else open(name, encoding='utf-8', newline='')
+               for name in (args.files or ['-'])]
+    history_file = open(args.history, 'w', encoding='utf-8') if args.history else None
+    totals = {'rows': 0, 'errors': 0, 'vectorized': 0}
+    output = sys.stdout
+    start = time.perf_counter()
+
+    try:
+        if args.output == 'csv':
+            output.write(','.join(OUTPUT_COLUMNS) + '\n')
+        chunks = read_chunks(streams, args.format, max(1, args.chunk_size), history_file is not None)
+        for text, history, counters in run_chunks(chunks, args.workers):
+            output.write(_ndjson_to_csv(text) if args.output == 'csv' else text)
+            if history_file is not None:
+                history_file.write(history)
+            for key, value in counters.items():
+                totals[key] += value
+        output.flush()
+    except BrokenPipeError:
+        # La salida se cerró antes de tiempo (por ejemplo con `| head`)
+        return 1
+    finally:
+        for stream in streams:
+            if stream is not sys.stdin:
+                stream.close()
+        if history_file is not None:
+            history_file.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"{totals['rows']:,} operaciones en {elapsed:.2f} s "
+          f"({totals['rows'] / elapsed if elapsed else 0:,.0f} op/s); "
+          f"errores: {totals['errors']:,}; vectorizadas: {totals['vectorized']:,}; "
+          f"workers: {args.workers}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,18 @@
+"""
+Paquete Client - Cliente Python de la API de la calculadora
+Sesión keep-alive con reintentos seguros (síncrono), variante asyncio con
+concurrencia acotada y micro-lotes, y resultados tipados.
+"""
+
+from .results import (
+    CalculationResult, CalculationError, CalculationFailed, ClientError, Outcome,
+    VALIDATION_ERRORS, MATH_ERRORS, TRANSIENT_ERRORS
+)
+from .sync_client import CalculatorClient
+from .async_client import AsyncCalculatorClient
+
+__all__ = [
+    'CalculatorClient', 'AsyncCalculatorClient',
+    'CalculationResult', 'CalculationError', 'CalculationFailed', 'ClientError', 'Outcome',
+    'VALIDATION_ERRORS', 'MATH_ERRORS', 'TRANSIENT_ERRORS'
+]
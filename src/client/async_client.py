@@ -0,0 +1,132 @@
+"""
+Cliente Asíncrono - Concurrencia acotada y micro-lotes automáticos
+Las llamadas individuales a ``calculate`` que llegan casi a la vez (dentro de
+``batch_window`` segundos) se agrupan en una sola petición a
+/calculate/batch cuando el servidor la ofrece. Las peticiones se ejecutan
+sobre el cliente síncrono (misma sesión keep-alive y mismos reintentos) en
+un pool de hilos, con como mucho ``max_concurrency`` en vuelo.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from .results import Outcome
+from .sync_client import CalculatorClient, build_payload
+
+
+class AsyncCalculatorClient:
+    """
+    Cliente asyncio de la API.
+
+    Ejemplo:
+        async with AsyncCalculatorClient('http://127.0.0.1:5000') as client:
+            outcomes = await asyncio.gather(*(client.calculate(i, 2, 'multiply') for i in range(500)))
+    """
+
+    def __init__(self, base_url: str = 'http://127.0.0.1:5000', max_concurrency: int = 8,
+                 batch_window: float = 0.002, max_batch_size: int = 100, **kwargs):
+        """
+        Inicializa el cliente.
+
+        Args:
+            base_url (str): URL base del servidor
+            max_concurrency (int): Peticiones HTTP en vuelo como máximo
+            batch_window (float): Segundos que se esperan llamadas para completar un lote
+            max_batch_size (int): Cálculos por lote
+            **kwargs: Opciones de ``CalculatorClient`` (timeout, max_retries...)
+        """
+        self.client = CalculatorClient(base_url, pool_size=max_concurrency,
+                                       max_batch_size=max_batch_size, **kwargs)
+        self.max_concurrency = max_concurrency
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency,
+                                            thread_name_prefix='calculator-client')
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._supports_batch: Optional[bool] = None
+        self._batch_probe: Optional[asyncio.Future] = None
+
+    async def __aenter__(self) -> 'AsyncCalculatorClient':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Envía los lotes pendientes, espera a que terminen y cierra el cliente."""
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._executor.shutdown(wait=True)
+        self.client.close()
+
+    async def _run(self, func, *args):
+        """Ejecuta una llamada bloqueante del cliente síncrono con concurrencia acotada."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def supports_batch(self) -> bool:
+        """Si el servidor ofrece POST /calculate/batch (se consulta una vez)."""
+        if self._supports_batch is None:
+            # Las llamadas concurrentes comparten una única consulta
+            if self._batch_probe is None:
+                self._batch_probe = asyncio.ensure_future(self._run(self.client.supports_batch))
+            self._supports_batch = await self._batch_probe
+        return self._supports_batch
+
+    async def calculate(self, num1, num2=None, operation: str = 'add',
+                        precision: str = 'float', num3=None) -> Outcome:
+        """
+        Realiza un cálculo; se agrupa con las llamadas concurrentes en un lote.
+
+        Returns:
+            CalculationResult o CalculationError
+        """
+        if not await self.supports_batch():
+            return await self._run(self.client.calculate, num1, num2, operation, precision, num3)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((build_payload(num1, num2, operation, precision, num3), future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return await future
+
+    async def calculate_many(self, calculations: Iterable[Mapping[str, Any]]) -> List[Outcome]:
+        """Realiza varios cálculos; devuelve los resultados en el mismo orden."""
+        return list(await asyncio.gather(*(self.calculate(**calculation)
+                                           for calculation in calculations)))
+
+    def _flush(self):
+        """Envía el lote pendiente en una tarea propia."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._send(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        """Envía un lote y resuelve el futuro de cada llamada."""
+        try:
+            outcomes = await self._run(self.client.send_batch, [payload for payload, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), outcome in zip(batch, outcomes):
+            if not future.done():
+                future.set_result(outcome)
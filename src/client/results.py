@@ -0,0 +1,141 @@
+"""
+Resultados del Cliente - Objetos tipados para las respuestas de la API
+Los errores de cálculo se devuelven como valores (igual que CalculatorModel
+devuelve códigos de error en lugar de lanzar excepciones); solo los fallos de
+transporte o del servidor lanzan ``ClientError``.
+"""
+
+from typing import Any, Dict, Mapping, Optional, Union
+
+from ..models.errors import ErrorCode, TRANSIENT_ERRORS
+
+# Errores de validación de la petición (400)
+VALIDATION_ERRORS = frozenset({
+    ErrorCode.INVALID_OPERATION, ErrorCode.INVALID_OPERAND,
+    ErrorCode.MISSING_OPERAND, ErrorCode.INVALID_PRECISION
+})
+
+# Errores matemáticos de la operación (200 con 'error_code')
+MATH_ERRORS = frozenset({
+    ErrorCode.DIVISION_BY_ZERO, ErrorCode.NEGATIVE_SQRT,
+    ErrorCode.OVERFLOW, ErrorCode.DOMAIN_ERROR
+})
+
+
+class CalculationResult:
+    """Resultado correcto de un cálculo."""
+
+    __slots__ = ('result', 'expression', 'precision', 'exact')
+
+    ok = True
+
+    def __init__(self, result: Union[float, str], expression: str,
+                 precision: str = 'float', exact: Optional[bool] = None):
+        """
+        Args:
+            result (float o str): Resultado (cadena en los modos exactos)
+            expression (str): Expresión matemática
+            precision (str): Modo de precisión usado
+            exact (bool, optional): Si el resultado es exacto (modos exactos)
+        """
+        self.result = result
+        self.expression = expression
+        self.precision = precision
+        self.exact = exact
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, CalculationResult) and
+                (self.result, self.expression, self.precision, self.exact) ==
+                (other.result, other.expression, other.precision, other.exact))
+
+    def __repr__(self) -> str:
+        return f"CalculationResult(result={self.result!r}, expression={self.expression!r})"
+
+
+class CalculationError:
+    """Error de un cálculo con su código estable (ver ``ErrorCode``)."""
+
+    __slots__ = ('code', 'message', 'status', 'details')
+
+    ok = False
+
+    def __init__(self, code: Optional[str], message: str, status: int,
+                 details: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            code (str, optional): Código de error (None si el servidor no lo indica)
+            message (str): Mensaje localizado
+            status (int): Código de estado HTTP
+            details (dict, optional): Detalles adicionales ('operand', ...)
+        """
+        self.code = code
+        self.message = message
+        self.status = status
+        self.details = details or {}
+
+    @property
+    def is_validation_error(self) -> bool:
+        """Si la petición no era válida (corregirla antes de reintentar)."""
+        return self.code in VALIDATION_ERRORS or (self.code is None and self.status == 400)
+
+    @property
+    def is_math_error(self) -> bool:
+        """Si la operación no tiene resultado (división por cero, dominio, ...)."""
+        return self.code in MATH_ERRORS
+
+    @property
+    def is_transient(self) -> bool:
+        """Si el servidor estaba ocupado y la operación puede repetirse más tarde."""
+        return self.code in TRANSIENT_ERRORS
+
+    def raise_for_error(self):
+        """Lanza ``CalculationFailed`` con este error."""
+        raise CalculationFailed(self)
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, CalculationError) and
+                (self.code, self.message, self.status, self.details) ==
+                (other.code, other.message, other.status, other.details))
+
+    def __repr__(self) -> str:
+        return f"CalculationError(code={self.code!r}, message={self.message!r}, status={self.status})"
+
+
+Outcome = Union[CalculationResult, CalculationError]
+
+
+class ClientError(Exception):
+    """Fallo de transporte o del servidor tras agotar los reintentos."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class CalculationFailed(Exception):
+    """Excepción opcional para quien prefiera tratar los errores de cálculo con try/except."""
+
+    def __init__(self, error: CalculationError):
+        super().__init__(error.message)
+        self.error = error
+
+
+def parse_outcome(body: Mapping[str, Any], status: int) -> Outcome:
+    """
+    Convierte la respuesta de un cálculo en un objeto tipado.
+
+    Args:
+        body (Mapping): Cuerpo JSON de /calculate o un elemento de /calculate/batch
+        status (int): Código de estado HTTP del cálculo
+
+    Returns:
+        CalculationResult o CalculationError
+    """
+    if 'result' in body and 'error_code' not in body:
+        return CalculationResult(body['result'], body.get('expression', ''),
+                                 body.get('precision', 'float'), body.get('exact'))
+
+    details = {key: value for key, value in body.items()
+               if key not in ('error', 'error_code', 'status')}
+    return CalculationError(body.get('error_code'), body.get('error', 'Error desconocido'),
+                            status, details)
@@ -0,0 +1,261 @@
+"""
+Cliente Síncrono - Sesión HTTP persistente con reintentos seguros
+Todas las llamadas reutilizan las conexiones keep-alive de un pool, así que
+solo la primera paga el handshake TCP. Los cálculos se envían con una
+cabecera Idempotency-Key: si la conexión falla o el servidor responde que
+está saturado, el reintento con la misma clave no duplica el cálculo ni el
+historial.
+"""
+
+import random
+import secrets
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .results import TRANSIENT_ERRORS, ClientError, Outcome, parse_outcome
+
+# Respuestas tras las que se reintenta: duplicado en curso, admisión, servidor
+# ocupado (503 con TIMEOUT o BUSY) y pasarelas
+RETRY_STATUSES = frozenset({409, 429, 502, 503, 504})
+
+# Métodos que se pueden repetir sin clave de idempotencia
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'PUT', 'DELETE'})
+
+
+class CalculatorClient:
+    """
+    Cliente de la API con sesión persistente, reintentos y lotes.
+
+    Ejemplo:
+        with CalculatorClient('http://127.0.0.1:5000') as client:
+            outcome = client.calculate(10, 5, 'divide')
+            if outcome.ok:
+                print(outcome.result)
+    """
+
+    def __init__(self, base_url: str = 'http://127.0.0.1:5000', timeout: float = 5.0,
+                 max_retries: int = 3, backoff: float = 0.1, max_backoff: float = 2.0,
+                 pool_size: int = 10, max_batch_size: int = 100,
+                 session: Optional[requests.Session] = None):
+        """
+        Inicializa el cliente (las conexiones se abren en el primer uso).
+
+        Args:
+            base_url (str): URL base del servidor
+            timeout (float): Segundos máximos por petición
+            max_retries (int): Reintentos tras un fallo transitorio
+            backoff (float): Espera base (se duplica en cada reintento, con jitter)
+            max_backoff (float): Espera máxima entre reintentos
+            pool_size (int): Conexiones keep-alive que se conservan
+            max_batch_size (int): Cálculos por petición a /calculate/batch
+            session (requests.Session, optional): Sesión propia a reutilizar
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_batch_size = max_batch_size
+
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._supports_batch: Optional[bool] = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> 'CalculatorClient':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Cierra las conexiones del pool."""
+        self.session.close()
+
+    def request(self, method: str, path: str, idempotent: bool = False,
+                **kwargs) -> requests.Response:
+        """
+        Envía una petición reintentando los fallos transitorios.
+
+        Solo se reintentan las peticiones repetibles: métodos idempotentes o
+        POST con Idempotency-Key (``idempotent=True``), que conserva la misma
+        clave en todos los intentos.
+
+        Args:
+            method (str): Método HTTP
+            path (str): Ruta ('/calculate')
+            idempotent (bool): Si se añade una Idempotency-Key a un POST
+            **kwargs: Argumentos de ``requests.Session.request`` (json, params...)
+
+        Returns:
+            requests.Response: Última respuesta recibida
+
+        Raises:
+            ClientError: Si la conexión falla en todos los intentos
+        """
+        method = method.upper()
+        headers = dict(kwargs.pop('headers', None) or {})
+        if idempotent:
+            headers.setdefault('Idempotency-Key', secrets.token_urlsafe(16))
+        retries = self.max_retries if idempotent or method in IDEMPOTENT_METHODS else 0
+
+        for attempt in range(retries + 1):
+            try:
+                response = self.session.request(method, self.base_url + path, headers=headers,
+                                                timeout=self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == retries:
+                    raise ClientError(f"Error de conexión: {e}") from e
+                retry_after = None
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == retries:
+                    return response
+                retry_after = response.headers.get('Retry-After')
+            time.sleep(self._retry_delay(attempt, retry_after))
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[str]) -> float:
+        """Espera antes del reintento: Retry-After si el servidor lo indica, si no backoff con jitter."""
+        if retry_after is not None:
+            try:
+                return min(max(float(retry_after), 0.0), self.max_backoff * 5)
+            except ValueError:
+                pass
+        delay = min(self.max_backoff, self.backoff * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _json(self, response: requests.Response) -> Any:
+        """
+        Cuerpo JSON de una respuesta, o ClientError si el servidor falló.
+
+        Un 503 con un error transitorio (TIMEOUT, BUSY) que persiste tras los
+        reintentos se devuelve como cuerpo: el cálculo lo convierte en un
+        ``CalculationError`` con ``is_transient``.
+        """
+        if response.status_code >= 500 or response.status_code in RETRY_STATUSES:
+            body = self._transient_body(response) if response.status_code == 503 else None
+            if body is None:
+                raise ClientError(f"El servidor respondió {response.status_code}", response.status_code)
+            return body
+        try:
+            return response.json()
+        except ValueError as e:
+            raise ClientError("Respuesta no JSON del servidor", response.status_code) from e
+
+    @staticmethod
+    def _transient_body(response: requests.Response) -> Optional[Dict[str, Any]]:
+        """Cuerpo de un error transitorio del cálculo, o None si es otro fallo."""
+        try:
+            body = response.json()
+        except ValueError:
+            return None
+        if isinstance(body, dict) and body.get('error_code') in TRANSIENT_ERRORS:
+            return body
+        return None
+
+    def calculate(self, num1, num2=None, operation: str = 'add',
+                  precision: str = 'float', num3=None) -> Outcome:
+        """
+        Realiza un cálculo.
+
+        Args:
+            num1: Primer número
+            num2: Segundo número (no requerido para sqrt y factorial)
+            operation (str): Operación
+            precision (str): 'float', 'decimal' o 'fraction'
+            num3: Tercer número (módulo de modpow)
+
+        Returns:
+            CalculationResult o CalculationError
+        """
+        response = self.request('POST', '/calculate', idempotent=True,
+                                json=build_payload(num1, num2, operation, precision, num3))
+        return parse_outcome(self._json(response), response.status_code)
+
+    def calculate_many(self, calculations: Iterable[Mapping[str, Any]]) -> List[Outcome]:
+        """
+        Realiza varios cálculos en orden, en lotes si el servidor ofrece /calculate/batch.
+
+        Args:
+            calculations (iterable): Diccionarios con num1, num2, operation, precision y num3
+
+        Returns:
+            list: Un resultado o error por cálculo, en el mismo orden
+        """
+        payloads = [build_payload(**calculation) for calculation in calculations]
+        if not self.supports_batch():
+            return [self.calculate(**payload) for payload in payloads]
+
+        outcomes = []
+        for start in range(0, len(payloads), self.max_batch_size):
+            outcomes.extend(self.send_batch(payloads[start:start + self.max_batch_size]))
+        return outcomes
+
+    def send_batch(self, payloads: List[Dict[str, Any]]) -> List[Outcome]:
+        """Envía un lote ya construido a /calculate/batch."""
+        response = self.request('POST', '/calculate/batch', idempotent=True,
+                                json={'calculations': payloads})
+        body = self._json(response)
+        if response.status_code != 200:
+            raise ClientError(body.get('error', 'Lote rechazado'), response.status_code)
+        return [parse_outcome(item, item.get('status', 200)) for item in body['results']]
+
+    def supports_batch(self) -> bool:
+        """Si el servidor ofrece POST /calculate/batch (se consulta /api/info una vez)."""
+        if self._supports_batch is None:
+            with self._lock:
+                if self._supports_batch is None:
+                    try:
+                        response = self.request('GET', '/api/info')
+                        endpoints = response.json().get('endpoints', {}) if response.ok else {}
+                    except (ClientError, ValueError):
+                        endpoints = {}
+                    self._supports_batch = 'POST /calculate/batch' in endpoints
+        return self._supports_batch
+
+    def history(self, **filters) -> List[Dict[str, Any]]:
+        """
+        Obtiene el historial de la sesión.
+
+        Args:
+            **filters: operation, errors_only, start/end (ISO 8601 o epoch) y limit
+
+        Returns:
+            list: Entradas del historial
+        """
+        params = {('from' if key == 'start' else 'to' if key == 'end' else key): value
+                  for key, value in filters.items() if value is not None}
+        if isinstance(params.get('errors_only'), bool):
+            params['errors_only'] = 'true' if params['errors_only'] else 'false'
+        return self._json(self.request('GET', '/history', params=params))['history']
+
+    def history_stats(self) -> Dict[str, Any]:
+        """Obtiene los agregados del historial de la sesión."""
+        return self._json(self.request('GET', '/history/stats'))
+
+    def clear_history(self):
+        """Limpia el historial de la sesión."""
+        self._json(self.request('DELETE', '/history'))
+
+    def health(self) -> Dict[str, Any]:
+        """Obtiene el estado del servicio."""
+        return self._json(self.request('GET', '/health'))
+
+
+def build_payload(num1, num2=None, operation: str = 'add', precision: str = 'float',
+                  num3=None) -> Dict[str, Any]:
+    """Cuerpo JSON de un cálculo (sin los campos por defecto)."""
+    payload = {'num1': num1, 'operation': operation}
+    if num2 is not None:
+        payload['num2'] = num2
+    if num3 is not None:
+        payload['num3'] = num3
+    if precision != 'float':
+        payload['precision'] = precision
+    return payload
@@ -3,5 +3,11 @@ Paquete Models - Contiene los modelos de datos para la aplicación
 """
 
 from .calculator import CalculatorModel
+from .errors import ErrorCode, render_error
+from .sessions import SessionModelStore
+from .offload import OffloadExecutor, OffloadTimeout, OffloadBusy
 
-__all__ = ['CalculatorModel']
+__all__ = [
+    'CalculatorModel', 'ErrorCode', 'render_error', 'SessionModelStore',
+    'OffloadExecutor', 'OffloadTimeout', 'OffloadBusy'
+]
@@ -0,0 +1,140 @@
+"""
+Agregados del Historial - Métricas de uso actualizadas en O(1) por operación
+Permite servir GET /history/stats sin recorrer el historial (que además solo
+conserva las últimas operaciones).
+"""
+
+import math
+import threading
+import time
+from array import array
+from fractions import Fraction
+from typing import Dict, Optional, Union
+
+
+class SlidingCounter:
+    """
+    Contador por ventanas deslizantes con un anillo de buckets de tiempo fijo.
+
+    Registrar un evento es O(1); la suma de una ventana recorre como mucho
+    ``slots`` buckets.
+    """
+
+    __slots__ = ('slots', 'width', '_counts', '_epochs')
+
+    def __init__(self, slots: int, width: float):
+        """
+        Args:
+            slots (int): Número de buckets del anillo
+            width (float): Segundos que cubre cada bucket
+        """
+        self.slots = slots
+        self.width = width
+        self._counts = array('q', [0]) * slots
+        self._epochs = array('q', [-1]) * slots
+
+    def add(self, now: float):
+        """Cuenta un evento en el instante indicado."""
+        epoch = int(now // self.width)
+        index = epoch % self.slots
+        if self._epochs[index] != epoch:
+            self._epochs[index] = epoch
+            self._counts[index] = 0
+        self._counts[index] += 1
+
+    def total(self, buckets: int, now: float) -> int:
+        """Eventos de los últimos ``buckets`` buckets (incluido el actual)."""
+        current = int(now // self.width)
+        oldest = current - min(buckets, self.slots) + 1
+        return sum(count for count, epoch in zip(self._counts, self._epochs)
+                   if oldest <= epoch <= current)
+
+
+class HistoryAggregates:
+    """Recuentos por operación y por error, ritmo de llamadas y resumen de resultados."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Vuelve a cero todos los agregados."""
+        with self._lock:
+            self.total = 0
+            self.errors = 0
+            self.by_operation: Dict[str, int] = {}
+            self.errors_by_code: Dict[str, int] = {}
+            self.result_count = 0
+            self.result_min = math.inf
+            self.result_max = -math.inf
+            self.result_mean = 0.0
+            self.since = time.time()
+            self._per_second = SlidingCounter(60, 1.0)
+            self._per_minute = SlidingCounter(15, 60.0)
+
+    def record(self, operation: str, result: Union[float, str, None], error_code: Optional[str]):
+        """
+        Registra una operación.
+
+        Args:
+            operation (str): Operación realizada
+            result (float o str, optional): Resultado (cadena en los modos exactos)
+            error_code (str, optional): Código del error, si lo hubo
+        """
+        now = time.time()
+        value = _numeric_result(result) if error_code is None else None
+
+        with self._lock:
+            self.total += 1
+            self.by_operation[operation] = self.by_operation.get(operation, 0) + 1
+            self._per_second.add(now)
+            self._per_minute.add(now)
+
+            if error_code is not None:
+                self.errors += 1
+                self.errors_by_code[error_code] = self.errors_by_code.get(error_code, 0) + 1
+            elif value is not None:
+                self.result_count += 1
+                self.result_mean += (value - self.result_mean) / self.result_count
+                if value < self.result_min:
+                    self.result_min = value
+                if value > self.result_max:
+                    self.result_max = value
+
+    def snapshot(self) -> Dict[str, object]:
+        """Obtiene los agregados actuales."""
+        now = time.time()
+        with self._lock:
+            has_results = self.result_count > 0
+            return {
+                "total": self.total,
+                "errors": self.errors,
+                "by_operation": dict(self.by_operation),
+                "errors_by_code": dict(self.errors_by_code),
+                "calls_per_minute": {
+                    "1m": self._per_second.total(60, now),
+                    "5m": self._per_minute.total(5, now) / 5,
+                    "15m": self._per_minute.total(15, now) / 15
+                },
+                "results": {
+                    "count": self.result_count,
+                    "min": self.result_min if has_results else None,
+                    "max": self.result_max if has_results else None,
+                    "mean": self.result_mean if has_results else None
+                },
+                "since": self.since
+            }
+
+
+def _numeric_result(result: Union[float, str, None]) -> Optional[float]:
+    """Valor numérico de un resultado (los modos exactos lo devuelven como cadena)."""
+    if result is None or isinstance(result, float):
+        return result
+    if isinstance(result, int):
+        return float(result)
+    try:
+        value = float(Fraction(result))
+    except (TypeError, ValueError, ZeroDivisionError, OverflowError):
+        # Resultados abreviados o no escalares (vectores y matrices)
+        return None
+    return value if math.isfinite(value) else None
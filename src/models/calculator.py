@@ -4,7 +4,18 @@ Sigue el patrón Modelo-Vista-Controlador (MVC)
 """
 
 import math
-from typing import Dict, Union, Optional
+from typing import Callable, Dict, Union, Optional
+
+from ..utils.tracing import traced
+from .aggregates import HistoryAggregates
+from .errors import ErrorCode, TRANSIENT_ERRORS
+from .history import HistoryLog
+from .integers import (INTEGER_HANDLERS, MAX_OPERAND_DIGITS, MAX_RESULT_DIGITS, abbreviate,
+                       check_result_size, estimate_integer_cost, evaluate_integer, parse_integer)
+from .linalg import (ARRAY_HANDLERS, ELEMENTWISE_OPERATIONS, MAX_ARRAY_ELEMENTS, check_shapes,
+                     describe, estimate_array_cost, evaluate_array, parse_array, shape_of)
+from .offload import OffloadExecutor, OffloadTimeout, OffloadBusy
+from .precision import PRECISION_MODES, ExactOperand, parse_exact, evaluate_exact, format_exact
 
 
 class CalculatorModel:
@@ -18,14 +29,78 @@ class CalculatorModel:
     # Operaciones válidas
     VALID_OPERATIONS = {
         'add', 'subtract', 'multiply', 'divide',
-        'power', 'sqrt', 'percentage'
+        'power', 'sqrt', 'percentage',
+        'factorial', 'ncr', 'npr', 'gcd', 'lcm', 'modpow', 'iroot', 'ipow',
+        'array_add', 'array_subtract', 'array_multiply', 'array_divide',
+        'dot', 'matmul', 'transpose', 'determinant', 'solve'
+    }
+
+    # Método que evalúa cada operación y formato de su expresión
+    OPERATION_HANDLERS = {
+        'add': ('_add', '{a} + {b} = {r}'),
+        'subtract': ('_subtract', '{a} - {b} = {r}'),
+        'multiply': ('_multiply', '{a} × {b} = {r}'),
+        'divide': ('_divide', '{a} ÷ {b} = {r}'),
+        'power': ('_power', '{a}^{b} = {r}'),
+        'sqrt': ('_sqrt', '√{a} = {r}'),
+        'percentage': ('_percentage', '{b}% de {a} = {r}')
     }
 
-    def __init__(self):
-        """Inicializa el modelo de la calculadora."""
-        self.history = []
+    # Operaciones exactas sobre enteros de tamaño arbitrario (ver ``integers``)
+    INTEGER_OPERATIONS = frozenset(INTEGER_HANDLERS)
+
+    # Operaciones con vectores y matrices (ver ``linalg``)
+    ARRAY_OPERATIONS = frozenset(ARRAY_HANDLERS)
+
+    # Operaciones de un solo operando
+    UNARY_OPERATIONS = {'sqrt', 'factorial', 'transpose', 'determinant'}
+
+    # Operaciones de tres operandos
+    TERNARY_OPERATIONS = {'modpow'}
+
+    # Operaciones que conserva el historial
+    HISTORY_LIMIT = 100
+
+    # Dígitos de un resultado entero que se guardan completos en el historial
+    HISTORY_RESULT_DIGITS = 1000
+
+    # Elementos de un vector o matriz que se guardan completos en el historial
+    HISTORY_ARRAY_ELEMENTS = 100
 
-    def perform_calculation(self, num1: float, num2: Optional[float], operation: str) -> Dict[str, Union[float, str]]:
+    # Coste estimado (operaciones elementales) a partir del cual se evalúa fuera del hilo
+    OFFLOAD_COST_THRESHOLD = 1_000_000
+
+    # Memoria estimada de un modelo vacío, de cada entrada del historial y de
+    # cada variable (medidas con tracemalloc, con margen)
+    MODEL_BASE_BYTES = 4096
+    HISTORY_ENTRY_BYTES = 768
+    VARIABLE_BYTES = 512
+
+    def __init__(self, offload_executor: Optional[OffloadExecutor] = None,
+                 offload_cost_threshold: Optional[float] = None):
+        """
+        Inicializa el modelo de la calculadora.
+
+        Args:
+            offload_executor (OffloadExecutor, optional): Pool para operaciones costosas
+            offload_cost_threshold (float, optional): Coste a partir del cual se usa el pool
+        """
+        self.history = HistoryLog(self.HISTORY_LIMIT)
+        # Agregados de todas las operaciones registradas (el historial solo guarda las últimas)
+        self.aggregates = HistoryAggregates()
+        # Variables y fórmulas de la sesión (VariableGraph, se crea al definir la primera)
+        self.variables = None
+        self.offload_executor = offload_executor
+        self.offload_cost_threshold = (offload_cost_threshold if offload_cost_threshold is not None
+                                       else self.OFFLOAD_COST_THRESHOLD)
+        # Manejadores ya enlazados para no resolverlos en cada operación
+        self._handlers = {operation: getattr(self, handler_name)
+                          for operation, (handler_name, _) in self.OPERATION_HANDLERS.items()}
+
+    @traced('CalculatorModel.perform_calculation')
+    def perform_calculation(self, num1: float, num2: Optional[float], operation: str,
+                            record_history: bool = True, precision: str = 'float',
+                            num3: Optional[int] = None) -> Dict[str, Union[float, str]]:
         """
         Realiza una operación matemática entre dos números.
 
@@ -33,53 +108,230 @@ class CalculatorModel:
             num1 (float): Primer número
             num2 (float, optional): Segundo número (no requerido para sqrt)
             operation (str): Tipo de operación a realizar
+            record_history (bool): Si la operación se guarda en el historial
+            precision (str): 'float', o 'decimal'/'fraction' para operandos
+                exactos validados con ``validate_inputs``
+            num3 (int, optional): Tercer número (módulo de modpow)
 
         Returns:
-            dict: Resultado de la operación y expresión matemática
-
-        Raises:
-            ValueError: Si la operación no es válida o hay errores matemáticos
+            dict: Resultado y expresión matemática, o 'error_code' (ver
+            ``ErrorCode``) si la operación no puede evaluarse. Los errores
+            matemáticos no lanzan excepciones.
         """
         if operation not in self.VALID_OPERATIONS:
-            return {"error": "Error: Operación no válida"}
+            return {"error_code": ErrorCode.INVALID_OPERATION}
 
-        try:
-            if operation == "add":
-                result = self._add(num1, num2)
-                expression = f"{num1} + {num2} = {result}"
-            elif operation == "subtract":
-                result = self._subtract(num1, num2)
-                expression = f"{num1} - {num2} = {result}"
-            elif operation == "multiply":
-                result = self._multiply(num1, num2)
-                expression = f"{num1} × {num2} = {result}"
-            elif operation == "divide":
-                result = self._divide(num1, num2)
-                expression = f"{num1} ÷ {num2} = {result}"
-            elif operation == "power":
-                result = self._power(num1, num2)
-                expression = f"{num1}^{num2} = {result}"
-            elif operation == "sqrt":
-                result = self._sqrt(num1)
-                expression = f"√{num1} = {result}"
-            elif operation == "percentage":
-                result = self._percentage(num1, num2)
-                expression = f"{num2}% de {num1} = {result}"
-            else:
-                return {"error": "Error: Operación no implementada"}
+        if operation in self.INTEGER_OPERATIONS:
+            return self._perform_integer(num1, num2, num3, operation, record_history)
+
+        if operation in self.ARRAY_OPERATIONS:
+            return self._perform_array(num1, num2, operation, record_history)
+
+        if precision != 'float':
+            return self._perform_exact(num1, num2, operation, precision, record_history)
 
-            # Guardar en historial
+        if self._should_offload(operation, num1, num2):
+            try:
+                result = self.offload_executor.run(evaluate_operation, operation, num1, num2)
+            except OffloadTimeout:
+                result = ErrorCode.TIMEOUT
+            except OffloadBusy:
+                result = ErrorCode.BUSY
+        else:
+            result = self._evaluate(operation, num1, num2)
+
+        # Los manejadores devuelven el código de error en lugar del resultado
+        if isinstance(result, str):
+            if record_history:
+                self._add_to_history(num1, num2, operation, None, None,
+                                     is_error=True, error_code=result)
+            return {"error_code": result}
+
+        expression = self.OPERATION_HANDLERS[operation][1].format(a=num1, b=num2, r=result)
+
+        # Guardar en historial
+        if record_history:
             self._add_to_history(num1, num2, operation, result, expression)
 
-            return {
-                "result": result,
-                "expression": expression
-            }
+        return {
+            "result": result,
+            "expression": expression
+        }
+
+    def _perform_exact(self, num1: ExactOperand, num2: Optional[ExactOperand], operation: str,
+                       precision: str, record_history: bool) -> Dict[str, Union[bool, str]]:
+        """
+        Realiza una operación en un modo exacto; el resultado es una cadena.
+
+        Returns:
+            dict: Resultado, expresión, modo y si el resultado es exacto, o 'error_code'
+        """
+        outcome = evaluate_exact(operation, num1, num2, precision)
+
+        if isinstance(outcome, str):
+            if record_history:
+                self._add_to_history(float(num1), None if num2 is None else float(num2),
+                                     operation, None, None, is_error=True, error_code=outcome)
+            return {"error_code": outcome}
+
+        result, exact = outcome
+        expression = self.OPERATION_HANDLERS[operation][1].format(
+            a=format_exact(num1), b=None if num2 is None else format_exact(num2), r=result)
 
-        except Exception as e:
-            error_msg = f"Error en el cálculo: {str(e)}"
-            self._add_to_history(num1, num2, operation, None, error_msg, is_error=True)
-            return {"error": error_msg}
+        if record_history:
+            self._add_to_history(float(num1), None if num2 is None else float(num2),
+                                 operation, result, expression)
+
+        return {
+            "result": result,
+            "expression": expression,
+            "precision": precision,
+            "exact": exact
+        }
+
+    def _perform_integer(self, num1: int, num2: Optional[int], num3: Optional[int], operation: str,
+                         record_history: bool) -> Dict[str, Union[bool, int, str]]:
+        """
+        Realiza una operación entera; el resultado es una cadena decimal exacta.
+
+        El tamaño del resultado se estima antes de calcularlo y las
+        operaciones costosas se evalúan en el pool de procesos.
+
+        Returns:
+            dict: Resultado, expresión, 'exact' y 'digits', o 'error_code'
+        """
+        outcome = check_result_size(operation, num1, num2, num3)
+        if outcome is None:
+            if self._should_offload(operation, num1, num2, num3):
+                try:
+                    outcome = self.offload_executor.run(evaluate_integer, operation, num1, num2, num3)
+                except OffloadTimeout:
+                    outcome = ErrorCode.TIMEOUT
+                except OffloadBusy:
+                    outcome = ErrorCode.BUSY
+            else:
+                outcome = evaluate_integer(operation, num1, num2, num3)
+
+        if isinstance(outcome, str):
+            error = {"error_code": outcome}
+            if outcome == ErrorCode.RESULT_TOO_LARGE:
+                error["max_digits"] = MAX_RESULT_DIGITS
+            if record_history:
+                # El historial guarda los detalles que usa el mensaje del error
+                self._add_to_history(num1, num2, operation, None, None, is_error=True,
+                                     error_code=outcome, num3=num3, error_details=error)
+            return error
+
+        result, digits = outcome
+        template = INTEGER_HANDLERS[operation][2]
+        expression = template.format(a=num1, b=num2, c=num3, r=abbreviate(result, digits))
+
+        if record_history:
+            # Los resultados enormes se guardan abreviados (el historial se sirve completo)
+            stored = result if digits <= self.HISTORY_RESULT_DIGITS else abbreviate(result, digits)
+            self._add_to_history(num1, num2, operation, stored, expression, num3=num3)
+
+        return {
+            "result": result,
+            "expression": expression,
+            "exact": True,
+            "digits": digits
+        }
+
+    def _perform_array(self, num1, num2, operation: str,
+                       record_history: bool) -> Dict[str, object]:
+        """
+        Realiza una operación con vectores o matrices validados con ``validate_inputs``.
+
+        Returns:
+            dict: Resultado (número, vector o matriz), expresión y forma
+            ('shape'), o 'error_code'
+        """
+        if self._should_offload(operation, num1, num2):
+            try:
+                result = self.offload_executor.run(evaluate_array, operation, num1, num2)
+            except OffloadTimeout:
+                result = ErrorCode.TIMEOUT
+            except OffloadBusy:
+                result = ErrorCode.BUSY
+        else:
+            result = evaluate_array(operation, num1, num2)
+
+        # Los operandos y resultados grandes se guardan como su descripción
+        stored = [value if self._array_size(value) <= self.HISTORY_ARRAY_ELEMENTS else describe(value)
+                  for value in (num1, num2, result)]
+
+        if isinstance(result, str):
+            if record_history:
+                self._add_to_history(stored[0], stored[1], operation, None, None,
+                                     is_error=True, error_code=result)
+            return {"error_code": result}
+
+        expression = ARRAY_HANDLERS[operation][3].format(
+            a=describe(num1), b=None if num2 is None else describe(num2), r=describe(result))
+
+        if record_history:
+            self._add_to_history(stored[0], stored[1], operation, stored[2], expression)
+
+        return {
+            "result": result,
+            "expression": expression,
+            "shape": list(shape_of(result))
+        }
+
+    @staticmethod
+    def _array_size(value) -> int:
+        """Elementos de un operando o resultado (1 si es un escalar o None)."""
+        return math.prod(shape_of(value)) if isinstance(value, list) else 1
+
+    def estimate_cost(self, operation: str, num1: float, num2: Optional[float],
+                      num3: Optional[int] = None) -> float:
+        """
+        Estima el coste de evaluar una operación.
+
+        Las operaciones float trabajan sobre números de tamaño fijo y tienen
+        coste constante; el de las operaciones enteras crece con el tamaño de
+        los operandos y del resultado, y el de vectores y matrices con sus
+        dimensiones.
+
+        Args:
+            operation (str): Operación a evaluar
+            num1 (float): Primer número
+            num2 (float, optional): Segundo número
+            num3 (int, optional): Tercer número
+
+        Returns:
+            float: Coste estimado en operaciones elementales
+        """
+        if operation in self.INTEGER_OPERATIONS:
+            return estimate_integer_cost(operation, num1, num2, num3)
+        if operation in self.ARRAY_OPERATIONS:
+            return estimate_array_cost(operation, num1, num2)
+        return 1.0
+
+    def _should_offload(self, operation: str, num1: float, num2: Optional[float],
+                        num3: Optional[int] = None) -> bool:
+        """Indica si la operación debe evaluarse en el pool de procesos."""
+        return (self.offload_executor is not None and
+                self.estimate_cost(operation, num1, num2, num3) >= self.offload_cost_threshold)
+
+    def _evaluate(self, operation: str, num1: float, num2: Optional[float]) -> Union[float, str]:
+        """
+        Evalúa una operación en el hilo actual.
+
+        Returns:
+            float o str: Resultado finito o código de error
+        """
+        handler = self._handlers[operation]
+        if operation in self.UNARY_OPERATIONS:
+            result = handler(num1)
+        else:
+            result = handler(num1, num2)
+
+        # Un resultado infinito (o NaN) no es representable en JSON
+        if isinstance(result, float) and not math.isfinite(result):
+            return ErrorCode.OVERFLOW
+        return result
 
     def _add(self, a: float, b: float) -> float:
         """Suma dos números."""
@@ -93,39 +345,60 @@ class CalculatorModel:
         """Multiplica dos números."""
         return a * b
 
-    def _divide(self, a: float, b: float) -> float:
+    def _divide(self, a: float, b: float) -> Union[float, str]:
         """Divide dos números con validación de división por cero."""
         if b == 0:
-            raise ZeroDivisionError("División por cero no permitida")
+            return ErrorCode.DIVISION_BY_ZERO
         return a / b
 
-    def _power(self, base: float, exponent: float) -> float:
-        """Calcula la potencia de un número."""
-        return math.pow(base, exponent)
+    def _power(self, base: float, exponent: float) -> Union[float, str]:
+        """Calcula la potencia de un número con validación de dominio y rango."""
+        if base == 0 and exponent < 0:
+            return ErrorCode.DOMAIN_ERROR
+        if base < 0 and not exponent.is_integer():
+            return ErrorCode.DOMAIN_ERROR
+        try:
+            return math.pow(base, exponent)
+        except OverflowError:
+            # math.pow no ofrece una comprobación previa de desbordamiento exacta
+            return ErrorCode.OVERFLOW
 
-    def _sqrt(self, number: float) -> float:
+    def _sqrt(self, number: float) -> Union[float, str]:
         """Calcula la raíz cuadrada con validación."""
         if number < 0:
-            raise ValueError("No se puede calcular la raíz cuadrada de un número negativo")
+            return ErrorCode.NEGATIVE_SQRT
         return math.sqrt(number)
 
     def _percentage(self, total: float, percentage: float) -> float:
         """Calcula el porcentaje de un número."""
         return (total * percentage) / 100
 
+    @traced('CalculatorModel._add_to_history')
     def _add_to_history(self, num1: float, num2: Optional[float], operation: str,
-                       result: Optional[float], expression: str, is_error: bool = False):
+                       result: Optional[float], expression: Optional[str], is_error: bool = False,
+                       error_code: Optional[str] = None, num3: Optional[int] = None,
+                       error_details: Optional[Dict[str, object]] = None):
         """
         Agrega una operación al historial.
 
+        Los errores transitorios (TIMEOUT, BUSY) no se registran: no dicen
+        nada de la operación y el cliente la repetirá.
+
         Args:
             num1 (float): Primer número
             num2 (float, optional): Segundo número
             operation (str): Operación realizada
             result (float, optional): Resultado de la operación
-            expression (str): Expresión matemática
+            expression (str, optional): Expresión matemática (None si fue un error)
             is_error (bool): Si fue un error
+            error_code (str, optional): Código del error (ver ``ErrorCode``)
+            num3 (int, optional): Tercer número (solo se guarda si existe)
+            error_details (dict, optional): Error devuelto con los detalles que usa
+                su mensaje (p. ej. 'max_digits'); se guardan con la entrada
         """
+        if error_code in TRANSIENT_ERRORS:
+            return
+
         history_item = {
             'num1': num1,
             'num2': num2,
@@ -133,30 +406,90 @@ class CalculatorModel:
             'result': result,
             'expression': expression,
             'is_error': is_error,
-            'timestamp': self._get_current_timestamp()
+            'error_code': error_code
         }
+        if num3 is not None:
+            history_item['num3'] = num3
+        if error_details:
+            history_item.update(error_details)
 
+        # El registro asigna 'id' y 'timestamp' y conserva solo los últimos HISTORY_LIMIT
         self.history.append(history_item)
-
-        # Mantener solo los últimos 100 elementos
-        if len(self.history) > 100:
-            self.history = self.history[-100:]
-
-    def _get_current_timestamp(self) -> str:
-        """Obtiene la marca de tiempo actual."""
-        import datetime
-        return datetime.datetime.now().strftime("%H:%M:%S")
+        self.aggregates.record(operation, result, error_code)
 
     def get_history(self) -> list:
         """Obtiene el historial de operaciones."""
-        return self.history.copy()
+        return self.history.entries()
+
+    def query_history(self, operation: Optional[str] = None, errors_only: bool = False,
+                      start: Optional[float] = None, end: Optional[float] = None,
+                      limit: Optional[int] = None) -> list:
+        """
+        Filtra el historial usando sus índices (el coste depende del resultado).
+
+        Args:
+            operation (str, optional): Solo operaciones de este tipo
+            errors_only (bool): Solo operaciones con error
+            start (float, optional): Epoch mínimo (incluido)
+            end (float, optional): Epoch máximo (incluido)
+            limit (int, optional): Máximo de entradas (las más recientes)
+
+        Returns:
+            list: Entradas en orden cronológico
+        """
+        return self.history.query(operation, errors_only, start, end, limit)
+
+    def get_history_json(self, encode: Callable[[Dict], bytes], **filters) -> bytes:
+        """
+        Obtiene el historial (con los filtros de ``query_history``) ya serializado.
+
+        Args:
+            encode (callable): Serializa una entrada; se llama una vez por entrada
+            **filters: Filtros de ``query_history``
+
+        Returns:
+            bytes: Cuerpo JSON {"history": [...]}
+        """
+        return self.history.query_json(encode, **filters)
+
+    def footprint(self) -> Dict[str, object]:
+        """Tamaño del historial y de las variables (diagnóstico de memoria)."""
+        return {
+            'history': self.history.footprint(),
+            'variables': len(self.variables) if self.variables is not None else 0
+        }
+
+    def estimated_bytes(self) -> int:
+        """
+        Estima la memoria que ocupa el modelo a partir de ``footprint``.
+
+        Las entradas (también las expulsadas que esperan a la compactación)
+        y las variables cuentan por un tamaño fijo; los JSON cacheados del
+        historial, por su longitud.
+
+        Returns:
+            int: Bytes estimados
+        """
+        footprint = self.footprint()
+        history = footprint['history']
+        return (self.MODEL_BASE_BYTES +
+                history['retained_entries'] * self.HISTORY_ENTRY_BYTES +
+                history['fragment_bytes'] + history['body_bytes'] +
+                footprint['variables'] * self.VARIABLE_BYTES)
+
+    def get_history_stats(self) -> Dict[str, object]:
+        """Obtiene los agregados del historial sin recorrerlo."""
+        return self.aggregates.snapshot()
 
     def clear_history(self):
-        """Limpia el historial de operaciones."""
+        """Limpia el historial de operaciones y sus agregados."""
         self.history.clear()
+        self.aggregates.reset()
 
+    @traced('CalculatorModel.validate_inputs')
     def validate_inputs(self, num1: Union[int, float, str], num2: Union[int, float, str, None],
-                       operation: str) -> Dict[str, Union[float, str]]:
+                       operation: str, precision: str = 'float',
+                       num3: Union[int, float, str, None] = None) -> Dict[str, Union[float, str]]:
         """
         Valida los inputs antes de realizar la operación.
 
@@ -164,38 +497,122 @@ class CalculatorModel:
             num1: Primer número
             num2: Segundo número (opcional)
             operation: Operación a validar
+            precision: Modo de precisión ('float', 'decimal' o 'fraction'); en
+                los modos exactos los números se devuelven como int o Decimal.
+                Las operaciones enteras y de vectores y matrices ignoran el modo
+            num3: Tercer número (solo para modpow)
 
         Returns:
-            dict: Resultado de validación o error
+            dict: Inputs normalizados, o 'error_code' (y 'operand' con la
+            posición del número inválido) si no son válidos
         """
         # Validar operación
-        if operation not in self.VALID_OPERATIONS:
-            return {"error": "Error: Operación no válida"}
+        if not isinstance(operation, str) or operation not in self.VALID_OPERATIONS:
+            return {"error_code": ErrorCode.INVALID_OPERATION}
+
+        if not isinstance(precision, str) or precision not in PRECISION_MODES:
+            return {"error_code": ErrorCode.INVALID_PRECISION}
+
+        if operation in self.INTEGER_OPERATIONS:
+            return self._validate_integers(num1, num2, num3, operation)
+
+        if operation in self.ARRAY_OPERATIONS:
+            return self._validate_arrays(num1, num2, operation)
+
+        to_operand = self._to_operand if precision == 'float' else parse_exact
 
         # Validar primer número
-        try:
-            num1 = float(num1)
-        except (ValueError, TypeError):
-            return {"error": "Error: El primer número debe ser válido"}
+        num1 = to_operand(num1)
+        if num1 is None:
+            return {"error_code": ErrorCode.INVALID_OPERAND, "operand": 1}
 
         # Para operaciones que requieren dos números
-        if operation != 'sqrt':
+        if operation not in self.UNARY_OPERATIONS:
             if num2 is None:
-                return {"error": "Error: Se requiere un segundo número para esta operación"}
+                return {"error_code": ErrorCode.MISSING_OPERAND}
 
-            try:
-                num2 = float(num2)
-            except (ValueError, TypeError):
-                return {"error": "Error: El segundo número debe ser válido"}
+            num2 = to_operand(num2)
+            if num2 is None:
+                return {"error_code": ErrorCode.INVALID_OPERAND, "operand": 2}
         else:
             num2 = None
 
         return {
             "num1": num1,
             "num2": num2,
-            "operation": operation
+            "operation": operation,
+            "precision": precision
         }
 
+    def _validate_integers(self, num1, num2, num3, operation: str) -> Dict[str, Union[int, str, None]]:
+        """Valida los operandos de una operación entera (ver ``validate_inputs``)."""
+        arity = 1 if operation in self.UNARY_OPERATIONS else 3 if operation in self.TERNARY_OPERATIONS else 2
+        operands = []
+        for position, value in enumerate((num1, num2, num3)[:arity], start=1):
+            if value is None and position > 1:
+                return {"error_code": ErrorCode.MISSING_OPERAND}
+            number = parse_integer(value)
+            if number is None:
+                return {"error_code": ErrorCode.INTEGER_REQUIRED, "operand": position,
+                        "max_digits": MAX_OPERAND_DIGITS}
+            operands.append(number)
+        operands += [None] * (3 - arity)
+
+        validated = {
+            "num1": operands[0],
+            "num2": operands[1],
+            "operation": operation,
+            "precision": 'float'
+        }
+        if arity == 3:
+            validated["num3"] = operands[2]
+        return validated
+
+    def _validate_arrays(self, num1, num2, operation: str) -> Dict[str, object]:
+        """
+        Valida los operandos de una operación con vectores o matrices.
+
+        Además del contenido se comprueba que las formas son compatibles con
+        la operación (SHAPE_MISMATCH con 'shapes'), antes de calcular nada.
+        """
+        unary = operation in self.UNARY_OPERATIONS
+        allow_scalar = operation in ELEMENTWISE_OPERATIONS
+        operands = []
+        for position, value in enumerate((num1,) if unary else (num1, num2), start=1):
+            if value is None and position == 2:
+                return {"error_code": ErrorCode.MISSING_OPERAND}
+            array = parse_array(value, allow_scalar)
+            if array is None:
+                return {"error_code": ErrorCode.INVALID_ARRAY, "operand": position,
+                        "max_elements": MAX_ARRAY_ELEMENTS}
+            operands.append(array)
+        if unary:
+            operands.append(None)
+
+        mismatch = check_shapes(operation, *operands)
+        if mismatch is not None:
+            return mismatch
+
+        return {
+            "num1": operands[0],
+            "num2": operands[1],
+            "operation": operation,
+            "precision": 'float'
+        }
+
+    @staticmethod
+    def _to_operand(value) -> Optional[float]:
+        """Convierte un operando a float finito, o None si no es válido."""
+        # Camino rápido para los números que ya llegan como tales en el JSON
+        if type(value) is float:
+            number = value
+        else:
+            try:
+                number = float(value)
+            except (ValueError, TypeError, OverflowError):
+                return None
+        return number if math.isfinite(number) else None
+
     def get_operation_info(self) -> Dict[str, str]:
         """Obtiene información sobre las operaciones disponibles."""
         return {
@@ -205,9 +622,45 @@ class CalculatorModel:
             'divide': 'Divide dos números',
             'power': 'Calcula la potencia (base^exponente)',
             'sqrt': 'Calcula la raíz cuadrada',
-            'percentage': 'Calcula el porcentaje de un número'
+            'percentage': 'Calcula el porcentaje de un número',
+            'factorial': 'Calcula el factorial exacto de un entero (n!)',
+            'ncr': 'Calcula las combinaciones C(n, k) de forma exacta',
+            'npr': 'Calcula las variaciones P(n, k) de forma exacta',
+            'gcd': 'Calcula el máximo común divisor de dos enteros',
+            'lcm': 'Calcula el mínimo común múltiplo de dos enteros',
+            'modpow': 'Calcula la potencia modular (base^exponente mod módulo)',
+            'iroot': 'Calcula la raíz n-ésima entera (redondeada hacia cero)',
+            'ipow': 'Calcula la potencia exacta de un entero',
+            'array_add': 'Suma elemento a elemento vectores o matrices (o un escalar)',
+            'array_subtract': 'Resta elemento a elemento vectores o matrices (o un escalar)',
+            'array_multiply': 'Multiplica elemento a elemento vectores o matrices (o un escalar)',
+            'array_divide': 'Divide elemento a elemento vectores o matrices (o un escalar)',
+            'dot': 'Calcula el producto escalar de dos vectores',
+            'matmul': 'Calcula el producto de matrices',
+            'transpose': 'Calcula la transpuesta de una matriz',
+            'determinant': 'Calcula el determinante de una matriz cuadrada',
+            'solve': 'Resuelve el sistema lineal A·x = b'
         }
 
     def __repr__(self) -> str:
         """Representación string del modelo."""
         return f"CalculatorModel(operations={len(self.VALID_OPERATIONS)}, history_items={len(self.history)})"
+
+
+def evaluate_operation(operation: str, num1: float, num2: Optional[float]) -> float:
+    """
+    Evalúa una operación sin estado (punto de entrada de los procesos del pool).
+
+    Args:
+        operation (str): Operación válida
+        num1 (float): Primer número
+        num2 (float, optional): Segundo número
+
+    Returns:
+        float: Resultado de la operación
+    """
+    return _worker_model._evaluate(operation, num1, num2)
+
+
+# Instancia usada por los procesos del pool (sin historial ni pool propio)
+_worker_model = CalculatorModel()
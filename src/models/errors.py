@@ -0,0 +1,132 @@
+"""
+Errores - Códigos de error del modelo y sus mensajes localizados
+El modelo devuelve códigos estables (sin lanzar excepciones) y los mensajes
+en español solo se generan al construir la respuesta HTTP.
+"""
+
+from typing import Dict, Mapping
+
+
+class ErrorCode:
+    """Códigos de error estables devueltos en el campo ``error_code``."""
+
+    INVALID_OPERATION = 'INVALID_OPERATION'
+    INVALID_OPERAND = 'INVALID_OPERAND'
+    MISSING_OPERAND = 'MISSING_OPERAND'
+    INVALID_PRECISION = 'INVALID_PRECISION'
+    DIVISION_BY_ZERO = 'DIVISION_BY_ZERO'
+    NEGATIVE_SQRT = 'NEGATIVE_SQRT'
+    OVERFLOW = 'OVERFLOW'
+    DOMAIN_ERROR = 'DOMAIN_ERROR'
+    TIMEOUT = 'TIMEOUT'
+    BUSY = 'BUSY'
+    INVALID_VALUE = 'INVALID_VALUE'
+    TOO_MANY_VALUES = 'TOO_MANY_VALUES'
+    INVALID_PERCENTILE = 'INVALID_PERCENTILE'
+    UNSUPPORTED_MEDIA_TYPE = 'UNSUPPORTED_MEDIA_TYPE'
+    INVALID_FILTER = 'INVALID_FILTER'
+    INVALID_NAME = 'INVALID_NAME'
+    INVALID_FORMULA = 'INVALID_FORMULA'
+    INVALID_DEFINITION = 'INVALID_DEFINITION'
+    UNDEFINED_VARIABLE = 'UNDEFINED_VARIABLE'
+    DEPENDENCY_CYCLE = 'DEPENDENCY_CYCLE'
+    TOO_MANY_VARIABLES = 'TOO_MANY_VARIABLES'
+    INVALID_RECORD = 'INVALID_RECORD'
+    INVALID_RANGE = 'INVALID_RANGE'
+    TOO_MANY_POINTS = 'TOO_MANY_POINTS'
+    UNUSED_VARIABLE = 'UNUSED_VARIABLE'
+    INTEGER_REQUIRED = 'INTEGER_REQUIRED'
+    RESULT_TOO_LARGE = 'RESULT_TOO_LARGE'
+    INVALID_ARRAY = 'INVALID_ARRAY'
+    SHAPE_MISMATCH = 'SHAPE_MISMATCH'
+    SINGULAR_MATRIX = 'SINGULAR_MATRIX'
+    INVALID_ACTION = 'INVALID_ACTION'
+    INVALID_PARAMETER = 'INVALID_PARAMETER'
+    SNAPSHOT_NOT_FOUND = 'SNAPSHOT_NOT_FOUND'
+    TRACEMALLOC_NOT_RUNNING = 'TRACEMALLOC_NOT_RUNNING'
+
+
+# Errores producidos al evaluar la operación (no de validación)
+CALCULATION_ERROR_PREFIX = 'Error en el cálculo: '
+
+# Errores por carga del servidor (pool de procesos lleno o sin tiempo): la
+# misma operación puede funcionar más tarde, así que no se guardan en el
+# historial y la respuesta HTTP es 503 sin caché
+TRANSIENT_ERRORS = frozenset({ErrorCode.TIMEOUT, ErrorCode.BUSY})
+
+ERROR_MESSAGES = {
+    ErrorCode.INVALID_OPERATION: 'Error: Operación no válida',
+    ErrorCode.INVALID_OPERAND: 'Error: El {ordinal} número debe ser válido',
+    ErrorCode.MISSING_OPERAND: 'Error: Se requiere un segundo número para esta operación',
+    ErrorCode.INVALID_PRECISION: "Error: Precisión no válida (use 'float', 'decimal' o 'fraction')",
+    ErrorCode.DIVISION_BY_ZERO: CALCULATION_ERROR_PREFIX + 'División por cero no permitida',
+    ErrorCode.NEGATIVE_SQRT: (CALCULATION_ERROR_PREFIX +
+                              'No se puede calcular la raíz cuadrada de un número negativo'),
+    ErrorCode.OVERFLOW: CALCULATION_ERROR_PREFIX + 'math range error',
+    ErrorCode.DOMAIN_ERROR: CALCULATION_ERROR_PREFIX + 'math domain error',
+    ErrorCode.TIMEOUT: CALCULATION_ERROR_PREFIX + 'Tiempo de cálculo excedido',
+    ErrorCode.BUSY: CALCULATION_ERROR_PREFIX + 'Servidor ocupado, inténtalo más tarde',
+    ErrorCode.INVALID_VALUE: 'Error: Valor no numérico en la posición {position}',
+    ErrorCode.TOO_MANY_VALUES: 'Error: Máximo {max_values} valores por petición',
+    ErrorCode.INVALID_PERCENTILE: 'Error: Los percentiles deben ser números entre 0 y 100',
+    ErrorCode.UNSUPPORTED_MEDIA_TYPE: ('Error: Tipo de contenido no soportado (use application/json, '
+                                       'application/x-ndjson, text/csv o application/octet-stream)'),
+    ErrorCode.INVALID_FILTER: "Error: Filtro de historial no válido ('{parameter}')",
+    ErrorCode.INVALID_NAME: "Error: Nombre de variable no válido ('{variable}')",
+    ErrorCode.INVALID_FORMULA: ('Error: Fórmula no válida (use operación(a, b) con números '
+                                'o variables, p. ej. percentage(subtotal, 21))'),
+    ErrorCode.INVALID_DEFINITION: "Error: Se requiere 'value' (número) o 'formula', pero no ambos",
+    ErrorCode.UNDEFINED_VARIABLE: "Error: Variable no definida ('{variable}')",
+    ErrorCode.DEPENDENCY_CYCLE: 'Error: La fórmula crea un ciclo de dependencias',
+    ErrorCode.TOO_MANY_VARIABLES: 'Error: Máximo {max_variables} variables por sesión',
+    ErrorCode.INVALID_RECORD: 'Error: Registro no válido en la línea {line}',
+    ErrorCode.INVALID_RANGE: ("Error: Rango no válido (use {{'start', 'stop', 'step'}} con "
+                              "números finitos en la dirección del paso, o una lista de números)"),
+    ErrorCode.TOO_MANY_POINTS: 'Error: Máximo {max_points} puntos por tabla',
+    ErrorCode.UNUSED_VARIABLE: "Error: La operación no usa la variable '{variable}'",
+    ErrorCode.INTEGER_REQUIRED: 'Error: El {ordinal} número debe ser un entero (máximo {max_digits} dígitos)',
+    ErrorCode.RESULT_TOO_LARGE: CALCULATION_ERROR_PREFIX + 'El resultado supera {max_digits} dígitos',
+    ErrorCode.INVALID_ARRAY: ('Error: El {ordinal} número debe ser un vector o una matriz de números '
+                              'finitos (máximo {max_elements} elementos)'),
+    ErrorCode.SHAPE_MISMATCH: 'Error: Dimensiones incompatibles para esta operación {shapes}',
+    ErrorCode.SINGULAR_MATRIX: CALCULATION_ERROR_PREFIX + 'La matriz es singular',
+    ErrorCode.INVALID_ACTION: ("Error: Acción no válida ('{action}'; use start, stop, snapshot, "
+                               "top, diff, collect o clear)"),
+    ErrorCode.INVALID_PARAMETER: "Error: Parámetro no válido ('{parameter}')",
+    ErrorCode.SNAPSHOT_NOT_FOUND: "Error: Snapshot no encontrado ('{snapshot}')",
+    ErrorCode.TRACEMALLOC_NOT_RUNNING: "Error: tracemalloc no está activo (use la acción 'start')"
+}
+
+_OPERAND_ORDINALS = {1: 'primer', 2: 'segundo', 3: 'tercer'}
+
+
+def error_message(outcome: Mapping) -> str:
+    """
+    Genera el mensaje localizado de un error del modelo.
+
+    Args:
+        outcome (Mapping): Resultado con 'error_code' y los detalles que use
+            el mensaje ('operand', 'position', ...)
+
+    Returns:
+        str: Mensaje en español
+    """
+    message = ERROR_MESSAGES[outcome['error_code']]
+    if 'operand' in outcome:
+        return message.format_map({**outcome, 'ordinal': _OPERAND_ORDINALS[outcome['operand']]})
+    if '{' in message:
+        return message.format_map(outcome)
+    return message
+
+
+def render_error(outcome: Mapping) -> Dict[str, object]:
+    """
+    Convierte un error del modelo en el cuerpo de la respuesta HTTP.
+
+    Args:
+        outcome (Mapping): Resultado con 'error_code' y sus detalles
+
+    Returns:
+        dict: Cuerpo con 'error' (mensaje), 'error_code' y los detalles
+    """
+    return {'error': error_message(outcome), **outcome}
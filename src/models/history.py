@@ -0,0 +1,297 @@
+"""
+Historial - Registro acotado de operaciones con índices secundarios
+Cada entrada recibe un identificador creciente ('id') y una marca de tiempo
+ISO 8601 completa. Además de la lista de entradas, el registro mantiene:
+
+- Un índice temporal (epoch de cada entrada, en orden) para buscar rangos
+  de tiempo con bisect.
+- Listas de identificadores por operación y de las entradas con error.
+
+Las entradas antiguas se descartan de forma amortizada: las listas crecen
+hasta el doble del límite y entonces se compactan, así que añadir una
+entrada es O(1) amortizado y una consulta cuesta O(log n + resultado).
+
+Como una entrada no cambia después de registrarse, su JSON se genera una sola
+vez y las respuestas se arman uniendo esos fragmentos.
+"""
+
+import datetime
+import math
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Callable, Collection, Dict, List, Mapping, Optional
+
+from .errors import ErrorCode
+
+_BOOLEANS = {'true': True, '1': True, 'yes': True, 'false': False, '0': False, 'no': False}
+
+
+class HistoryLog:
+    """Últimas ``limit`` operaciones con índices por operación, error y tiempo."""
+
+    def __init__(self, limit: int = 100):
+        """
+        Inicializa el registro.
+
+        Args:
+            limit (int): Número máximo de entradas visibles
+        """
+        self.limit = limit
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        """Elimina todas las entradas, sus índices y los JSON cacheados."""
+        with self._lock:
+            self._entries: List[Dict] = []
+            self._times: List[float] = []
+            # JSON de cada entrada (se codifica en la primera lectura; las entradas no cambian)
+            self._fragments: List[Optional[bytes]] = []
+            # Cuerpo completo sin filtros; se invalida al añadir o limpiar
+            self._body: Optional[bytes] = None
+            self._first_id = 0
+            self._next_id = 0
+            self._by_operation: Dict[str, List[int]] = {}
+            self._errors: List[int] = []
+
+    def append(self, item: Dict) -> Dict:
+        """
+        Añade una entrada asignándole 'id' y 'timestamp'.
+
+        Args:
+            item (dict): Campos de la operación
+
+        Returns:
+            dict: La entrada añadida
+        """
+        now = datetime.datetime.now(datetime.timezone.utc)
+        epoch = now.timestamp()
+
+        with self._lock:
+            if self._times and epoch < self._times[-1]:
+                # El reloj retrocedió: se mantiene el índice temporal ordenado
+                epoch = self._times[-1]
+                now = datetime.datetime.fromtimestamp(epoch, datetime.timezone.utc)
+
+            entry_id = self._next_id
+            self._next_id += 1
+            item['id'] = entry_id
+            item['timestamp'] = now.isoformat(timespec='milliseconds')
+
+            self._entries.append(item)
+            self._times.append(epoch)
+            self._fragments.append(None)
+            self._body = None
+            self._by_operation.setdefault(item['operation'], []).append(entry_id)
+            if item['is_error']:
+                self._errors.append(entry_id)
+
+            if len(self._entries) >= 2 * self.limit:
+                self._compact()
+        return item
+
+    def _compact(self):
+        """Descarta las entradas que ya no son visibles y sus identificadores (requiere el lock)."""
+        first_id = self._visible_start()
+        drop = first_id - self._first_id
+        del self._entries[:drop]
+        del self._times[:drop]
+        del self._fragments[:drop]
+        self._first_id = first_id
+
+        for operation in list(self._by_operation):
+            ids = self._by_operation[operation]
+            del ids[:bisect_left(ids, first_id)]
+            if not ids:
+                del self._by_operation[operation]
+        del self._errors[:bisect_left(self._errors, first_id)]
+
+    def _visible_start(self) -> int:
+        """Identificador de la entrada visible más antigua."""
+        return max(self._first_id, self._next_id - self.limit)
+
+    def __len__(self) -> int:
+        """Número de entradas visibles."""
+        return self._next_id - self._visible_start()
+
+    def footprint(self) -> Dict[str, int]:
+        """Tamaño de las estructuras internas (diagnóstico de memoria)."""
+        with self._lock:
+            fragments = [fragment for fragment in self._fragments if fragment is not None]
+            return {
+                'entries': len(self),
+                # Las entradas expulsadas siguen en memoria hasta la siguiente compactación
+                'retained_entries': len(self._entries),
+                'cached_fragments': len(fragments),
+                'fragment_bytes': sum(map(len, fragments)),
+                'body_bytes': len(self._body) if self._body is not None else 0,
+                'indexed_ids': sum(map(len, self._by_operation.values())) + len(self._errors)
+            }
+
+    def entries(self) -> List[Dict]:
+        """Obtiene las entradas visibles, de la más antigua a la más reciente."""
+        with self._lock:
+            return self._entries[self._visible_start() - self._first_id:]
+
+    def query(self, operation: Optional[str] = None, errors_only: bool = False,
+              start: Optional[float] = None, end: Optional[float] = None,
+              limit: Optional[int] = None) -> List[Dict]:
+        """
+        Filtra las entradas visibles usando los índices.
+
+        Args:
+            operation (str, optional): Solo entradas de esta operación
+            errors_only (bool): Solo entradas con error
+            start (float, optional): Epoch mínimo (incluido)
+            end (float, optional): Epoch máximo (incluido)
+            limit (int, optional): Máximo de entradas (se devuelven las más recientes)
+
+        Returns:
+            list: Entradas en orden cronológico
+        """
+        with self._lock:
+            positions = self._select(operation, errors_only, start, end, limit)
+            return [self._entries[position] for position in positions]
+
+    def query_json(self, encode: Callable[[Dict], bytes], operation: Optional[str] = None,
+                   errors_only: bool = False, start: Optional[float] = None,
+                   end: Optional[float] = None, limit: Optional[int] = None) -> bytes:
+        """
+        Como ``query``, pero devuelve el cuerpo JSON {"history": [...]} ya serializado.
+
+        Cada entrada se codifica una sola vez con ``encode`` y el cuerpo se
+        arma uniendo esos fragmentos; el cuerpo sin filtros se reutiliza
+        hasta la siguiente escritura.
+
+        Args:
+            encode (callable): Serializa una entrada a bytes JSON
+            (resto): Filtros de ``query``
+
+        Returns:
+            bytes: Cuerpo de la respuesta
+        """
+        unfiltered = (operation is None and not errors_only and start is None and
+                      end is None and limit is None)
+        with self._lock:
+            if unfiltered and self._body is not None:
+                return self._body
+
+            positions = self._select(operation, errors_only, start, end, limit)
+            fragments = self._fragments
+            for position in positions:
+                if fragments[position] is None:
+                    fragments[position] = encode(self._entries[position])
+            body = b'{"history":[' + b','.join(fragments[position] for position in positions) + b']}\n'
+
+            if unfiltered:
+                self._body = body
+            return body
+
+    def _select(self, operation: Optional[str], errors_only: bool, start: Optional[float],
+                end: Optional[float], limit: Optional[int]) -> List[int]:
+        """Posiciones (en ``_entries``) de las entradas que cumplen los filtros (requiere el lock)."""
+        offset = self._first_id
+        low = self._visible_start()
+        high = self._next_id
+        if start is not None:
+            low = max(low, offset + bisect_left(self._times, start))
+        if end is not None:
+            high = min(high, offset + bisect_right(self._times, end))
+        if low >= high or limit == 0:
+            return []
+
+        if operation is None and not errors_only:
+            if limit is not None:
+                low = max(low, high - limit)
+            return list(range(low - offset, high - offset))
+
+        # Se recorre el índice más corto; el otro filtro se comprueba en la entrada
+        if operation is None:
+            ids, check_operation, check_error = self._errors, None, False
+        else:
+            by_operation = self._by_operation.get(operation, [])
+            if errors_only and len(self._errors) < len(by_operation):
+                ids, check_operation, check_error = self._errors, operation, False
+            else:
+                ids, check_operation, check_error = by_operation, None, errors_only
+
+        selected = []
+        for index in range(bisect_left(ids, high) - 1, bisect_left(ids, low) - 1, -1):
+            position = ids[index] - offset
+            entry = self._entries[position]
+            if check_operation is not None and entry['operation'] != check_operation:
+                continue
+            if check_error and not entry['is_error']:
+                continue
+            selected.append(position)
+            if limit is not None and len(selected) >= limit:
+                break
+        selected.reverse()
+        return selected
+
+
+def parse_history_filters(args: Mapping[str, str],
+                          valid_operations: Collection[str]) -> Dict[str, object]:
+    """
+    Interpreta los filtros de GET /history ('operation', 'errors_only', 'from', 'to', 'limit').
+
+    Args:
+        args (Mapping): Parámetros de la query string
+        valid_operations (Collection): Operaciones admitidas en 'operation'
+
+    Returns:
+        dict: Argumentos para ``HistoryLog.query``, o 'error_code' y 'parameter'
+    """
+    filters: Dict[str, object] = {}
+
+    operation = args.get('operation')
+    if operation is not None:
+        if operation not in valid_operations:
+            return _invalid_filter('operation')
+        filters['operation'] = operation
+
+    errors_only = args.get('errors_only')
+    if errors_only is not None:
+        flag = _BOOLEANS.get(errors_only.strip().lower())
+        if flag is None:
+            return _invalid_filter('errors_only')
+        filters['errors_only'] = flag
+
+    for parameter, key in (('from', 'start'), ('to', 'end')):
+        value = args.get(parameter)
+        if value is not None:
+            epoch = _parse_time(value)
+            if epoch is None:
+                return _invalid_filter(parameter)
+            filters[key] = epoch
+
+    limit = args.get('limit')
+    if limit is not None:
+        try:
+            filters['limit'] = int(limit)
+        except ValueError:
+            return _invalid_filter('limit')
+        if filters['limit'] < 0:
+            return _invalid_filter('limit')
+
+    return filters
+
+
+def _parse_time(value: str) -> Optional[float]:
+    """Epoch de una marca ISO 8601 (UTC si no tiene zona) o de un número de segundos."""
+    try:
+        epoch = float(value)
+    except ValueError:
+        try:
+            moment = datetime.datetime.fromisoformat(value.strip())
+        except ValueError:
+            return None
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=datetime.timezone.utc)
+        return moment.timestamp()
+    return epoch if math.isfinite(epoch) else None
+
+
+def _invalid_filter(parameter: str) -> Dict[str, str]:
+    """Error de un filtro no válido."""
+    return {'error_code': ErrorCode.INVALID_FILTER, 'parameter': parameter}
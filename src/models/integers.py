@@ -0,0 +1,460 @@
+"""
+Enteros - Combinatoria y teoría de números con enteros de tamaño arbitrario
+Operaciones exactas sobre enteros (factorial, nCr/nPr, gcd/lcm, potencia
+modular, raíz entera y potencia entera) cuyo resultado se devuelve como cadena
+decimal exacta:
+
+- El número de dígitos del resultado se estima antes de calcular (con
+  lgamma o logaritmos) y se rechaza si supera MAX_RESULT_DIGITS.
+- Los productos grandes (factorial, nCr, nPr, potencias) se calculan con un
+  árbol de productos (binary splitting): las hojas con enteros de Python y
+  los niveles altos con Decimal, cuya multiplicación (libmpdec, NTT) es
+  subcuadrática y produce directamente los dígitos decimales, sin la
+  conversión entero → cadena, que es cuadrática y está limitada a 4300 dígitos.
+- nCr y nPr con n moderado se factorizan en primos (teoremas de Kummer y
+  Legendre) sobre una criba cacheada; los factoriales pequeños salen de una
+  tabla precalculada.
+- gcd, lcm, pow modular e isqrt usan las implementaciones en C de la
+  biblioteca estándar (Lehmer, exponenciación por cuadrados).
+"""
+
+import decimal
+import itertools
+import math
+import re
+import threading
+from array import array
+from decimal import Decimal
+from typing import Callable, Dict, Optional, Sequence, Tuple, Union
+
+from .errors import ErrorCode
+
+# Dígitos máximos de un operando entero (por debajo del límite de int/str de Python)
+MAX_OPERAND_DIGITS = 4000
+
+# Dígitos máximos del resultado
+MAX_RESULT_DIGITS = 100_000
+
+# Resultados con más dígitos se abrevian en la expresión y en el historial
+MAX_EXPRESSION_DIGITS = 40
+
+# Por debajo de este tamaño str(int) es lo más rápido (y no alcanza el límite de 4300)
+STR_DIGITS_LIMIT = 4000
+
+# Factoriales precalculados (0! ... 256!)
+SMALL_FACTORIAL_LIMIT = 256
+
+# Mayor n para el que se criban primos (nCr/nPr por factorización)
+SIEVE_LIMIT = 2_000_000
+
+# Tamaño en bits a partir del cual el árbol de productos pasa a Decimal
+DECIMAL_PRODUCT_BITS = 4096
+
+# Operandos de más bits no se convierten a float en las estimaciones (máximo ~1024)
+FLOAT_SAFE_BITS = 1000
+
+INTEGER_PATTERN = re.compile(r'[+-]?\d+')
+
+IntegerOutcome = Union[Tuple[str, int], str]
+
+_LOG10_2 = math.log10(2)
+
+# Un resultado de al menos 2^k con k por encima de esto supera MAX_RESULT_DIGITS
+_MAX_RESULT_BITS = MAX_RESULT_DIGITS / _LOG10_2
+
+_SMALL_FACTORIALS = [1]
+for _n in range(1, SMALL_FACTORIAL_LIMIT + 1):
+    _SMALL_FACTORIALS.append(_SMALL_FACTORIALS[-1] * _n)
+
+# Contexto exacto: cualquier redondeo es un error de programación
+_EXACT_CONTEXT = decimal.Context(prec=decimal.MAX_PREC, Emax=decimal.MAX_EMAX,
+                                 Emin=decimal.MIN_EMIN,
+                                 traps=[decimal.Inexact, decimal.Overflow, decimal.InvalidOperation])
+
+_primes = array('q')
+_primes_limit = 1
+_primes_lock = threading.Lock()
+
+
+def parse_integer(value) -> Optional[int]:
+    """
+    Convierte un operando a entero.
+
+    Args:
+        value: int, float con valor entero o cadena de dígitos
+
+    Returns:
+        int, o None si no es un entero válido de hasta MAX_OPERAND_DIGITS dígitos
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        number = value
+    elif type(value) is float:
+        if not math.isfinite(value) or not value.is_integer():
+            return None
+        number = int(value)
+    elif isinstance(value, str):
+        value = value.strip()
+        if not INTEGER_PATTERN.fullmatch(value) or len(value.lstrip('+-')) > MAX_OPERAND_DIGITS:
+            return None
+        number = int(value)
+    else:
+        return None
+    return number if _digits_upper_bound(number) <= MAX_OPERAND_DIGITS else None
+
+
+def evaluate_integer(operation: str, a: int, b: Optional[int] = None,
+                     c: Optional[int] = None) -> IntegerOutcome:
+    """
+    Evalúa una operación entera (también es el punto de entrada del pool de procesos).
+
+    Args:
+        operation (str): Operación de INTEGER_HANDLERS
+        a (int): Primer operando
+        b (int, optional): Segundo operando
+        c (int, optional): Tercer operando (módulo de modpow)
+
+    Returns:
+        tuple o str: (resultado en decimal, número de dígitos), o código de error
+    """
+    handler, arity, _ = INTEGER_HANDLERS[operation]
+    outcome = handler(*(a, b, c)[:arity])
+    if isinstance(outcome, str):
+        return outcome
+    text = format(outcome, 'f') if isinstance(outcome, Decimal) else to_decimal_string(outcome)
+    digits = len(text) - (text[0] == '-')
+    if digits > MAX_RESULT_DIGITS:
+        return ErrorCode.RESULT_TOO_LARGE
+    return text, digits
+
+
+def estimate_digits(operation: str, a: int, b: Optional[int] = None,
+                    c: Optional[int] = None) -> float:
+    """
+    Estima (por exceso) los dígitos del resultado sin calcularlo.
+
+    Los operandos que no caben en un float (hasta MAX_OPERAND_DIGITS) no se
+    convierten: basta su tamaño en bits para acotar el resultado.
+
+    Returns:
+        float: Dígitos estimados (0 si los operandos están fuera del dominio,
+        inf si el resultado supera con seguridad MAX_RESULT_DIGITS)
+    """
+    if operation == 'factorial':
+        if a > MAX_RESULT_DIGITS:
+            # n! tiene más de n dígitos desde n = 25
+            return math.inf
+        return _log10_factorial(a) + 1 if a >= 0 else 0
+    if operation in ('ncr', 'npr'):
+        if a < 0 or b < 0 or b > a:
+            return 0
+        if a.bit_length() > FLOAT_SAFE_BITS:
+            # Cota a^k con k factores; el resultado es al menos 2^k
+            factors = min(b, a - b) if operation == 'ncr' else b
+            if factors > _MAX_RESULT_BITS:
+                return math.inf
+            return factors * math.log10(a) + 1
+        estimate = _log10_factorial(a) - _log10_factorial(a - b)
+        if operation == 'ncr':
+            estimate -= _log10_factorial(b)
+        return max(estimate, 0) + 1
+    if operation == 'ipow':
+        if b <= 0 or abs(a) < 2:
+            return 1
+        if b > _MAX_RESULT_BITS:
+            return math.inf
+        return b * math.log10(abs(a)) + 1
+    if operation == 'modpow':
+        return _digits_upper_bound(c)
+    if operation == 'iroot':
+        return _digits_upper_bound(a) / max(b, 1) + 1
+    if operation == 'lcm':
+        return _digits_upper_bound(a) + _digits_upper_bound(b)
+    return min(_digits_upper_bound(a), _digits_upper_bound(b))
+
+
+def estimate_integer_cost(operation: str, a: int, b: Optional[int] = None,
+                          c: Optional[int] = None) -> float:
+    """
+    Estima el coste (operaciones elementales) de una operación entera.
+
+    Los productos crecen como D·log D con los dígitos D del resultado (la
+    multiplicación de Decimal es casi lineal); la potencia modular hace una
+    multiplicación del tamaño del módulo por cada bit del exponente.
+    """
+    if operation == 'modpow':
+        limbs = c.bit_length() / 30 + 1
+        return abs(b).bit_length() * limbs ** 1.6
+    if operation in ('gcd', 'lcm'):
+        limbs = max(a.bit_length(), b.bit_length()) / 30 + 1
+        return limbs * limbs
+    digits = min(estimate_digits(operation, a, b, c), 10.0 ** 12)
+    return digits * math.log2(digits + 2) * 4
+
+
+def check_result_size(operation: str, a: int, b: Optional[int] = None,
+                      c: Optional[int] = None) -> Optional[str]:
+    """Código RESULT_TOO_LARGE si el resultado superará MAX_RESULT_DIGITS, o None."""
+    if estimate_digits(operation, a, b, c) > MAX_RESULT_DIGITS + 1:
+        return ErrorCode.RESULT_TOO_LARGE
+    return None
+
+
+def abbreviate(text: str, digits: int) -> str:
+    """Abrevia un resultado largo: '4023872600…0000 (2568 dígitos)'."""
+    if digits <= MAX_EXPRESSION_DIGITS:
+        return text
+    half = MAX_EXPRESSION_DIGITS // 4
+    return f'{text[:half + (text[0] == "-")]}…{text[-half:]} ({digits} dígitos)'
+
+
+def to_decimal_string(number: int) -> str:
+    """
+    Convierte un entero a decimal sin el límite de 4300 dígitos de str().
+
+    Los enteros grandes se dividen por bits (n = hi·2^k + lo) y se
+    recombinan con aritmética Decimal: coste subcuadrático, frente a la
+    conversión cuadrática de int → str en CPython 3.11.
+    """
+    if _digits_upper_bound(number) <= STR_DIGITS_LIMIT:
+        return str(number)
+    if number < 0:
+        return '-' + to_decimal_string(-number)
+
+    powers: Dict[int, Decimal] = {}
+
+    def power_of_two(bits: int) -> Decimal:
+        result = powers.get(bits)
+        if result is None:
+            if bits <= DECIMAL_PRODUCT_BITS:
+                result = Decimal(1 << bits)
+            else:
+                half = bits >> 1
+                result = _EXACT_CONTEXT.multiply(power_of_two(half), power_of_two(bits - half))
+            powers[bits] = result
+        return result
+
+    def convert(value: int, bits: int) -> Decimal:
+        if bits <= DECIMAL_PRODUCT_BITS:
+            return Decimal(value)
+        half = bits >> 1
+        high = value >> half
+        low = value - (high << half)
+        return _EXACT_CONTEXT.add(_EXACT_CONTEXT.multiply(convert(high, bits - half), power_of_two(half)),
+                                  convert(low, half))
+
+    return format(convert(number, number.bit_length()), 'f')
+
+
+def product(factors: Sequence[int]) -> Union[int, Decimal]:
+    """
+    Producto de una secuencia de enteros por binary splitting.
+
+    Los subproductos pequeños se multiplican como enteros; cuando superan
+    DECIMAL_PRODUCT_BITS se pasan a Decimal, cuya multiplicación es
+    subcuadrática para números grandes.
+
+    Returns:
+        int o Decimal: Producto exacto
+    """
+    def split(low: int, high: int) -> Union[int, Decimal]:
+        if high - low <= 8:
+            result = 1
+            for index in range(low, high):
+                result *= factors[index]
+            return result
+        middle = (low + high) // 2
+        left, right = split(low, middle), split(middle, high)
+        if type(left) is int and type(right) is int:
+            if left.bit_length() + right.bit_length() <= DECIMAL_PRODUCT_BITS:
+                return left * right
+        return _EXACT_CONTEXT.multiply(_as_decimal(left), _as_decimal(right))
+
+    return split(0, len(factors)) if factors else 1
+
+
+def primes_up_to(limit: int) -> Sequence[int]:
+    """Primos ≤ limit (criba de Eratóstenes cacheada y ampliada bajo demanda)."""
+    global _primes, _primes_limit
+    if limit > _primes_limit:
+        with _primes_lock:
+            if limit > _primes_limit:
+                size = max(limit, min(2 * _primes_limit, SIEVE_LIMIT))
+                sieve = bytearray([1]) * (size + 1)
+                sieve[0:2] = b'\x00\x00'
+                for prime in range(2, math.isqrt(size) + 1):
+                    if sieve[prime]:
+                        sieve[prime * prime::prime] = bytes(len(range(prime * prime, size + 1, prime)))
+                _primes = array('q', itertools.compress(range(size + 1), sieve))
+                _primes_limit = size
+    primes = _primes
+    return primes[:_bisect_right(primes, limit)]
+
+
+def _factorial(n: int) -> Union[int, Decimal, str]:
+    """n! (tabla para n pequeño; factorización de Legendre y árbol de productos)."""
+    if n < 0:
+        return ErrorCode.DOMAIN_ERROR
+    if n <= SMALL_FACTORIAL_LIMIT:
+        return _SMALL_FACTORIALS[n]
+    if n > SIEVE_LIMIT:
+        return math.factorial(n)
+    return product([prime ** _legendre(n, prime) for prime in primes_up_to(n)])
+
+
+def _ncr(n: int, k: int) -> Union[int, Decimal, str]:
+    """Combinaciones C(n, k) (0 si k > n)."""
+    if n < 0 or k < 0:
+        return ErrorCode.DOMAIN_ERROR
+    if k > n:
+        return 0
+    k = min(k, n - k)
+    if k < 64 or n > SIEVE_LIMIT:
+        return math.comb(n, k)
+
+    # Kummer: el exponente de p es el número de acarreos al sumar k + (n - k) en base p
+    factors = []
+    for prime in primes_up_to(n):
+        if prime > n - k:
+            factors.append(prime)
+        elif prime > n // 2:
+            continue
+        elif prime * prime > n:
+            if n % prime < k % prime:
+                factors.append(prime)
+        else:
+            exponent, carry, x, y = 0, 0, n, k
+            while x:
+                carry = 1 if x % prime < y % prime + carry else 0
+                exponent += carry
+                x //= prime
+                y //= prime
+            if exponent:
+                factors.append(prime ** exponent)
+    return product(factors)
+
+
+def _npr(n: int, k: int) -> Union[int, Decimal, str]:
+    """Variaciones P(n, k) = n! / (n - k)! (0 si k > n)."""
+    if n < 0 or k < 0:
+        return ErrorCode.DOMAIN_ERROR
+    if k > n:
+        return 0
+    if k < 64:
+        return math.perm(n, k)
+    if n <= SIEVE_LIMIT and k > n // 8:
+        # Legendre: exponente de p en n! menos el de (n - k)!
+        return product([prime ** (_legendre(n, prime) - _legendre(n - k, prime))
+                        for prime in primes_up_to(n) if _legendre(n, prime) > _legendre(n - k, prime)])
+    return product(range(n - k + 1, n + 1))
+
+
+def _gcd(a: int, b: int) -> int:
+    """Máximo común divisor (no negativo)."""
+    return math.gcd(a, b)
+
+
+def _lcm(a: int, b: int) -> int:
+    """Mínimo común múltiplo (no negativo)."""
+    return math.lcm(a, b)
+
+
+def _modpow(base: int, exponent: int, modulus: int) -> Union[int, str]:
+    """base^exponente mod módulo (exponente negativo: inverso modular)."""
+    if modulus == 0:
+        return ErrorCode.DIVISION_BY_ZERO
+    if modulus < 0:
+        return ErrorCode.DOMAIN_ERROR
+    try:
+        return pow(base, exponent, modulus)
+    except ValueError:
+        # La base no es invertible módulo el módulo
+        return ErrorCode.DOMAIN_ERROR
+
+
+def _iroot(x: int, n: int) -> Union[int, str]:
+    """Raíz n-ésima entera ⌊x^(1/n)⌋ (truncada hacia cero para x negativo y n impar)."""
+    if n <= 0:
+        return ErrorCode.DOMAIN_ERROR
+    if x < 0:
+        if n % 2 == 0:
+            return ErrorCode.NEGATIVE_SQRT
+        return -_iroot(-x, n)
+    if n == 1 or x < 2:
+        return x
+    if n == 2:
+        return math.isqrt(x)
+    if n >= x.bit_length():
+        return 1
+
+    # Newton desde arriba con una estimación inicial por logaritmos (converge cuadráticamente)
+    estimate = math.log2(x) / n
+    guess = int(2 ** estimate * (1 + 1e-12)) + 1 if estimate < 1000 else 1 << (-(-x.bit_length() // n))
+    while True:
+        better = ((n - 1) * guess + x // guess ** (n - 1)) // n
+        if better >= guess:
+            break
+        guess = better
+    while guess ** n > x:
+        guess -= 1
+    while (guess + 1) ** n <= x:
+        guess += 1
+    return guess
+
+
+def _ipow(base: int, exponent: int) -> Union[int, Decimal, str]:
+    """Potencia entera exacta (exponenciación por cuadrados)."""
+    if exponent < 0:
+        if abs(base) == 1:
+            return base ** (-exponent % 2) if base == -1 else 1
+        return ErrorCode.DOMAIN_ERROR
+    if estimate_digits('ipow', base, exponent) <= STR_DIGITS_LIMIT:
+        return base ** exponent
+    return _EXACT_CONTEXT.power(Decimal(base), exponent)
+
+
+# Operación → (función, número de operandos, formato de la expresión)
+INTEGER_HANDLERS: Dict[str, Tuple[Callable, int, str]] = {
+    'factorial': (_factorial, 1, '{a}! = {r}'),
+    'ncr': (_ncr, 2, 'C({a}, {b}) = {r}'),
+    'npr': (_npr, 2, 'P({a}, {b}) = {r}'),
+    'gcd': (_gcd, 2, 'mcd({a}, {b}) = {r}'),
+    'lcm': (_lcm, 2, 'mcm({a}, {b}) = {r}'),
+    'modpow': (_modpow, 3, '{a}^{b} mod {c} = {r}'),
+    'iroot': (_iroot, 2, '⌊{b}√{a}⌋ = {r}'),
+    'ipow': (_ipow, 2, '{a}^{b} = {r}')
+}
+
+
+def _as_decimal(value: Union[int, Decimal]) -> Decimal:
+    return Decimal(value) if type(value) is int else value
+
+
+def _legendre(n: int, prime: int) -> int:
+    """Exponente de ``prime`` en n! (fórmula de Legendre)."""
+    exponent = 0
+    while n:
+        n //= prime
+        exponent += n
+    return exponent
+
+
+def _log10_factorial(n: int) -> float:
+    return math.lgamma(n + 1) / math.log(10)
+
+
+def _digits_upper_bound(number: int) -> int:
+    """Cota superior de los dígitos decimales de un entero (sin convertirlo)."""
+    return int(number.bit_length() * _LOG10_2) + 1
+
+
+def _bisect_right(values: Sequence[int], target: int) -> int:
+    low, high = 0, len(values)
+    while low < high:
+        middle = (low + high) // 2
+        if values[middle] <= target:
+            low = middle + 1
+        else:
+            high = middle
+    return low
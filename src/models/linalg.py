@@ -0,0 +1,337 @@
+"""
+Álgebra Lineal - Operaciones con vectores y matrices
+Operaciones elemento a elemento (con un escalar como segundo operando si se
+quiere), producto escalar, producto de matrices, transpuesta, determinante y
+resolución de sistemas lineales. Los vectores son listas de números y las
+matrices listas de filas de la misma longitud (como llegan en el JSON).
+
+Se usa numpy si está instalado y el tamaño compensa la conversión a arrays;
+si no, implementaciones nativas: el producto de matrices recorre bloques de
+columnas de la transpuesta con ``sum(map(mul, ...))`` y el determinante y
+``solve`` usan eliminación gaussiana con pivoteo parcial. Como en las
+operaciones escalares, los errores (división por cero, matriz singular,
+resultados no finitos) se devuelven como códigos, sin excepciones.
+"""
+
+import json
+import math
+import operator
+from itertools import chain, repeat
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from .errors import ErrorCode
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: se usan las implementaciones nativas
+    np = None
+
+# Elementos máximos de cada operando
+MAX_ARRAY_ELEMENTS = 1_000_000
+
+# Por debajo de este número de elementos la conversión a numpy no compensa
+NUMPY_MIN_ELEMENTS = 64
+
+# Columnas de la transpuesta que se recorren juntas en el producto nativo
+MATMUL_BLOCK_SIZE = 64
+
+# numpy hace en C lo que el camino nativo hace en el intérprete; la
+# estimación de coste se divide por este factor
+NUMPY_SPEEDUP = 50
+
+Array = Union[float, List[float], List[List[float]]]
+
+
+def shape_of(value: Array) -> Tuple[int, ...]:
+    """Forma de un operando: () escalar, (n,) vector o (filas, columnas) matriz."""
+    if not isinstance(value, list):
+        return ()
+    if isinstance(value[0], list):
+        return len(value), len(value[0])
+    return len(value),
+
+
+def describe(value: Array) -> str:
+    """Descripción breve para la expresión: '2.5', 'vector(3)' o 'matriz 2×3'."""
+    shape = shape_of(value)
+    if not shape:
+        return repr(value)
+    if len(shape) == 1:
+        return f'vector({shape[0]})'
+    return f'matriz {shape[0]}×{shape[1]}'
+
+
+def parse_array(value, allow_scalar: bool = False,
+                max_elements: int = MAX_ARRAY_ELEMENTS) -> Optional[Array]:
+    """
+    Convierte un operando a vector o matriz de floats finitos.
+
+    Args:
+        value: Lista de números, lista de filas, o su texto JSON (parámetros GET)
+        allow_scalar (bool): Si se acepta también un número
+        max_elements (int): Elementos máximos
+
+    Returns:
+        float, list o list de lists; None si no es válido
+    """
+    if isinstance(value, str) and value.lstrip().startswith('['):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return None
+
+    if not isinstance(value, list):
+        return _to_float(value) if allow_scalar else None
+    if not value:
+        return None
+
+    if isinstance(value[0], list):
+        columns = len(value[0])
+        if not columns or len(value) * columns > max_elements:
+            return None
+        rows = []
+        for row in value:
+            if not isinstance(row, list) or len(row) != columns:
+                return None
+            row = _to_floats(row)
+            if row is None:
+                return None
+            rows.append(row)
+        return rows
+
+    if len(value) > max_elements:
+        return None
+    return _to_floats(value)
+
+
+def check_shapes(operation: str, a: Array, b: Optional[Array] = None) -> Optional[Dict[str, object]]:
+    """
+    Comprueba que las formas de los operandos son compatibles con la operación.
+
+    Returns:
+        dict: Error SHAPE_MISMATCH con 'shapes', o None si son compatibles
+    """
+    shape_a = shape_of(a)
+    shape_b = shape_of(b) if b is not None else None
+
+    if operation in ELEMENTWISE_OPERATIONS:
+        valid = shape_a == shape_b or not shape_a or not shape_b
+    elif operation == 'dot':
+        valid = len(shape_a) == 1 and shape_a == shape_b
+    elif operation == 'matmul':
+        valid = shape_a[-1] == shape_b[0]
+    elif operation == 'determinant':
+        valid = len(shape_a) == 2 and shape_a[0] == shape_a[1]
+    elif operation == 'solve':
+        valid = len(shape_a) == 2 and shape_a[0] == shape_a[1] == shape_b[0]
+    else:
+        valid = True
+
+    if valid:
+        return None
+    shapes = [list(shape_a)] if shape_b is None else [list(shape_a), list(shape_b)]
+    return {'error_code': ErrorCode.SHAPE_MISMATCH, 'shapes': shapes}
+
+
+def evaluate_array(operation: str, a: Array, b: Optional[Array] = None) -> Union[Array, str]:
+    """
+    Evalúa una operación con operandos ya validados (también en el pool de procesos).
+
+    Args:
+        operation (str): Operación de ARRAY_HANDLERS
+        a: Primer operando
+        b: Segundo operando (None en las operaciones unarias)
+
+    Returns:
+        Resultado (float, vector o matriz) o código de error
+    """
+    if operation == 'array_divide' and 0.0 in (_flatten(b) if isinstance(b, list) else (b,)):
+        return ErrorCode.DIVISION_BY_ZERO
+
+    if np is not None and _size(a) + _size(b) >= NUMPY_MIN_ELEMENTS:
+        result = _evaluate_numpy(operation, a, b)
+    else:
+        result = ARRAY_HANDLERS[operation][0](*((a,) if b is None else (a, b)))
+
+    if isinstance(result, str):
+        return result
+    values = _flatten(result) if isinstance(result, list) else (result,)
+    if not all(map(math.isfinite, values)):
+        return ErrorCode.OVERFLOW
+    return result
+
+
+def estimate_array_cost(operation: str, a: Array, b: Optional[Array] = None) -> float:
+    """Estima el coste (operaciones elementales) de una operación con arrays."""
+    shape_a = shape_of(a)
+    if operation == 'matmul':
+        shape_b = shape_of(b)
+        cost = math.prod(shape_a) * (shape_b[-1] if len(shape_b) == 2 else 1)
+    elif operation in ('determinant', 'solve'):
+        n = shape_a[0]
+        cost = n ** 3 / 3 + (n * _size(b) if b is not None else 0)
+    else:
+        cost = max(_size(a), _size(b))
+    return cost / NUMPY_SPEEDUP if np is not None else cost
+
+
+def _elementwise(func: Callable[[float, float], float], a: Array, b: Array) -> Array:
+    """Aplica ``func`` elemento a elemento (un escalar se repite)."""
+    if not isinstance(a, list) and not isinstance(b, list):
+        return func(a, b)
+    if isinstance(a, list) and isinstance(a[0], list) or isinstance(b, list) and isinstance(b[0], list):
+        rows = len(a) if isinstance(a, list) else len(b)
+        return [_elementwise(func, a[index] if isinstance(a, list) else a,
+                             b[index] if isinstance(b, list) else b) for index in range(rows)]
+    return list(map(func, a if isinstance(a, list) else repeat(a),
+                    b if isinstance(b, list) else repeat(b)))
+
+
+def _dot(a: List[float], b: List[float]) -> float:
+    """Producto escalar de dos vectores."""
+    return float(sum(map(operator.mul, a, b)))
+
+
+def _matmul(a: Array, b: Array) -> Array:
+    """
+    Producto de matrices (un vector actúa como fila a la izquierda y como
+    columna a la derecha, como en ``numpy.matmul``).
+    """
+    left_vector, right_vector = not isinstance(a[0], list), not isinstance(b[0], list)
+    rows = [a] if left_vector else a
+    columns = [tuple(b)] if right_vector else list(zip(*b))
+
+    result = [[] for _ in rows]
+    for start in range(0, len(columns), MATMUL_BLOCK_SIZE):
+        block = columns[start:start + MATMUL_BLOCK_SIZE]
+        for row, output in zip(rows, result):
+            output.extend([float(sum(map(operator.mul, row, column))) for column in block])
+
+    if right_vector:
+        result = [row[0] for row in result]
+    return result[0] if left_vector else result
+
+
+def _transpose(a: Array) -> Array:
+    """Transpuesta (un vector no cambia)."""
+    if not isinstance(a[0], list):
+        return list(a)
+    return [list(column) for column in zip(*a)]
+
+
+def _determinant(a: List[List[float]]) -> float:
+    """Determinante por eliminación gaussiana con pivoteo parcial."""
+    matrix = [list(row) for row in a]
+    size = len(matrix)
+    determinant = 1.0
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda index: abs(matrix[index][column]))
+        if matrix[pivot][column] == 0:
+            return 0.0
+        if pivot != column:
+            matrix[column], matrix[pivot] = matrix[pivot], matrix[column]
+            determinant = -determinant
+        pivot_row = matrix[column]
+        determinant *= pivot_row[column]
+        _eliminate(matrix, pivot_row, column, column + 1)
+    return determinant
+
+
+def _solve(a: List[List[float]], b: Array) -> Union[Array, str]:
+    """Resuelve A·x = b (b vector o matriz) por eliminación gaussiana con pivoteo parcial."""
+    vector = not isinstance(b[0], list)
+    size = len(a)
+    # Matriz ampliada [A | b]
+    columns = [[value] for value in b] if vector else b
+    matrix = [list(row) + list(extra) for row, extra in zip(a, columns)]
+
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda index: abs(matrix[index][column]))
+        if matrix[pivot][column] == 0:
+            return ErrorCode.SINGULAR_MATRIX
+        matrix[column], matrix[pivot] = matrix[pivot], matrix[column]
+        _eliminate(matrix, matrix[column], column, column + 1)
+
+    # Sustitución hacia atrás sobre las columnas de b
+    solution: List[List[float]] = [[] for _ in range(size)]
+    for index in range(size - 1, -1, -1):
+        row = matrix[index]
+        values = row[size:]
+        for other in range(index + 1, size):
+            factor = row[other]
+            if factor:
+                values = [value - factor * known for value, known in zip(values, solution[other])]
+        solution[index] = [value / row[index] for value in values]
+    return [row[0] for row in solution] if vector else solution
+
+
+def _eliminate(matrix: List[List[float]], pivot_row: List[float], column: int, start: int):
+    """Anula la columna ``column`` en las filas desde ``start`` con la fila pivote."""
+    pivot = pivot_row[column]
+    tail = pivot_row[column:]
+    for index in range(start, len(matrix)):
+        row = matrix[index]
+        factor = row[column] / pivot
+        if factor:
+            row[column:] = [value - factor * reference for value, reference in zip(row[column:], tail)]
+
+
+def _evaluate_numpy(operation: str, a: Array, b: Optional[Array]) -> Union[Array, str]:
+    """Evalúa con numpy; los resultados vuelven como listas de floats."""
+    arrays = [np.asarray(a, dtype=float)] + ([] if b is None else [np.asarray(b, dtype=float)])
+    with np.errstate(all='ignore'):
+        try:
+            result = ARRAY_HANDLERS[operation][1](*arrays)
+        except np.linalg.LinAlgError:
+            return ErrorCode.SINGULAR_MATRIX
+    return result.tolist() if isinstance(result, np.ndarray) and result.ndim else float(result)
+
+
+def _to_float(value) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def _to_floats(values: list) -> Optional[List[float]]:
+    """Convierte una fila a floats finitos (None si algún elemento no es válido)."""
+    try:
+        floats = list(map(float, values))
+    except (TypeError, ValueError, OverflowError):
+        return None
+    if not all(map(math.isfinite, floats)) or any(type(value) is bool for value in values):
+        return None
+    return floats
+
+
+def _flatten(value: list) -> List[float]:
+    return list(chain.from_iterable(value)) if isinstance(value[0], list) else value
+
+
+def _size(value: Optional[Array]) -> int:
+    return math.prod(shape_of(value)) if value is not None else 0
+
+
+# Operaciones elemento a elemento (admiten un escalar)
+ELEMENTWISE_OPERATIONS = frozenset({'array_add', 'array_subtract', 'array_multiply', 'array_divide'})
+
+# Operación → (función nativa, función numpy o None, número de operandos, formato de la expresión)
+ARRAY_HANDLERS: Dict[str, Tuple[Callable, Optional[Callable], int, str]] = {
+    'array_add': (lambda a, b: _elementwise(operator.add, a, b),
+                  np.add if np is not None else None, 2, '{a} + {b} = {r}'),
+    'array_subtract': (lambda a, b: _elementwise(operator.sub, a, b),
+                       np.subtract if np is not None else None, 2, '{a} - {b} = {r}'),
+    'array_multiply': (lambda a, b: _elementwise(operator.mul, a, b),
+                       np.multiply if np is not None else None, 2, '{a} ⊙ {b} = {r}'),
+    'array_divide': (lambda a, b: _elementwise(operator.truediv, a, b),
+                     np.divide if np is not None else None, 2, '{a} ⊘ {b} = {r}'),
+    'dot': (_dot, np.dot if np is not None else None, 2, '{a} · {b} = {r}'),
+    'matmul': (_matmul, np.matmul if np is not None else None, 2, '{a} × {b} = {r}'),
+    'transpose': (_transpose, np.transpose if np is not None else None, 1, '({a})ᵀ = {r}'),
+    'determinant': (_determinant, np.linalg.det if np is not None else None, 1, 'det({a}) = {r}'),
+    'solve': (_solve, np.linalg.solve if np is not None else None, 2, 'solve({a}, {b}) = {r}')
+}
@@ -0,0 +1,176 @@
+"""
+Ejecución Diferida - Pool de procesos para operaciones costosas
+Las operaciones cuyo coste estimado supera el umbral se evalúan en un
+ProcessPoolExecutor gestionado, con una cola acotada y un tiempo máximo por
+llamada, para que una petición patológica no bloquee un hilo del worker.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional, Set
+
+
+class OffloadTimeout(Exception):
+    """La evaluación superó el tiempo máximo permitido."""
+
+
+class OffloadBusy(Exception):
+    """La cola de evaluaciones diferidas está llena."""
+
+
+class OffloadExecutor:
+    """
+    Pool de procesos con cola acotada y tiempo máximo por llamada.
+
+    Si una evaluación agota el tiempo, el pool se retira: las evaluaciones
+    nuevas van a un pool nuevo y los procesos del retirado se terminan en
+    cuanto acaban (o agotan su tiempo) las demás evaluaciones que tenía en
+    curso. El trabajo colgado deja de consumir CPU sin que las evaluaciones
+    vecinas fallen por un pool roto, y el proceso del worker web no se ve
+    afectado.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 8, timeout: float = 2.0,
+                 start_method: str = 'spawn'):
+        """
+        Inicializa el ejecutor (el pool se crea en el primer uso).
+
+        Args:
+            max_workers (int): Procesos del pool
+            max_pending (int): Evaluaciones en cola o en curso como máximo
+            timeout (float): Segundos máximos por evaluación
+            start_method (str): Método de arranque de multiprocessing
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.start_method = start_method
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Evaluaciones en curso por pool y pools retirados pendientes de terminar
+        self._in_flight: Dict[ProcessPoolExecutor, int] = {}
+        self._retired: Set[ProcessPoolExecutor] = set()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._counters = {
+            'completed': 0,
+            'timeouts': 0,
+            'broken': 0,
+            'rejected': 0,
+            'recycled': 0
+        }
+
+    def run(self, func: Callable, *args, timeout: Optional[float] = None):
+        """
+        Evalúa ``func(*args)`` en el pool y espera el resultado.
+
+        Args:
+            func (callable): Función de nivel de módulo (serializable)
+            *args: Argumentos de la función
+            timeout (float, optional): Tiempo máximo para esta llamada
+
+        Returns:
+            Resultado de la función
+
+        Raises:
+            OffloadBusy: Si la cola está llena o un proceso del pool murió
+            OffloadTimeout: Si la evaluación supera el tiempo máximo
+        """
+        if not self._slots.acquire(blocking=False):
+            self._count('rejected')
+            raise OffloadBusy("Servidor ocupado, inténtalo más tarde")
+
+        try:
+            pool = self._acquire_pool()
+            retire = False
+            try:
+                future = pool.submit(func, *args)
+                result = future.result(timeout=timeout or self.timeout)
+            except FutureTimeoutError:
+                future.cancel()
+                retire = True
+                self._count('timeouts')
+                raise OffloadTimeout("Tiempo de cálculo excedido")
+            except BrokenProcessPool:
+                # Un proceso murió (p. ej. sin memoria): el pool ya no sirve
+                retire = True
+                self._count('broken')
+                raise OffloadBusy("Servidor ocupado, inténtalo más tarde")
+            finally:
+                self._release_pool(pool, retire)
+
+            self._count('completed')
+            return result
+        finally:
+            self._slots.release()
+
+    def _acquire_pool(self) -> ProcessPoolExecutor:
+        """Obtiene el pool actual (o lo crea) y anota una evaluación en curso."""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(self.start_method)
+                )
+            pool = self._pool
+            self._in_flight[pool] = self._in_flight.get(pool, 0) + 1
+            return pool
+
+    def _release_pool(self, pool: ProcessPoolExecutor, retire: bool):
+        """
+        Anota el fin de una evaluación y termina el pool retirado que queda vacío.
+
+        Args:
+            pool (ProcessPoolExecutor): Pool de la evaluación
+            retire (bool): Si el pool tiene trabajo colgado y debe retirarse
+        """
+        with self._lock:
+            remaining = self._in_flight.pop(pool, 0) - 1
+            if remaining > 0:
+                self._in_flight[pool] = remaining
+            if retire and self._pool is pool:
+                self._pool = None
+                self._retired.add(pool)
+                self._counters['recycled'] += 1
+            if pool not in self._retired or remaining > 0:
+                return
+            self._retired.discard(pool)
+        self._terminate(pool)
+
+    @staticmethod
+    def _terminate(pool: ProcessPoolExecutor):
+        """Termina los procesos de un pool retirado."""
+        # ProcessPoolExecutor no expone una forma pública de terminar sus hijos
+        for process in list(getattr(pool, '_processes', {}).values()):
+            if process.is_alive():
+                process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _count(self, counter: str):
+        """Incrementa un contador (las llamadas llegan desde varios hilos)."""
+        with self._lock:
+            self._counters[counter] += 1
+
+    def shutdown(self):
+        """Detiene el pool actual y termina los retirados."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            retired, self._retired = self._retired, set()
+            self._in_flight.clear()
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+        for retired_pool in retired:
+            self._terminate(retired_pool)
+
+    def stats(self) -> Dict[str, int]:
+        """Obtiene los contadores del ejecutor."""
+        with self._lock:
+            return {
+                **self._counters,
+                'pool_active': self._pool is not None,
+                'retired_pools': len(self._retired),
+                'max_workers': self.max_workers,
+                'max_pending': self.max_pending
+            }
@@ -0,0 +1,275 @@
+"""
+Precisión - Evaluación exacta de operaciones (modos decimal y fraction)
+En el modo por defecto ('float') las operaciones usan aritmética binaria y
+arrastran ruido de representación (0.1 + 0.2 = 0.30000000000000004). Los modos
+exactos interpretan cada operando por su valor decimal y devuelven el
+resultado como cadena:
+
+- Camino rápido: si ambos operandos son enteros pequeños y el resultado es
+  exacto (por ejemplo 6 / 3), se calcula con enteros sin tocar Decimal.
+- 'decimal': aritmética decimal con contextos precalculados por hilo;
+  el resultado se redondea a DECIMAL_PRECISION dígitos si no es exacto.
+- 'fraction': aritmética racional exacta; sqrt y potencias no enteras, que
+  no tienen resultado racional, se calculan en decimal.
+"""
+
+import decimal
+import math
+import threading
+from decimal import Decimal
+from fractions import Fraction
+from typing import Optional, Tuple, Union
+
+from .errors import ErrorCode
+
+PRECISION_MODES = ('float', 'decimal', 'fraction')
+
+# Dígitos significativos del modo decimal (los de decimal128)
+DECIMAL_PRECISION = 34
+
+# Exponente decimal máximo de operandos y resultados exactos
+DECIMAL_EMAX = 9999
+
+# Dígitos significativos máximos de un operando exacto
+MAX_OPERAND_DIGITS = 100
+
+# Tamaño máximo (bits de numerador o denominador) de un resultado racional
+MAX_FRACTION_BITS = 8192
+
+# Enteros representables exactamente en float: límite del camino rápido
+FAST_PATH_LIMIT = 2 ** 53
+
+ExactOperand = Union[int, Decimal]
+
+_local = threading.local()
+
+
+def decimal_context(precision: int = DECIMAL_PRECISION) -> decimal.Context:
+    """
+    Obtiene el contexto decimal del hilo actual para una precisión.
+
+    Los contextos guardan flags (Inexact, ...), así que se cachean por hilo
+    en lugar de compartirse entre peticiones concurrentes.
+
+    Args:
+        precision (int): Dígitos significativos
+
+    Returns:
+        decimal.Context: Contexto con redondeo bancario y errores atrapados
+    """
+    contexts = getattr(_local, 'contexts', None)
+    if contexts is None:
+        contexts = _local.contexts = {}
+
+    context = contexts.get(precision)
+    if context is None:
+        context = contexts[precision] = decimal.Context(
+            prec=precision,
+            rounding=decimal.ROUND_HALF_EVEN,
+            Emax=DECIMAL_EMAX,
+            Emin=-DECIMAL_EMAX,
+            traps=[decimal.InvalidOperation, decimal.DivisionByZero, decimal.Overflow]
+        )
+    return context
+
+
+def parse_exact(value) -> Optional[ExactOperand]:
+    """
+    Convierte un operando a su valor decimal exacto.
+
+    Los floats se interpretan por su representación más corta (0.1 es
+    exactamente 1/10) y las cadenas por su valor literal. Los enteros
+    pequeños se devuelven como int para el camino rápido.
+
+    Args:
+        value: Número o cadena recibidos en la petición
+
+    Returns:
+        int o Decimal: Valor exacto, o None si no es un número finito válido
+    """
+    if type(value) is float:
+        if not math.isfinite(value):
+            return None
+        if value.is_integer() and abs(value) < FAST_PATH_LIMIT:
+            return int(value)
+        number = Decimal(repr(value))
+    elif isinstance(value, int):
+        if abs(value) < FAST_PATH_LIMIT:
+            return int(value)
+        number = Decimal(value)
+    elif isinstance(value, str):
+        try:
+            number = Decimal(value.strip())
+        except decimal.InvalidOperation:
+            return None
+    else:
+        return None
+
+    if not number.is_finite() or len(number.as_tuple().digits) > MAX_OPERAND_DIGITS:
+        return None
+    if number and abs(number.adjusted()) > DECIMAL_EMAX:
+        return None
+    if number == number.to_integral_value() and abs(number) < FAST_PATH_LIMIT:
+        return int(number)
+    return number
+
+
+def format_exact(value: Union[ExactOperand, Fraction]) -> str:
+    """
+    Formatea un valor exacto sin exponente ni ceros sobrantes.
+
+    No redondea: los operandos tienen hasta MAX_OPERAND_DIGITS dígitos, más
+    que los DECIMAL_PRECISION de los resultados del modo decimal.
+
+    Args:
+        value: Entero, Decimal o Fraction
+
+    Returns:
+        str: '6', '0.3', '-12.5' o '1/3'
+    """
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, Fraction):
+        return str(value)
+    if not value:
+        return '0'
+    return format(value.normalize(decimal_context(MAX_OPERAND_DIGITS)), 'f')
+
+
+def evaluate_exact(operation: str, a: ExactOperand, b: Optional[ExactOperand],
+                   mode: str) -> Union[Tuple[str, bool], str]:
+    """
+    Evalúa una operación en un modo exacto.
+
+    Args:
+        operation (str): Operación válida
+        a: Primer operando exacto
+        b: Segundo operando exacto (None para sqrt)
+        mode (str): 'decimal' o 'fraction'
+
+    Returns:
+        tuple o str: (resultado formateado, si es exacto), o código de error
+    """
+    if type(a) is int and (b is None or type(b) is int):
+        result = _evaluate_integers(operation, a, b)
+        if result is not None:
+            return str(result), True
+
+    if mode == 'fraction':
+        return _evaluate_fraction(operation, a, b)
+    return _evaluate_decimal(operation, a, b)
+
+
+def _evaluate_integers(operation: str, a: int, b: Optional[int]) -> Optional[int]:
+    """
+    Camino rápido: resultado entero exacto dentro del rango de float, o None
+    si no puede garantizarse (y hay que pasar al camino general).
+    """
+    if operation == 'add':
+        result = a + b
+    elif operation == 'subtract':
+        result = a - b
+    elif operation == 'multiply':
+        result = a * b
+    elif operation == 'divide':
+        if b == 0 or a % b:
+            return None
+        result = a // b
+    elif operation == 'percentage':
+        product = a * b
+        if product % 100:
+            return None
+        result = product // 100
+    elif operation == 'power':
+        if b < 0 or (a.bit_length() - 1) * b >= 53:
+            return None
+        result = a ** b
+    elif operation == 'sqrt':
+        if a < 0:
+            return None
+        result = math.isqrt(a)
+        if result * result != a:
+            return None
+    else:
+        return None
+
+    return result if abs(result) < FAST_PATH_LIMIT else None
+
+
+def _evaluate_decimal(operation: str, a: ExactOperand, b: Optional[ExactOperand]) -> Union[Tuple[str, bool], str]:
+    """Evalúa con aritmética decimal redondeada a DECIMAL_PRECISION dígitos."""
+    context = decimal_context()
+    context.clear_flags()
+    a = Decimal(a)
+    b = Decimal(b) if b is not None else None
+
+    try:
+        if operation == 'add':
+            result = context.add(a, b)
+        elif operation == 'subtract':
+            result = context.subtract(a, b)
+        elif operation == 'multiply':
+            result = context.multiply(a, b)
+        elif operation == 'divide':
+            if not b:
+                return ErrorCode.DIVISION_BY_ZERO
+            result = context.divide(a, b)
+        elif operation == 'percentage':
+            result = context.divide(context.multiply(a, b), 100)
+        elif operation == 'power':
+            if not a and b < 0:
+                return ErrorCode.DOMAIN_ERROR
+            if a < 0 and b != b.to_integral_value():
+                return ErrorCode.DOMAIN_ERROR
+            result = context.power(a, b)
+        else:
+            if a < 0:
+                return ErrorCode.NEGATIVE_SQRT
+            result = context.sqrt(a)
+    except decimal.Overflow:
+        # El contexto no permite comprobar el exponente del resultado antes de calcularlo
+        return ErrorCode.OVERFLOW
+
+    return format_exact(result), not context.flags[decimal.Inexact]
+
+
+def _evaluate_fraction(operation: str, a: ExactOperand, b: Optional[ExactOperand]) -> Union[Tuple[str, bool], str]:
+    """Evalúa con aritmética racional exacta."""
+    x = Fraction(a)
+    y = Fraction(b) if b is not None else None
+
+    if operation == 'add':
+        result = x + y
+    elif operation == 'subtract':
+        result = x - y
+    elif operation == 'multiply':
+        result = x * y
+    elif operation == 'divide':
+        if not y:
+            return ErrorCode.DIVISION_BY_ZERO
+        result = x / y
+    elif operation == 'percentage':
+        result = x * y / 100
+    elif operation == 'power':
+        if y.denominator != 1:
+            # Sin resultado racional en general: se calcula en decimal
+            return _evaluate_decimal(operation, a, b)
+        if not x and y < 0:
+            return ErrorCode.DOMAIN_ERROR
+        size = max(x.numerator.bit_length(), x.denominator.bit_length())
+        if size * abs(y.numerator) > MAX_FRACTION_BITS:
+            return ErrorCode.OVERFLOW
+        result = x ** y.numerator
+    else:
+        if x < 0:
+            return ErrorCode.NEGATIVE_SQRT
+        numerator_root = math.isqrt(x.numerator)
+        denominator_root = math.isqrt(x.denominator)
+        if (numerator_root * numerator_root != x.numerator or
+                denominator_root * denominator_root != x.denominator):
+            return _evaluate_decimal(operation, a, b)
+        result = Fraction(numerator_root, denominator_root)
+
+    if max(result.numerator.bit_length(), result.denominator.bit_length()) > MAX_FRACTION_BITS:
+        return ErrorCode.OVERFLOW
+    return format_exact(result), True
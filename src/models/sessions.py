@@ -0,0 +1,193 @@
+"""
+Sesiones - Un CalculatorModel por sesión de usuario
+Cada sesión (identificada por la cookie de sesión firmada) tiene su propio
+historial. Los modelos se guardan en una caché LRU acotada de dos formas:
+
+- Por número: las sesiones inactivas más de ``idle_ttl`` segundos se
+  expulsan y, si se alcanza ``max_sessions``, se expulsa la usada hace más
+  tiempo.
+- Por memoria: el tamaño estimado de cada sesión
+  (``CalculatorModel.estimated_bytes``) se actualiza con ``measure`` después
+  de cada petición que la usa; mientras la suma supera ``max_bytes`` se
+  expulsan las sesiones usadas hace más tiempo.
+
+Las estimaciones cuentan las entradas del historial y las variables por un
+tamaño fijo, así que el presupuesto es aproximado (no una medida exacta).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from .calculator import CalculatorModel
+
+
+class _SessionEntry:
+    """Modelo de una sesión, el instante de su último uso y su tamaño estimado."""
+
+    __slots__ = ('model', 'last_access', 'size')
+
+    def __init__(self, model: CalculatorModel, last_access: float, size: int):
+        self.model = model
+        self.last_access = last_access
+        self.size = size
+
+
+class SessionModelStore:
+    """
+    Caché LRU de modelos por sesión con expiración por inactividad y
+    presupuesto de memoria.
+
+    Las entradas se mantienen ordenadas por último uso, de modo que tanto la
+    expulsión LRU como la purga de sesiones inactivas solo recorren el
+    principio del diccionario.
+    """
+
+    def __init__(self, model_factory: Callable[[], CalculatorModel],
+                 max_sessions: int = 10000, idle_ttl: float = 1800.0,
+                 max_bytes: int = 0):
+        """
+        Inicializa el almacén.
+
+        Args:
+            model_factory (callable): Crea el modelo de una sesión nueva
+            max_sessions (int): Número máximo de sesiones en memoria
+            idle_ttl (float): Segundos de inactividad antes de expulsar una sesión
+            max_bytes (int): Memoria estimada máxima de todas las sesiones (0 sin límite)
+        """
+        self.model_factory = model_factory
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, _SessionEntry]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {
+            'hits': 0,
+            'misses': 0,
+            'created': 0,
+            'evicted_idle': 0,
+            'evicted_lru': 0,
+            'evicted_memory': 0
+        }
+
+    def get(self, session_id: str, create: bool = True) -> Optional[CalculatorModel]:
+        """
+        Obtiene el modelo de una sesión.
+
+        Args:
+            session_id (str): Identificador de la sesión
+            create (bool): Si se crea el modelo cuando la sesión no tiene uno
+
+        Returns:
+            CalculatorModel: Modelo de la sesión, o None si no existe y create es False
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._purge(now)
+
+            entry = self._entries.get(session_id)
+            if entry is not None:
+                entry.last_access = now
+                self._entries.move_to_end(session_id)
+                self._counters['hits'] += 1
+                return entry.model
+
+            self._counters['misses'] += 1
+            if not create:
+                return None
+
+            if len(self._entries) >= self.max_sessions:
+                self._remove_oldest('evicted_lru')
+
+            model = self.model_factory()
+            size = model.estimated_bytes()
+            self._entries[session_id] = _SessionEntry(model, now, size)
+            self._bytes += size
+            self._counters['created'] += 1
+            return model
+
+    def measure(self, session_id: str):
+        """
+        Actualiza el tamaño estimado de una sesión después de usarla y
+        expulsa las sesiones menos recientes si se supera ``max_bytes``.
+
+        La sesión medida no se expulsa: acaba de usarse.
+
+        Args:
+            session_id (str): Identificador de la sesión
+        """
+        with self._lock:
+            entry = self._entries.get(session_id)
+        if entry is None:
+            return
+
+        # La estimación toma el lock del historial: fuera del lock del almacén
+        size = entry.model.estimated_bytes()
+
+        with self._lock:
+            if self._entries.get(session_id) is not entry:
+                return
+            self._bytes += size - entry.size
+            entry.size = size
+            while self.max_bytes and self._bytes > self.max_bytes:
+                if next(iter(self._entries)) == session_id:
+                    break
+                self._remove_oldest('evicted_memory')
+
+    def discard(self, session_id: str):
+        """Elimina el modelo de una sesión."""
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+            if entry is not None:
+                self._bytes -= entry.size
+
+    def _remove_oldest(self, counter: str):
+        """Expulsa la sesión usada hace más tiempo (requiere el lock)."""
+        _, entry = self._entries.popitem(last=False)
+        self._bytes -= entry.size
+        self._counters[counter] += 1
+
+    def _purge(self, now: float):
+        """Expulsa las sesiones inactivas (requiere el lock)."""
+        deadline = now - self.idle_ttl
+        while self._entries:
+            entry = next(iter(self._entries.values()))
+            if entry.last_access > deadline:
+                break
+            self._remove_oldest('evicted_idle')
+
+    def __len__(self) -> int:
+        """Número de sesiones en memoria."""
+        return len(self._entries)
+
+    def footprint(self) -> Dict[str, object]:
+        """
+        Suma el tamaño del historial y de las variables de todas las sesiones.
+
+        Recorre todos los modelos: solo para el diagnóstico de memoria.
+        """
+        with self._lock:
+            models = [entry.model for entry in self._entries.values()]
+
+        history: Dict[str, int] = {}
+        variables = 0
+        for model in models:
+            footprint = model.footprint()
+            for key, value in footprint['history'].items():
+                history[key] = history.get(key, 0) + value
+            variables += footprint['variables']
+        return {'sessions': len(models), 'history': history, 'variables': variables}
+
+    def stats(self) -> Dict[str, int]:
+        """Obtiene el número de sesiones y los contadores del almacén."""
+        with self._lock:
+            self._purge(time.monotonic())
+            return {
+                **self._counters,
+                'sessions': len(self._entries),
+                'max_sessions': self.max_sessions,
+                'estimated_bytes': self._bytes,
+                'max_bytes': self.max_bytes
+            }
@@ -0,0 +1,508 @@
+"""
+Estadísticas - Agregados de una serie de números en una sola pasada
+Calcula recuento, suma compensada (Neumaier), media, varianza y desviación
+típica (Welford), mínimo, máximo y percentiles aproximados con memoria
+constante, leyendo la entrada de forma incremental (array JSON, NDJSON, CSV
+o un buffer contiguo de float64).
+"""
+
+import codecs
+import csv
+import io
+import json
+import math
+import sys
+from array import array
+from typing import Dict, Iterator, Optional, Sequence
+
+from .errors import ErrorCode
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: sin él, el buffer se recorre en Python
+    np = None
+
+# Percentiles calculados si la petición no indica otros
+DEFAULT_PERCENTILES = (50.0, 90.0, 95.0, 99.0)
+
+# Bytes leídos por iteración del cuerpo de la petición
+READ_CHUNK_SIZE = 64 * 1024
+
+# Longitud máxima de un valor en el array JSON
+MAX_TOKEN_LENGTH = 1024
+
+# Tipos de contenido admitidos
+MEDIA_TYPES = ('application/json', 'application/x-ndjson', 'text/csv', 'application/octet-stream')
+
+
+class StatisticsInputError(Exception):
+    """Valor no numérico (o no finito) en la posición indicada de la entrada."""
+
+    def __init__(self, position: int):
+        super().__init__(position)
+        self.position = position
+
+
+class _Buckets(dict):
+    """Buckets de un signo (clave logarítmica → recuento) con su suelo tras fusionar."""
+
+    # Clave mínima tras la primera fusión: las menores se cuentan en ella
+    floor: Optional[int] = None
+
+
+class QuantileSketch:
+    """
+    Sketch de cuantiles con error relativo acotado (al estilo de DDSketch).
+
+    Cada valor se cuenta en un bucket logarítmico de base ``gamma``; el
+    cuantil devuelto está a menos de ``relative_accuracy`` del valor real.
+    Si se supera ``max_buckets`` se fusionan los buckets de menor magnitud
+    en un suelo, de modo que la memoria está acotada sea cual sea la entrada
+    y el coste por valor es O(1) amortizado.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        """
+        Args:
+            relative_accuracy (float): Error relativo máximo de los cuantiles
+            max_buckets (int): Buckets máximos por signo
+        """
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self._positive = _Buckets()
+        self._negative = _Buckets()
+        self._zero = 0
+        self.count = 0
+
+    def add(self, value: float):
+        """Cuenta un valor."""
+        self.count += 1
+        if value > sys.float_info.min:
+            store = self._positive
+            key = math.ceil(math.log(value) / self._log_gamma)
+        elif value < -sys.float_info.min:
+            store = self._negative
+            key = math.ceil(math.log(-value) / self._log_gamma)
+        else:
+            self._zero += 1
+            return
+
+        self._count(store, key, 1)
+        if len(store) > self.max_buckets:
+            self._collapse(store)
+
+    def add_array(self, values):
+        """Cuenta un array de numpy de valores finitos (camino vectorizado)."""
+        self.count += values.size
+        self._zero += int(np.count_nonzero(np.abs(values) <= sys.float_info.min))
+        for store, magnitudes in ((self._positive, values[values > sys.float_info.min]),
+                                  (self._negative, -values[values < -sys.float_info.min])):
+            if not magnitudes.size:
+                continue
+            keys = np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64)
+            unique_keys, counts = np.unique(keys, return_counts=True)
+            for key, count in zip(unique_keys.tolist(), counts.tolist()):
+                self._count(store, key, count)
+            if len(store) > self.max_buckets:
+                self._collapse(store)
+
+    @staticmethod
+    def _count(store: _Buckets, key: int, count: int):
+        """Suma ``count`` al bucket ``key`` (o al suelo, si está por debajo)."""
+        if store.floor is not None and key < store.floor:
+            key = store.floor
+        store[key] = store.get(key, 0) + count
+
+    def _collapse(self, store: _Buckets):
+        """
+        Fusiona los buckets de menor magnitud en el suelo.
+
+        Se fusionan ``max_buckets // 16`` buckets más de los que sobran para
+        no ordenar las claves con cada bucket nuevo.
+        """
+        keys = sorted(store)
+        excess = len(keys) - self.max_buckets + self.max_buckets // 16
+        floor = keys[excess]
+        store[floor] += sum(store.pop(key) for key in keys[:excess])
+        store.floor = floor
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Obtiene el cuantil aproximado.
+
+        Args:
+            q (float): Cuantil entre 0 y 1
+
+        Returns:
+            float: Valor aproximado, o None si no hay valores
+        """
+        if not self.count:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = 0
+        # De menor a mayor: negativos de mayor magnitud, cero, positivos
+        for key in sorted(self._negative, reverse=True):
+            seen += self._negative[key]
+            if seen > rank:
+                return -self._bucket_value(key)
+        seen += self._zero
+        if seen > rank:
+            return 0.0
+        for key in sorted(self._positive):
+            seen += self._positive[key]
+            if seen > rank:
+                return self._bucket_value(key)
+        return self._bucket_value(max(self._positive)) if self._positive else 0.0
+
+    def _bucket_value(self, key: int) -> float:
+        """Valor representativo de un bucket (equidistante en error relativo)."""
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+
+class RunningStatistics:
+    """Agregados de una serie actualizados en O(1) por valor."""
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        """
+        Args:
+            relative_accuracy (float): Error relativo máximo de los percentiles
+        """
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._sum = 0.0
+        self._compensation = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def add(self, value: float):
+        """Agrega un valor (Welford para media y varianza, Neumaier para la suma)."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+        total = self._sum + value
+        if abs(self._sum) >= abs(value):
+            self._compensation += (self._sum - total) + value
+        else:
+            self._compensation += (value - total) + self._sum
+        self._sum = total
+
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.sketch.add(value)
+
+    def add_array(self, values):
+        """
+        Agrega un bloque de numpy de valores finitos.
+
+        Los agregados del bloque se calculan vectorizados y se combinan con
+        los acumulados (fórmula de Chan para la varianza).
+        """
+        size = values.size
+        if not size:
+            return
+
+        block_mean = float(values.mean())
+        block_m2 = float(np.square(values - block_mean).sum())
+        total = self.count + size
+        delta = block_mean - self.mean
+        self.mean += delta * size / total
+        self._m2 += block_m2 + delta * delta * self.count * size / total
+        self.count = total
+
+        block_sum = float(values.sum())
+        new_sum = self._sum + block_sum
+        if abs(self._sum) >= abs(block_sum):
+            self._compensation += (self._sum - new_sum) + block_sum
+        else:
+            self._compensation += (block_sum - new_sum) + self._sum
+        self._sum = new_sum
+
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.sketch.add_array(values)
+
+    @property
+    def sum(self) -> float:
+        """Suma compensada."""
+        return self._sum + self._compensation
+
+    def result(self, percentiles: Sequence[float]) -> Dict[str, object]:
+        """
+        Obtiene los agregados finales.
+
+        Args:
+            percentiles (sequence): Percentiles a estimar (0 - 100)
+
+        Returns:
+            dict: count, sum, mean, variance (muestral), stddev, min, max y
+            percentiles; 'error_code' OVERFLOW si algún agregado no es finito
+        """
+        if not self.count:
+            return {
+                "count": 0, "sum": 0.0, "mean": None, "variance": None, "stddev": None,
+                "min": None, "max": None,
+                "percentiles": {_percentile_key(p): None for p in percentiles},
+                "relative_accuracy": self.sketch.relative_accuracy
+            }
+
+        variance = self._m2 / (self.count - 1) if self.count > 1 else None
+        result = {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.mean,
+            "variance": variance,
+            "stddev": math.sqrt(variance) if variance is not None else None,
+            "min": self.min,
+            "max": self.max,
+            "percentiles": {
+                # El sketch puede salirse ligeramente del rango observado
+                _percentile_key(p): min(max(self.sketch.quantile(p / 100), self.min), self.max)
+                for p in percentiles
+            },
+            "relative_accuracy": self.sketch.relative_accuracy
+        }
+
+        if not all(math.isfinite(result[key]) for key in ('sum', 'mean')) or \
+                (variance is not None and not math.isfinite(variance)):
+            return {"error_code": ErrorCode.OVERFLOW}
+        return result
+
+
+def parse_percentiles(text: Optional[str]) -> Optional[tuple]:
+    """
+    Interpreta la lista de percentiles de la query string ('50,90,99').
+
+    Returns:
+        tuple: Percentiles, los predeterminados si no se indican, o None si no son válidos
+    """
+    if not text:
+        return DEFAULT_PERCENTILES
+    try:
+        percentiles = tuple(float(part) for part in text.split(','))
+    except ValueError:
+        return None
+    if not percentiles or len(percentiles) > 20 or not all(0 <= p <= 100 for p in percentiles):
+        return None
+    return percentiles
+
+
+def compute_statistics(stream: io.RawIOBase, media_type: str, max_values: int,
+                       percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, object]:
+    """
+    Calcula las estadísticas de un cuerpo leído de forma incremental.
+
+    Args:
+        stream: Flujo binario de la petición
+        media_type (str): Tipo de contenido (ver MEDIA_TYPES)
+        max_values (int): Número máximo de valores aceptados
+        percentiles (sequence): Percentiles a estimar
+
+    Returns:
+        dict: Agregados (ver ``RunningStatistics.result``) o 'error_code'
+    """
+    if media_type not in MEDIA_TYPES:
+        return {"error_code": ErrorCode.UNSUPPORTED_MEDIA_TYPE}
+
+    statistics = RunningStatistics()
+    try:
+        if media_type == 'application/octet-stream':
+            if not _consume_float64(stream, statistics, max_values):
+                return {"error_code": ErrorCode.TOO_MANY_VALUES, "max_values": max_values}
+        else:
+            parsers = {
+                'application/json': _iter_json_array,
+                'application/x-ndjson': _iter_ndjson,
+                'text/csv': _iter_csv
+            }
+            add = statistics.add
+            for value in parsers[media_type](stream):
+                if statistics.count >= max_values:
+                    return {"error_code": ErrorCode.TOO_MANY_VALUES, "max_values": max_values}
+                add(value)
+    except StatisticsInputError as error:
+        return {"error_code": ErrorCode.INVALID_VALUE, "position": error.position}
+
+    return statistics.result(percentiles)
+
+
+def _to_value(token, position: int) -> float:
+    """Valida un valor ya decodificado: número finito (no booleano)."""
+    if type(token) not in (int, float):
+        raise StatisticsInputError(position)
+    try:
+        value = float(token)
+    except OverflowError:
+        raise StatisticsInputError(position) from None
+    if not math.isfinite(value):
+        raise StatisticsInputError(position)
+    return value
+
+
+def _parse_number(text: str, position: int) -> float:
+    """Convierte el texto de un valor a float finito."""
+    try:
+        value = float(text)
+    except ValueError:
+        raise StatisticsInputError(position) from None
+    if not math.isfinite(value):
+        raise StatisticsInputError(position)
+    return value
+
+
+def _iter_json_array(stream) -> Iterator[float]:
+    """Recorre un array JSON plano de números sin cargarlo entero en memoria."""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    started = False
+    position = 0
+
+    while True:
+        chunk = stream.read(READ_CHUNK_SIZE)
+        final = not chunk
+        try:
+            buffer += decoder.decode(chunk, final=final)
+        except UnicodeDecodeError:
+            # Bytes que no son UTF-8: el error se atribuye al valor en curso
+            raise StatisticsInputError(position) from None
+
+        if not started:
+            buffer = buffer.lstrip()
+            if not buffer:
+                if final:
+                    raise StatisticsInputError(0)
+                continue
+            if buffer[0] != '[':
+                raise StatisticsInputError(0)
+            buffer = buffer[1:]
+            started = True
+
+        *tokens, buffer = buffer.split(',')
+        for token in tokens:
+            yield _to_value(_decode_token(token, position), position)
+            position += 1
+
+        if len(buffer) > MAX_TOKEN_LENGTH:
+            raise StatisticsInputError(position)
+        if final:
+            break
+
+    buffer = buffer.rstrip()
+    if not buffer.endswith(']'):
+        raise StatisticsInputError(position)
+    last = buffer[:-1].strip()
+    if last:
+        yield _to_value(_decode_token(last, position), position)
+    elif position:
+        # Coma final ("[1, 2,]")
+        raise StatisticsInputError(position)
+
+
+def _decode_token(token: str, position: int):
+    """Decodifica un elemento del array JSON."""
+    try:
+        return json.loads(token)
+    except ValueError:
+        raise StatisticsInputError(position) from None
+
+
+def _iter_ndjson(stream) -> Iterator[float]:
+    """Recorre un cuerpo NDJSON con un número por línea."""
+    position = 0
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            token = json.loads(line)
+        except ValueError:
+            raise StatisticsInputError(position) from None
+        yield _to_value(token, position)
+        position += 1
+
+
+def _iter_csv(stream) -> Iterator[float]:
+    """Recorre un CSV de números (una o varias columnas); admite una fila de cabecera."""
+    reader = csv.reader(io.TextIOWrapper(stream, encoding='utf-8', newline=''))
+    position = 0
+    try:
+        for row_number, row in enumerate(reader):
+            cells = [cell.strip() for cell in row if cell.strip()]
+            if row_number == 0 and cells and not _is_number(cells[0]):
+                continue
+            for cell in cells:
+                yield _parse_number(cell, position)
+                position += 1
+    except UnicodeDecodeError:
+        raise StatisticsInputError(position) from None
+
+
+def _is_number(text: str) -> bool:
+    """Indica si un texto es un número (para detectar la cabecera del CSV)."""
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
+
+
+def _consume_float64(stream, statistics: RunningStatistics, max_values: int) -> bool:
+    """
+    Camino vectorizado: agrega un buffer contiguo de float64 little-endian.
+
+    Con numpy cada bloque se procesa vectorizado; sin él, los valores se
+    recorren desde un ``array('d')`` sin pasar por texto.
+
+    Returns:
+        bool: False si el buffer supera ``max_values`` valores
+    """
+    remainder = b''
+    position = 0
+
+    while True:
+        chunk = stream.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        data = remainder + chunk
+        usable = len(data) - len(data) % 8
+        remainder = data[usable:]
+        if not usable:
+            continue
+
+        if position + usable // 8 > max_values:
+            return False
+
+        if np is not None:
+            values = np.frombuffer(data[:usable], dtype='<f8')
+            finite = np.isfinite(values)
+            if not finite.all():
+                raise StatisticsInputError(position + int(np.argmin(finite)))
+            statistics.add_array(values)
+        else:
+            values = array('d', data[:usable])
+            if sys.byteorder == 'big':
+                values.byteswap()
+            add = statistics.add
+            for offset, value in enumerate(values):
+                if not math.isfinite(value):
+                    raise StatisticsInputError(position + offset)
+                add(value)
+        position += usable // 8
+
+    if remainder:
+        # Buffer truncado: el último valor está incompleto
+        raise StatisticsInputError(position)
+    return True
+
+
+def _percentile_key(percentile: float) -> str:
+    """Nombre del percentil en la respuesta ('p50', 'p99.9')."""
+    return f"p{percentile:g}"
@@ -0,0 +1,162 @@
+"""
+Tabulación - Una operación o fórmula evaluada sobre un rango de valores
+Construye tablas (potencias, porcentajes...) en una sola petición: la
+variable recorre un rango ``start/stop/step`` o una lista, y los puntos se
+evalúan por bloques con ``evaluate_columns`` (una pasada vectorizada por
+bloque) en lugar de un cálculo por punto. Cada punto lleva su resultado o su
+código de error; un error en un punto no interrumpe la tabla.
+"""
+
+import math
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from .errors import ErrorCode
+from .variables import NAME_PATTERN, parse_formula, to_number
+from .vectorized import evaluate_columns
+
+# Puntos evaluados por pasada (y por fragmento de la respuesta)
+CHUNK_SIZE = 4096
+
+# Nombres de columna de la tabla, no válidos como variable
+RESERVED_NAMES = frozenset({'result', 'error_code'})
+
+# Tolerancia para incluir ``stop`` cuando cae en la rejilla (0.1 * 10 != 1.0)
+_STOP_TOLERANCE = 1e-9
+
+Argument = Union[float, str]
+
+
+class Tabulation:
+    """Tabla validada: operación, argumentos (la variable o constantes) y puntos."""
+
+    __slots__ = ('operation', 'variable', 'arguments', 'count', '_start', '_step', '_values')
+
+    def __init__(self, operation: str, variable: str, arguments: Tuple[Argument, ...],
+                 count: int, start: float = 0.0, step: float = 1.0,
+                 values: Optional[List[float]] = None):
+        """
+        Args:
+            operation (str): Operación del modelo
+            variable (str): Nombre de la variable que recorre el rango
+            arguments (tuple): Operandos: la variable (str) o constantes (float)
+            count (int): Número de puntos
+            start (float): Primer punto del rango (si no hay lista)
+            step (float): Paso del rango (si no hay lista)
+            values (list, optional): Puntos explícitos
+        """
+        self.operation = operation
+        self.variable = variable
+        self.arguments = arguments
+        self.count = count
+        self._start = start
+        self._step = step
+        self._values = values
+
+    def points(self, begin: int, end: int) -> List[float]:
+        """Puntos de las posiciones [begin, end)."""
+        if self._values is not None:
+            return self._values[begin:end]
+        # start + i * step en lugar de acumular el paso (sin deriva)
+        start, step = self._start, self._step
+        return [start + index * step for index in range(begin, end)]
+
+    def chunks(self, model, size: int = CHUNK_SIZE) -> Iterator[Tuple[List[float], List[Union[float, str]]]]:
+        """
+        Evalúa la tabla por bloques.
+
+        Args:
+            model (CalculatorModel): Modelo que evalúa la operación
+            size (int): Puntos por bloque
+
+        Yields:
+            tuple: (puntos, resultados o códigos de error) de cada bloque
+        """
+        for begin in range(0, self.count, size):
+            points = self.points(begin, min(begin + size, self.count))
+            columns = [points if argument == self.variable else [argument] * len(points)
+                       for argument in self.arguments]
+            yield points, evaluate_columns(model, self.operation, columns[0],
+                                           columns[1] if len(columns) > 1 else None)
+
+
+def parse_tabulation(data, model, max_points: int,
+                     variables=None) -> Union[Tabulation, Dict[str, object]]:
+    """
+    Valida una petición de tabulación.
+
+    Args:
+        data: Objeto JSON con 'formula' ('power(x, 2)') u 'operation' con
+            'num1'/'num2' (números o el nombre de la variable), 'variable'
+            (por defecto 'x') y 'range' ({start, stop, step} o lista)
+        model (CalculatorModel): Modelo que define las operaciones
+        max_points (int): Número máximo de puntos
+        variables (VariableGraph, optional): Variables de la sesión que puede
+            usar la fórmula como constantes
+
+    Returns:
+        Tabulation, o dict con 'error_code' si la petición no es válida
+    """
+    variable = data.get('variable', 'x')
+    if not isinstance(variable, str) or not NAME_PATTERN.fullmatch(variable) or variable in RESERVED_NAMES:
+        return {'error_code': ErrorCode.INVALID_NAME, 'variable': str(variable)[:64]}
+
+    if 'formula' in data:
+        parsed = parse_formula(data['formula'], model)
+        if parsed is None:
+            return {'error_code': ErrorCode.INVALID_FORMULA}
+        operation, arguments = parsed
+    else:
+        operation = data.get('operation')
+        if operation not in model.OPERATION_HANDLERS:
+            return {'error_code': ErrorCode.INVALID_OPERATION}
+        operands = ('num1',) if operation in model.UNARY_OPERATIONS else ('num1', 'num2')
+        arguments = []
+        for position, key in enumerate(operands, start=1):
+            value = data.get(key)
+            if value is None and position == 2:
+                return {'error_code': ErrorCode.MISSING_OPERAND}
+            if isinstance(value, str) and NAME_PATTERN.fullmatch(value.strip()):
+                argument = value.strip()
+            else:
+                argument = to_number(value)
+            if argument is None:
+                return {'error_code': ErrorCode.INVALID_OPERAND, 'operand': position}
+            arguments.append(argument)
+
+    if variable not in arguments:
+        return {'error_code': ErrorCode.UNUSED_VARIABLE, 'variable': variable}
+
+    # Las demás variables de la fórmula son constantes de la sesión
+    resolved = []
+    for argument in arguments:
+        if isinstance(argument, str) and argument != variable:
+            snapshot = variables.get(argument) if variables is not None else None
+            if snapshot is None or snapshot['value'] is None:
+                return {'error_code': ErrorCode.UNDEFINED_VARIABLE, 'variable': argument}
+            argument = snapshot['value']
+        resolved.append(argument)
+
+    spec = data.get('range')
+    if isinstance(spec, list):
+        if len(spec) > max_points:
+            return {'error_code': ErrorCode.TOO_MANY_POINTS, 'max_points': max_points}
+        values = [to_number(value) for value in spec]
+        if not values or None in values:
+            return {'error_code': ErrorCode.INVALID_RANGE}
+        return Tabulation(operation, variable, tuple(resolved), len(values), values=values)
+
+    if not isinstance(spec, dict):
+        return {'error_code': ErrorCode.INVALID_RANGE}
+    start, stop, step = (to_number(spec.get('start')), to_number(spec.get('stop')),
+                         to_number(spec.get('step', 1)))
+    if start is None or stop is None or not step:
+        return {'error_code': ErrorCode.INVALID_RANGE}
+
+    # El número de puntos se comprueba antes de generar ninguno
+    span = (stop - start) / step
+    if not math.isfinite(span) or span < 0:
+        return {'error_code': ErrorCode.INVALID_RANGE}
+    if span + _STOP_TOLERANCE >= max_points:
+        return {'error_code': ErrorCode.TOO_MANY_POINTS, 'max_points': max_points}
+    count = int(math.floor(span + _STOP_TOLERANCE)) + 1
+    return Tabulation(operation, variable, tuple(resolved), count, start=start, step=step)
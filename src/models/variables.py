@@ -0,0 +1,331 @@
+"""
+Variables - Variables con nombre y fórmulas con recálculo incremental
+Cada sesión puede definir entradas (``subtotal = 100``) y fórmulas sobre las
+operaciones del modelo (``tax = percentage(subtotal, 21)``). Las fórmulas
+forman un grafo de dependencias; al cambiar una variable solo se recalcula su
+subgrafo descendente, en orden topológico, y los nodos cuyo valor no cambia
+no vuelven a marcar como sucios a sus dependientes.
+"""
+
+import math
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .errors import ErrorCode
+
+# Nombre de variable: identificador de hasta 64 caracteres
+NAME_PATTERN = re.compile(r'[A-Za-z_][A-Za-z0-9_]{0,63}')
+
+# Fórmula: una operación del modelo aplicada a números o variables
+FORMULA_PATTERN = re.compile(r'\s*([a-z]+)\s*\(([^()]*)\)\s*')
+
+Argument = Union[float, str]
+
+
+class _Variable:
+    """Definición y valor actual de una variable."""
+
+    __slots__ = ('name', 'operation', 'arguments', 'value', 'error')
+
+    def __init__(self, name: str, operation: Optional[str], arguments: Tuple[Argument, ...],
+                 value: Optional[float] = None):
+        self.name = name
+        self.operation = operation
+        self.arguments = arguments
+        self.value = value
+        self.error: Optional[Dict[str, str]] = None
+
+    @property
+    def dependencies(self) -> Tuple[str, ...]:
+        """Variables de las que depende la fórmula (sin repetir)."""
+        return tuple(dict.fromkeys(arg for arg in self.arguments if isinstance(arg, str)))
+
+    @property
+    def formula(self) -> Optional[str]:
+        """Fórmula normalizada, o None si es una entrada."""
+        if self.operation is None:
+            return None
+        return f"{self.operation}({', '.join(_format_argument(arg) for arg in self.arguments)})"
+
+
+class VariableGraph:
+    """
+    Variables de una sesión y su grafo de dependencias.
+
+    ``_dependents`` guarda, para cada nombre (definido o no), las fórmulas que
+    lo usan, de modo que definir más tarde una variable referenciada
+    recalcula las fórmulas que la esperaban.
+    """
+
+    def __init__(self, model, max_variables: int = 1000):
+        """
+        Inicializa el grafo.
+
+        Args:
+            model (CalculatorModel): Modelo que evalúa las operaciones
+            max_variables (int): Número máximo de variables
+        """
+        self.model = model
+        self.max_variables = max_variables
+        self._variables: Dict[str, _Variable] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Número de variables definidas."""
+        return len(self._variables)
+
+    def set(self, name: str, value=None, formula: Optional[str] = None) -> Dict[str, object]:
+        """
+        Define o redefine una variable y recalcula sus dependientes.
+
+        Args:
+            name (str): Nombre de la variable
+            value: Valor numérico de una entrada
+            formula (str, optional): Fórmula ('operación(a, b)')
+
+        Returns:
+            dict: La variable ('name', 'value', ...) y 'recomputed' (variables
+            recalculadas, en orden), o 'error_code' si la definición no es válida
+        """
+        if not isinstance(name, str) or not NAME_PATTERN.fullmatch(name):
+            return {'error_code': ErrorCode.INVALID_NAME, 'variable': str(name)[:64]}
+
+        if formula is not None and value is None:
+            parsed = parse_formula(formula, self.model)
+            if parsed is None:
+                return {'error_code': ErrorCode.INVALID_FORMULA}
+            variable = _Variable(name, *parsed)
+        elif value is not None and formula is None:
+            number = to_number(value)
+            if number is None:
+                return {'error_code': ErrorCode.INVALID_DEFINITION}
+            variable = _Variable(name, None, (), number)
+        else:
+            return {'error_code': ErrorCode.INVALID_DEFINITION}
+
+        with self._lock:
+            previous = self._variables.get(name)
+            if previous is None and len(self._variables) >= self.max_variables:
+                return {'error_code': ErrorCode.TOO_MANY_VARIABLES, 'max_variables': self.max_variables}
+
+            cycle = self._find_cycle(name, variable.dependencies)
+            if cycle is not None:
+                return {'error_code': ErrorCode.DEPENDENCY_CYCLE, 'cycle': cycle}
+
+            if previous is not None:
+                self._unlink(previous)
+            self._variables[name] = variable
+            for dependency in variable.dependencies:
+                self._dependents.setdefault(dependency, set()).add(name)
+
+            recomputed = self._propagate(name)
+            return {**self._snapshot(variable), 'recomputed': recomputed}
+
+    def delete(self, name: str) -> Optional[List[str]]:
+        """
+        Elimina una variable; sus dependientes pasan a UNDEFINED_VARIABLE.
+
+        Returns:
+            list: Variables recalculadas, o None si no existía
+        """
+        with self._lock:
+            variable = self._variables.pop(name, None)
+            if variable is None:
+                return None
+            self._unlink(variable)
+            return self._propagate(name)
+
+    def get(self, name: str) -> Optional[Dict[str, object]]:
+        """Obtiene una variable, o None si no existe."""
+        with self._lock:
+            variable = self._variables.get(name)
+            return self._snapshot(variable) if variable is not None else None
+
+    def get_many(self, names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, object]]:
+        """
+        Obtiene varias variables (todas si ``names`` es None); las que no
+        existen se omiten.
+        """
+        with self._lock:
+            if names is None:
+                return {name: self._snapshot(variable) for name, variable in self._variables.items()}
+            return {name: self._snapshot(self._variables[name])
+                    for name in names if name in self._variables}
+
+    def _find_cycle(self, name: str, dependencies: Tuple[str, ...]) -> Optional[List[str]]:
+        """Camino name → ... → name que crearía la nueva definición, o None (requiere el lock)."""
+        parents: Dict[str, Optional[str]] = {}
+        stack = []
+        for dependency in dependencies:
+            if dependency not in parents:
+                parents[dependency] = None
+                stack.append(dependency)
+
+        while stack:
+            current = stack.pop()
+            if current == name:
+                path = [current]
+                while parents[current] is not None:
+                    current = parents[current]
+                    path.append(current)
+                return [name] + path[::-1]
+            variable = self._variables.get(current)
+            if variable is None:
+                continue
+            for dependency in variable.dependencies:
+                if dependency not in parents:
+                    parents[dependency] = current
+                    stack.append(dependency)
+        return None
+
+    def _unlink(self, variable: _Variable):
+        """Quita las aristas de las dependencias de una variable (requiere el lock)."""
+        for dependency in variable.dependencies:
+            dependents = self._dependents.get(dependency)
+            if dependents is not None:
+                dependents.discard(variable.name)
+                if not dependents:
+                    del self._dependents[dependency]
+
+    def _downstream_order(self, name: str) -> List[str]:
+        """Subgrafo descendente de ``name`` en orden topológico (requiere el lock)."""
+        order = []
+        visited = {name}
+        stack = [(name, iter(self._dependents.get(name, ())))]
+        while stack:
+            current, children = stack[-1]
+            for child in children:
+                if child not in visited:
+                    visited.add(child)
+                    stack.append((child, iter(self._dependents.get(child, ()))))
+                    break
+            else:
+                stack.pop()
+                order.append(current)
+        order.reverse()
+        return order
+
+    def _propagate(self, name: str) -> List[str]:
+        """
+        Recalcula ``name`` y los dependientes afectados (requiere el lock).
+
+        Un dependiente solo se evalúa si alguna de sus dependencias ha
+        cambiado de valor (está sucia).
+
+        Returns:
+            list: Variables evaluadas, en orden
+        """
+        dirty = {name}
+        recomputed = []
+        for current in self._downstream_order(name):
+            variable = self._variables.get(current)
+            if variable is None:
+                continue
+            if current != name and dirty.isdisjoint(variable.dependencies):
+                continue
+
+            before = (variable.value, variable.error)
+            if variable.operation is not None:
+                self._evaluate(variable)
+            recomputed.append(current)
+            if current == name or (variable.value, variable.error) != before:
+                dirty.add(current)
+        return recomputed
+
+    def _evaluate(self, variable: _Variable):
+        """Evalúa una fórmula con los valores actuales de sus dependencias."""
+        operands = []
+        for argument in variable.arguments:
+            if isinstance(argument, str):
+                dependency = self._variables.get(argument)
+                if dependency is None:
+                    variable.value = None
+                    variable.error = {'error_code': ErrorCode.UNDEFINED_VARIABLE, 'variable': argument}
+                    return
+                if dependency.error is not None:
+                    # El error de origen se propaga tal cual
+                    variable.value = None
+                    variable.error = dependency.error
+                    return
+                argument = dependency.value
+            operands.append(argument)
+
+        num2 = operands[1] if len(operands) > 1 else None
+        result = self.model.perform_calculation(operands[0], num2, variable.operation,
+                                                record_history=False)
+        if 'error_code' in result:
+            variable.value = None
+            variable.error = result
+        else:
+            variable.value = result['result']
+            variable.error = None
+
+    @staticmethod
+    def _snapshot(variable: _Variable) -> Dict[str, object]:
+        """Representación de una variable (con 'error_code' si su valor es un error)."""
+        return {
+            'name': variable.name,
+            'value': variable.value,
+            'formula': variable.formula,
+            'depends_on': list(variable.dependencies),
+            **(variable.error or {})
+        }
+
+
+def parse_formula(formula, model) -> Optional[Tuple[str, Tuple[Argument, ...]]]:
+    """
+    Interpreta 'operación(a, b)' con números o nombres de variable como argumentos.
+
+    Args:
+        formula: Texto de la fórmula
+        model (CalculatorModel): Modelo que define las operaciones float
+
+    Returns:
+        tuple: (operación, argumentos) con floats y nombres, o None si no es válida
+    """
+    if not isinstance(formula, str):
+        return None
+    match = FORMULA_PATTERN.fullmatch(formula)
+    if match is None:
+        return None
+
+    # Las variables guardan floats: las operaciones enteras no admiten fórmulas
+    operation = match.group(1)
+    if operation not in model.OPERATION_HANDLERS:
+        return None
+
+    arguments = []
+    for token in match.group(2).split(','):
+        token = token.strip()
+        if NAME_PATTERN.fullmatch(token):
+            arguments.append(token)
+            continue
+        number = to_number(token)
+        if number is None:
+            return None
+        arguments.append(number)
+
+    arity = 1 if operation in model.UNARY_OPERATIONS else 2
+    if len(arguments) != arity:
+        return None
+    return operation, tuple(arguments)
+
+
+def _format_argument(argument: Argument) -> str:
+    """Formatea un argumento de fórmula (los enteros sin '.0')."""
+    if isinstance(argument, str):
+        return argument
+    return str(int(argument)) if argument.is_integer() and abs(argument) < 2 ** 53 else repr(argument)
+
+
+def to_number(value) -> Optional[float]:
+    """Convierte un valor de entrada a float finito, o None si no es válido."""
+    if isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return number if math.isfinite(number) else None
@@ -0,0 +1,82 @@
+"""
+Evaluación Vectorizada - Una operación del modelo sobre columnas de operandos
+Evalúa muchos puntos de una misma operación en una sola pasada (numpy si está
+instalado, o funciones nativas sobre listas) con la semántica de
+CalculatorModel: los puntos cuyo resultado no es finito (división por cero,
+raíz de un negativo, desbordamiento) se reevalúan con el modelo para obtener
+su código de error exacto.
+"""
+
+import math
+import operator
+from typing import List, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: se usan las funciones nativas
+    np = None
+
+
+def _native_divide(a: float, b: float) -> float:
+    return a / b if b else math.nan
+
+
+def _native_power(a: float, b: float) -> float:
+    try:
+        return math.pow(a, b)
+    except (OverflowError, ValueError):
+        return math.nan
+
+
+def _native_sqrt(a: float) -> float:
+    return math.sqrt(a) if a >= 0 else math.nan
+
+
+# Operaciones con camino vectorizado: (función nativa por elemento, función
+# sobre arrays de numpy o None). Los casos de error dan un resultado no
+# finito. power no tiene versión numpy: math.pow y numpy pueden diferir en el
+# último bit, así que se evalúa siempre con math.pow como el modelo.
+VECTOR_KERNELS = {
+    'add': (operator.add, operator.add),
+    'subtract': (operator.sub, operator.sub),
+    'multiply': (operator.mul, operator.mul),
+    'divide': (_native_divide, operator.truediv),
+    'power': (_native_power, None),
+    'sqrt': (_native_sqrt, lambda a: np.sqrt(a)),
+    'percentage': (lambda a, b: a * b / 100, lambda a, b: a * b / 100)
+}
+
+
+def evaluate_columns(model, operation: str, num1: Sequence[float],
+                     num2: Optional[Sequence[float]] = None) -> List[Union[float, str]]:
+    """
+    Evalúa una operación float sobre columnas de operandos, sin historial.
+
+    Args:
+        model (CalculatorModel): Modelo con la semántica de referencia
+        operation (str): Operación válida
+        num1 (sequence): Primeros operandos (floats finitos)
+        num2 (sequence, optional): Segundos operandos (None si es unaria)
+
+    Returns:
+        list: Por cada punto, el resultado (float) o el código de error (str),
+        como devuelven los manejadores del modelo
+    """
+    kernels = VECTOR_KERNELS.get(operation)
+    if kernels is None:
+        values = [math.nan] * len(num1)
+    else:
+        native, vectorized = kernels
+        if np is not None and vectorized is not None:
+            with np.errstate(all='ignore'):
+                arrays = (np.array(num1),) if num2 is None else (np.array(num1), np.array(num2))
+                values = vectorized(*arrays).tolist()
+        else:
+            values = list(map(native, num1)) if num2 is None else list(map(native, num1, num2))
+
+    for index, value in enumerate(values):
+        if not math.isfinite(value):
+            outcome = model.perform_calculation(num1[index], None if num2 is None else num2[index],
+                                                operation, record_history=False)
+            values[index] = outcome['result'] if 'result' in outcome else outcome['error_code']
+    return values
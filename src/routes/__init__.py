@@ -3,9 +3,41 @@ Módulo de Rutas - Define y configura todas las rutas de la aplicación
 Sigue el patrón Modelo-Vista-Controlador (MVC)
 """
 
-from flask import Blueprint, render_template, request, jsonify, abort
+from flask import (
+    Blueprint, render_template, request, jsonify, abort, current_app, redirect, url_for, g, session,
+    stream_with_context, Response
+)
+import hmac
+import json
+import secrets
+from urllib.parse import urlencode
 from ..models.calculator import CalculatorModel
-from typing import Dict, Any
+from ..models.aggregates import HistoryAggregates
+from ..models.history import parse_history_filters
+from ..models.variables import VariableGraph
+from ..models.tabulate import Tabulation, parse_tabulation
+from ..models.sessions import SessionModelStore
+from ..models.errors import ErrorCode, TRANSIENT_ERRORS, render_error, error_message
+from ..models.statistics import compute_statistics, parse_percentiles
+from ..models.precision import PRECISION_MODES, format_exact
+from ..utils.http_cache import ResponseCache, json_bytes, compute_etag
+from ..utils.idempotency import IdempotencyCache, idempotent
+from ..utils.tracing import span
+from typing import Dict, Any, Iterator, Optional
+
+# Cabeceras de caché para la forma GET de /calculate: las operaciones son
+# funciones puras, así que un mismo cálculo siempre produce la misma respuesta
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+INVALID_INPUT_CACHE_CONTROL = 'public, max-age=300'
+# Con historial la respuesta depende de la sesión (y puede llevar Set-Cookie)
+PRIVATE_CACHE_CONTROL = 'private, no-store'
+
+# Cuerpo de GET /history para sesiones sin historial
+EMPTY_HISTORY_BODY = b'{"history":[]}\n'
+
+# Segundos que el cliente debe esperar antes de repetir un cálculo que
+# falló por carga del servidor (TIMEOUT, BUSY)
+TRANSIENT_RETRY_AFTER = '1'
 
 
 def create_routes() -> Blueprint:
@@ -21,111 +53,640 @@ def create_routes() -> Blueprint:
     # Crear instancia del modelo
     calculator_model = CalculatorModel()
 
+    # Respuestas que no cambian entre peticiones: se generan una sola vez
+    response_cache = ResponseCache()
+    response_cache.register(
+        'index',
+        lambda: render_template('index.html'),
+        'text/html'
+    )
+    response_cache.register(
+        'operations',
+        lambda: json_bytes({"operations": calculator_model.get_operation_info()}),
+        'application/json'
+    )
+    response_cache.register(
+        'health',
+        lambda: json_bytes({
+            "status": "healthy",
+            "service": "Calculator Web API",
+            "version": "2.0.0",
+            "model": "MVC Architecture"
+        }),
+        'application/json'
+    )
+    response_cache.register(
+        'api_info',
+        lambda: json_bytes(_build_api_info()),
+        'application/json'
+    )
+
+    @main_blueprint.record_once
+    def register_extension(state):
+        """Expone el modelo y la caché de respuestas a nivel de aplicación."""
+        idempotency_cache = IdempotencyCache(
+            max_entries=state.app.config.get('IDEMPOTENCY_MAX_ENTRIES', 10000),
+            ttl=state.app.config.get('IDEMPOTENCY_TTL', 300)
+        )
+        # Cada sesión tiene su propio historial; comparte el pool de procesos
+        session_models = SessionModelStore(
+            lambda: CalculatorModel(calculator_model.offload_executor,
+                                    calculator_model.offload_cost_threshold),
+            max_sessions=state.app.config.get('SESSION_MAX_MODELS', 10000),
+            idle_ttl=state.app.config.get('SESSION_IDLE_TTL', 1800),
+            max_bytes=state.app.config.get('SESSION_MAX_BYTES', 0)
+        )
+        state.app.extensions['calculator'] = {
+            'model': calculator_model,
+            'sessions': session_models,
+            'responses': response_cache,
+            'idempotency': idempotency_cache,
+            # Proveedores de métricas expuestos en GET /metrics
+            'metrics': {
+                'responses': response_cache.stats,
+                'idempotency': idempotency_cache.stats,
+                'sessions': session_models.stats
+            }
+        }
+
+    def get_idempotency_cache() -> IdempotencyCache:
+        """Obtiene la caché de idempotencia de la aplicación actual."""
+        return current_app.extensions['calculator']['idempotency']
+
+    def get_session_id(create: bool = True) -> Optional[str]:
+        """
+        Obtiene el identificador de la sesión actual (cookie de sesión firmada).
+
+        Args:
+            create (bool): Si se asigna un identificador nuevo cuando no existe
+
+        Returns:
+            str: Identificador de la sesión, o None si no existe y create es False
+        """
+        session_id = session.get('sid')
+        if session_id is None and create:
+            session_id = session['sid'] = secrets.token_urlsafe(16)
+        return session_id
+
+    def get_idempotency_scope() -> str:
+        """
+        Obtiene el ámbito de las claves de idempotencia de la petición actual.
+
+        Es la sesión del cliente o, si la petición no trae cookie de sesión, su
+        dirección: un cliente cuya primera respuesta (con la cookie) se perdió
+        reintenta sin cookie y debe encontrar la respuesta guardada, no una
+        sesión recién creada.
+
+        Returns:
+            str: Ámbito de las claves
+        """
+        session_id = get_session_id(create=False)
+        if session_id is not None:
+            return f'sesion:{session_id}'
+        return f'cliente:{request.remote_addr}'
+
+    def adopt_idempotency_scope(scope: str):
+        """Une al cliente a la sesión creada por la ejecución que se le repite."""
+        if scope.startswith('sesion:'):
+            session['sid'] = scope[len('sesion:'):]
+
+    def get_session_model(create: bool = True) -> Optional[CalculatorModel]:
+        """
+        Obtiene el modelo (y por tanto el historial) de la sesión actual.
+
+        Args:
+            create (bool): Si se crea la sesión y su modelo cuando no existen
+
+        Returns:
+            CalculatorModel: Modelo de la sesión, o None si no existe y create es False
+        """
+        session_id = get_session_id(create)
+        if session_id is None:
+            return None
+        model = current_app.extensions['calculator']['sessions'].get(session_id, create)
+        if model is not None:
+            # Su tamaño se vuelve a estimar al terminar la petición
+            g.session_model_id = session_id
+        return model
+
+    @main_blueprint.after_request
+    def measure_session(response):
+        """Actualiza la memoria estimada de la sesión usada en la petición (SESSION_MAX_BYTES)."""
+        session_id = g.get('session_model_id')
+        if session_id is not None:
+            current_app.extensions['calculator']['sessions'].measure(session_id)
+        return response
+
+    def get_session_variables(create: bool = True) -> Optional[VariableGraph]:
+        """
+        Obtiene las variables de la sesión actual.
+
+        Args:
+            create (bool): Si se crean la sesión y sus variables cuando no existen
+
+        Returns:
+            VariableGraph: Variables de la sesión, o None si no existen y create es False
+        """
+        model = get_session_model(create)
+        if model is None:
+            return None
+        if model.variables is None and create:
+            model.variables = VariableGraph(
+                model, current_app.config.get('VARIABLES_MAX_PER_SESSION', 1000))
+        return model.variables
+
+    def encode_history_entry(item: Dict[str, Any]) -> bytes:
+        """Serializa una entrada del historial como ``jsonify`` (los errores con su mensaje)."""
+        if item['is_error']:
+            item = dict(item, expression=error_message(item))
+        return current_app.json.dumps(item, separators=(',', ':')).encode('utf-8')
+
+    def render_variable(variable: Dict[str, Any]) -> Dict[str, Any]:
+        """Añade el mensaje de error a una variable cuyo valor es un error."""
+        return render_error(variable) if 'error_code' in variable else variable
+
     @main_blueprint.route('/')
     def index():
         """Ruta principal que renderiza la interfaz."""
-        return render_template('index.html')
+        return response_cache.respond('index')
 
     @main_blueprint.route('/favicon.ico')
     def favicon():
         """Ruta para favicon.ico - devuelve 204 No Content para evitar errores 404."""
         return '', 204
 
+    def run_calculation(data, model: CalculatorModel) -> tuple:
+        """
+        Valida y ejecuta un cálculo recibido como JSON.
+
+        Args:
+            data: Objeto JSON con 'num1', 'num2' (opcional), 'num3' (solo
+                modpow) y 'operation'
+            model (CalculatorModel): Modelo de la sesión que registra el historial
+
+        Returns:
+            tuple: (cuerpo de la respuesta, código de estado HTTP); 503 si
+            el servidor estaba ocupado (ver ``TRANSIENT_ERRORS``)
+        """
+        if not isinstance(data, dict) or not data:
+            return {"error": "Error: Datos JSON requeridos"}, 400
+
+        # Validar campos requeridos
+        if 'num1' not in data or 'operation' not in data:
+            return {"error": "Error: Campos 'num1' y 'operation' son requeridos"}, 400
+
+        # Para el log de acceso estructurado
+        g.operation = data['operation']
+
+        # Validar inputs usando el modelo
+        validation_result = calculator_model.validate_inputs(
+            data['num1'],
+            data.get('num2'),
+            data['operation'],
+            data.get('precision', 'float'),
+            data.get('num3')
+        )
+
+        if 'error_code' in validation_result:
+            return render_error(validation_result), 400
+
+        # Realizar el cálculo
+        result = model.perform_calculation(
+            validation_result['num1'],
+            validation_result['num2'],
+            validation_result['operation'],
+            precision=validation_result['precision'],
+            num3=validation_result.get('num3')
+        )
+
+        if 'error_code' in result:
+            return render_error(result), 503 if result['error_code'] in TRANSIENT_ERRORS else 200
+
+        return result, 200
+
+    def no_store(response: Response, retry: bool = False) -> Response:
+        """
+        Marca una respuesta que no debe guardarse en cachés ni en la caché
+        de idempotencia (contiene errores transitorios).
+
+        Args:
+            response (Response): Respuesta a marcar
+            retry (bool): Si se indica cuándo repetir la petición (503)
+
+        Returns:
+            Response: La misma respuesta
+        """
+        response.headers['Cache-Control'] = 'no-store'
+        if retry:
+            response.headers['Retry-After'] = TRANSIENT_RETRY_AFTER
+        return response
+
     @main_blueprint.route('/calculate', methods=['POST'])
+    @idempotent(get_idempotency_cache, scope=get_idempotency_scope,
+                adopt_scope=adopt_idempotency_scope)
     def calculate():
         """Endpoint para realizar cálculos."""
         try:
             # Obtener datos del request
             data = request.get_json()
 
-            if not data:
-                return jsonify({"error": "Error: Datos JSON requeridos"}), 400
+            result, status_code = run_calculation(data, get_session_model())
+            with span('jsonify'):
+                response = jsonify(result)
+            response.status_code = status_code
+            return no_store(response, retry=True) if status_code == 503 else response
 
-            # Validar campos requeridos
-            if 'num1' not in data or 'operation' not in data:
-                return jsonify({"error": "Error: Campos 'num1' y 'operation' son requeridos"}), 400
+        except Exception as e:
+            return jsonify({"error": "Error interno del servidor"}), 500
 
-            # Validar inputs usando el modelo
-            validation_result = calculator_model.validate_inputs(
-                data['num1'],
-                data.get('num2'),
-                data['operation']
-            )
+    @main_blueprint.route('/calculate/batch', methods=['POST'])
+    @idempotent(get_idempotency_cache, scope=get_idempotency_scope,
+                adopt_scope=adopt_idempotency_scope)
+    def calculate_batch():
+        """
+        Realiza varios cálculos en una sola petición.
 
-            if 'error' in validation_result:
-                return jsonify(validation_result), 400
+        Cada elemento se valida y registra en el historial por separado; la
+        respuesta contiene un resultado (con su código de estado) por elemento,
+        en el mismo orden.
+        """
+        try:
+            data = request.get_json()
+            calculations = data.get('calculations') if isinstance(data, dict) else None
+
+            if not isinstance(calculations, list):
+                return jsonify({"error": "Error: Se requiere una lista 'calculations'"}), 400
+
+            max_items = current_app.config.get('CALCULATE_BATCH_MAX_ITEMS', 100)
+            if len(calculations) > max_items:
+                return jsonify({"error": f"Error: Máximo {max_items} cálculos por lote"}), 400
 
-            # Realizar el cálculo
-            result = calculator_model.perform_calculation(
-                validation_result['num1'],
-                validation_result['num2'],
-                validation_result['operation']
-            )
+            model = get_session_model()
+            results = []
+            for item in calculations:
+                result, status_code = run_calculation(item, model)
+                results.append(dict(result, status=status_code))
 
-            return jsonify(result), 200
+            response = jsonify({"results": results})
+            # Un elemento transitorio no debe repetirse al reintentar el lote
+            if any(result['status'] == 503 for result in results):
+                no_store(response)
+            return response
 
         except Exception as e:
             return jsonify({"error": "Error interno del servidor"}), 500
 
+    @main_blueprint.route('/calculate', methods=['GET'])
+    def calculate_cacheable():
+        """
+        Forma cacheable de /calculate mediante parámetros de consulta.
+
+        Los parámetros se canonicalizan (orden fijo y números normalizados)
+        para que cada cálculo tenga una única URL y las cachés intermedias
+        puedan servir las repeticiones sin llegar al worker.
+        """
+        # Werkzeug decodifica request.args como UTF-8 estricto
+        try:
+            query_string = request.query_string.decode('utf-8')
+        except UnicodeDecodeError:
+            response = jsonify({"error": "Error: Parámetros de consulta no válidos (UTF-8)"})
+            response.status_code = 400
+            response.headers['Cache-Control'] = INVALID_INPUT_CACHE_CONTROL
+            return response
+
+        args = request.args
+
+        if 'num1' not in args or 'operation' not in args:
+            response = jsonify({"error": "Error: Parámetros 'num1' y 'operation' son requeridos"})
+            response.status_code = 400
+            response.headers['Cache-Control'] = INVALID_INPUT_CACHE_CONTROL
+            return response
+
+        validation_result = calculator_model.validate_inputs(
+            args['num1'],
+            args.get('num2'),
+            args['operation'],
+            args.get('precision', 'float'),
+            args.get('num3')
+        )
+
+        if 'error_code' in validation_result:
+            response = jsonify(render_error(validation_result))
+            response.status_code = 400
+            response.headers['Cache-Control'] = INVALID_INPUT_CACHE_CONTROL
+            return response
+
+        # Redirigir a la URL canónica para no fragmentar la caché
+        canonical_query = _canonical_calculation_query(validation_result)
+        if query_string != canonical_query:
+            response = redirect(f"{url_for('.calculate_cacheable')}?{canonical_query}", code=301)
+            response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+            return response
+
+        # Por defecto no se registra en el historial: un acierto de caché
+        # nunca llega aquí, así que aciertos y fallos se comportan igual.
+        # Sin historial tampoco se toca la sesión (evita "Vary: Cookie")
+        record_history = current_app.config.get('CALCULATE_GET_RECORD_HISTORY', False)
+        model = get_session_model() if record_history else calculator_model
+        result = model.perform_calculation(
+            validation_result['num1'],
+            validation_result['num2'],
+            validation_result['operation'],
+            record_history=record_history,
+            precision=validation_result['precision'],
+            num3=validation_result.get('num3')
+        )
+
+        # Solo los resultados y errores matemáticos son deterministas; un
+        # error por carga del servidor no debe quedar en ninguna caché
+        if result.get('error_code') in TRANSIENT_ERRORS:
+            response = jsonify(render_error(result))
+            response.status_code = 503
+            return no_store(response, retry=True)
+
+        response = jsonify(render_error(result) if 'error_code' in result else result)
+        # Una caché compartida no debe guardar (ni repetir a otros usuarios)
+        # una respuesta que registra historial o asigna la cookie de sesión
+        if record_history or session.modified:
+            response.headers['Cache-Control'] = PRIVATE_CACHE_CONTROL
+            return response
+
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        response.set_etag(compute_etag(response.get_data()))
+        return response.make_conditional(request)
+
+    @main_blueprint.route('/statistics', methods=['POST'])
+    def statistics():
+        """
+        Calcula estadísticas de una serie de números en una sola pasada.
+
+        El cuerpo puede ser un array JSON, NDJSON (un número por línea), CSV o
+        un buffer de float64 little-endian (application/octet-stream); se lee
+        de forma incremental, con memoria constante.
+        """
+        g.operation = 'statistics'
+
+        percentiles = parse_percentiles(request.args.get('percentiles'))
+        if percentiles is None:
+            return jsonify(render_error({"error_code": ErrorCode.INVALID_PERCENTILE})), 400
+
+        result = compute_statistics(
+            request.stream,
+            request.mimetype,
+            max_values=current_app.config.get('STATISTICS_MAX_VALUES', 10_000_000),
+            percentiles=percentiles
+        )
+
+        if 'error_code' in result:
+            status_code = 415 if result['error_code'] == ErrorCode.UNSUPPORTED_MEDIA_TYPE else 400
+            return jsonify(render_error(result)), status_code
+
+        return jsonify(result), 200
+
+    @main_blueprint.route('/tabulate', methods=['POST'])
+    def tabulate():
+        """
+        Evalúa una operación o fórmula sobre un rango de valores.
+
+        La tabla se evalúa por bloques y se envía en streaming como JSON o
+        CSV (``?format=csv`` o ``Accept: text/csv``); los puntos con error
+        llevan su código en lugar del resultado.
+        """
+        g.operation = 'tabulate'
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or not data:
+            return jsonify({"error": "Error: Datos JSON requeridos"}), 400
+
+        table = parse_tabulation(
+            data,
+            calculator_model,
+            max_points=current_app.config.get('TABULATE_MAX_POINTS', 100_000),
+            variables=get_session_variables(create=False)
+        )
+        if not isinstance(table, Tabulation):
+            return jsonify(render_error(table)), 400
+
+        output = request.args.get('format')
+        if output is None:
+            best = request.accept_mimetypes.best_match(('application/json', 'text/csv'))
+            output = 'csv' if best == 'text/csv' else 'json'
+        if output == 'csv':
+            body, mimetype = _tabulation_csv(table, calculator_model), 'text/csv'
+        elif output == 'json':
+            body, mimetype = _tabulation_json(table, calculator_model), 'application/json'
+        else:
+            return jsonify({"error": "Error: Formato no válido (use 'json' o 'csv')"}), 400
+
+        # El contexto se mantiene durante el streaming (admisión, trazas)
+        return current_app.response_class(stream_with_context(body), mimetype=mimetype)
+
     @main_blueprint.route('/history', methods=['GET'])
     def get_history():
-        """Obtiene el historial de operaciones."""
+        """
+        Obtiene el historial de operaciones de la sesión actual.
+
+        Filtros opcionales: operation, errors_only, from/to (ISO 8601 o epoch) y
+        limit (las N entradas más recientes que cumplan el resto).
+        """
+        filters = parse_history_filters(request.args, CalculatorModel.VALID_OPERATIONS)
+        if 'error_code' in filters:
+            return jsonify(render_error(filters)), 400
+
         try:
-            history = calculator_model.get_history()
-            return jsonify({"history": history}), 200
+            model = get_session_model(create=False)
+            if model is None:
+                body = EMPTY_HISTORY_BODY
+            else:
+                # Cada entrada se serializa una vez; las lecturas unen los fragmentos cacheados
+                body = model.get_history_json(encode_history_entry, **filters)
+            return current_app.response_class(body, mimetype='application/json')
         except Exception as e:
             return jsonify({"error": "Error al obtener el historial"}), 500
 
+    @main_blueprint.route('/history/stats', methods=['GET'])
+    def get_history_stats():
+        """Obtiene los agregados del historial de la sesión actual (sin recorrerlo)."""
+        try:
+            model = get_session_model(create=False)
+            stats = model.get_history_stats() if model is not None else HistoryAggregates().snapshot()
+            return jsonify(stats), 200
+        except Exception as e:
+            return jsonify({"error": "Error al obtener las estadísticas del historial"}), 500
+
     @main_blueprint.route('/history', methods=['DELETE'])
     def clear_history():
-        """Limpia el historial de operaciones."""
+        """Limpia el historial de operaciones de la sesión actual."""
         try:
-            calculator_model.clear_history()
+            model = get_session_model(create=False)
+            if model is not None:
+                model.clear_history()
             return jsonify({"message": "Historial limpiado correctamente"}), 200
         except Exception as e:
             return jsonify({"error": "Error al limpiar el historial"}), 500
 
+    @main_blueprint.route('/variables', methods=['GET'])
+    def get_variables():
+        """
+        Obtiene las variables de la sesión actual.
+
+        Con ?names=a,b solo devuelve esas variables y lista en 'missing' las
+        que no existen.
+        """
+        try:
+            variables = get_session_variables(create=False)
+            names = request.args.get('names')
+            requested = [name.strip() for name in names.split(',') if name.strip()] if names else None
+
+            found = variables.get_many(requested) if variables is not None else {}
+            body = {"variables": {name: render_variable(item) for name, item in found.items()}}
+            if requested is not None:
+                body["missing"] = [name for name in requested if name not in found]
+            return jsonify(body), 200
+        except Exception as e:
+            return jsonify({"error": "Error al obtener las variables"}), 500
+
+    @main_blueprint.route('/variables/<name>', methods=['GET'])
+    def get_variable(name: str):
+        """Obtiene una variable de la sesión actual."""
+        try:
+            variables = get_session_variables(create=False)
+            variable = variables.get(name) if variables is not None else None
+            if variable is None:
+                return jsonify(render_error({'error_code': ErrorCode.UNDEFINED_VARIABLE,
+                                             'variable': name})), 404
+            return jsonify(render_variable(variable)), 200
+        except Exception as e:
+            return jsonify({"error": "Error al obtener la variable"}), 500
+
+    @main_blueprint.route('/variables/<name>', methods=['PUT'])
+    def set_variable(name: str):
+        """
+        Define una entrada ({"value": 100}) o una fórmula
+        ({"formula": "percentage(subtotal, 21)"}) y recalcula sus dependientes.
+        """
+        try:
+            data = request.get_json(silent=True)
+            if not isinstance(data, dict):
+                return jsonify({"error": "Error: Datos JSON requeridos"}), 400
+
+            result = get_session_variables().set(name, data.get('value'), data.get('formula'))
+            if 'recomputed' not in result:
+                return jsonify(render_error(result)), 400
+            return jsonify(render_variable(result)), 200
+        except Exception as e:
+            return jsonify({"error": "Error interno del servidor"}), 500
+
+    @main_blueprint.route('/variables/<name>', methods=['DELETE'])
+    def delete_variable(name: str):
+        """Elimina una variable; las fórmulas que la usan pasan a error."""
+        try:
+            variables = get_session_variables(create=False)
+            recomputed = variables.delete(name) if variables is not None else None
+            if recomputed is None:
+                return jsonify(render_error({'error_code': ErrorCode.UNDEFINED_VARIABLE,
+                                             'variable': name})), 404
+            return jsonify({"message": "Variable eliminada correctamente",
+                            "recomputed": recomputed}), 200
+        except Exception as e:
+            return jsonify({"error": "Error al eliminar la variable"}), 500
+
     @main_blueprint.route('/operations', methods=['GET'])
     def get_operations():
         """Obtiene información sobre las operaciones disponibles."""
         try:
-            operations_info = calculator_model.get_operation_info()
-            return jsonify({"operations": operations_info}), 200
+            return response_cache.respond('operations')
         except Exception as e:
             return jsonify({"error": "Error al obtener información de operaciones"}), 500
 
     @main_blueprint.route('/health')
     def health_check():
         """Endpoint de verificación de salud."""
-        return jsonify({
-            "status": "healthy",
-            "service": "Calculator Web API",
-            "version": "2.0.0",
-            "model": "MVC Architecture"
-        }), 200
+        return response_cache.respond('health')
+
+    @main_blueprint.route('/ready')
+    def readiness_check():
+        """
+        Endpoint de preparación: 503 hasta que termina el calentamiento.
+
+        A diferencia de /health (el proceso está vivo), indica si el worker
+        ya puede recibir tráfico sin pagar el arranque en frío.
+        """
+        warmup = current_app.extensions['calculator'].get('warmup')
+        if warmup is None:
+            return jsonify({"status": "ready"}), 200
+
+        ready = warmup.ready
+        response = jsonify({"status": "ready" if ready else "warming_up", "warmup": warmup.stats()})
+        response.status_code = 200 if ready else 503
+        response.headers['Cache-Control'] = 'no-store'
+        if not ready:
+            response.headers['Retry-After'] = '1'
+        return response
 
     @main_blueprint.route('/api/info')
     def api_info():
         """Información sobre la API."""
-        return jsonify({
-            "name": "Calculator Web API",
-            "description": "API para calculadora web con arquitectura MVC",
-            "version": "2.0.0",
-            "endpoints": {
-                "GET /": "Interfaz web de la calculadora",
-                "GET /favicon.ico": "Favicon (204 No Content)",
-                "POST /calculate": "Realizar cálculos matemáticos",
-                "GET /history": "Obtener historial de operaciones",
-                "DELETE /history": "Limpiar historial",
-                "GET /operations": "Información de operaciones disponibles",
-                "GET /health": "Verificación de salud del servicio",
-                "GET /api/info": "Información de la API"
-            },
-            "supported_operations": [
-                "add", "subtract", "multiply", "divide",
-                "power", "sqrt", "percentage"
-            ]
-        }), 200
+        return response_cache.respond('api_info')
+
+    @main_blueprint.route('/metrics')
+    def metrics():
+        """Métricas internas de los componentes de la aplicación."""
+        providers = current_app.extensions['calculator']['metrics']
+        return jsonify({name: provider() for name, provider in providers.items()}), 200
+
+    def debug_access_denied() -> Optional[Response]:
+        """
+        Comprueba el acceso a los endpoints de diagnóstico.
+
+        Deshabilitados (DEBUG_MEMORY_ENABLED) responden 404, como si no
+        existieran; habilitados exigen siempre la cabecera X-Debug-Token con
+        DEBUG_MEMORY_TOKEN (sin token configurado se deniega todo acceso: la
+        dirección local no es fiable detrás de un proxy inverso).
+
+        Returns:
+            Response: Respuesta de rechazo, o None si el acceso está permitido
+        """
+        if not current_app.config.get('DEBUG_MEMORY_ENABLED'):
+            abort(404)
+        token = current_app.config.get('DEBUG_MEMORY_TOKEN')
+        if token and hmac.compare_digest(request.headers.get('X-Debug-Token', '').encode('utf-8'),
+                                         token.encode('utf-8')):
+            return None
+        response = jsonify({"error": "Acceso denegado", "status_code": 403})
+        response.status_code = 403
+        return response
+
+    @main_blueprint.route('/debug/memory', methods=['GET', 'POST'])
+    def debug_memory():
+        """
+        Diagnóstico de memoria del worker.
+
+        GET devuelve RSS, GC, estado de tracemalloc, tamaño de las
+        estructuras del modelo y muestras recientes (``?types=20`` añade los
+        tipos de objeto más numerosos). POST ejecuta una acción: arrancar o
+        detener tracemalloc, tomar snapshots, consultar sus puntos de
+        asignación principales o la diferencia entre dos.
+        """
+        denied = debug_access_denied()
+        if denied is not None:
+            return denied
+
+        extension = current_app.extensions['calculator']
+        diagnostics = extension['memory']
+        if request.method == 'GET':
+            types = request.args.get('types', '0')
+            if not types.isdigit() or int(types) > 1000:
+                return jsonify(render_error({"error_code": ErrorCode.INVALID_PARAMETER,
+                                             "parameter": 'types'})), 400
+            response = jsonify(diagnostics.report(extension, int(types)))
+        else:
+            result = diagnostics.run_action(request.get_json(silent=True))
+            if 'error_code' in result:
+                status = DEBUG_ERROR_STATUS.get(result['error_code'], 400)
+                return jsonify(render_error(result)), status
+            response = jsonify(result)
+        response.headers['Cache-Control'] = 'no-store'
+        return response
 
     @main_blueprint.errorhandler(404)
     def not_found(error):
@@ -134,7 +695,7 @@ def create_routes() -> Blueprint:
             "error": "Endpoint no encontrado",
             "status_code": 404,
             "available_endpoints": [
-                "/", "/favicon.ico", "/calculate", "/history", "/operations", "/health", "/api/info"
+                "/", "/favicon.ico", "/calculate", "/calculate/batch", "/statistics", "/tabulate", "/history", "/history/stats", "/variables", "/operations", "/health", "/ready", "/api/info", "/metrics"
             ]
         }), 404
 
@@ -158,6 +719,120 @@ def create_routes() -> Blueprint:
     return main_blueprint
 
 
+# Código de estado de cada error de /debug/memory (por defecto 400)
+DEBUG_ERROR_STATUS = {
+    ErrorCode.SNAPSHOT_NOT_FOUND: 404,
+    ErrorCode.TRACEMALLOC_NOT_RUNNING: 409
+}
+
+
+def _canonical_calculation_query(validated: Dict[str, Any]) -> str:
+    """
+    Construye la query string canónica de un cálculo ya validado.
+
+    Args:
+        validated (dict): Resultado de ``CalculatorModel.validate_inputs``
+
+    Returns:
+        str: Parámetros en orden fijo con los números normalizados
+    """
+    # En los modos exactos los números se escriben por su valor decimal; los
+    # vectores y matrices, como JSON compacto
+    exact = validated['precision'] != 'float'
+    format_scalar = format_exact if exact else repr
+
+    def format_number(value) -> str:
+        if isinstance(value, list):
+            return json.dumps(value, separators=(',', ':'))
+        return format_scalar(value)
+
+    params = [('num1', format_number(validated['num1']))]
+    if validated['num2'] is not None:
+        params.append(('num2', format_number(validated['num2'])))
+    if validated.get('num3') is not None:
+        params.append(('num3', format_number(validated['num3'])))
+    params.append(('operation', validated['operation']))
+    if exact:
+        params.append(('precision', validated['precision']))
+    return urlencode(params)
+
+
+def _tabulation_json(table: Tabulation, model: CalculatorModel) -> Iterator[str]:
+    """
+    Genera la tabla como JSON, bloque a bloque.
+
+    Los puntos con error llevan 'error_code'; los mensajes y el número de
+    puntos de cada error van al final, en 'errors'.
+    """
+    header = json.dumps({"operation": table.operation, "variable": table.variable,
+                         "count": table.count})
+    yield header[:-1] + ',"points":['
+
+    errors: Dict[str, int] = {}
+    key = json.dumps(table.variable)
+    separator = ''
+    for points, values in table.chunks(model):
+        rows = []
+        for point, value in zip(points, values):
+            if isinstance(value, str):
+                errors[value] = errors.get(value, 0) + 1
+                rows.append(f'{{{key}:{point!r},"error_code":"{value}"}}')
+            else:
+                rows.append(f'{{{key}:{point!r},"result":{value!r}}}')
+        yield separator + ','.join(rows)
+        separator = ','
+
+    summary = {code: {"count": count, "error": error_message({"error_code": code})}
+               for code, count in errors.items()}
+    yield '],"errors":' + json.dumps(summary, ensure_ascii=False) + '}\n'
+
+
+def _tabulation_csv(table: Tabulation, model: CalculatorModel) -> Iterator[str]:
+    """Genera la tabla como CSV (variable, result, error_code), bloque a bloque."""
+    yield f'{table.variable},result,error_code\n'
+    for points, values in table.chunks(model):
+        yield ''.join(f'{point!r},,{value}\n' if isinstance(value, str) else f'{point!r},{value!r},\n'
+                      for point, value in zip(points, values))
+
+
+def _build_api_info() -> Dict[str, Any]:
+    """Construye el documento de información de la API."""
+    return {
+        "name": "Calculator Web API",
+        "description": "API para calculadora web con arquitectura MVC",
+        "version": "2.0.0",
+        "endpoints": {
+            "GET /": "Interfaz web de la calculadora",
+            "GET /favicon.ico": "Favicon (204 No Content)",
+            "POST /calculate": "Realizar cálculos matemáticos",
+            "GET /calculate": "Cálculo cacheable (num1, num2, num3, operation como parámetros)",
+            "POST /calculate/batch": "Realizar varios cálculos en una sola petición",
+            "POST /statistics": "Estadísticas de una serie (JSON, NDJSON, CSV o float64)",
+            "POST /tabulate": "Tabla de una operación o fórmula sobre un rango (JSON o CSV)",
+            "GET /history": "Obtener historial (filtros: operation, errors_only, from, to, limit)",
+            "GET /history/stats": "Agregados del historial (recuentos, ritmo, resultados)",
+            "DELETE /history": "Limpiar historial",
+            "GET /variables": "Variables de la sesión (?names=a,b para leer varias)",
+            "GET /variables/<name>": "Obtener una variable",
+            "PUT /variables/<name>": "Definir una entrada (value) o fórmula (formula)",
+            "DELETE /variables/<name>": "Eliminar una variable",
+            "GET /operations": "Información de operaciones disponibles",
+            "GET /health": "Verificación de salud del servicio",
+            "GET /ready": "Preparación del worker (503 hasta terminar el calentamiento)",
+            "GET /api/info": "Información de la API",
+            "GET /metrics": "Métricas internas (admisión, cachés)"
+        },
+        "supported_operations": [
+            "add", "subtract", "multiply", "divide",
+            "power", "sqrt", "percentage",
+            "factorial", "ncr", "npr", "gcd", "lcm", "modpow", "iroot", "ipow",
+            "array_add", "array_subtract", "array_multiply", "array_divide",
+            "dot", "matmul", "transpose", "determinant", "solve"
+        ],
+        "precision_modes": list(PRECISION_MODES)
+    }
+
+
 def register_all_routes(app):
     """
     Registra todos los blueprints en la aplicación Flask.
@@ -0,0 +1,241 @@
+/**
+ * Calculadora Web - Núcleo de cálculo local
+ * Replica la semántica de CalculatorModel (resultados, expresiones y mensajes
+ * de error) para evaluar operaciones en el navegador sin esperar al backend.
+ * Se valida contra tests/calculator_vectors.json junto con el modelo Python.
+ */
+
+(function (root) {
+    'use strict';
+
+    const VALID_OPERATIONS = [
+        'add', 'subtract', 'multiply', 'divide',
+        'power', 'sqrt', 'percentage'
+    ];
+
+    // Códigos y mensajes idénticos a los de src/models/errors.py
+    const CALCULATION_PREFIX = 'Error en el cálculo: ';
+    const ERROR_MESSAGES = {
+        INVALID_OPERATION: 'Error: Operación no válida',
+        INVALID_OPERAND: 'Error: El {ordinal} número debe ser válido',
+        MISSING_OPERAND: 'Error: Se requiere un segundo número para esta operación',
+        DIVISION_BY_ZERO: CALCULATION_PREFIX + 'División por cero no permitida',
+        NEGATIVE_SQRT: CALCULATION_PREFIX + 'No se puede calcular la raíz cuadrada de un número negativo',
+        OVERFLOW: CALCULATION_PREFIX + 'math range error',
+        DOMAIN_ERROR: CALCULATION_PREFIX + 'math domain error'
+    };
+
+    const OPERAND_ORDINALS = { 1: 'primer', 2: 'segundo' };
+
+    // Literales que acepta float() de Python para un número finito (admite
+    // '_' entre dígitos; no admite hexadecimal, binario ni octal como Number())
+    const DIGITS = '\\d(?:_?\\d)*';
+    const PYTHON_FLOAT_PATTERN = new RegExp(
+        `^[+-]?(?:${DIGITS}(?:\\.(?:${DIGITS})?)?|\\.${DIGITS})(?:[eE][+-]?${DIGITS})?$`
+    );
+
+    /**
+     * Construye el resultado de error con el mismo cuerpo que el backend.
+     */
+    function errorOutcome(status, errorCode, operand) {
+        const error = ERROR_MESSAGES[errorCode].replace('{ordinal}', OPERAND_ORDINALS[operand]);
+        const outcome = { status: status, error: error, error_code: errorCode };
+        if (operand !== undefined) {
+            outcome.operand = operand;
+        }
+        return outcome;
+    }
+
+    /**
+     * Formatea un número igual que str(float) en Python
+     * (notación científica si el exponente es < -4 o >= 16).
+     */
+    function formatPythonFloat(value) {
+        if (Number.isNaN(value)) {
+            return 'nan';
+        }
+        if (value === Infinity) {
+            return 'inf';
+        }
+        if (value === -Infinity) {
+            return '-inf';
+        }
+        if (value === 0) {
+            return Object.is(value, -0) ? '-0.0' : '0.0';
+        }
+
+        const sign = value < 0 ? '-' : '';
+        // toExponential() sin argumentos usa los dígitos mínimos que
+        // identifican el número, igual que el repr de Python
+        const [mantissa, exponentText] = Math.abs(value).toExponential().split('e');
+        const digits = mantissa.replace('.', '');
+        const exponent = parseInt(exponentText, 10);
+
+        if (exponent < -4 || exponent >= 16) {
+            const fraction = digits.length > 1 ? `.${digits.slice(1)}` : '';
+            const exponentSign = exponent < 0 ? '-' : '+';
+            const exponentDigits = String(Math.abs(exponent)).padStart(2, '0');
+            return `${sign}${digits[0]}${fraction}e${exponentSign}${exponentDigits}`;
+        }
+
+        if (exponent < 0) {
+            return `${sign}0.${'0'.repeat(-exponent - 1)}${digits}`;
+        }
+
+        const integerPart = digits.slice(0, exponent + 1).padEnd(exponent + 1, '0');
+        const fractionPart = digits.slice(exponent + 1) || '0';
+        return `${sign}${integerPart}.${fractionPart}`;
+    }
+
+    /**
+     * Replica math.pow de Python, incluidos sus errores de rango y dominio.
+     * Devuelve { value } o { errorCode }.
+     */
+    function pythonPow(base, exponent) {
+        // Casos especiales en los que Python devuelve 1.0 y JavaScript NaN
+        if (base === 1 || exponent === 0) {
+            return { value: 1 };
+        }
+        if (base === -1 && (exponent === Infinity || exponent === -Infinity)) {
+            return { value: 1 };
+        }
+
+        const bothFinite = Number.isFinite(base) && Number.isFinite(exponent);
+        if (bothFinite) {
+            if (base === 0 && exponent < 0) {
+                return { errorCode: 'DOMAIN_ERROR' };
+            }
+            if (base < 0 && !Number.isInteger(exponent)) {
+                return { errorCode: 'DOMAIN_ERROR' };
+            }
+        }
+
+        const value = Math.pow(base, exponent);
+        if (bothFinite && !Number.isFinite(value)) {
+            return { errorCode: 'OVERFLOW' };
+        }
+        return { value: value };
+    }
+
+    /**
+     * Convierte un operando igual que lo haría el backend tras JSON.stringify.
+     * Devuelve null si falta (NaN, Infinity y undefined llegan como null), NaN
+     * si el backend lo rechazaría como no válido, o el número.
+     */
+    function normalizeOperand(value) {
+        if (value === undefined || value === null) {
+            return null;
+        }
+        if (typeof value === 'number') {
+            return Number.isFinite(value) ? value : null;
+        }
+        if (typeof value === 'boolean') {
+            return Number(value);
+        }
+        const text = typeof value === 'string' ? value.trim() : '';
+        if (!PYTHON_FLOAT_PATTERN.test(text)) {
+            return NaN;
+        }
+        const number = Number(text.replace(/_/g, ''));
+        return Number.isFinite(number) ? number : NaN;
+    }
+
+    /**
+     * Evalúa una operación localmente con la misma semántica que el backend.
+     *
+     * Devuelve { status, result, expression } si tiene éxito o
+     * { status, error, error_code } en caso de error. status replica el
+     * código HTTP que devolvería POST /calculate.
+     */
+    function evaluateLocally(num1, num2, operation) {
+        if (!VALID_OPERATIONS.includes(operation)) {
+            return errorOutcome(400, 'INVALID_OPERATION');
+        }
+
+        const a = normalizeOperand(num1);
+        if (a === null || Number.isNaN(a)) {
+            return errorOutcome(400, 'INVALID_OPERAND', 1);
+        }
+
+        let b = null;
+        if (operation !== 'sqrt') {
+            b = normalizeOperand(num2);
+            if (b === null) {
+                return errorOutcome(400, 'MISSING_OPERAND');
+            }
+            if (Number.isNaN(b)) {
+                return errorOutcome(400, 'INVALID_OPERAND', 2);
+            }
+        }
+
+        const fa = formatPythonFloat(a);
+        const fb = b === null ? null : formatPythonFloat(b);
+        let result;
+        let expression;
+
+        switch (operation) {
+            case 'add':
+                result = a + b;
+                expression = `${fa} + ${fb}`;
+                break;
+            case 'subtract':
+                result = a - b;
+                expression = `${fa} - ${fb}`;
+                break;
+            case 'multiply':
+                result = a * b;
+                expression = `${fa} × ${fb}`;
+                break;
+            case 'divide':
+                if (b === 0) {
+                    return errorOutcome(200, 'DIVISION_BY_ZERO');
+                }
+                result = a / b;
+                expression = `${fa} ÷ ${fb}`;
+                break;
+            case 'power': {
+                const power = pythonPow(a, b);
+                if (power.errorCode) {
+                    return errorOutcome(200, power.errorCode);
+                }
+                result = power.value;
+                expression = `${fa}^${fb}`;
+                break;
+            }
+            case 'sqrt':
+                if (a < 0) {
+                    return errorOutcome(200, 'NEGATIVE_SQRT');
+                }
+                result = Math.sqrt(a);
+                expression = `√${fa}`;
+                break;
+            case 'percentage':
+                result = (a * b) / 100;
+                expression = `${fb}% de ${fa}`;
+                break;
+        }
+
+        // Un resultado infinito no es representable en JSON
+        if (!Number.isFinite(result)) {
+            return errorOutcome(200, 'OVERFLOW');
+        }
+
+        return {
+            status: 200,
+            result: result,
+            expression: `${expression} = ${formatPythonFloat(result)}`
+        };
+    }
+
+    const api = {
+        VALID_OPERATIONS: VALID_OPERATIONS,
+        formatPythonFloat: formatPythonFloat,
+        evaluateLocally: evaluateLocally
+    };
+
+    if (typeof module !== 'undefined' && module.exports) {
+        module.exports = api;
+    } else {
+        root.CalculatorCore = api;
+    }
+})(typeof window !== 'undefined' ? window : this);
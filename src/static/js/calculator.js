@@ -1,6 +1,8 @@
 /**
  * Calculadora Web - Lógica del Frontend
  * Maneja la interfaz de usuario y la comunicación con el backend Flask.
+ * Los cálculos se evalúan localmente con calculator-core.js; el backend
+ * registra el historial en segundo plano y prevalece si hay discrepancias.
  */
 
 // Variables globales
@@ -8,6 +10,27 @@ let currentDisplay = '';
 let previousDisplay = '';
 let waitingForOperand = false;
 let history = [];
+let calculationSeq = 0;
+
+// Petición de cálculo en curso (para cancelarla o reutilizarla)
+let activeCalculation = null;
+
+// Cola de cálculos pendientes de registrar en el historial del backend
+const HISTORY_BATCH_SIZE = 20;
+const HISTORY_FLUSH_INTERVAL_MS = 1000;
+const HISTORY_RETRY_DELAY_MS = 5000;
+const PENDING_HISTORY_KEY = 'calculatorPendingHistory';
+let historyQueue = [];
+let historyFlushTimer = null;
+let historyFlushInFlight = false;
+// Clave y tamaño del lote enviado sin respuesta definitiva (se reenvía igual)
+let pendingBatchKey = null;
+let pendingBatchSize = 0;
+
+// Historial local: límite de entradas y escritura diferida en localStorage
+const HISTORY_LIMIT = 1000;
+const HISTORY_SAVE_DELAY_MS = 500;
+let historySaveTimer = null;
 
 // Elementos del DOM
 const currentDisplayElement = document.getElementById('currentDisplay');
@@ -15,6 +38,9 @@ const previousDisplayElement = document.getElementById('previousDisplay');
 const historyListElement = document.getElementById('historyList');
 const clearHistoryBtn = document.getElementById('clearHistoryBtn');
 
+// Vista incremental y virtualizada del historial (history-view.js)
+const historyView = new HistoryView(historyListElement, () => history);
+
 // Constantes para operaciones
 const OPERATIONS = {
     ADD: 'add',
@@ -33,6 +59,16 @@ document.addEventListener('DOMContentLoaded', function() {
     // Cargar historial desde localStorage si existe
     loadHistoryFromStorage();
 
+    // Recuperar cálculos que no llegaron a enviarse al backend
+    loadPendingHistory();
+    window.addEventListener('online', flushHistoryQueue);
+    document.addEventListener('visibilitychange', function() {
+        if (document.visibilityState === 'hidden') {
+            saveHistoryToStorageNow();
+            flushHistoryQueueWithBeacon();
+        }
+    });
+
     // Agregar event listeners para el teclado
     setupKeyboardSupport();
 
@@ -192,62 +228,203 @@ function deleteLast() {
 }
 
 /**
- * Realiza un cálculo usando el backend Flask
+ * Realiza un cálculo: se evalúa localmente y el backend solo registra el historial
  */
 async function calculate() {
     if (currentDisplay === '') {
         return;
     }
 
+    // Si no hay operadores, solo mostrar el número
+    if (!hasOperator(currentDisplay)) {
+        addToHistory(currentDisplay, currentDisplay);
+        return;
+    }
+
+    // Preparar datos para el cálculo
+    const calculationData = parseExpression(currentDisplay);
+
+    if (!calculationData) {
+        showError('Expresión no válida');
+        return;
+    }
+
+    // Mostrar la operación en el display anterior
+    previousDisplay = currentDisplay;
+    updateDisplay();
+
+    await runCalculation(calculationData, currentDisplay);
+}
+
+/**
+ * Ejecuta un cálculo mostrando el resultado local de inmediato.
+ * Si el núcleo local no está disponible, espera la respuesta del backend.
+ */
+async function runCalculation(calculationData, label) {
+    const seq = ++calculationSeq;
+    const localOutcome = evaluateLocally(calculationData);
+
+    if (localOutcome) {
+        const historyItem = showCalculationOutcome(localOutcome, label);
+        // En segundo plano: registrar en el historial del backend y reconciliar
+        recordCalculationOnServer(calculationData, localOutcome, historyItem, seq);
+        return;
+    }
+
     try {
-        // Si no hay operadores, solo mostrar el número
-        if (!hasOperator(currentDisplay)) {
-            addToHistory(currentDisplay, currentDisplay);
+        const outcome = await requestCalculation(calculationData);
+
+        // Una respuesta lenta no debe sobrescribir un cálculo más reciente
+        if (seq === calculationSeq) {
+            showCalculationOutcome(outcome, label);
+        }
+    } catch (error) {
+        if (error.name === 'AbortError') {
             return;
         }
+        console.error('Error en el cálculo:', error);
+        showError('Error en la conexión con el servidor');
+        addToHistory(label, 'Error de conexión', true);
+        updateDisplay();
+    }
+}
 
-        // Preparar datos para el backend
-        const calculationData = parseExpression(currentDisplay);
+/**
+ * Evalúa un cálculo con el núcleo local (calculator-core.js)
+ */
+function evaluateLocally(calculationData) {
+    if (typeof CalculatorCore === 'undefined') {
+        return null;
+    }
+    return CalculatorCore.evaluateLocally(
+        calculationData.num1,
+        calculationData.num2,
+        calculationData.operation
+    );
+}
 
-        if (!calculationData) {
-            throw new Error('Expresión no válida');
+/**
+ * Solicita un cálculo al backend cancelando la petición anterior si quedó obsoleta.
+ * Una petición idéntica a la que está en curso reutiliza su respuesta.
+ */
+function requestCalculation(calculationData) {
+    const key = JSON.stringify(calculationData);
+
+    if (activeCalculation && activeCalculation.key === key) {
+        return activeCalculation.promise;
+    }
+
+    if (activeCalculation) {
+        activeCalculation.controller.abort();
+    }
+
+    const entry = {
+        key: key,
+        controller: new AbortController(),
+        promise: null
+    };
+    entry.promise = fetchCalculation(calculationData, entry.controller.signal).finally(() => {
+        if (activeCalculation === entry) {
+            activeCalculation = null;
         }
+    });
+    activeCalculation = entry;
 
-        // Mostrar la operación en el display anterior
-        previousDisplay = currentDisplay;
-        updateDisplay();
+    return entry.promise;
+}
 
-        // Realizar la petición al backend
-        const response = await fetch('/calculate', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify(calculationData)
-        });
+/**
+ * Envía un cálculo al backend y devuelve el resultado normalizado
+ */
+async function fetchCalculation(calculationData, signal) {
+    const response = await fetch('/calculate', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify(calculationData),
+        signal: signal
+    });
 
-        const result = await response.json();
+    const result = await response.json();
+    return {
+        status: response.status,
+        result: result.result,
+        expression: result.expression,
+        error: result.error,
+        error_code: result.error_code
+    };
+}
 
-        if (response.ok) {
-            // Mostrar resultado
-            currentDisplay = result.result.toString();
-            addToHistory(result.expression, currentDisplay);
+/**
+ * Muestra el resultado (o el error) de un cálculo y lo agrega al historial
+ */
+function showCalculationOutcome(outcome, label) {
+    let historyItem;
 
-            // Preparar para siguiente operación
-            waitingForOperand = true;
-        } else {
-            // Mostrar error
-            showError(result.error);
-            addToHistory(currentDisplay, result.error, true);
-        }
+    if (outcome.error) {
+        showError(outcome.error);
+        historyItem = addToHistory(label, outcome.error, true);
+    } else {
+        currentDisplay = outcome.result.toString();
+        historyItem = addToHistory(outcome.expression, currentDisplay);
 
-        updateDisplay();
+        // Preparar para siguiente operación
+        waitingForOperand = true;
+    }
 
-    } catch (error) {
-        console.error('Error en el cálculo:', error);
-        showError('Error en la conexión con el servidor');
-        addToHistory(currentDisplay, 'Error de conexión', true);
-        updateDisplay();
+    updateDisplay();
+    return historyItem;
+}
+
+/**
+ * Registra el cálculo en el backend (por lotes) para que quede en su historial
+ */
+function recordCalculationOnServer(calculationData, localOutcome, historyItem, seq) {
+    // Los errores de validación no se registran en el historial del backend
+    if (localOutcome.status === 400) {
+        return;
+    }
+    sendToBackendHistory(calculationData, localOutcome, historyItem, seq);
+}
+
+/**
+ * Corrige el historial y el display cuando el backend no coincide con el cálculo local.
+ * El backend es la referencia: su resultado prevalece.
+ */
+function reconcileOutcome(localOutcome, serverOutcome, historyItem, seq) {
+    if (!localOutcome || !historyItem) {
+        return;
+    }
+
+    // Los errores se comparan por código, no por el texto del mensaje
+    const sameError = (localOutcome.error_code || null) === (serverOutcome.error_code || null);
+    const sameResult = localOutcome.result === serverOutcome.result;
+    if (sameError && sameResult) {
+        return;
+    }
+
+    console.warn('El resultado local no coincide con el backend:', localOutcome, serverOutcome);
+
+    if (serverOutcome.error) {
+        historyItem.result = serverOutcome.error;
+        historyItem.isError = true;
+    } else {
+        historyItem.operation = serverOutcome.expression;
+        historyItem.result = serverOutcome.result.toString();
+        historyItem.isError = false;
+    }
+    historyView.refresh(historyItem);
+    saveHistoryToStorage();
+
+    // Solo corregir el display si el usuario no ha hecho otro cálculo desde entonces
+    if (seq === calculationSeq) {
+        if (serverOutcome.error) {
+            showError(serverOutcome.error);
+        } else {
+            currentDisplay = historyItem.result;
+            updateDisplay();
+        }
     }
 }
 
@@ -321,48 +498,18 @@ async function calculateAdvanced(operation) {
         return;
     }
 
-    try {
-        const num1 = parseFloat(currentDisplay);
-
-        if (isNaN(num1)) {
-            showError('Número no válido');
-            return;
-        }
-
-        // Mostrar la operación en el display anterior
-        previousDisplay = `${operation === OPERATIONS.SQRT ? '√' : operation}(${currentDisplay})`;
-        updateDisplay();
-
-        // Realizar la petición al backend
-        const response = await fetch('/calculate', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({
-                num1: num1,
-                operation: operation
-            })
-        });
-
-        const result = await response.json();
+    const num1 = parseFloat(currentDisplay);
 
-        if (response.ok) {
-            currentDisplay = result.result.toString();
-            addToHistory(result.expression, currentDisplay);
-        } else {
-            showError(result.error);
-            addToHistory(previousDisplay, result.error, true);
-        }
+    if (isNaN(num1)) {
+        showError('Número no válido');
+        return;
+    }
 
-        updateDisplay();
+    // Mostrar la operación en el display anterior
+    previousDisplay = `${operation === OPERATIONS.SQRT ? '√' : operation}(${currentDisplay})`;
+    updateDisplay();
 
-    } catch (error) {
-        console.error('Error en operación avanzada:', error);
-        showError('Error en la conexión con el servidor');
-        addToHistory(previousDisplay, 'Error de conexión', true);
-        updateDisplay();
-    }
+    await runCalculation({ num1: num1, operation: operation }, previousDisplay);
 }
 
 /**
@@ -394,35 +541,24 @@ function addToHistory(operation, result, isError = false) {
 
     history.unshift(historyItem);
 
-    // Mantener solo los últimos 50 elementos
-    if (history.length > 50) {
-        history = history.slice(0, 50);
+    // Mantener solo los últimos HISTORY_LIMIT elementos
+    if (history.length > HISTORY_LIMIT) {
+        history.length = HISTORY_LIMIT;
     }
 
-    updateHistoryDisplay();
+    // Solo se inserta la fila nueva; el guardado en localStorage se difiere
+    historyView.prepend(1);
     saveHistoryToStorage();
     updateClearHistoryButton();
+
+    return historyItem;
 }
 
 /**
- * Actualiza la visualización del historial
+ * Vuelve a dibujar el historial completo (en el siguiente frame)
  */
 function updateHistoryDisplay() {
-    if (history.length === 0) {
-        historyListElement.innerHTML = '<div class="history-item" style="color: var(--text-muted); font-style: italic;">No hay operaciones en el historial</div>';
-        return;
-    }
-
-    historyListElement.innerHTML = history.map(item => {
-        const errorClass = item.isError ? 'error' : '';
-        return `
-            <div class="history-item ${errorClass}">
-                <div><strong>${item.operation}</strong></div>
-                <div style="color: var(--text-secondary); font-size: 0.8rem;">${item.timestamp}</div>
-                <div style="color: var(--text-primary); font-weight: 600;">= ${item.result}</div>
-            </div>
-        `;
-    }).join('');
+    historyView.reset();
 }
 
 /**
@@ -457,9 +593,22 @@ function updateClearHistoryButton() {
 }
 
 /**
- * Guarda el historial en localStorage
+ * Programa el guardado del historial en localStorage.
+ * Varias operaciones seguidas se agrupan en una sola serialización.
  */
 function saveHistoryToStorage() {
+    if (historySaveTimer === null) {
+        historySaveTimer = setTimeout(saveHistoryToStorageNow, HISTORY_SAVE_DELAY_MS);
+    }
+}
+
+/**
+ * Guarda el historial en localStorage de inmediato
+ */
+function saveHistoryToStorageNow() {
+    clearTimeout(historySaveTimer);
+    historySaveTimer = null;
+
     try {
         localStorage.setItem('calculatorHistory', JSON.stringify(history));
     } catch (error) {
@@ -495,17 +644,189 @@ async function syncHistoryWithBackend() {
 }
 
 /**
- * Envía una operación al historial del backend
+ * Encola un cálculo para registrarlo en el historial del backend.
+ * Los envíos se agrupan en lotes periódicos a POST /calculate/batch.
+ */
+function sendToBackendHistory(calculationData, localOutcome = null, historyItem = null, seq = 0) {
+    historyQueue.push({
+        data: calculationData,
+        localOutcome: localOutcome,
+        historyItem: historyItem,
+        seq: seq
+    });
+    savePendingHistory();
+
+    if (historyQueue.length >= HISTORY_BATCH_SIZE) {
+        flushHistoryQueue();
+    } else {
+        scheduleHistoryFlush(HISTORY_FLUSH_INTERVAL_MS);
+    }
+}
+
+/**
+ * Programa el próximo envío de la cola de historial
+ */
+function scheduleHistoryFlush(delay) {
+    if (historyFlushTimer === null) {
+        historyFlushTimer = setTimeout(flushHistoryQueue, delay);
+    }
+}
+
+/**
+ * Envía al backend el siguiente lote de la cola de historial.
+ * Sin conexión, la cola se conserva y se drena con el evento 'online'.
+ */
+async function flushHistoryQueue() {
+    clearTimeout(historyFlushTimer);
+    historyFlushTimer = null;
+
+    if (historyFlushInFlight || historyQueue.length === 0 || navigator.onLine === false) {
+        return;
+    }
+
+    historyFlushInFlight = true;
+    const batch = takePendingBatch();
+
+    try {
+        const response = await fetch('/calculate/batch', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Idempotency-Key': pendingBatchKey
+            },
+            body: JSON.stringify({ calculations: batch.map(entry => entry.data) })
+        });
+
+        // Errores del servidor, límite de peticiones (429) y duplicado aún en
+        // curso (409) se reintentan con la misma clave; el resto de 4xx no,
+        // para no bloquear la cola
+        if (isRetryableStatus(response.status)) {
+            console.warn('El backend no registró el lote de historial, se reintentará:', response.status);
+            historyFlushInFlight = false;
+            scheduleHistoryFlush(retryDelayMs(response));
+            return;
+        }
+
+        historyQueue.splice(0, batch.length);
+        pendingBatchKey = null;
+        savePendingHistory();
+
+        if (response.ok) {
+            const data = await response.json();
+            batch.forEach((entry, index) => {
+                reconcileOutcome(entry.localOutcome, data.results[index], entry.historyItem, entry.seq);
+            });
+        } else {
+            console.warn('El backend rechazó un lote de historial:', response.status);
+        }
+    } catch (error) {
+        console.warn('No se pudo enviar el historial al backend, se reintentará:', error);
+        historyFlushInFlight = false;
+        scheduleHistoryFlush(HISTORY_RETRY_DELAY_MS);
+        return;
+    }
+
+    historyFlushInFlight = false;
+    if (historyQueue.length > 0) {
+        scheduleHistoryFlush(0);
+    }
+}
+
+/**
+ * Obtiene el lote a enviar: el pendiente de respuesta (misma clave y mismos
+ * cálculos, para que el backend no los registre dos veces) o uno nuevo
+ */
+function takePendingBatch() {
+    if (pendingBatchKey === null) {
+        pendingBatchKey = createIdempotencyKey();
+        pendingBatchSize = Math.min(historyQueue.length, HISTORY_BATCH_SIZE);
+    }
+    return historyQueue.slice(0, pendingBatchSize);
+}
+
+/**
+ * Indica si un lote rechazado con este estado debe reintentarse
+ */
+function isRetryableStatus(status) {
+    return status >= 500 || status === 429 || status === 409;
+}
+
+/**
+ * Espera antes de reintentar un lote: el Retry-After del servidor (segundos
+ * o fecha HTTP) o el retardo por defecto
+ */
+function retryDelayMs(response) {
+    const retryAfter = response.headers.get('Retry-After');
+    if (retryAfter === null) {
+        return HISTORY_RETRY_DELAY_MS;
+    }
+    const seconds = Number(retryAfter);
+    const delay = Number.isNaN(seconds) ? Date.parse(retryAfter) - Date.now() : seconds * 1000;
+    return Number.isFinite(delay) && delay > 0 ? delay : HISTORY_RETRY_DELAY_MS;
+}
+
+/**
+ * Genera una clave de idempotencia para un lote de historial
+ */
+function createIdempotencyKey() {
+    if (window.crypto && crypto.randomUUID) {
+        return crypto.randomUUID();
+    }
+    return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+}
+
+/**
+ * Envía la cola pendiente con sendBeacon cuando la página se oculta o se cierra
+ */
+function flushHistoryQueueWithBeacon() {
+    if (historyFlushInFlight || historyQueue.length === 0 || !navigator.sendBeacon) {
+        return;
+    }
+
+    const batch = takePendingBatch();
+    const payload = new Blob(
+        [JSON.stringify({ calculations: batch.map(entry => entry.data) })],
+        { type: 'application/json' }
+    );
+
+    // sendBeacon no admite cabeceras: la clave viaja en la URL, y si el lote
+    // ya se envió con fetch y la respuesta se perdió, el backend no lo repite
+    const url = `/calculate/batch?idempotency_key=${encodeURIComponent(pendingBatchKey)}`;
+    if (navigator.sendBeacon(url, payload)) {
+        historyQueue.splice(0, batch.length);
+        pendingBatchKey = null;
+        savePendingHistory();
+    }
+}
+
+/**
+ * Guarda en localStorage los cálculos aún no enviados (cola offline)
+ */
+function savePendingHistory() {
+    try {
+        if (historyQueue.length === 0) {
+            localStorage.removeItem(PENDING_HISTORY_KEY);
+        } else {
+            localStorage.setItem(PENDING_HISTORY_KEY, JSON.stringify(historyQueue.map(entry => entry.data)));
+        }
+    } catch (error) {
+        console.warn('No se pudo guardar la cola de historial:', error);
+    }
+}
+
+/**
+ * Recupera la cola offline guardada en una sesión anterior
  */
-async function sendToBackendHistory(operation, result, isError = false) {
+function loadPendingHistory() {
     try {
-        // Solo enviar si no es un error de conexión y hay una operación válida
-        if (!isError || operation !== 'Error de conexión') {
-            // El backend ya maneja el historial automáticamente
-            // Esta función es para operaciones adicionales si es necesario
+        const pending = JSON.parse(localStorage.getItem(PENDING_HISTORY_KEY) || '[]');
+        historyQueue = pending.map(data => ({ data: data, localOutcome: null, historyItem: null, seq: 0 }));
+        if (historyQueue.length > 0) {
+            scheduleHistoryFlush(0);
         }
     } catch (error) {
-        console.warn('No se pudo enviar al historial del backend:', error);
+        console.warn('No se pudo recuperar la cola de historial:', error);
+        historyQueue = [];
     }
 }
 
@@ -0,0 +1,238 @@
+/**
+ * Calculadora Web - Vista del historial
+ * Renderiza el historial de forma incremental: las entradas nuevas se insertan
+ * al principio sin reconstruir la lista y, a partir de cierto tamaño, solo se
+ * crean los nodos de las filas visibles (lista virtualizada).
+ * Todas las escrituras en el DOM se agrupan en un requestAnimationFrame.
+ */
+
+(function (root) {
+    'use strict';
+
+    const EMPTY_MESSAGE = 'No hay operaciones en el historial';
+
+    class HistoryView {
+        /**
+         * @param {HTMLElement} container - Elemento .history-list
+         * @param {Function} getItems - Devuelve el array de historial (más reciente primero)
+         * @param {Object} options - virtualizeThreshold, overscan, rowGap
+         */
+        constructor(container, getItems, options = {}) {
+            this.container = container;
+            this.getItems = getItems;
+            this.virtualizeThreshold = options.virtualizeThreshold || 100;
+            this.overscan = options.overscan || 5;
+            this.rowGap = options.rowGap !== undefined ? options.rowGap : 8;
+
+            this.virtualized = false;
+            this.rowStride = 0;
+            this.renderedCount = 0;
+            this.pendingPrepend = 0;
+            this.pendingFull = true;
+            this.pendingRefresh = new Set();
+            this.frameRequested = false;
+
+            this.spacer = null;
+            this.windowElement = null;
+            this.lastFrameCost = 0;
+
+            this.container.addEventListener('scroll', () => {
+                if (this.virtualized) {
+                    this.scheduleRender();
+                }
+            }, { passive: true });
+        }
+
+        /**
+         * Marca la lista para reconstruirse por completo (carga, sincronización, limpieza)
+         */
+        reset() {
+            this.pendingFull = true;
+            this.pendingPrepend = 0;
+            this.pendingRefresh.clear();
+            this.scheduleRender();
+        }
+
+        /**
+         * Indica que se agregaron `count` entradas al principio del historial
+         */
+        prepend(count = 1) {
+            this.pendingPrepend += count;
+            this.scheduleRender();
+        }
+
+        /**
+         * Vuelve a dibujar una entrada que cambió (por ejemplo tras reconciliar)
+         */
+        refresh(item) {
+            this.pendingRefresh.add(item);
+            this.scheduleRender();
+        }
+
+        /**
+         * Agrupa todos los cambios pendientes en el siguiente frame
+         */
+        scheduleRender() {
+            if (this.frameRequested) {
+                return;
+            }
+            this.frameRequested = true;
+            requestAnimationFrame(() => {
+                this.frameRequested = false;
+                this.render();
+            });
+        }
+
+        /**
+         * Aplica los cambios pendientes en el DOM
+         */
+        render() {
+            const start = performance.now();
+            const items = this.getItems();
+
+            if (items.length === 0) {
+                this.renderEmpty();
+            } else if (items.length > this.virtualizeThreshold) {
+                this.renderVirtual(items);
+            } else if (this.pendingFull || this.virtualized || this.renderedCount === 0) {
+                this.renderAll(items);
+            } else {
+                this.renderIncremental(items);
+            }
+
+            this.pendingFull = false;
+            this.pendingPrepend = 0;
+            this.pendingRefresh.clear();
+            this.lastFrameCost = performance.now() - start;
+        }
+
+        renderEmpty() {
+            this.leaveVirtualMode();
+            const placeholder = document.createElement('div');
+            placeholder.className = 'history-item';
+            placeholder.style.color = 'var(--text-muted)';
+            placeholder.style.fontStyle = 'italic';
+            placeholder.textContent = EMPTY_MESSAGE;
+            this.container.replaceChildren(placeholder);
+            this.renderedCount = 0;
+        }
+
+        renderAll(items) {
+            this.leaveVirtualMode();
+            const fragment = document.createDocumentFragment();
+            for (const item of items) {
+                fragment.appendChild(createHistoryRow(item));
+            }
+            this.container.replaceChildren(fragment);
+            this.renderedCount = items.length;
+        }
+
+        renderIncremental(items) {
+            // Insertar solo las entradas nuevas al principio
+            const count = Math.min(this.pendingPrepend, items.length);
+            if (count > 0) {
+                const fragment = document.createDocumentFragment();
+                for (let i = 0; i < count; i++) {
+                    fragment.appendChild(createHistoryRow(items[i]));
+                }
+                this.container.insertBefore(fragment, this.container.firstChild);
+                this.renderedCount += count;
+            }
+
+            // Eliminar las filas que salieron del historial por el límite
+            while (this.renderedCount > items.length) {
+                this.container.removeChild(this.container.lastChild);
+                this.renderedCount -= 1;
+            }
+
+            for (const item of this.pendingRefresh) {
+                const index = items.indexOf(item);
+                if (index !== -1) {
+                    this.container.replaceChild(createHistoryRow(item), this.container.children[index]);
+                }
+            }
+        }
+
+        renderVirtual(items) {
+            this.enterVirtualMode();
+
+            const viewportHeight = this.container.clientHeight;
+            const scrollTop = this.container.scrollTop;
+            const first = Math.max(0, Math.floor(scrollTop / this.rowStride) - this.overscan);
+            const visible = Math.ceil(viewportHeight / this.rowStride) + 2 * this.overscan;
+            const last = Math.min(items.length, first + visible);
+
+            this.spacer.style.height = `${items.length * this.rowStride}px`;
+            this.windowElement.style.transform = `translateY(${first * this.rowStride}px)`;
+
+            const fragment = document.createDocumentFragment();
+            for (let i = first; i < last; i++) {
+                fragment.appendChild(createHistoryRow(items[i]));
+            }
+            this.windowElement.replaceChildren(fragment);
+            this.renderedCount = last - first;
+        }
+
+        enterVirtualMode() {
+            if (this.virtualized) {
+                return;
+            }
+
+            // Medir una fila real para calcular la altura fija de cada fila
+            const probe = createHistoryRow({ operation: '0', result: '0', timestamp: '' });
+            this.container.replaceChildren(probe);
+            this.rowStride = (probe.offsetHeight || 64) + this.rowGap;
+
+            this.spacer = document.createElement('div');
+            this.spacer.className = 'history-spacer';
+            this.windowElement = document.createElement('div');
+            this.windowElement.className = 'history-window';
+            this.spacer.appendChild(this.windowElement);
+            this.container.replaceChildren(this.spacer);
+            this.container.classList.add('virtualized');
+            this.virtualized = true;
+        }
+
+        leaveVirtualMode() {
+            if (!this.virtualized) {
+                return;
+            }
+            this.container.classList.remove('virtualized');
+            this.spacer = null;
+            this.windowElement = null;
+            this.virtualized = false;
+        }
+    }
+
+    /**
+     * Crea el nodo DOM de una entrada del historial
+     */
+    function createHistoryRow(item) {
+        const row = document.createElement('div');
+        row.className = item.isError ? 'history-item error' : 'history-item';
+
+        const operation = document.createElement('div');
+        const strong = document.createElement('strong');
+        strong.textContent = item.operation;
+        operation.appendChild(strong);
+
+        const timestamp = document.createElement('div');
+        timestamp.style.color = 'var(--text-secondary)';
+        timestamp.style.fontSize = '0.8rem';
+        // El backend envía marcas ISO 8601 completas; se muestra solo la hora local
+        timestamp.textContent = item.timestamp && item.timestamp.includes('T')
+            ? new Date(item.timestamp).toLocaleTimeString()
+            : item.timestamp;
+
+        const result = document.createElement('div');
+        result.style.color = 'var(--text-primary)';
+        result.style.fontWeight = '600';
+        result.textContent = `= ${item.result}`;
+
+        row.append(operation, timestamp, result);
+        return row;
+    }
+
+    root.HistoryView = HistoryView;
+    root.createHistoryRow = createHistoryRow;
+})(window);
@@ -0,0 +1,17 @@
+"""
+Paquete Utils - Componentes de infraestructura HTTP compartidos por la aplicación
+"""
+
+from .http_cache import PrebuiltResponse, ResponseCache
+from .admission import AdmissionController, install_admission_control
+from .idempotency import IdempotencyCache, idempotent
+from .structured_logging import JsonFormatter, start_queue_logging, install_access_log
+from .tracing import Tracer, span, traced, install_tracing
+
+__all__ = [
+    'PrebuiltResponse', 'ResponseCache',
+    'AdmissionController', 'install_admission_control',
+    'IdempotencyCache', 'idempotent',
+    'JsonFormatter', 'start_queue_logging', 'install_access_log',
+    'Tracer', 'span', 'traced', 'install_tracing'
+]
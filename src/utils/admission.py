@@ -0,0 +1,286 @@
+"""
+Control de Admisión - Limita el trabajo concurrente y descarta carga en sobrecarga
+Combina cubetas de tokens por cliente, un límite global de peticiones en curso,
+rechazo temprano de cuerpos demasiado grandes y descarte adaptativo cuando la
+espera en cola supera el objetivo configurado.
+
+El cliente se identifica por ``request.remote_addr``; detrás de un proxy inverso
+la aplicación lo toma de ``X-Forwarded-For`` (``TRUSTED_PROXIES``, ver create_app).
+"""
+
+import io
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Union
+
+from flask import Flask, g, jsonify, request
+
+
+class Rejection:
+    """Resultado de una petición no admitida."""
+
+    __slots__ = ('status', 'message', 'retry_after')
+
+    def __init__(self, status: int, message: str, retry_after: Optional[int] = None):
+        """
+        Inicializa el rechazo.
+
+        Args:
+            status (int): Código HTTP (413, 429 o 503)
+            message (str): Mensaje de error para el cliente
+            retry_after (int, optional): Segundos sugeridos antes de reintentar
+        """
+        self.status = status
+        self.message = message
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Decide si una petición se atiende, se limita (429) o se descarta (503).
+
+    El estado es pequeño y seguro entre hilos: las cubetas por cliente viven en
+    un OrderedDict acotado protegido por un lock y el límite de peticiones en
+    curso es un semáforo. La espera media en cola se mide con una media móvil
+    exponencial; mientras supera el objetivo, las peticiones que no encuentran
+    un hueco libre se descartan de inmediato en lugar de encolarse.
+    """
+
+    def __init__(self, rate: float = 20.0, burst: int = 40, max_in_flight: int = 32,
+                 queue_timeout: float = 0.5, target_queue_delay: float = 0.05,
+                 max_content_length: int = 64 * 1024, max_clients: int = 10000):
+        """
+        Inicializa el controlador.
+
+        Args:
+            rate (float): Tokens por segundo repuestos a cada cliente
+            burst (int): Capacidad de la cubeta de cada cliente
+            max_in_flight (int): Peticiones admitidas simultáneamente
+            queue_timeout (float): Espera máxima por un hueco libre (segundos)
+            target_queue_delay (float): Espera media a partir de la cual se descarta carga
+            max_content_length (int): Tamaño máximo del cuerpo en bytes
+            max_clients (int): Clientes cuyo estado se conserva (LRU)
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.queue_timeout = queue_timeout
+        self.target_queue_delay = target_queue_delay
+        self.max_content_length = max_content_length
+        self.max_clients = max_clients
+
+        self._buckets: 'OrderedDict[str, list]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._queue_delay = 0.0
+        self._in_flight = 0
+
+        self._counters = {
+            'admitted': 0,
+            'rejected_too_large': 0,
+            'rejected_rate_limited': 0,
+            'rejected_overloaded': 0
+        }
+
+    def admit(self, client_id: str, content_length: Optional[int]) -> Optional[Rejection]:
+        """
+        Intenta admitir una petición.
+
+        Args:
+            client_id (str): Identificador del cliente (dirección remota)
+            content_length (int, optional): Tamaño del cuerpo (cabecera
+                Content-Length o bytes leídos de un cuerpo chunked)
+
+        Returns:
+            Rejection o None: None si la petición fue admitida. En ese caso
+            es obligatorio llamar a ``release`` al terminar.
+        """
+        # Rechazo temprano de cuerpos grandes
+        if content_length is not None and content_length > self.max_content_length:
+            self._count('rejected_too_large')
+            return Rejection(413, "Error: Cuerpo de la petición demasiado grande")
+
+        retry_after = self._take_token(client_id)
+        if retry_after is not None:
+            self._count('rejected_rate_limited')
+            return Rejection(429, "Error: Demasiadas peticiones", retry_after)
+
+        # Camino rápido: hay un hueco libre
+        if self._slots.acquire(blocking=False):
+            self._record_admission(0.0)
+            return None
+
+        # Sin huecos y con la cola por encima del objetivo: descartar ya
+        if self._queue_delay > self.target_queue_delay:
+            self._count('rejected_overloaded')
+            return Rejection(503, "Error: Servicio sobrecargado", self._overload_retry_after())
+
+        start = time.monotonic()
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            self._update_queue_delay(time.monotonic() - start)
+            self._count('rejected_overloaded')
+            return Rejection(503, "Error: Servicio sobrecargado", self._overload_retry_after())
+
+        self._record_admission(time.monotonic() - start)
+        return None
+
+    def release(self):
+        """Libera el hueco de una petición admitida."""
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def _take_token(self, client_id: str) -> Optional[int]:
+        """
+        Consume un token de la cubeta del cliente.
+
+        Returns:
+            int o None: None si había token; si no, segundos hasta el siguiente
+        """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(client_id)
+            if bucket is None:
+                bucket = [float(self.burst), now]
+                self._buckets[client_id] = bucket
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client_id)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1.0:
+                bucket[0] -= 1.0
+                return None
+
+            return max(1, math.ceil((1.0 - bucket[0]) / self.rate))
+
+    def _record_admission(self, waited: float):
+        """Actualiza contadores y la espera media tras admitir una petición."""
+        with self._lock:
+            self._in_flight += 1
+            self._counters['admitted'] += 1
+            self._queue_delay = 0.8 * self._queue_delay + 0.2 * waited
+
+    def _update_queue_delay(self, waited: float):
+        """Incorpora a la media la espera de una petición que agotó el tiempo."""
+        with self._lock:
+            self._queue_delay = 0.8 * self._queue_delay + 0.2 * waited
+
+    def _overload_retry_after(self) -> int:
+        """Segundos sugeridos a un cliente descartado por sobrecarga."""
+        return max(1, math.ceil(self._queue_delay * 10))
+
+    def _count(self, counter: str):
+        """Incrementa un contador de rechazos."""
+        with self._lock:
+            self._counters[counter] += 1
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Obtiene el estado actual del control de admisión."""
+        with self._lock:
+            return {
+                **self._counters,
+                'in_flight': self._in_flight,
+                'max_in_flight': self.max_in_flight,
+                'queue_delay_ms': round(self._queue_delay * 1000, 3),
+                'tracked_clients': len(self._buckets)
+            }
+
+
+def install_admission_control(app: Flask, endpoints: Iterable[str],
+                              unsized_endpoints: Iterable[str] = ()) -> AdmissionController:
+    """
+    Aplica el control de admisión a los endpoints indicados del blueprint.
+
+    Args:
+        app (Flask): Instancia de la aplicación Flask
+        endpoints (iterable): Nombres de las vistas protegidas (sin prefijo de blueprint)
+        unsized_endpoints (iterable): Vistas protegidas que leen el cuerpo en
+            streaming con su propio límite: pasan por las cubetas y el límite
+            de peticiones en curso, pero sin comprobar (ni leer) el tamaño del cuerpo
+
+    Returns:
+        AdmissionController: Controlador instalado
+    """
+    controller = AdmissionController(
+        rate=app.config['ADMISSION_RATE'],
+        burst=app.config['ADMISSION_BURST'],
+        max_in_flight=app.config['ADMISSION_MAX_IN_FLIGHT'],
+        queue_timeout=app.config['ADMISSION_QUEUE_TIMEOUT'],
+        target_queue_delay=app.config['ADMISSION_TARGET_QUEUE_DELAY'],
+        max_content_length=app.config['ADMISSION_MAX_CONTENT_LENGTH'],
+        max_clients=app.config['ADMISSION_MAX_CLIENTS']
+    )
+    unsized = frozenset(unsized_endpoints)
+    protected = frozenset(endpoints) | unsized
+
+    @app.before_request
+    def admission_check():
+        """Admite, limita o descarta la petición antes de llegar a la vista."""
+        endpoint = request.endpoint
+        name = endpoint.rsplit('.', 1)[-1] if endpoint is not None else None
+        if name not in protected:
+            return None
+
+        if name in unsized:
+            content_length = None
+        else:
+            content_length = request.content_length
+            if content_length is None and request.method in ('POST', 'PUT', 'PATCH'):
+                content_length = buffer_unsized_body(request.environ, controller.max_content_length)
+
+        rejection = controller.admit(request.remote_addr or 'unknown', content_length)
+        if rejection is None:
+            g.admission_slot = True
+            return None
+
+        response = jsonify({"error": rejection.message, "status_code": rejection.status})
+        response.status_code = rejection.status
+        if rejection.retry_after is not None:
+            response.headers['Retry-After'] = str(rejection.retry_after)
+        return response
+
+    @app.teardown_request
+    def admission_release(exc):
+        """Libera el hueco de la petición admitida."""
+        if g.pop('admission_slot', False):
+            controller.release()
+
+    return controller
+
+
+def buffer_unsized_body(environ: dict, limit: int) -> Optional[int]:
+    """
+    Lee un cuerpo sin Content-Length (chunked) hasta ``limit + 1`` bytes.
+
+    Solo se lee si el servidor WSGI termina el flujo (``wsgi.input_terminated``);
+    si no, Werkzeug entrega un cuerpo vacío y no hay nada que medir. El cuerpo
+    leído sustituye a ``wsgi.input`` para que la vista lo lea con normalidad.
+
+    Args:
+        environ (dict): Entorno WSGI de la petición
+        limit (int): Tamaño máximo admitido en bytes
+
+    Returns:
+        int o None: Bytes leídos (``limit + 1`` si el cuerpo es mayor), o
+        None si el flujo no se puede leer de forma segura
+    """
+    if not environ.get('wsgi.input_terminated'):
+        return None
+
+    stream = environ['wsgi.input']
+    chunks = []
+    size = 0
+    while size <= limit:
+        chunk = stream.read(min(64 * 1024, limit + 1 - size))
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size += len(chunk)
+
+    environ['wsgi.input'] = io.BytesIO(b''.join(chunks))
+    return size
@@ -0,0 +1,141 @@
+"""
+Caché HTTP - Respuestas precalculadas con ETag fuerte
+Permite servir contenido que no cambia entre peticiones (plantillas estáticas,
+metadatos de la API) sin volver a renderizar ni serializar en cada request.
+"""
+
+import hashlib
+import threading
+from typing import Callable, Dict, Optional
+
+from flask import Response, current_app, request
+
+
+class PrebuiltResponse:
+    """
+    Respuesta inmutable que se construye una sola vez y se reutiliza.
+
+    El cuerpo se genera de forma perezosa en el primer uso (necesita un
+    contexto de aplicación para ``render_template`` o ``url_for``) y queda
+    almacenado como bytes junto con su ETag fuerte.
+    """
+
+    def __init__(self, builder: Callable[[], bytes], mimetype: str,
+                 status: int = 200, cache_control: str = 'no-cache',
+                 conditional: bool = True):
+        """
+        Inicializa la respuesta precalculada.
+
+        Args:
+            builder (callable): Función que devuelve el cuerpo en bytes
+            mimetype (str): Tipo MIME de la respuesta
+            status (int): Código de estado HTTP
+            cache_control (str): Valor de la cabecera Cache-Control
+            conditional (bool): Si se atienden peticiones condicionales (304)
+        """
+        self._builder = builder
+        self.mimetype = mimetype
+        self.status = status
+        self.cache_control = cache_control
+        self.conditional = conditional
+        self._body: Optional[bytes] = None
+        self._etag: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_built(self) -> bool:
+        """Indica si el cuerpo ya fue generado."""
+        return self._body is not None
+
+    def build(self) -> bytes:
+        """Genera el cuerpo (una sola vez) y devuelve los bytes almacenados."""
+        if self._body is None:
+            with self._lock:
+                if self._body is None:
+                    body = self._builder()
+                    if isinstance(body, str):
+                        body = body.encode('utf-8')
+                    self._etag = compute_etag(body)
+                    self._body = body
+        return self._body
+
+    @property
+    def etag(self) -> str:
+        """ETag fuerte del cuerpo."""
+        self.build()
+        return self._etag
+
+    def respond(self) -> Response:
+        """
+        Crea la respuesta HTTP a partir de los bytes almacenados.
+
+        Returns:
+            Response: Respuesta completa o 304 si el cliente ya tiene la versión
+        """
+        body = self.build()
+        response = current_app.response_class(body, status=self.status,
+                                              mimetype=self.mimetype)
+        response.headers['Cache-Control'] = self.cache_control
+
+        if self.conditional and self.status == 200:
+            response.set_etag(self._etag)
+            response.make_conditional(request)
+
+        return response
+
+
+class ResponseCache:
+    """
+    Registro de respuestas precalculadas identificadas por nombre.
+
+    Permite construir todas las respuestas de golpe (por ejemplo durante el
+    arranque del worker) o dejar que se generen en el primer uso.
+    """
+
+    def __init__(self):
+        """Inicializa el registro vacío."""
+        self._entries: Dict[str, PrebuiltResponse] = {}
+
+    def register(self, name: str, builder: Callable[[], bytes], mimetype: str,
+                 **kwargs) -> PrebuiltResponse:
+        """
+        Registra una nueva respuesta precalculada.
+
+        Args:
+            name (str): Identificador de la respuesta
+            builder (callable): Función que genera el cuerpo
+            mimetype (str): Tipo MIME de la respuesta
+            **kwargs: Opciones adicionales de ``PrebuiltResponse``
+
+        Returns:
+            PrebuiltResponse: Entrada registrada
+        """
+        entry = PrebuiltResponse(builder, mimetype, **kwargs)
+        self._entries[name] = entry
+        return entry
+
+    def respond(self, name: str) -> Response:
+        """Sirve la respuesta registrada con el nombre indicado."""
+        return self._entries[name].respond()
+
+    def prime(self):
+        """Construye todas las respuestas pendientes."""
+        for entry in self._entries.values():
+            entry.build()
+
+    def stats(self) -> Dict[str, int]:
+        """Obtiene el número de respuestas registradas y construidas."""
+        return {
+            'registered': len(self._entries),
+            'built': sum(1 for entry in self._entries.values() if entry.is_built)
+        }
+
+
+def compute_etag(body: bytes) -> str:
+    """Calcula un ETag fuerte a partir del contenido."""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def json_bytes(data) -> bytes:
+    """Serializa datos exactamente igual que ``jsonify``."""
+    return current_app.json.response(data).get_data()
@@ -0,0 +1,227 @@
+"""
+Idempotencia - Caché de respuestas por cabecera Idempotency-Key
+Los reintentos de un cliente con la misma clave reciben la respuesta original
+byte a byte, sin recalcular ni duplicar entradas del historial. Las peticiones
+duplicadas concurrentes esperan a que termine la primera ejecución.
+"""
+
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from flask import current_app, request
+
+
+class _Entry:
+    """Entrada de la caché: pendiente hasta que la primera ejecución termina."""
+
+    __slots__ = ('fingerprint', 'expires_at', 'status', 'headers', 'body', 'scope', 'done')
+
+    def __init__(self, fingerprint: str, expires_at: float):
+        self.fingerprint = fingerprint
+        self.expires_at = expires_at
+        self.status: Optional[int] = None
+        self.headers: Optional[list] = None
+        self.body: Optional[bytes] = None
+        self.scope: Optional[str] = None
+        self.done = threading.Event()
+
+
+class IdempotencyCache:
+    """
+    Caché acotada y con expiración de respuestas idempotentes.
+
+    Las entradas se guardan en un OrderedDict en orden de inserción: como
+    todas comparten el mismo TTL, las más antiguas son también las primeras
+    en expirar y la purga solo recorre el principio del diccionario.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 300.0, wait_timeout: float = 10.0):
+        """
+        Inicializa la caché.
+
+        Args:
+            max_entries (int): Número máximo de respuestas guardadas
+            ttl (float): Segundos que se conserva cada respuesta
+            wait_timeout (float): Espera máxima de un duplicado concurrente
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self._entries: 'OrderedDict[str, _Entry]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {
+            'hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+            'conflicts': 0,
+            'evictions': 0
+        }
+
+    def begin(self, key: str, fingerprint: str) -> Tuple[str, Optional[_Entry]]:
+        """
+        Registra el inicio de una petición con clave de idempotencia.
+
+        Args:
+            key (str): Clave de idempotencia (con el endpoint incluido)
+            fingerprint (str): Huella del cuerpo de la petición
+
+        Returns:
+            tuple: ('execute', entrada) si esta petición debe ejecutarse,
+            ('replay', entrada) si ya hay respuesta o hay que esperarla,
+            ('mismatch', None) si la clave se usó con otro cuerpo
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._purge(now)
+
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.fingerprint != fingerprint:
+                    self._counters['conflicts'] += 1
+                    return 'mismatch', None
+                if entry.done.is_set():
+                    self._counters['hits'] += 1
+                else:
+                    self._counters['coalesced'] += 1
+                return 'replay', entry
+
+            entry = _Entry(fingerprint, now + self.ttl)
+            self._entries[key] = entry
+            self._counters['misses'] += 1
+            if len(self._entries) > self.max_entries:
+                self._evict_oldest()
+            return 'execute', entry
+
+    def complete(self, entry: _Entry, status: int, headers: list, body: bytes,
+                 scope: Optional[str] = None):
+        """Guarda la respuesta de la primera ejecución y despierta a los duplicados."""
+        entry.status = status
+        entry.headers = headers
+        entry.body = body
+        entry.scope = scope
+        entry.done.set()
+
+    def alias(self, key: str, entry: _Entry):
+        """Registra una entrada terminada también con otra clave (si está libre)."""
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = entry
+                if len(self._entries) > self.max_entries:
+                    self._evict_oldest()
+
+    def abandon(self, key: str, entry: _Entry):
+        """Descarta una ejecución fallida para que un reintento vuelva a ejecutarla."""
+        with self._lock:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+        entry.done.set()
+
+    def _purge(self, now: float):
+        """Elimina las entradas expiradas (requiere el lock)."""
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if entry.expires_at > now:
+                break
+            del self._entries[key]
+
+    def _evict_oldest(self):
+        """Elimina la entrada terminada más antigua (requiere el lock)."""
+        for key, entry in self._entries.items():
+            if entry.done.is_set():
+                del self._entries[key]
+                self._counters['evictions'] += 1
+                return
+
+    def stats(self) -> Dict[str, int]:
+        """Obtiene el tamaño de la caché y sus contadores."""
+        with self._lock:
+            return {
+                **self._counters,
+                'size': len(self._entries),
+                'max_entries': self.max_entries
+            }
+
+
+def idempotent(get_cache: Callable[[], IdempotencyCache],
+               scope: Optional[Callable[[], str]] = None,
+               adopt_scope: Optional[Callable[[str], None]] = None):
+    """
+    Decorador que aplica la cabecera Idempotency-Key a una vista.
+
+    La clave también se acepta en el parámetro de consulta ``idempotency_key``
+    para los clientes que no pueden enviar cabeceras (``navigator.sendBeacon``).
+
+    Las respuestas 5xx y las marcadas con ``Cache-Control: no-store`` (un
+    lote con errores transitorios) no se guardan para que el cliente pueda
+    reintentar.
+
+    Args:
+        get_cache (callable): Devuelve la caché a usar en la petición actual
+        scope (callable, optional): Devuelve el ámbito de las claves (por
+            ejemplo la sesión), para que dos clientes no compartan respuestas.
+            Si la ejecución cambia el ámbito (crea la sesión), la respuesta se
+            guarda en los dos
+        adopt_scope (callable, optional): Recibe el ámbito con el que terminó la
+            primera ejecución cuando su respuesta se repite en otro ámbito (un
+            reintento sin la cookie de sesión que creó esa ejecución)
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            header = request.headers.get('Idempotency-Key') or request.args.get('idempotency_key')
+            if not header:
+                return view(*args, **kwargs)
+
+            if len(header) > 255:
+                return current_app.json.response(
+                    {"error": "Error: Idempotency-Key demasiado larga"}), 400
+
+            cache = get_cache()
+            initial_scope = scope() if scope else ''
+            key = f"{request.method} {request.path} {initial_scope} {header}"
+            fingerprint = hashlib.blake2b(request.get_data(), digest_size=16).hexdigest()
+            action, entry = cache.begin(key, fingerprint)
+
+            if action == 'mismatch':
+                return current_app.json.response(
+                    {"error": "Error: Idempotency-Key reutilizada con otra petición"}), 422
+
+            if action == 'replay':
+                if not entry.done.wait(cache.wait_timeout) or entry.body is None:
+                    return current_app.json.response(
+                        {"error": "Error: Petición con la misma Idempotency-Key en curso"}), 409
+                if adopt_scope and entry.scope not in (None, initial_scope):
+                    adopt_scope(entry.scope)
+                return _replay(entry)
+
+            try:
+                response = current_app.make_response(view(*args, **kwargs))
+            except Exception:
+                cache.abandon(key, entry)
+                raise
+
+            if (response.status_code >= 500 or response.is_streamed or
+                    'no-store' in response.headers.get('Cache-Control', '')):
+                cache.abandon(key, entry)
+                return response
+
+            final_scope = scope() if scope else ''
+            cache.complete(entry, response.status_code,
+                           list(response.headers.items()), response.get_data(), final_scope)
+            if final_scope != initial_scope:
+                cache.alias(f"{request.method} {request.path} {final_scope} {header}", entry)
+            return response
+
+        return wrapper
+    return decorator
+
+
+def _replay(entry: _Entry):
+    """Reconstruye la respuesta guardada, idéntica byte a byte."""
+    response = current_app.response_class(entry.body, status=entry.status, headers=entry.headers)
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
@@ -0,0 +1,462 @@
+"""
+Memoria - Diagnóstico del uso de memoria del worker
+Herramientas para localizar el crecimiento de memoria de un worker de larga
+duración:
+
+- ``MemoryProfiler``: arranca y detiene ``tracemalloc``, guarda un número
+  acotado de snapshots y devuelve los puntos de asignación con más memoria y
+  las diferencias entre dos snapshots.
+- ``GCMonitor``: cuenta las recolecciones de cada generación del recolector
+  de ciclos y su duración (``gc.callbacks``).
+- ``MemorySampler``: hilo que registra periódicamente el RSS, los contadores
+  del GC y las peticiones atendidas desde la muestra anterior, para
+  relacionar el crecimiento con el tráfico.
+
+``install_memory_diagnostics`` los conecta a la aplicación; el endpoint
+protegido /debug/memory y GET /metrics los exponen.
+"""
+
+import gc
+import linecache
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, OrderedDict, deque
+from typing import Callable, Dict, List, Optional
+
+from flask import Flask
+
+from ..models.errors import ErrorCode
+
+try:
+    import resource
+except ImportError:  # Windows: sin getrusage
+    resource = None
+
+# Agrupaciones de tracemalloc admitidas
+GROUP_BY = ('lineno', 'filename', 'traceback')
+
+# Marcos de pila guardados por asignación (más marcos, más sobrecoste)
+MAX_TRACEBACK_FRAMES = 64
+
+# Asignaciones del propio diagnóstico y de la maquinaria de imports
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, linecache.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>')
+)
+
+
+def read_rss() -> Optional[int]:
+    """RSS actual del proceso en bytes (/proc en Linux), o None si no se puede leer."""
+    try:
+        with open('/proc/self/statm', 'rb') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def read_peak_rss() -> Optional[int]:
+    """RSS máximo alcanzado por el proceso en bytes, o None si no está disponible."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss está en KiB en Linux y en bytes en macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class GCMonitor:
+    """Recolecciones y pausas del recolector de ciclos por generación."""
+
+    def __init__(self):
+        self._start: Optional[float] = None
+        self._pause_ms = [0.0, 0.0, 0.0]
+        self._max_pause_ms = [0.0, 0.0, 0.0]
+
+    def install(self):
+        """Registra el monitor en ``gc.callbacks``."""
+        if self._callback not in gc.callbacks:
+            gc.callbacks.append(self._callback)
+
+    def uninstall(self):
+        """Retira el monitor de ``gc.callbacks``."""
+        if self._callback in gc.callbacks:
+            gc.callbacks.remove(self._callback)
+
+    def _callback(self, phase: str, info: Dict[str, int]):
+        # El GC no es reentrante: 'start' y 'stop' llegan siempre en pareja
+        if phase == 'start':
+            self._start = time.perf_counter()
+        elif self._start is not None:
+            elapsed = (time.perf_counter() - self._start) * 1000
+            generation = info['generation']
+            self._pause_ms[generation] += elapsed
+            if elapsed > self._max_pause_ms[generation]:
+                self._max_pause_ms[generation] = elapsed
+            self._start = None
+
+    def stats(self) -> Dict[str, object]:
+        """Contadores por generación, umbrales y objetos no recolectables."""
+        generations = []
+        for generation, stats in enumerate(gc.get_stats()):
+            generations.append({
+                **stats,
+                'pause_ms': round(self._pause_ms[generation], 3),
+                'max_pause_ms': round(self._max_pause_ms[generation], 3)
+            })
+        return {
+            'enabled': gc.isenabled(),
+            'counts': list(gc.get_count()),
+            'thresholds': list(gc.get_threshold()),
+            'generations': generations,
+            'garbage': len(gc.garbage)
+        }
+
+
+class MemoryProfiler:
+    """Control de ``tracemalloc`` y snapshots numerados (se conservan los últimos)."""
+
+    def __init__(self, max_snapshots: int = 8):
+        """
+        Args:
+            max_snapshots (int): Snapshots conservados (cada uno ocupa memoria)
+        """
+        self.max_snapshots = max_snapshots
+        self._snapshots: 'OrderedDict[int, tracemalloc.Snapshot]' = OrderedDict()
+        self._taken_at: Dict[int, float] = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def start(self, frames: int = 1):
+        """Empieza a trazar asignaciones guardando ``frames`` marcos por asignación."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def stop(self):
+        """Deja de trazar (los snapshots ya tomados se conservan)."""
+        tracemalloc.stop()
+
+    def take_snapshot(self) -> Optional[int]:
+        """
+        Toma un snapshot de las asignaciones trazadas.
+
+        Returns:
+            int: Identificador del snapshot, o None si tracemalloc no está activo
+        """
+        if not tracemalloc.is_tracing():
+            return None
+        snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        with self._lock:
+            snapshot_id = self._next_id
+            self._next_id += 1
+            self._snapshots[snapshot_id] = snapshot
+            self._taken_at[snapshot_id] = time.time()
+            while len(self._snapshots) > self.max_snapshots:
+                expired, _ = self._snapshots.popitem(last=False)
+                del self._taken_at[expired]
+        return snapshot_id
+
+    def has_snapshot(self, snapshot_id) -> bool:
+        """Si existe un snapshot con ese identificador."""
+        return type(snapshot_id) is int and snapshot_id in self._snapshots
+
+    def top(self, snapshot_id: int, group_by: str = 'lineno',
+            limit: int = 20) -> Optional[List[Dict[str, object]]]:
+        """
+        Puntos de asignación con más memoria de un snapshot.
+
+        Returns:
+            list: Un elemento por punto de asignación, o None si el snapshot no existe
+        """
+        snapshot = self._snapshots.get(snapshot_id)
+        if snapshot is None:
+            return None
+        return [_format_stat(stat) for stat in snapshot.statistics(group_by)[:limit]]
+
+    def diff(self, base_id: int, target_id: int, group_by: str = 'lineno',
+             limit: int = 20) -> Optional[List[Dict[str, object]]]:
+        """
+        Diferencias entre dos snapshots, de mayor a menor crecimiento absoluto.
+
+        Returns:
+            list: Un elemento por punto de asignación, o None si algún snapshot no existe
+        """
+        base, target = self._snapshots.get(base_id), self._snapshots.get(target_id)
+        if base is None or target is None:
+            return None
+        return [{**_format_stat(stat), 'size_diff': stat.size_diff, 'count_diff': stat.count_diff}
+                for stat in target.compare_to(base, group_by)[:limit]]
+
+    def clear(self):
+        """Descarta los snapshots guardados."""
+        with self._lock:
+            self._snapshots.clear()
+            self._taken_at.clear()
+
+    def status(self) -> Dict[str, object]:
+        """Estado de tracemalloc y snapshots guardados."""
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        with self._lock:
+            snapshots = [{'id': snapshot_id, 'taken_at': self._taken_at[snapshot_id],
+                          'traces': len(snapshot.traces)}
+                         for snapshot_id, snapshot in self._snapshots.items()]
+        return {
+            'tracing': tracing,
+            'frames': tracemalloc.get_traceback_limit() if tracing else None,
+            'traced_bytes': current,
+            'peak_traced_bytes': peak,
+            'overhead_bytes': tracemalloc.get_tracemalloc_memory(),
+            'snapshots': snapshots
+        }
+
+
+class MemorySampler:
+    """
+    Muestras periódicas de RSS, GC y tráfico registradas en el log.
+
+    El hilo se arranca en la primera petición de cada proceso: con
+    ``gunicorn --preload`` los hilos creados en el maestro no sobreviven al
+    fork de los workers.
+    """
+
+    def __init__(self, interval: float, logger=None,
+                 collect: Optional[Callable[[], Dict[str, object]]] = None, max_samples: int = 120):
+        """
+        Args:
+            interval (float): Segundos entre muestras (0 desactiva el muestreo)
+            logger (logging.Logger, optional): Destino de cada muestra
+            collect (callable, optional): Datos adicionales de cada muestra
+            max_samples (int): Muestras recientes conservadas en memoria
+        """
+        self.interval = interval
+        self.logger = logger
+        self.collect = collect
+        self.samples: deque = deque(maxlen=max_samples)
+        self._requests = 0
+        self._sampled_requests = 0
+        self._pid: Optional[int] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def note_request(self):
+        """Cuenta una petición y arranca el hilo si este proceso aún no lo tiene."""
+        self._requests += 1
+        if self._pid != os.getpid() and self.interval > 0:
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._pid = os.getpid()
+                    self._stop = threading.Event()
+                    threading.Thread(target=self._run, name='memory-sampler', daemon=True).start()
+
+    def stop(self):
+        """Detiene el hilo de muestreo."""
+        self._stop.set()
+
+    def _run(self):
+        stop = self._stop
+        while not stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                if self.logger is not None:
+                    self.logger.warning('Memory sample failed: %s', e)
+
+    def sample(self) -> Dict[str, object]:
+        """Toma una muestra, la guarda y la registra en el log."""
+        requests = self._requests
+        sample = {
+            'ts': round(time.time(), 3),
+            'rss_bytes': read_rss(),
+            'requests': requests - self._sampled_requests,
+            'gc_counts': list(gc.get_count()),
+            'gc_collections': [stats['collections'] for stats in gc.get_stats()]
+        }
+        self._sampled_requests = requests
+        if tracemalloc.is_tracing():
+            sample['traced_bytes'] = tracemalloc.get_traced_memory()[0]
+        if self.collect is not None:
+            sample.update(self.collect())
+        self.samples.append(sample)
+
+        if self.logger is not None:
+            rss = sample['rss_bytes']
+            self.logger.info('Memory sample: rss=%s MB requests=%d gc_counts=%s gc_collections=%s',
+                             f'{rss / 1e6:.1f}' if rss is not None else '?', sample['requests'],
+                             sample['gc_counts'], sample['gc_collections'])
+        return sample
+
+    def stats(self) -> Dict[str, object]:
+        """Intervalo, última muestra y crecimiento del RSS entre las muestras guardadas."""
+        samples = list(self.samples)
+        stats = {
+            'interval_s': self.interval,
+            'running': self._pid == os.getpid() and not self._stop.is_set(),
+            'samples': len(samples),
+            'last': samples[-1] if samples else None
+        }
+        if len(samples) > 1 and samples[0]['rss_bytes'] is not None and samples[-1]['rss_bytes'] is not None:
+            stats['rss_growth_bytes'] = samples[-1]['rss_bytes'] - samples[0]['rss_bytes']
+            stats['rss_growth_window_s'] = round(samples[-1]['ts'] - samples[0]['ts'], 3)
+        return stats
+
+
+class MemoryDiagnostics:
+    """Profiler, monitor del GC y sampler de una aplicación."""
+
+    def __init__(self, profiler: MemoryProfiler, gc_monitor: GCMonitor, sampler: MemorySampler):
+        self.profiler = profiler
+        self.gc_monitor = gc_monitor
+        self.sampler = sampler
+        self.started_at = time.time()
+
+    def summary(self) -> Dict[str, object]:
+        """Resumen barato para GET /metrics (sin recorrer estructuras)."""
+        return {
+            'rss_bytes': read_rss(),
+            'peak_rss_bytes': read_peak_rss(),
+            'gc': self.gc_monitor.stats(),
+            'sampler': self.sampler.stats(),
+            'tracemalloc': tracemalloc.is_tracing()
+        }
+
+    def report(self, extension: Dict[str, object], types: int = 0) -> Dict[str, object]:
+        """
+        Informe completo: proceso, GC, tracemalloc, tamaños de las estructuras
+        del modelo y muestras recientes.
+
+        Args:
+            extension (dict): ``app.extensions['calculator']``
+            types (int): Tipos de objeto más numerosos a incluir (0 = ninguno;
+                recorre todos los objetos del GC)
+        """
+        report = {
+            'process': {
+                'pid': os.getpid(),
+                'uptime_s': round(time.time() - self.started_at, 3),
+                'rss_bytes': read_rss(),
+                'peak_rss_bytes': read_peak_rss()
+            },
+            'gc': self.gc_monitor.stats(),
+            'tracemalloc': self.profiler.status(),
+            'objects': {
+                'model': extension['model'].footprint(),
+                'sessions': extension['sessions'].footprint(),
+                'responses': extension['responses'].stats(),
+                'idempotency': extension['idempotency'].stats()
+            },
+            'samples': list(self.sampler.samples)
+        }
+        if types > 0:
+            report['types'] = dict(Counter(type(obj).__name__ for obj in gc.get_objects()).most_common(types))
+        return report
+
+    def run_action(self, data) -> Dict[str, object]:
+        """
+        Ejecuta una acción de POST /debug/memory.
+
+        Args:
+            data: Objeto JSON con 'action' ('start', 'stop', 'snapshot', 'top',
+                'diff', 'collect' o 'clear') y sus parámetros: 'frames',
+                'snapshot', 'base', 'target', 'group_by', 'limit'
+
+        Returns:
+            dict: Resultado de la acción, o 'error_code' si no puede ejecutarse
+        """
+        data = data if isinstance(data, dict) else {}
+        action = data.get('action')
+        group_by = data.get('group_by', 'lineno')
+        limit = data.get('limit', 20)
+        if group_by not in GROUP_BY:
+            return {'error_code': ErrorCode.INVALID_PARAMETER, 'parameter': 'group_by'}
+        if type(limit) is not int or not 0 < limit <= 1000:
+            return {'error_code': ErrorCode.INVALID_PARAMETER, 'parameter': 'limit'}
+
+        if action == 'start':
+            frames = data.get('frames', 1)
+            if type(frames) is not int or not 0 < frames <= MAX_TRACEBACK_FRAMES:
+                return {'error_code': ErrorCode.INVALID_PARAMETER, 'parameter': 'frames'}
+            self.profiler.start(frames)
+            return {'tracemalloc': self.profiler.status()}
+        if action == 'stop':
+            self.profiler.stop()
+            return {'tracemalloc': self.profiler.status()}
+        if action == 'clear':
+            self.profiler.clear()
+            return {'tracemalloc': self.profiler.status()}
+        if action == 'collect':
+            before = read_rss()
+            collected = gc.collect()
+            return {'collected': collected, 'rss_before_bytes': before, 'rss_after_bytes': read_rss()}
+
+        if action == 'snapshot':
+            snapshot_id = self.profiler.take_snapshot()
+            if snapshot_id is None:
+                return {'error_code': ErrorCode.TRACEMALLOC_NOT_RUNNING}
+            return {'snapshot': snapshot_id, 'top': self.profiler.top(snapshot_id, group_by, limit)}
+        if action == 'top':
+            snapshot_id = data.get('snapshot')
+            if not self.profiler.has_snapshot(snapshot_id):
+                return {'error_code': ErrorCode.SNAPSHOT_NOT_FOUND, 'snapshot': str(snapshot_id)[:64]}
+            return {'snapshot': snapshot_id, 'top': self.profiler.top(snapshot_id, group_by, limit)}
+        if action == 'diff':
+            base, target = data.get('base'), data.get('target')
+            for snapshot_id in (base,) if target is None else (base, target):
+                if not self.profiler.has_snapshot(snapshot_id):
+                    return {'error_code': ErrorCode.SNAPSHOT_NOT_FOUND, 'snapshot': str(snapshot_id)[:64]}
+            # Sin 'target' se compara con un snapshot nuevo
+            if target is None:
+                target = self.profiler.take_snapshot()
+                if target is None:
+                    return {'error_code': ErrorCode.TRACEMALLOC_NOT_RUNNING}
+            return {'base': base, 'target': target,
+                    'diff': self.profiler.diff(base, target, group_by, limit)}
+
+        return {'error_code': ErrorCode.INVALID_ACTION, 'action': str(action)[:64]}
+
+
+def _format_stat(stat: tracemalloc.Statistic) -> Dict[str, object]:
+    """Punto de asignación: marcos 'fichero:línea' (con la línea de código del primero)."""
+    frames = [f'{frame.filename}:{frame.lineno}' for frame in stat.traceback]
+    first = stat.traceback[0]
+    return {
+        'site': frames[0],
+        'code': linecache.getline(first.filename, first.lineno).strip(),
+        'traceback': frames if len(frames) > 1 else None,
+        'size': stat.size,
+        'count': stat.count
+    }
+
+
+def install_memory_diagnostics(app: Flask) -> MemoryDiagnostics:
+    """
+    Crea el diagnóstico de memoria de la aplicación.
+
+    Registra el monitor del GC, el sampler (que arranca con la primera
+    petición) y el resumen de GET /metrics.
+
+    Args:
+        app (Flask): Instancia de la aplicación Flask
+
+    Returns:
+        MemoryDiagnostics: Diagnóstico instalado (expuesto en /debug/memory)
+    """
+    extension = app.extensions['calculator']
+    gc_monitor = GCMonitor()
+    gc_monitor.install()
+    sampler = MemorySampler(app.config['MEMORY_SAMPLE_INTERVAL'], app.logger,
+                            collect=lambda: {'sessions': len(extension['sessions'])})
+    diagnostics = MemoryDiagnostics(MemoryProfiler(app.config['DEBUG_MEMORY_MAX_SNAPSHOTS']),
+                                    gc_monitor, sampler)
+
+    @app.before_request
+    def count_request():
+        sampler.note_request()
+
+    extension['memory'] = diagnostics
+    extension['metrics']['memory'] = diagnostics.summary
+    return diagnostics
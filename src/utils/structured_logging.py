@@ -0,0 +1,200 @@
+"""
+Logging Estructurado - Registro asíncrono en formato JSON
+Los hilos de las peticiones solo encolan los registros; un hilo escritor
+dedicado los formatea y los escribe en disco (incluida la rotación), de modo
+que las peticiones nunca se bloquean en operaciones de fichero.
+"""
+
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Union
+
+from flask import Flask, g, request
+from flask.logging import default_handler
+
+# Campos estructurados admitidos mediante ``extra=``
+STRUCTURED_FIELDS = ('route', 'method', 'operation', 'status', 'latency_ms', 'trace_id')
+
+
+class JsonFormatter(logging.Formatter):
+    """Formatea cada registro como una línea JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Convierte el registro en JSON. El mensaje se interpola aquí, en el
+        hilo escritor, y no en el hilo de la petición.
+        """
+        entry = {
+            'ts': round(record.created, 6),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'source': f'{record.pathname}:{record.lineno}'
+        }
+
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler que nunca bloquea ni formatea en el hilo de la petición.
+
+    Si la cola está llena el registro se descarta y se contabiliza, en lugar
+    de frenar la petición.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Encola el registro sin formatear (formateo perezoso en el escritor)."""
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        """Encola sin esperar; descarta el registro si la cola está llena."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LoggingStats:
+    """Mide el coste de logging en el hilo de cada petición frente a un presupuesto."""
+
+    def __init__(self, budget_us: float):
+        """
+        Args:
+            budget_us (float): Presupuesto de coste de logging por petición (microsegundos)
+        """
+        self.budget_us = budget_us
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._total_us = 0.0
+        self._max_us = 0.0
+        self._over_budget = 0
+
+    def record(self, elapsed_us: float):
+        """Registra el coste de logging de una petición."""
+        with self._lock:
+            self._requests += 1
+            self._total_us += elapsed_us
+            if elapsed_us > self._max_us:
+                self._max_us = elapsed_us
+            if elapsed_us > self.budget_us:
+                self._over_budget += 1
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Obtiene el coste medio y máximo frente al presupuesto."""
+        with self._lock:
+            average = self._total_us / self._requests if self._requests else 0.0
+            return {
+                'requests': self._requests,
+                'avg_overhead_us': round(average, 2),
+                'max_overhead_us': round(self._max_us, 2),
+                'budget_us': self.budget_us,
+                'over_budget': self._over_budget
+            }
+
+
+def start_queue_logging(app: Flask, handler: logging.Handler) -> QueueListener:
+    """
+    Conecta el logger de la aplicación a una cola atendida por un hilo escritor.
+
+    Args:
+        app (Flask): Instancia de la aplicación Flask
+        handler (logging.Handler): Handler final (fichero) usado por el escritor
+
+    Returns:
+        QueueListener: Escritor en segundo plano ya iniciado
+    """
+    log_queue = queue.Queue(maxsize=app.config.get('LOG_QUEUE_SIZE', 10000))
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.setLevel(handler.level)
+
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+
+    # El logger se comparte entre aplicaciones con el mismo nombre: quitar la
+    # cola de una instancia anterior y el handler síncrono por defecto de Flask
+    for existing in list(app.logger.handlers):
+        if isinstance(existing, NonBlockingQueueHandler) or existing is default_handler:
+            app.logger.removeHandler(existing)
+
+    app.logger.addHandler(queue_handler)
+    app.extensions.setdefault('logging', {})['queue_handler'] = queue_handler
+    app.extensions['logging']['listener'] = listener
+    return listener
+
+
+def install_access_log(app: Flask) -> LoggingStats:
+    """
+    Registra un log de acceso estructurado y muestreado para cada petición.
+
+    Las respuestas 5xx se registran siempre; el resto según
+    ``ACCESS_LOG_SAMPLE_RATE`` (0.0 - 1.0).
+
+    Args:
+        app (Flask): Instancia de la aplicación Flask
+
+    Returns:
+        LoggingStats: Medidor del coste de logging por petición
+    """
+    sample_rate = app.config.get('ACCESS_LOG_SAMPLE_RATE', 0.1)
+    logging_stats = LoggingStats(app.config.get('LOG_OVERHEAD_BUDGET_US', 50.0))
+    logger = app.logger
+
+    @app.before_request
+    def start_request_timer():
+        """Marca el inicio de la petición."""
+        g.request_start = time.perf_counter()
+
+    @app.after_request
+    def access_log(response):
+        """Encola el registro de acceso si la petición fue muestreada."""
+        start = g.get('request_start')
+        if start is None:
+            return response
+
+        log_start = time.perf_counter()
+        if response.status_code >= 500 or random.random() < sample_rate:
+            if logger.isEnabledFor(logging.INFO):
+                logger.info('%s %s %s', request.method, request.path, response.status_code, extra={
+                    'route': request.url_rule.rule if request.url_rule else request.path,
+                    'method': request.method,
+                    'operation': g.get('operation'),
+                    'status': response.status_code,
+                    'latency_ms': round((log_start - start) * 1000, 3),
+                    'trace_id': g.get('trace_id')
+                })
+        logging_stats.record((time.perf_counter() - log_start) * 1e6)
+        return response
+
+    app.extensions.setdefault('logging', {})['stats'] = logging_stats
+    return logging_stats
+
+
+def logging_metrics(app: Flask) -> Dict[str, Union[int, float]]:
+    """Obtiene las métricas del pipeline de logging de la aplicación."""
+    extension = app.extensions.get('logging', {})
+    metrics = extension['stats'].stats() if 'stats' in extension else {}
+
+    queue_handler = extension.get('queue_handler')
+    if queue_handler is not None:
+        metrics['queued'] = queue_handler.queue.qsize()
+        metrics['dropped'] = queue_handler.dropped
+
+    return metrics
@@ -0,0 +1,440 @@
+"""
+Trazas - Trazador mínimo con exportación OTLP/JSON a fichero
+Permite seguir una petición a través de la ruta y del modelo
+(calculate → validate_inputs → perform_calculation → _add_to_history → jsonify).
+
+El identificador de traza se propaga desde la cabecera ``traceparent`` (W3C).
+Todas las trazas registran sus spans en memoria y al terminar se decide si se
+exportan: por muestreo de cabecera (``sample_rate``) o siempre que la petición
+haya superado el umbral de lentitud. El indicador de muestreo de un
+``traceparent`` recibido solo se respeta hasta ``forced_per_second`` trazas por
+segundo; por encima se aplica el muestreo local. El fichero de exportación rota
+al alcanzar ``max_bytes``. Sin traza activa, ``span`` no hace nada.
+"""
+
+import contextvars
+import functools
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from flask import Flask, g, request
+
+TRACEPARENT_PATTERN = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$')
+
+# Límite de spans por traza para acotar la memoria de peticiones anómalas
+MAX_SPANS_PER_TRACE = 256
+
+_current_trace: contextvars.ContextVar = contextvars.ContextVar('calculator_trace', default=None)
+_current_span: contextvars.ContextVar = contextvars.ContextVar('calculator_span', default=None)
+
+
+class Span:
+    """Un tramo de trabajo dentro de una traza."""
+
+    __slots__ = ('trace_id', 'span_id', 'parent_id', 'name', 'kind',
+                 'start_ns', 'end_ns', 'attributes', 'error')
+
+    def __init__(self, trace_id: str, parent_id: Optional[str], name: str, kind: int = 1):
+        self.trace_id = trace_id
+        self.span_id = _random_id(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes: Dict[str, object] = {}
+        self.error = False
+
+    def set_attribute(self, key: str, value):
+        """Agrega un atributo al span."""
+        self.attributes[key] = value
+
+    def to_otlp(self) -> Dict:
+        """Convierte el span al formato OTLP/JSON."""
+        otlp = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns),
+            'attributes': [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            'status': {'code': 2 if self.error else 1}
+        }
+        if self.parent_id:
+            otlp['parentSpanId'] = self.parent_id
+        return otlp
+
+
+class _Trace:
+    """Estado de la traza activa en la petición actual."""
+
+    __slots__ = ('trace_id', 'sampled', 'spans', 'root', 'token_trace', 'token_span')
+
+    def __init__(self, trace_id: str, sampled: bool):
+        self.trace_id = trace_id
+        self.sampled = sampled
+        self.spans: List[Span] = []
+        self.root: Optional[Span] = None
+        self.token_trace = None
+        self.token_span = None
+
+
+class BufferedSpanExporter:
+    """
+    Exportador en segundo plano que escribe trazas OTLP/JSON (una por línea).
+
+    Las trazas se encolan sin bloquear y un hilo dedicado las escribe por
+    lotes; si la cola está llena, la traza se descarta y se contabiliza.
+    """
+
+    def __init__(self, path: str, service_name: str = 'calculator-web',
+                 max_queue: int = 1000, flush_interval: float = 1.0,
+                 max_bytes: int = 0, backup_count: int = 0):
+        """
+        Args:
+            path (str): Fichero de destino (por ejemplo logs/traces.jsonl)
+            service_name (str): Valor del atributo de recurso service.name
+            max_queue (int): Trazas pendientes como máximo
+            flush_interval (float): Segundos entre escrituras
+            max_bytes (int): Tamaño a partir del cual el fichero rota (0 = sin límite)
+            backup_count (int): Ficheros rotados que se conservan (path.1 ... path.N)
+        """
+        self.path = path
+        self.service_name = service_name
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.exported = 0
+        self.dropped = 0
+        self.rotations = 0
+
+    def export(self, spans: List[Span]):
+        """Encola los spans de una traza terminada."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_started(self):
+        """Arranca el hilo escritor en la primera exportación."""
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name='trace-exporter', daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        """Bucle del hilo escritor."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch: List[List[Span]]):
+        """Escribe un lote de trazas en el fichero."""
+        lines = []
+        for spans in batch:
+            lines.append(json.dumps({
+                'resourceSpans': [{
+                    'resource': {'attributes': [_otlp_attribute('service.name', self.service_name)]},
+                    'scopeSpans': [{
+                        'scope': {'name': 'calculator.tracing'},
+                        'spans': [span.to_otlp() for span in spans]
+                    }]
+                }]
+            }, ensure_ascii=False))
+
+        data = ('\n'.join(lines) + '\n').encode('utf-8')
+        try:
+            self._rotate_if_needed(len(data))
+            with open(self.path, 'ab') as trace_file:
+                trace_file.write(data)
+            self.exported += len(batch)
+        except OSError:
+            self.dropped += len(batch)
+
+    def _rotate_if_needed(self, incoming: int):
+        """
+        Rota el fichero si la escritura pendiente superaría ``max_bytes``,
+        igual que RotatingFileHandler: path → path.1 → ... → path.N. Sin
+        copias de respaldo, el fichero se trunca.
+
+        Args:
+            incoming (int): Bytes que se van a escribir
+        """
+        if self.max_bytes <= 0:
+            return
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if size == 0 or size + incoming <= self.max_bytes:
+            return
+
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f'{self.path}.{index}'
+                if os.path.exists(source):
+                    os.replace(source, f'{self.path}.{index + 1}')
+            os.replace(self.path, f'{self.path}.1')
+        else:
+            os.remove(self.path)
+        self.rotations += 1
+
+
+class Tracer:
+    """Crea trazas por petición y decide cuáles se exportan."""
+
+    def __init__(self, exporter: Optional[BufferedSpanExporter] = None,
+                 sample_rate: float = 0.01, slow_threshold_ms: float = 200.0,
+                 forced_per_second: float = 10.0):
+        """
+        Args:
+            exporter (BufferedSpanExporter, optional): Destino de las trazas
+            sample_rate (float): Fracción de trazas exportadas por muestreo (0.0 - 1.0)
+            slow_threshold_ms (float): Duración a partir de la cual se exporta siempre
+            forced_per_second (float): Trazas por segundo que un ``traceparent``
+                muestreado puede forzar; por encima se aplica ``sample_rate``
+        """
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.slow_threshold_ns = int(slow_threshold_ms * 1_000_000)
+        self.forced_per_second = forced_per_second
+        self._forced_tokens = max(forced_per_second, 1.0) if forced_per_second > 0 else 0.0
+        self._forced_updated = time.monotonic()
+        self._forced_lock = threading.Lock()
+        self.finished = 0
+        self.exported_slow = 0
+        self.forced_limited = 0
+
+    def start_trace(self, name: str, traceparent: Optional[str] = None) -> Span:
+        """
+        Inicia la traza de una petición y activa su span raíz.
+
+        Args:
+            name (str): Nombre del span raíz
+            traceparent (str, optional): Cabecera W3C recibida
+
+        Returns:
+            Span: Span raíz de la traza
+        """
+        parent_id = None
+        match = TRACEPARENT_PATTERN.match(traceparent or '')
+        if match and match.group(1) != '0' * 32:
+            trace_id, parent_id = match.group(1), match.group(2)
+            forced = bool(int(match.group(3), 16) & 0x01) and self._take_forced()
+            sampled = forced or random.random() < self.sample_rate
+        else:
+            trace_id = _random_id(16)
+            sampled = random.random() < self.sample_rate
+
+        trace = _Trace(trace_id, sampled)
+        root = Span(trace_id, parent_id, name, kind=2)
+        trace.root = root
+        trace.spans.append(root)
+        trace.token_trace = _current_trace.set(trace)
+        trace.token_span = _current_span.set(root)
+        return root
+
+    def _take_forced(self) -> bool:
+        """
+        Consume un permiso del cubo de muestreo forzado por el cliente.
+
+        Returns:
+            bool: True si el indicador de muestreo recibido se respeta
+        """
+        if self.forced_per_second <= 0:
+            self.forced_limited += 1
+            return False
+        with self._forced_lock:
+            now = time.monotonic()
+            capacity = max(self.forced_per_second, 1.0)
+            self._forced_tokens = min(
+                capacity, self._forced_tokens + (now - self._forced_updated) * self.forced_per_second)
+            self._forced_updated = now
+            if self._forced_tokens >= 1.0:
+                self._forced_tokens -= 1.0
+                return True
+            self.forced_limited += 1
+            return False
+
+    def end_trace(self):
+        """Cierra la traza activa y la exporta si fue muestreada o es lenta."""
+        trace = _current_trace.get()
+        if trace is None:
+            return
+
+        root = trace.root
+        if not root.end_ns:
+            root.end_ns = time.time_ns()
+
+        _current_span.reset(trace.token_span)
+        _current_trace.reset(trace.token_trace)
+        self.finished += 1
+
+        slow = root.end_ns - root.start_ns >= self.slow_threshold_ns
+        if self.exporter is not None and (trace.sampled or slow):
+            if slow and not trace.sampled:
+                self.exported_slow += 1
+            self.exporter.export(trace.spans)
+
+    def stats(self) -> Dict[str, object]:
+        """Obtiene los contadores del trazador y del exportador."""
+        stats = {
+            'finished': self.finished,
+            'exported_slow': self.exported_slow,
+            'forced_limited': self.forced_limited,
+            'sample_rate': self.sample_rate,
+            'forced_per_second': self.forced_per_second,
+            'slow_threshold_ms': self.slow_threshold_ns / 1_000_000
+        }
+        if self.exporter is not None:
+            stats['exported'] = self.exporter.exported
+            stats['dropped'] = self.exporter.dropped
+            stats['rotations'] = self.exporter.rotations
+        return stats
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Abre un span hijo del span actual. Sin traza activa no hace nada.
+
+    Args:
+        name (str): Nombre del span
+        **attributes: Atributos iniciales del span
+    """
+    trace = _current_trace.get()
+    if trace is None or len(trace.spans) >= MAX_SPANS_PER_TRACE:
+        yield None
+        return
+
+    parent = _current_span.get()
+    child = Span(trace.trace_id, parent.span_id if parent else None, name)
+    child.attributes.update(attributes)
+    trace.spans.append(child)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException:
+        child.error = True
+        raise
+    finally:
+        child.end_ns = time.time_ns()
+        _current_span.reset(token)
+
+
+def traced(name: str):
+    """Decorador que envuelve una función en un span con el nombre indicado."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_trace.get() is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_trace_id() -> Optional[str]:
+    """Identificador de la traza activa, si existe."""
+    trace = _current_trace.get()
+    return trace.trace_id if trace is not None else None
+
+
+def install_tracing(app: Flask) -> Tracer:
+    """
+    Traza cada petición de la aplicación.
+
+    Args:
+        app (Flask): Instancia de la aplicación Flask
+
+    Returns:
+        Tracer: Trazador instalado
+    """
+    exporter = BufferedSpanExporter(
+        app.config['TRACE_EXPORT_PATH'],
+        max_bytes=app.config['TRACE_EXPORT_MAX_BYTES'],
+        backup_count=app.config['TRACE_EXPORT_BACKUPS']
+    )
+    tracer = Tracer(
+        exporter,
+        sample_rate=app.config['TRACE_SAMPLE_RATE'],
+        slow_threshold_ms=app.config['TRACE_SLOW_THRESHOLD_MS'],
+        forced_per_second=app.config['TRACE_FORCED_PER_SECOND']
+    )
+
+    @app.before_request
+    def start_request_trace():
+        """Abre el span raíz de la petición."""
+        root = tracer.start_trace(f'{request.method} {request.path}',
+                                  request.headers.get('traceparent'))
+        root.set_attribute('http.method', request.method)
+        root.set_attribute('http.target', request.path)
+        g.trace_id = root.trace_id
+
+    @app.after_request
+    def finish_request_span(response):
+        """Anota el resultado de la petición y propaga el traceparent."""
+        trace = _current_trace.get()
+        if trace is not None:
+            root = trace.root
+            root.set_attribute('http.status_code', response.status_code)
+            if request.url_rule is not None:
+                root.name = f'{request.method} {request.url_rule.rule}'
+                root.set_attribute('http.route', request.url_rule.rule)
+            root.error = response.status_code >= 500
+            flags = '01' if trace.sampled else '00'
+            response.headers['traceparent'] = f'00-{trace.trace_id}-{root.span_id}-{flags}'
+        return response
+
+    @app.teardown_request
+    def end_request_trace(exc):
+        """Cierra la traza y decide si se exporta."""
+        tracer.end_trace()
+
+    return tracer
+
+
+def _random_id(num_bytes: int) -> str:
+    """Genera un identificador hexadecimal aleatorio."""
+    return random.getrandbits(num_bytes * 8).to_bytes(num_bytes, 'big').hex()
+
+
+def _otlp_attribute(key: str, value) -> Dict:
+    """Convierte un atributo al formato clave/valor de OTLP/JSON."""
+    if isinstance(value, bool):
+        typed = {'boolValue': value}
+    elif isinstance(value, int):
+        typed = {'intValue': str(value)}
+    elif isinstance(value, float):
+        typed = {'doubleValue': value}
+    else:
+        typed = {'stringValue': str(value)}
+    return {'key': key, 'value': typed}
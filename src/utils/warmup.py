@@ -0,0 +1,215 @@
+"""
+Calentamiento - Prepara el worker antes de recibir tráfico real
+Un worker recién arrancado paga en sus primeras peticiones la compilación de
+plantillas, los imports perezosos, la configuración del codificador JSON y
+las cachés frías. El calentamiento ejecuta ese trabajo en el arranque
+(cálculos representativos, plantillas, respuestas precalculadas y peticiones
+internas) y GET /ready indica si ya terminó, separado de la comprobación de
+vida de GET /health.
+"""
+
+import io
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from flask import Flask
+
+from ..models.calculator import CalculatorModel
+from ..models.precision import PRECISION_MODES
+from ..models.statistics import compute_statistics
+
+# Modos de calentamiento (WARMUP_MODE)
+WARMUP_MODES = ('sync', 'background', 'off')
+
+# Dirección de cliente de las peticiones internas (no consume el cupo de
+# admisión de clientes reales)
+WARMUP_REMOTE_ADDR = 'warmup'
+
+# Peticiones internas: recorren el enrutado, los hooks y la serialización
+WARMUP_REQUESTS = (
+    ('GET', '/', None),
+    ('GET', '/operations', None),
+    ('GET', '/api/info', None),
+    ('GET', '/health', None),
+    ('GET', '/calculate?num1=7.0&num2=3.0&operation=multiply', None),
+    ('GET', '/calculate?num1=1&num2=3&operation=divide&precision=fraction', None),
+    ('GET', '/calculate?num1=1.0&num2=0.0&operation=divide', None),
+    ('POST', '/statistics', [1.5, 2.5, 4.0, 8.0]),
+    ('POST', '/tabulate', {'formula': 'divide(12, x)', 'range': {'start': -2, 'stop': 2}})
+)
+
+
+class Warmup:
+    """
+    Secuencia de pasos de calentamiento con su estado y duración.
+
+    Los pasos que fallan se registran y no impiden terminar: un worker que
+    no pudo calentarse sigue siendo capaz de atender peticiones.
+    """
+
+    def __init__(self, logger=None):
+        """
+        Args:
+            logger (logging.Logger, optional): Destino de los avisos y del resumen
+        """
+        self.logger = logger
+        self.state = 'pending'
+        self.duration_ms: Optional[float] = None
+        self.steps: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self._pending: List[Tuple[str, Callable[[], None]]] = []
+        self._done = threading.Event()
+
+    def add_step(self, name: str, func: Callable[[], None]):
+        """
+        Registra un paso de calentamiento.
+
+        Args:
+            name (str): Nombre del paso (aparece en GET /ready)
+            func (callable): Función sin argumentos que realiza el trabajo
+        """
+        self._pending.append((name, func))
+
+    @property
+    def ready(self) -> bool:
+        """Si el calentamiento terminó (o no se ejecuta)."""
+        return self._done.is_set()
+
+    def run(self):
+        """Ejecuta los pasos registrados en orden y marca el worker como listo."""
+        self.state = 'running'
+        start = time.perf_counter()
+
+        for name, func in self._pending:
+            step_start = time.perf_counter()
+            try:
+                func()
+            except Exception as e:
+                self.errors[name] = f'{type(e).__name__}: {e}'
+                if self.logger is not None:
+                    self.logger.warning('Warmup step %s failed: %s', name, e)
+            self.steps[name] = round((time.perf_counter() - step_start) * 1000, 3)
+
+        self.duration_ms = round((time.perf_counter() - start) * 1000, 3)
+        self.state = 'ready'
+        self._done.set()
+        if self.logger is not None:
+            self.logger.info('Warmup completed in %.1f ms', self.duration_ms)
+
+    def start(self, mode: str = 'sync'):
+        """
+        Ejecuta el calentamiento según el modo indicado.
+
+        Args:
+            mode (str): 'sync' (antes de atender peticiones), 'background'
+                (en un hilo; GET /ready responde 503 mientras tanto) u 'off'
+        """
+        if mode == 'off':
+            self.state = 'skipped'
+            self._done.set()
+        elif mode == 'background':
+            threading.Thread(target=self.run, name='calculator-warmup', daemon=True).start()
+        else:
+            self.run()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que termine el calentamiento; devuelve si está listo."""
+        return self._done.wait(timeout)
+
+    def stats(self) -> Dict[str, object]:
+        """Obtiene el estado, la duración total y la de cada paso."""
+        stats = {
+            'state': self.state,
+            'duration_ms': self.duration_ms,
+            'steps': dict(self.steps)
+        }
+        if self.errors:
+            stats['errors'] = dict(self.errors)
+        return stats
+
+
+def warm_calculations(model: CalculatorModel, iterations: int):
+    """
+    Ejecuta todas las operaciones en todos los modos de precisión.
+
+    Recorre la validación, los manejadores (también los enteros y los de
+    vectores y matrices), el formateo de expresiones y los caminos de error
+    sin registrar historial.
+
+    Args:
+        model (CalculatorModel): Modelo compartido de la aplicación
+        iterations (int): Repeticiones de la serie completa
+    """
+    for _ in range(iterations):
+        for operation in CalculatorModel.OPERATION_HANDLERS:
+            num2 = None if operation in CalculatorModel.UNARY_OPERATIONS else '3'
+            for precision in PRECISION_MODES:
+                validated = model.validate_inputs('12.5', num2, operation, precision)
+                if 'error_code' not in validated:
+                    model.perform_calculation(validated['num1'], validated['num2'], operation,
+                                              record_history=False, precision=validated['precision'])
+        for operation in CalculatorModel.INTEGER_OPERATIONS:
+            validated = model.validate_inputs('30', '4', operation, num3='1009')
+            model.perform_calculation(validated['num1'], validated['num2'], operation,
+                                      record_history=False, num3=validated.get('num3'))
+        for operation in CalculatorModel.ARRAY_OPERATIONS:
+            num2 = None if operation in CalculatorModel.UNARY_OPERATIONS else [1.0, 2.0]
+            validated = model.validate_inputs([[4.0, 1.0], [2.0, 3.0]], num2, operation)
+            if 'error_code' not in validated:
+                model.perform_calculation(validated['num1'], validated['num2'], operation,
+                                          record_history=False)
+        model.validate_inputs('abc', '1', 'add')
+        model.perform_calculation(1.0, 0.0, 'divide', record_history=False)
+        model.perform_calculation(-1.0, None, 'sqrt', record_history=False)
+        compute_statistics(io.BytesIO(b'[1, 2.5, 4, 8]'), 'application/json', max_values=16)
+
+
+def warm_requests(app: Flask, iterations: int):
+    """
+    Envía peticiones internas representativas a la aplicación.
+
+    Args:
+        app (Flask): Instancia de la aplicación Flask
+        iterations (int): Repeticiones de la serie de peticiones
+    """
+    client = app.test_client()
+    environ = {'REMOTE_ADDR': WARMUP_REMOTE_ADDR}
+    for _ in range(iterations):
+        for method, path, body in WARMUP_REQUESTS:
+            client.open(path, method=method, json=body, environ_base=environ).close()
+
+
+def install_warmup(app: Flask) -> Warmup:
+    """
+    Registra los pasos de calentamiento de la aplicación y los ejecuta.
+
+    Debe llamarse al final de ``create_app``, con las rutas, las páginas de
+    error y los hooks ya instalados.
+
+    Args:
+        app (Flask): Instancia de la aplicación Flask
+
+    Returns:
+        Warmup: Calentamiento instalado (expuesto en GET /ready)
+    """
+    extension = app.extensions['calculator']
+    iterations = max(1, app.config['WARMUP_ITERATIONS'])
+    warmup = Warmup(app.logger)
+
+    def prime_responses():
+        """Renderiza las plantillas y construye las respuestas precalculadas."""
+        with app.test_request_context('/'):
+            extension['responses'].prime()
+            if 'error_pages' in extension:
+                extension['error_pages'].prime()
+
+    warmup.add_step('templates', prime_responses)
+    warmup.add_step('calculations', lambda: warm_calculations(extension['model'], iterations))
+    warmup.add_step('requests', lambda: warm_requests(app, iterations))
+
+    extension['warmup'] = warmup
+    extension['metrics']['warmup'] = warmup.stats
+    warmup.start(app.config['WARMUP_MODE'])
+    return warmup
+
@@ -0,0 +1,46 @@
+"""
+Configuración común de las pruebas con el cliente de pruebas de Flask.
+Las aplicaciones se crean con create_app('testing'); la configuración que
+lee create_app del entorno se puede cambiar por prueba con ``make_app``.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# El calentamiento, el muestreo de memoria, las trazas y el control de
+# admisión no forman parte de las pruebas salvo que una prueba los active
+os.environ.setdefault('WARMUP_MODE', 'off')
+os.environ.setdefault('MEMORY_SAMPLE_INTERVAL', '0')
+os.environ.setdefault('TRACE_ENABLED', 'false')
+os.environ.setdefault('ADMISSION_ENABLED', 'false')
+
+from src.app import create_app
+
+# test_api.py es un script contra un servidor en marcha, no una suite de pytest
+collect_ignore = ['test_api.py']
+
+
+@pytest.fixture
+def make_app(monkeypatch):
+    """Crea aplicaciones de prueba con variables de entorno adicionales."""
+    def factory(**environ):
+        for name, value in environ.items():
+            monkeypatch.setenv(name, str(value))
+        return create_app('testing')
+    return factory
+
+
+@pytest.fixture
+def app(make_app):
+    """Aplicación de prueba con la configuración por defecto."""
+    return make_app()
+
+
+@pytest.fixture
+def client(app):
+    """Cliente de pruebas de la aplicación (conserva la cookie de sesión)."""
+    return app.test_client()
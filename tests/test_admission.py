@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Pruebas del control de admisión: límite por cliente, cuerpos chunked y
+dirección del cliente detrás de un proxy de confianza.
+"""
+
+import json
+
+import pytest
+
+CALCULATION = {'num1': 2, 'num2': 3, 'operation': 'add'}
+
+
+@pytest.fixture
+def admission_app(make_app):
+    """Aplicación con admisión activa y una ráfaga de dos peticiones por cliente."""
+    def factory(**environ):
+        environ.setdefault('ADMISSION_RATE', 0.001)
+        environ.setdefault('ADMISSION_BURST', 2)
+        return make_app(ADMISSION_ENABLED='true', **environ)
+    return factory
+
+
+def post_calculation(client, **kwargs):
+    """Envía un cálculo a POST /calculate."""
+    return client.post('/calculate', json=CALCULATION, **kwargs)
+
+
+def test_rate_limit_per_client(admission_app):
+    client = admission_app().test_client()
+
+    statuses = [post_calculation(client).status_code for _ in range(3)]
+
+    assert statuses == [200, 200, 429]
+    assert 'Retry-After' in post_calculation(client).headers
+
+
+def test_unprotected_endpoints_are_not_limited(admission_app):
+    client = admission_app(ADMISSION_BURST=1).test_client()
+
+    assert all(client.get('/health').status_code == 200 for _ in range(5))
+
+
+def test_content_length_over_limit_is_rejected(admission_app):
+    client = admission_app(ADMISSION_MAX_CONTENT_LENGTH=32).test_client()
+
+    response = client.post('/calculate', data=json.dumps({**CALCULATION, 'pad': 'x' * 64}),
+                           content_type='application/json')
+
+    assert response.status_code == 413
+
+
+@pytest.mark.parametrize('padding, status', [(0, 200), (200, 413)])
+def test_chunked_body_is_streamed_with_limit(admission_app, padding, status):
+    client = admission_app(ADMISSION_MAX_CONTENT_LENGTH=128).test_client()
+    body = json.dumps({**CALCULATION, 'pad': 'x' * padding}).encode()
+
+    # Los servidores que decodifican chunked (gunicorn, el de desarrollo) marcan
+    # wsgi.input_terminated; el cliente de pruebas no lo hace por sí solo
+    response = client.post('/calculate', data=body, content_type='application/json',
+                           headers={'Transfer-Encoding': 'chunked'},
+                           environ_overrides={'wsgi.input_terminated': True})
+
+    assert response.status_code == status
+    if status == 200:
+        assert response.get_json()['result'] == 5
+
+
+def test_forwarded_clients_get_separate_buckets(admission_app):
+    client = admission_app(TRUSTED_PROXIES=1).test_client()
+
+    for address in ('203.0.113.1', '203.0.113.2'):
+        headers = {'X-Forwarded-For': address}
+        statuses = [post_calculation(client, headers=headers).status_code for _ in range(2)]
+        assert statuses == [200, 200]
+
+    assert post_calculation(client, headers={'X-Forwarded-For': '203.0.113.1'}).status_code == 429
+
+
+def test_forwarded_header_is_ignored_without_trusted_proxies(admission_app):
+    client = admission_app().test_client()
+
+    for address in ('203.0.113.1', '203.0.113.2'):
+        post_calculation(client, headers={'X-Forwarded-For': address})
+
+    assert post_calculation(client, headers={'X-Forwarded-For': '203.0.113.3'}).status_code == 429
+
+
+def test_statistics_is_rate_limited_without_body_size_limit(admission_app):
+    client = admission_app(ADMISSION_MAX_CONTENT_LENGTH=32).test_client()
+    body = '\n'.join(str(value) for value in range(1000)).encode()
+
+    statuses = [client.post('/statistics', data=body, content_type='application/x-ndjson').status_code
+                for _ in range(3)]
+
+    assert statuses == [200, 200, 429]
+
+
+def test_chunked_statistics_upload_is_not_buffered(admission_app):
+    client = admission_app(ADMISSION_MAX_CONTENT_LENGTH=32).test_client()
+    body = '\n'.join(str(value) for value in range(1000)).encode()
+
+    response = client.post('/statistics', data=body, content_type='application/x-ndjson',
+                           headers={'Transfer-Encoding': 'chunked'},
+                           environ_overrides={'wsgi.input_terminated': True})
+
+    assert response.status_code == 200
+    assert response.get_json()['count'] == 1000
@@ -2,61 +2,55 @@
 """
 Script de prueba para la API de la calculadora web.
 Verifica que todas las operaciones funcionen correctamente.
+Usa el cliente de src/client: todas las peticiones comparten una sesión
+keep-alive en lugar de abrir una conexión por operación.
 """
 
-import requests
-import json
+import os
 import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.client import CalculatorClient, ClientError
+
 BASE_URL = 'http://127.0.0.1:5000'
 
+client = CalculatorClient(BASE_URL, timeout=5)
+
 def test_calculation(num1, num2, operation, expected_result=None):
     """Prueba una operación matemática."""
-    data = {
-        'num1': num1,
-        'num2': num2,
-        'operation': operation
-    }
-
     try:
-        response = requests.post(f'{BASE_URL}/calculate', json=data, timeout=5)
-        result = response.json()
+        outcome = client.calculate(num1, num2, operation)
 
-        if response.status_code == 200 and 'result' in result:
-            print(f"✅ {num1} {operation} {num2} = {result['result']}")
-            if expected_result and abs(result['result'] - expected_result) > 0.001:
+        if outcome.ok:
+            print(f"✅ {num1} {operation} {num2} = {outcome.result}")
+            if expected_result and abs(outcome.result - expected_result) > 0.001:
                 print(f"   ⚠️  Resultado esperado: {expected_result}")
-            print(f"   📝 Expresión: {result['expression']}")
+            print(f"   📝 Expresión: {outcome.expression}")
         else:
-            print(f"❌ Error en {num1} {operation} {num2}: {result.get('error', 'Error desconocido')}")
+            print(f"❌ Error en {num1} {operation} {num2}: {outcome.message} ({outcome.code})")
 
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Error de conexión: {e}")
+    except ClientError as e:
+        print(f"❌ {e}")
         return False
 
     return True
 
 def test_single_operand_calculation(num1, operation, expected_result=None):
     """Prueba operaciones con un solo operando."""
-    data = {
-        'num1': num1,
-        'operation': operation
-    }
-
     try:
-        response = requests.post(f'{BASE_URL}/calculate', json=data, timeout=5)
-        result = response.json()
+        outcome = client.calculate(num1, operation=operation)
 
-        if response.status_code == 200 and 'result' in result:
-            print(f"✅ {operation}({num1}) = {result['result']}")
-            if expected_result and abs(result['result'] - expected_result) > 0.001:
+        if outcome.ok:
+            print(f"✅ {operation}({num1}) = {outcome.result}")
+            if expected_result and abs(outcome.result - expected_result) > 0.001:
                 print(f"   ⚠️  Resultado esperado: {expected_result}")
-            print(f"   📝 Expresión: {result['expression']}")
+            print(f"   📝 Expresión: {outcome.expression}")
         else:
-            print(f"❌ Error en {operation}({num1}): {result.get('error', 'Error desconocido')}")
+            print(f"❌ Error en {operation}({num1}): {outcome.message} ({outcome.code})")
 
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Error de conexión: {e}")
+    except ClientError as e:
+        print(f"❌ {e}")
         return False
 
     return True
@@ -68,11 +62,11 @@ def main():
 
     # Verificar que el servidor esté corriendo
     try:
-        response = requests.get(f'{BASE_URL}', timeout=5)
+        response = client.request('GET', '/')
         if response.status_code != 200:
             print("❌ El servidor no está respondiendo correctamente")
             sys.exit(1)
-    except requests.exceptions.RequestException:
+    except ClientError:
         print("❌ No se puede conectar con el servidor. Asegúrate de que esté ejecutándose en http://127.0.0.1:5000")
         sys.exit(1)
 
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Pruebas de POST /calculate/batch, usado por el frontend para subir en lotes
+los cálculos pendientes del historial.
+"""
+
+import pytest
+
+
+def test_batch_returns_one_result_per_item_in_order(client):
+    response = client.post('/calculate/batch', json={'calculations': [
+        {'num1': 2, 'num2': 3, 'operation': 'add'},
+        {'num1': 9, 'operation': 'sqrt'},
+        {'num1': 1, 'num2': 0, 'operation': 'divide'}
+    ]})
+
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert [item['result'] for item in results[:2]] == [5, 3]
+    assert results[2]['error_code'] == 'DIVISION_BY_ZERO'
+    assert [item['status'] for item in results] == [200, 200, 200]
+
+
+def test_invalid_items_do_not_fail_the_batch(client):
+    response = client.post('/calculate/batch', json={'calculations': [
+        {'num1': 1, 'num2': 1, 'operation': 'add'},
+        {'num2': 1, 'operation': 'add'},
+        'no es un objeto'
+    ]})
+
+    statuses = [item['status'] for item in response.get_json()['results']]
+    assert statuses == [200, 400, 400]
+
+
+def test_every_valid_item_is_recorded_in_history(client):
+    client.post('/calculate/batch', json={'calculations': [
+        {'num1': value, 'num2': 1, 'operation': 'add'} for value in range(5)
+    ]})
+
+    history = client.get('/history').get_json()['history']
+    assert len(history) == 5
+
+
+@pytest.mark.parametrize('payload', [{}, {'calculations': 'x'}, [1, 2]])
+def test_calculations_list_is_required(client, payload):
+    assert client.post('/calculate/batch', json=payload).status_code == 400
+
+
+def test_batch_size_is_limited(make_app):
+    client = make_app(CALCULATE_BATCH_MAX_ITEMS=2).test_client()
+    calculation = {'num1': 1, 'num2': 1, 'operation': 'add'}
+
+    response = client.post('/calculate/batch', json={'calculations': [calculation] * 3})
+
+    assert response.status_code == 400
+    assert client.get('/history').get_json()['history'] == []
+
+
+def test_beacon_with_the_key_in_the_query_is_not_recorded_twice(client):
+    """sendBeacon no envía cabeceras: la clave del lote viaja en ?idempotency_key=."""
+    batch = {'calculations': [{'num1': 2, 'num2': 3, 'operation': 'add'}]}
+    first = client.post('/calculate/batch', json=batch, headers={'Idempotency-Key': 'lote-1'})
+
+    beacon = client.post('/calculate/batch?idempotency_key=lote-1', json=batch)
+
+    assert beacon.headers['Idempotent-Replayed'] == 'true'
+    assert beacon.get_data() == first.get_data()
+    assert len(client.get('/history').get_json()['history']) == 1
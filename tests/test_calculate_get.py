@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la forma cacheable GET /calculate.
+"""
+
+from src.models.errors import ErrorCode
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+
+def test_canonical_result_is_immutable_with_etag(client):
+    response = client.get('/calculate?num1=10.0&num2=5.0&operation=add')
+    assert response.status_code == 200
+    assert response.get_json()['result'] == 15.0
+    assert response.headers['Cache-Control'] == IMMUTABLE
+    etag = response.headers['ETag']
+
+    response = client.get('/calculate?num1=10.0&num2=5.0&operation=add',
+                          headers={'If-None-Match': etag})
+    assert response.status_code == 304
+
+
+def test_non_canonical_query_redirects(client):
+    response = client.get('/calculate?operation=add&num1=10&num2=5')
+    assert response.status_code == 301
+    assert response.headers['Location'].endswith('/calculate?num1=10.0&num2=5.0&operation=add')
+    assert response.headers['Cache-Control'] == IMMUTABLE
+
+
+def test_math_error_is_cacheable(client):
+    """Un error matemático es tan determinista como un resultado."""
+    response = client.get('/calculate?num1=1.0&num2=0.0&operation=divide')
+    assert response.status_code == 200
+    assert response.get_json()['error_code'] == ErrorCode.DIVISION_BY_ZERO
+    assert response.headers['Cache-Control'] == IMMUTABLE
+
+
+def test_invalid_input_is_cached_briefly(client):
+    response = client.get('/calculate?num1=abc&num2=1&operation=add')
+    assert response.status_code == 400
+    assert response.headers['Cache-Control'] == 'public, max-age=300'
+
+    response = client.get('/calculate?num1=1')
+    assert response.status_code == 400
+
+
+def test_get_does_not_record_history_by_default(client):
+    client.get('/calculate?num1=10.0&num2=5.0&operation=add')
+    assert client.get('/history').get_json()['history'] == []
+
+
+def test_transient_error_is_not_cacheable(make_app):
+    """Regresión: BUSY y TIMEOUT no llevan la cabecera inmutable ni ETag."""
+    client = make_app(OFFLOAD_MAX_PENDING=0, OFFLOAD_COST_THRESHOLD=0).test_client()
+    response = client.get('/calculate?num1=10.0&num2=5.0&operation=add')
+    assert response.status_code == 503
+    assert response.get_json()['error_code'] == ErrorCode.BUSY
+    assert response.headers['Cache-Control'] == 'no-store'
+    assert response.headers['Retry-After'] == '1'
+    assert 'ETag' not in response.headers
+
+
+def test_recorded_history_is_private(make_app):
+    """Regresión: con historial la respuesta lleva Set-Cookie y no puede ser pública."""
+    client = make_app(CALCULATE_GET_RECORD_HISTORY='true').test_client()
+
+    response = client.get('/calculate?num1=10.0&num2=5.0&operation=add')
+
+    assert response.status_code == 200
+    assert 'Set-Cookie' in response.headers
+    assert response.headers['Cache-Control'] == 'private, no-store'
+    assert 'ETag' not in response.headers
+    assert len(client.get('/history').get_json()['history']) == 1
+
+
+def test_default_response_sets_no_cookie(client):
+    response = client.get('/calculate?num1=10.0&num2=5.0&operation=add')
+
+    assert 'Set-Cookie' not in response.headers
+    assert response.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+
+
+def test_non_utf8_query_string_is_a_400(client):
+    # Byte sin escapar (el entorno WSGI lo representa en latin-1)
+    response = client.get('/calculate', environ_overrides={
+        'QUERY_STRING': 'num1=10&num2=5&operation=add&x=\xff'})
+
+    assert response.status_code == 400
+    assert response.headers['Cache-Control'] == 'public, max-age=300'
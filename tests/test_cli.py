@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la calculadora por lotes (python -m src.cli).
+"""
+
+import json
+
+import pytest
+
+from src import cli
+from src.models.calculator import CalculatorModel
+
+
+def run(capsys, tmp_path, content, *options, name='entrada.csv'):
+    """Ejecuta la CLI sobre un fichero temporal y devuelve las líneas de salida."""
+    return run_captured(capsys, tmp_path, content, *options, name=name).out.splitlines()
+
+
+def run_captured(capsys, tmp_path, content, *options, name='entrada.csv'):
+    """Ejecuta la CLI y devuelve la salida y el resumen de stderr."""
+    path = tmp_path / name
+    path.write_text(content, encoding='utf-8')
+    assert cli.main([str(path), *options]) == 0
+    return capsys.readouterr()
+
+
+def test_csv_without_header(capsys, tmp_path):
+    lines = run(capsys, tmp_path, '2,3,add\n1,0,divide\nx,1,add\n', '--workers', '1')
+
+    results = [json.loads(line) for line in lines]
+    assert results[0] == {'result': 5.0, 'expression': '2.0 + 3.0 = 5.0'}
+    assert results[1]['error_code'] == 'DIVISION_BY_ZERO'
+    assert results[2] == {'error': 'Error: El primer número debe ser válido',
+                          'error_code': 'INVALID_OPERAND', 'operand': 1}
+
+
+def test_header_allows_any_column_order_and_precision(capsys, tmp_path):
+    lines = run(capsys, tmp_path, 'operation,precision,num2,num1\nadd,fraction,0.2,0.1\n',
+                '--workers', '1')
+
+    assert json.loads(lines[0])['result'] == '3/10'
+
+
+def test_ndjson_and_invalid_records(capsys, tmp_path):
+    content = '{"num1": 9, "operation": "sqrt"}\n{roto\n'
+    lines = run(capsys, tmp_path, content, '--workers', '1', name='entrada.ndjson')
+
+    assert json.loads(lines[0])['result'] == 3
+    assert json.loads(lines[1]) == {'error': 'Error: Registro no válido en la línea 2',
+                                    'error_code': 'INVALID_RECORD', 'line': 2}
+
+
+def test_csv_output(capsys, tmp_path):
+    lines = run(capsys, tmp_path, '2,3,multiply\n', '--workers', '1', '--output', 'csv')
+
+    assert lines == ['result,expression,error_code,error', '6.0,2.0 × 3.0 = 6.0,,']
+
+
+def test_order_is_kept_across_workers_and_chunks(capsys, tmp_path):
+    content = ''.join(f'{value},1,add\n' for value in range(200))
+
+    lines = run(capsys, tmp_path, content, '--workers', '2', '--chunk-size', '7')
+
+    assert [json.loads(line)['result'] for line in lines] == [value + 1.0 for value in range(200)]
+
+
+@pytest.mark.parametrize('operation', ['add', 'divide', 'power', 'sqrt', 'percentage'])
+def test_vectorized_path_matches_the_model(capsys, tmp_path, operation):
+    values = ['0', '1', '-1', '2.5', '1e308', '-0.5', '3']
+    content = ''.join(f'{a},{b},{operation}\n' for a in values for b in values)
+
+    vectorized = run_captured(capsys, tmp_path, content, '--workers', '1')
+    scalar = run_captured(capsys, tmp_path, content, '--workers', '1',
+                          '--history', str(tmp_path / 'historial.ndjson'))
+
+    assert f'vectorizadas: {len(values) ** 2}' in vectorized.err
+    assert 'vectorizadas: 0;' in scalar.err
+    assert vectorized.out == scalar.out
+
+
+def test_history_file(capsys, tmp_path):
+    history_path = tmp_path / 'historial.ndjson'
+
+    run(capsys, tmp_path, '2,3,add\n1,0,divide\n', '--workers', '1', '--history', str(history_path))
+
+    history = [json.loads(line) for line in history_path.read_text(encoding='utf-8').splitlines()]
+    assert [entry['operation'] for entry in history] == ['add', 'divide']
+    assert [entry['is_error'] for entry in history] == [False, True]
+
+
+def test_every_operation_is_accepted(capsys, tmp_path):
+    content = ''.join(f'4,2,{operation}\n' for operation in sorted(CalculatorModel.VALID_OPERATIONS)
+                      if operation not in CalculatorModel.ARRAY_OPERATIONS)
+
+    lines = run(capsys, tmp_path, content, '--workers', '1')
+
+    assert all(json.loads(line).get('error_code') != 'INVALID_OPERATION' for line in lines)
@@ -0,0 +1,42 @@
+#!/usr/bin/env node
+/**
+ * Pruebas de conformidad del núcleo de cálculo del frontend.
+ * Verifica que calculator-core.js produce los mismos resultados, expresiones
+ * y mensajes de error que CalculatorModel (ver tests/calculator_vectors.json).
+ *
+ * Uso: node tests/test_conformance.js
+ */
+
+const path = require('path');
+const { evaluateLocally } = require(path.join(__dirname, '..', 'src', 'static', 'js', 'calculator-core.js'));
+const { vectors } = require(path.join(__dirname, 'calculator_vectors.json'));
+
+console.log('🧮 Conformidad de calculator-core.js');
+console.log('='.repeat(50));
+
+let failed = 0;
+for (const vector of vectors) {
+    const actual = evaluateLocally(vector.num1, vector.num2, vector.operation);
+    const label = `${vector.operation}(${vector.num1}, ${vector.num2})`;
+    const diffs = [];
+
+    for (const key of ['status', 'result', 'expression', 'error', 'error_code', 'operand']) {
+        if (vector[key] !== actual[key]) {
+            diffs.push(`${key}: esperado ${JSON.stringify(vector[key])}, obtenido ${JSON.stringify(actual[key])}`);
+        }
+    }
+
+    if (diffs.length > 0) {
+        failed += 1;
+        console.log(`❌ ${label}: ${diffs.join('; ')}`);
+    } else {
+        console.log(`✅ ${label}`);
+    }
+}
+
+console.log('='.repeat(50));
+if (failed > 0) {
+    console.log(`❌ ${failed} vectores no coinciden`);
+    process.exit(1);
+}
+console.log('✅ Todos los vectores coinciden');
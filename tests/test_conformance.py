@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Pruebas de conformidad del modelo de la calculadora.
+Verifica que CalculatorModel produce exactamente los resultados, expresiones y
+mensajes de error recogidos en calculator_vectors.json, los mismos vectores que
+usa tests/test_conformance.js para el núcleo JavaScript del frontend.
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.models.calculator import CalculatorModel
+from src.models.errors import render_error
+
+VECTORS_PATH = os.path.join(os.path.dirname(__file__), 'calculator_vectors.json')
+
+
+def load_vectors():
+    """Carga los vectores de conformidad compartidos."""
+    with open(VECTORS_PATH, encoding='utf-8') as vectors_file:
+        return json.load(vectors_file)['vectors']
+
+
+def evaluate(model, vector):
+    """Evalúa un vector igual que lo haría POST /calculate."""
+    validation_result = model.validate_inputs(vector['num1'], vector['num2'], vector['operation'])
+    if 'error_code' in validation_result:
+        return dict(render_error(validation_result), status=400)
+
+    result = model.perform_calculation(
+        validation_result['num1'],
+        validation_result['num2'],
+        validation_result['operation'],
+        record_history=False
+    )
+    if 'error_code' in result:
+        return dict(render_error(result), status=200)
+    return dict(result, status=200)
+
+
+def check_vector(model, vector):
+    """Compara la salida del modelo con la esperada. Devuelve los campos distintos."""
+    actual = evaluate(model, vector)
+    expected = {key: value for key, value in vector.items()
+                if key not in ('num1', 'num2', 'operation')}
+    return {key: (expected.get(key), actual.get(key))
+            for key in set(expected) | set(actual)
+            if expected.get(key) != actual.get(key)}
+
+
+def test_python_conformance():
+    """Todos los vectores deben coincidir con CalculatorModel."""
+    model = CalculatorModel()
+    failures = [(vector, diff) for vector in load_vectors()
+                if (diff := check_vector(model, vector))]
+    assert not failures, failures
+
+
+def main():
+    """Ejecuta las pruebas de conformidad mostrando cada vector."""
+    print("🧮 Conformidad de CalculatorModel")
+    print("=" * 50)
+
+    model = CalculatorModel()
+    failed = 0
+    for vector in load_vectors():
+        diff = check_vector(model, vector)
+        label = f"{vector['operation']}({vector['num1']}, {vector['num2']})"
+        if diff:
+            failed += 1
+            print(f"❌ {label}: {diff}")
+        else:
+            print(f"✅ {label}")
+
+    print("=" * 50)
+    if failed:
+        print(f"❌ {failed} vectores no coinciden")
+        return 1
+    print("✅ Todos los vectores coinciden")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
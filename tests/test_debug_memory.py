@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Pruebas de /debug/memory: control de acceso e informe y acciones de
+tracemalloc.
+"""
+
+import tracemalloc
+
+import pytest
+
+TOKEN = 'secreto-de-pruebas'
+AUTH = {'X-Debug-Token': TOKEN}
+
+
+@pytest.fixture
+def debug_client(make_app):
+    """Cliente de una aplicación con /debug/memory habilitado y token."""
+    client = make_app(DEBUG_MEMORY_ENABLED='true', DEBUG_MEMORY_TOKEN=TOKEN).test_client()
+    yield client
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def test_disabled_endpoint_is_not_found(client):
+    assert client.get('/debug/memory', headers=AUTH).status_code == 404
+
+
+def test_enabled_without_token_denies_local_requests(make_app):
+    client = make_app(DEBUG_MEMORY_ENABLED='true', DEBUG_MEMORY_TOKEN='').test_client()
+
+    for address in ('127.0.0.1', '::1'):
+        response = client.get('/debug/memory', environ_overrides={'REMOTE_ADDR': address})
+        assert response.status_code == 403
+
+
+@pytest.mark.parametrize('headers', [{}, {'X-Debug-Token': 'otro'}])
+def test_wrong_token_is_denied(debug_client, headers):
+    assert debug_client.get('/debug/memory', headers=headers).status_code == 403
+
+
+def test_report_with_token(debug_client):
+    response = debug_client.get('/debug/memory?types=5', headers=AUTH)
+
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'no-store'
+    report = response.get_json()
+    assert {'process', 'gc', 'tracemalloc', 'objects', 'samples'} <= set(report)
+    assert len(report['types']) == 5
+
+
+def test_invalid_types_parameter(debug_client):
+    assert debug_client.get('/debug/memory?types=abc', headers=AUTH).status_code == 400
+
+
+def test_snapshot_and_diff(debug_client):
+    def action(**data):
+        return debug_client.post('/debug/memory', json=data, headers=AUTH)
+
+    assert action(action='snapshot').status_code == 409
+    assert action(action='start', frames=2).status_code == 200
+
+    base = action(action='snapshot').get_json()['snapshot']
+    retained = [bytearray(1024) for _ in range(100)]
+    target = action(action='snapshot').get_json()['snapshot']
+
+    diff = action(action='diff', base=base, target=target, limit=5).get_json()
+    assert diff['base'] == base and diff['target'] == target
+    assert len(diff['diff']) <= 5
+    assert action(action='top', snapshot=99).status_code == 404
+    assert action(action='unknown').status_code == 400
+    assert action(action='stop').get_json()['tracemalloc']
+    del retained
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Pruebas de los códigos de error del modelo y de su traducción a mensajes
+en las respuestas HTTP.
+"""
+
+import string
+
+import pytest
+
+from src.models.calculator import CalculatorModel
+from src.models.errors import ERROR_MESSAGES, ErrorCode, error_message, render_error
+
+# Un cuerpo de POST /calculate que produce cada error de validación
+VALIDATION_CASES = [
+    ({'num1': 1, 'num2': 2, 'operation': 'modulo'}, {'error_code': ErrorCode.INVALID_OPERATION}),
+    ({'num1': 'abc', 'num2': 2, 'operation': 'add'},
+     {'error_code': ErrorCode.INVALID_OPERAND, 'operand': 1}),
+    ({'num1': 1, 'num2': 'abc', 'operation': 'add'},
+     {'error_code': ErrorCode.INVALID_OPERAND, 'operand': 2}),
+    ({'num1': 1, 'operation': 'add'}, {'error_code': ErrorCode.MISSING_OPERAND}),
+    ({'num1': 1, 'num2': 2, 'operation': 'add', 'precision': 'bcd'},
+     {'error_code': ErrorCode.INVALID_PRECISION})
+]
+
+
+def test_every_code_has_a_message():
+    codes = {value for name, value in vars(ErrorCode).items() if name.isupper()}
+    assert codes == set(ERROR_MESSAGES)
+
+
+@pytest.mark.parametrize('code, message', ERROR_MESSAGES.items())
+def test_every_template_can_be_rendered(code, message):
+    fields = {name for _, name, _, _ in string.Formatter().parse(message) if name}
+    outcome = {'error_code': code, **{field: 'x' for field in fields - {'ordinal'}}}
+    if 'ordinal' in fields:
+        outcome['operand'] = 1
+
+    rendered = error_message(outcome)
+
+    assert rendered.startswith('Error')
+    assert render_error(outcome)['error'] == rendered
+
+
+def test_operand_ordinals():
+    assert error_message({'error_code': ErrorCode.INVALID_OPERAND, 'operand': 2}) == \
+        'Error: El segundo número debe ser válido'
+
+
+@pytest.mark.parametrize('payload, outcome', VALIDATION_CASES)
+def test_model_returns_codes_without_raising(payload, outcome):
+    model = CalculatorModel()
+
+    result = model.validate_inputs(payload['num1'], payload.get('num2'), payload['operation'],
+                                   payload.get('precision', 'float'))
+
+    assert result == outcome
+
+
+@pytest.mark.parametrize('payload, outcome', VALIDATION_CASES)
+def test_validation_errors_are_rendered_as_400(client, payload, outcome):
+    response = client.post('/calculate', json=payload)
+
+    assert response.status_code == 400
+    assert response.get_json() == render_error(outcome)
+
+
+def test_calculation_errors_are_200_with_code(client):
+    response = client.post('/calculate', json={'num1': 1, 'num2': 0, 'operation': 'divide'})
+
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body['error_code'] == ErrorCode.DIVISION_BY_ZERO
+    assert body['error'] == ERROR_MESSAGES[ErrorCode.DIVISION_BY_ZERO]
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Pruebas de los recursos del frontend servidos por la aplicación: la página
+carga la vista del historial antes del controlador y los scripts existen.
+"""
+
+import re
+
+import pytest
+
+SCRIPTS = ['js/calculator-core.js', 'js/history-view.js', 'js/calculator.js']
+
+
+def read_static(client, filename):
+    """Lee un fichero estático y cierra la respuesta."""
+    response = client.get(f'/static/{filename}')
+    try:
+        assert response.status_code == 200
+        return response.get_data(as_text=True)
+    finally:
+        response.close()
+
+
+def test_index_loads_scripts_in_dependency_order(client):
+    html = client.get('/').get_data(as_text=True)
+
+    loaded = re.findall(r'<script src="/static/([^"]+)"', html)
+    assert loaded == SCRIPTS
+
+
+@pytest.mark.parametrize('filename', SCRIPTS + ['css/style.css', 'bench/history-bench.html'])
+def test_static_asset_is_served(client, filename):
+    assert read_static(client, filename)
+
+
+def test_history_view_is_exposed_to_the_controller(client):
+    assert 'class HistoryView' in read_static(client, 'js/history-view.js')
+    assert 'new HistoryView(' in read_static(client, 'js/calculator.js')
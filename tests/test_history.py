@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Pruebas del historial por sesión servido por GET /history.
+"""
+
+from src.models.errors import CALCULATION_ERROR_PREFIX, ERROR_MESSAGES, TRANSIENT_ERRORS, ErrorCode
+
+# Un cálculo que produce cada error de cálculo (los que llegan al historial)
+HISTORY_ERROR_CASES = {
+    ErrorCode.DIVISION_BY_ZERO: {'num1': 1, 'num2': 0, 'operation': 'divide'},
+    ErrorCode.NEGATIVE_SQRT: {'num1': -1, 'operation': 'sqrt'},
+    ErrorCode.OVERFLOW: {'num1': 1e300, 'num2': 1e300, 'operation': 'multiply'},
+    ErrorCode.DOMAIN_ERROR: {'num1': -8, 'num2': 0.5, 'operation': 'power'},
+    ErrorCode.RESULT_TOO_LARGE: {'num1': 100000, 'operation': 'factorial'},
+    ErrorCode.SINGULAR_MATRIX: {'num1': [[1, 2], [2, 4]], 'num2': [1, 2], 'operation': 'solve'}
+}
+
+
+def test_every_calculation_error_has_a_history_case():
+    """Cada error de cálculo que llega al historial (no transitorio) tiene un caso."""
+    calculation_errors = {code for code, message in ERROR_MESSAGES.items()
+                          if message.startswith(CALCULATION_ERROR_PREFIX)}
+    assert calculation_errors - TRANSIENT_ERRORS == set(HISTORY_ERROR_CASES)
+
+
+def test_history_renders_every_calculation_error(client):
+    """GET /history genera el mismo mensaje que la respuesta original."""
+    messages = {}
+    for code, payload in HISTORY_ERROR_CASES.items():
+        response = client.post('/calculate', json=payload)
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body['error_code'] == code
+        messages[code] = body['error']
+
+    response = client.get('/history')
+    assert response.status_code == 200
+    history = response.get_json()['history']
+    assert {entry['error_code']: entry['expression'] for entry in history} == messages
+    assert all(entry['is_error'] for entry in history)
+
+
+def test_result_too_large_keeps_max_digits_in_history(client):
+    """Regresión: la entrada guarda 'max_digits', que usa su mensaje."""
+    client.post('/calculate', json={'num1': 100000, 'operation': 'factorial'})
+    entry = client.get('/history').get_json()['history'][0]
+    assert entry['max_digits'] == 100_000
+    assert '100000 dígitos' in entry['expression']
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Pruebas de las consultas indexadas del historial (HistoryLog.query) y de
+los filtros de GET /history.
+"""
+
+import datetime
+import random
+from unittest import mock
+
+import pytest
+
+from src.models.history import HistoryLog, parse_history_filters
+
+OPERATIONS = ('add', 'divide', 'sqrt')
+
+
+def fill(log, count, seed=7):
+    """Añade ``count`` entradas con operación y error aleatorios."""
+    generator = random.Random(seed)
+    for _ in range(count):
+        log.append({'operation': generator.choice(OPERATIONS), 'is_error': generator.random() < 0.3})
+
+
+def brute_force(log, operation=None, errors_only=False, start=None, end=None, limit=None):
+    """Filtra recorriendo todas las entradas visibles."""
+    selected = [entry for entry, epoch in zip(log.entries(), visible_times(log))
+                if (operation is None or entry['operation'] == operation)
+                and (not errors_only or entry['is_error'])
+                and (start is None or epoch >= start) and (end is None or epoch <= end)]
+    if limit is not None:
+        selected = selected[len(selected) - limit:] if limit else []
+    return selected
+
+
+def visible_times(log):
+    """Epochs de las entradas visibles."""
+    return log._times[len(log._times) - len(log):]
+
+
+def test_visible_entries_are_bounded_and_ids_grow():
+    log = HistoryLog(limit=10)
+    fill(log, 35)
+
+    entries = log.entries()
+    assert len(log) == 10
+    assert [entry['id'] for entry in entries] == list(range(25, 35))
+    assert log.footprint()['retained_entries'] < 20
+
+
+@pytest.mark.parametrize('filters', [
+    {'operation': 'divide'},
+    {'errors_only': True},
+    {'operation': 'sqrt', 'errors_only': True},
+    {'limit': 5},
+    {'operation': 'add', 'limit': 3},
+    {'errors_only': True, 'limit': 0}
+])
+def test_indexed_query_matches_brute_force(filters):
+    log = HistoryLog(limit=50)
+    fill(log, 173)
+
+    assert log.query(**filters) == brute_force(log, **filters)
+
+
+def test_time_range_uses_timestamps():
+    log = HistoryLog(limit=50)
+    clock = iter(range(1000, 1020))
+    with mock.patch('src.models.history.datetime') as fake:
+        fake.timezone = datetime.timezone
+        fake.datetime.now.side_effect = lambda tz: datetime.datetime.fromtimestamp(next(clock), tz)
+        fill(log, 20)
+
+    selected = log.query(start=1005, end=1009)
+
+    assert [entry['id'] for entry in selected] == [5, 6, 7, 8, 9]
+    assert selected[0]['timestamp'].startswith('1970-01-01T00:16:45')
+
+
+@pytest.mark.parametrize('args, parameter', [
+    ({'operation': 'modulo'}, 'operation'),
+    ({'errors_only': 'quizá'}, 'errors_only'),
+    ({'from': 'ayer'}, 'from'),
+    ({'to': 'nan'}, 'to'),
+    ({'limit': '-1'}, 'limit'),
+    ({'limit': 'diez'}, 'limit')
+])
+def test_invalid_filters(args, parameter):
+    assert parse_history_filters(args, OPERATIONS) == {'error_code': 'INVALID_FILTER',
+                                                      'parameter': parameter}
+
+
+def test_filters_are_parsed():
+    filters = parse_history_filters({'operation': 'add', 'errors_only': 'yes',
+                                     'from': '1970-01-01T00:01:00', 'to': '120', 'limit': '3'},
+                                    OPERATIONS)
+
+    assert filters == {'operation': 'add', 'errors_only': True, 'start': 60.0,
+                       'end': 120.0, 'limit': 3}
+
+
+def test_endpoint_applies_filters(client):
+    for payload in ({'num1': 1, 'num2': 0, 'operation': 'divide'},
+                    {'num1': 4, 'num2': 2, 'operation': 'divide'},
+                    {'num1': 9, 'operation': 'sqrt'},
+                    {'num1': 1, 'num2': 2, 'operation': 'add'}):
+        client.post('/calculate', json=payload)
+
+    def ids(query):
+        return [entry['id'] for entry in client.get(f'/history?{query}').get_json()['history']]
+
+    assert ids('operation=divide') == [0, 1]
+    assert ids('errors_only=true') == [0]
+    assert ids('limit=2') == [2, 3]
+    assert ids('from=4102444800') == []
+
+
+def test_endpoint_rejects_invalid_filter(client):
+    response = client.get('/history?limit=abc')
+
+    assert response.status_code == 400
+    assert response.get_json()['parameter'] == 'limit'
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Pruebas del historial pre-serializado: cada entrada se codifica una sola vez
+y GET /history devuelve el mismo JSON que generaría jsonify.
+"""
+
+import json
+
+from src.models.history import HistoryLog
+
+
+def counting_encoder(calls):
+    """Codificador que anota cada entrada serializada."""
+    def encode(item):
+        calls.append(item['id'])
+        return json.dumps(item, separators=(',', ':')).encode('utf-8')
+    return encode
+
+
+def test_entries_are_encoded_once():
+    log = HistoryLog(limit=10)
+    calls = []
+    encode = counting_encoder(calls)
+    for value in range(3):
+        log.append({'operation': 'add', 'is_error': False, 'result': value})
+
+    log.query_json(encode)
+    log.query_json(encode, limit=2)
+    log.append({'operation': 'add', 'is_error': True})
+    body = log.query_json(encode)
+
+    assert calls == [0, 1, 2, 3]
+    assert json.loads(body) == {'history': log.entries()}
+
+
+def test_unfiltered_body_is_reused_until_next_write():
+    log = HistoryLog(limit=10)
+    encode = counting_encoder([])
+    log.append({'operation': 'add', 'is_error': False})
+
+    first = log.query_json(encode)
+    assert log.query_json(encode) is first
+
+    log.append({'operation': 'sqrt', 'is_error': False})
+    assert log.query_json(encode) is not first
+    assert log.footprint()['body_bytes'] > 0
+
+    log.clear()
+    assert log.query_json(encode) == b'{"history":[]}\n'
+
+
+def test_filtered_body_matches_query():
+    log = HistoryLog(limit=10)
+    for operation in ('add', 'divide', 'add'):
+        log.append({'operation': operation, 'is_error': False})
+
+    body = log.query_json(counting_encoder([]), operation='add')
+
+    assert json.loads(body) == {'history': log.query(operation='add')}
+
+
+def test_get_history_matches_jsonify(client):
+    client.post('/calculate', json={'num1': 2, 'num2': 3, 'operation': 'add'})
+    client.post('/calculate', json={'num1': 1, 'num2': 0, 'operation': 'divide'})
+
+    response = client.get('/history')
+
+    assert response.mimetype == 'application/json'
+    history = response.get_json()['history']
+    assert [entry['operation'] for entry in history] == ['add', 'divide']
+    assert history[1]['expression'].startswith('Error en el cálculo')
+    assert client.get('/history').get_data() == response.get_data()
+
+
+def test_history_without_session_is_empty(client):
+    response = client.get('/history')
+
+    assert response.get_data() == b'{"history":[]}\n'
+    assert 'Set-Cookie' not in response.headers
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Pruebas de los agregados del historial (HistoryAggregates) y de
+GET /history/stats.
+"""
+
+from src.models.aggregates import HistoryAggregates, SlidingCounter
+from src.models.calculator import CalculatorModel
+from src.models.errors import ErrorCode
+
+
+def test_sliding_counter_windows():
+    counter = SlidingCounter(slots=10, width=1.0)
+    for second in (100.0, 100.5, 105.0, 109.9):
+        counter.add(second)
+
+    assert counter.total(10, 109.9) == 4
+    assert counter.total(5, 109.9) == 2
+    assert counter.total(10, 112.0) == 2
+    assert counter.total(10, 200.0) == 0
+
+
+def test_aggregates_count_operations_errors_and_results():
+    aggregates = HistoryAggregates()
+    aggregates.record('add', 5.0, None)
+    aggregates.record('divide', '1/4', None)
+    aggregates.record('divide', None, ErrorCode.DIVISION_BY_ZERO)
+    aggregates.record('transpose', '[[1, 2]]', None)
+
+    stats = aggregates.snapshot()
+
+    assert stats['total'] == 4
+    assert stats['errors'] == 1
+    assert stats['by_operation'] == {'add': 1, 'divide': 2, 'transpose': 1}
+    assert stats['errors_by_code'] == {ErrorCode.DIVISION_BY_ZERO: 1}
+    assert stats['results'] == {'count': 2, 'min': 0.25, 'max': 5.0, 'mean': 2.625}
+    assert stats['calls_per_minute']['1m'] == 4
+
+
+def test_empty_aggregates():
+    stats = HistoryAggregates().snapshot()
+
+    assert stats['total'] == 0
+    assert stats['results'] == {'count': 0, 'min': None, 'max': None, 'mean': None}
+
+
+def test_endpoint_without_session_returns_empty_stats(client):
+    response = client.get('/history/stats')
+
+    assert response.status_code == 200
+    assert response.get_json()['total'] == 0
+
+
+def test_endpoint_follows_calculations_and_clearing(client):
+    client.post('/calculate', json={'num1': 2, 'num2': 3, 'operation': 'add'})
+    client.post('/calculate', json={'num1': 1, 'num2': 0, 'operation': 'divide'})
+    client.post('/calculate', json={'num1': 'x', 'num2': 0, 'operation': 'add'})
+
+    stats = client.get('/history/stats').get_json()
+    assert stats['total'] == 2
+    assert stats['errors_by_code'] == {ErrorCode.DIVISION_BY_ZERO: 1}
+    assert stats['results']['mean'] == 5
+
+    client.delete('/history')
+    assert client.get('/history/stats').get_json()['total'] == 0
+
+
+def test_aggregates_count_beyond_retained_history(client):
+    calculations = CalculatorModel.HISTORY_LIMIT + 20
+    for value in range(calculations):
+        client.post('/calculate', json={'num1': value, 'num2': 1, 'operation': 'add'})
+
+    retained = len(client.get('/history').get_json()['history'])
+    stats = client.get('/history/stats').get_json()
+
+    assert retained == CalculatorModel.HISTORY_LIMIT
+    assert stats['total'] == calculations
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Pruebas de las respuestas precalculadas con ETag: índice, metadatos y
+páginas de error.
+"""
+
+import os
+
+import pytest
+
+from src.app import is_private_directory
+from src.utils.http_cache import PrebuiltResponse, compute_etag
+
+PREBUILT_ENDPOINTS = ['/', '/operations', '/health', '/api/info']
+
+
+@pytest.mark.parametrize('path', PREBUILT_ENDPOINTS)
+def test_prebuilt_response_has_strong_etag(client, path):
+    response = client.get(path)
+
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'no-cache'
+    assert response.get_etag() == (compute_etag(response.get_data()), False)
+
+
+@pytest.mark.parametrize('path', PREBUILT_ENDPOINTS)
+def test_if_none_match_returns_not_modified(client, path):
+    etag = client.get(path).headers['ETag']
+
+    response = client.get(path, headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert response.get_data() == b''
+
+
+def test_stale_etag_returns_full_body(client):
+    response = client.get('/health', headers={'If-None-Match': '"otro"'})
+
+    assert response.status_code == 200
+    assert response.get_json()['status'] == 'healthy'
+
+
+def test_body_is_built_once(app):
+    calls = []
+
+    def builder():
+        calls.append(1)
+        return 'cuerpo'
+
+    entry = PrebuiltResponse(builder, 'text/plain')
+    with app.test_request_context('/'):
+        first = entry.respond()
+        second = entry.respond()
+
+    assert len(calls) == 1
+    assert first.get_data() == second.get_data() == b'cuerpo'
+
+
+def test_error_page_is_not_conditional(client):
+    response = client.get('/no-existe', headers={'Accept': 'text/html'})
+
+    assert response.status_code == 404
+    assert 'ETag' not in response.headers
+
+
+def test_metrics_report_built_responses(client):
+    client.get('/health')
+
+    responses = client.get('/metrics').get_json()['responses']
+
+    assert responses['registered'] == 4
+    assert responses['built'] >= 1
+
+
+def test_default_template_cache_is_private_per_user(app):
+    cache = app.jinja_env.bytecode_cache
+
+    assert cache is not None
+    assert os.stat(cache.directory).st_mode & 0o077 == 0
+    assert os.stat(cache.directory).st_uid == os.getuid()
+
+
+def test_configured_template_cache_directory_is_created_private(make_app, tmp_path):
+    cache_dir = tmp_path / 'plantillas'
+
+    app = make_app(JINJA_CACHE_DIR=cache_dir)
+
+    assert app.jinja_env.bytecode_cache.directory == str(cache_dir)
+    assert cache_dir.stat().st_mode & 0o777 == 0o700
+
+
+def test_shared_template_cache_directory_is_not_used(make_app, tmp_path):
+    cache_dir = tmp_path / 'compartido'
+    cache_dir.mkdir()
+    cache_dir.chmod(0o777)
+
+    app = make_app(JINJA_CACHE_DIR=cache_dir)
+
+    assert not is_private_directory(str(cache_dir))
+    assert app.jinja_env.bytecode_cache is None
+    assert app.test_client().get('/').status_code == 200
+
+
+def test_symlinked_template_cache_directory_is_not_used(tmp_path):
+    target = tmp_path / 'destino'
+    target.mkdir(mode=0o700)
+    (tmp_path / 'enlace').symlink_to(target)
+
+    assert is_private_directory(str(target))
+    assert not is_private_directory(str(tmp_path / 'enlace'))
+
+
+def test_empty_template_cache_directory_disables_the_cache(make_app):
+    assert make_app(JINJA_CACHE_DIR='').jinja_env.bytecode_cache is None
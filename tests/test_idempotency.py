@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la cabecera Idempotency-Key en los endpoints de cálculo y de
+IdempotencyCache.
+"""
+
+import threading
+
+from src.utils.idempotency import IdempotencyCache
+
+CALCULATION = {'num1': 6, 'num2': 7, 'operation': 'multiply'}
+
+
+def post(client, key, payload=CALCULATION, path='/calculate'):
+    """Envía un cálculo con la clave de idempotencia indicada."""
+    return client.post(path, json=payload, headers={'Idempotency-Key': key})
+
+
+def test_retry_replays_original_response_without_new_history(client):
+    first = post(client, 'clave-1')
+    retry = post(client, 'clave-1')
+
+    assert retry.status_code == first.status_code == 200
+    assert retry.get_data() == first.get_data()
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert 'Idempotent-Replayed' not in first.headers
+    assert len(client.get('/history').get_json()['history']) == 1
+
+
+def test_without_key_every_request_executes(client):
+    client.post('/calculate', json=CALCULATION)
+    client.post('/calculate', json=CALCULATION)
+
+    assert len(client.get('/history').get_json()['history']) == 2
+
+
+def test_key_reused_with_another_body_is_rejected(client):
+    post(client, 'clave-2')
+
+    response = post(client, 'clave-2', {**CALCULATION, 'num2': 8})
+
+    assert response.status_code == 422
+
+
+def test_key_too_long_is_rejected(client):
+    assert post(client, 'x' * 256).status_code == 400
+
+
+def test_keys_are_scoped_per_endpoint_and_session(app):
+    first_client = app.test_client()
+    second_client = app.test_client()
+    # Sin cookie el ámbito es la dirección: el segundo cliente es otra máquina
+    second_client.environ_base['REMOTE_ADDR'] = '192.0.2.2'
+    post(first_client, 'clave-3')
+
+    batch = post(first_client, 'clave-3', {'calculations': [CALCULATION]}, '/calculate/batch')
+    other_session = post(second_client, 'clave-3')
+
+    assert batch.status_code == 200 and 'Idempotent-Replayed' not in batch.headers
+    assert other_session.status_code == 200 and 'Idempotent-Replayed' not in other_session.headers
+    assert len(second_client.get('/history').get_json()['history']) == 1
+
+
+def test_cookieless_retry_replays_the_original_response(app):
+    """Regresión: la primera respuesta (con la cookie de sesión) se pierde y el reintento llega sin cookie."""
+    first = post(app.test_client(), 'clave-perdida')
+    assert 'Set-Cookie' in first.headers
+
+    retry_client = app.test_client()
+    retry = post(retry_client, 'clave-perdida')
+
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert retry.get_data() == first.get_data()
+    # La cookie de la primera ejecución llega con la respuesta repetida
+    assert len(retry_client.get('/history').get_json()['history']) == 1
+
+
+def test_cookieless_clients_at_other_addresses_do_not_share_keys(app):
+    post(app.test_client(), 'clave-4')
+
+    other = app.test_client()
+    other.environ_base['REMOTE_ADDR'] = '192.0.2.9'
+
+    assert 'Idempotent-Replayed' not in post(other, 'clave-4').headers
+
+
+def test_validation_errors_are_replayed(client):
+    invalid = {'num1': 'abc', 'num2': 1, 'operation': 'add'}
+
+    first = post(client, 'clave-4', invalid)
+    retry = post(client, 'clave-4', invalid)
+
+    assert first.status_code == retry.status_code == 400
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+
+
+def test_cache_coalesces_concurrent_duplicates():
+    cache = IdempotencyCache()
+    action, entry = cache.begin('k', 'huella')
+    assert action == 'execute'
+
+    replayed = []
+    waiter = threading.Thread(target=lambda: replayed.append(cache.begin('k', 'huella')))
+    waiter.start()
+    waiter.join()
+    cache.complete(entry, 200, [], b'{}')
+
+    assert replayed[0][0] == 'replay'
+    assert replayed[0][1].done.wait(1) and replayed[0][1].body == b'{}'
+    assert cache.stats()['coalesced'] == 1
+
+
+def test_abandoned_entry_executes_again():
+    cache = IdempotencyCache()
+    _, entry = cache.begin('k', 'huella')
+    cache.abandon('k', entry)
+
+    assert cache.begin('k', 'huella')[0] == 'execute'
+
+
+def test_cache_is_bounded_and_expires():
+    cache = IdempotencyCache(max_entries=2)
+    for index in range(3):
+        _, entry = cache.begin(f'k{index}', 'huella')
+        cache.complete(entry, 200, [], b'')
+
+    assert cache.stats()['size'] == 2
+    assert cache.stats()['evictions'] == 1
+
+    expiring = IdempotencyCache(ttl=0)
+    _, entry = expiring.begin('k', 'huella')
+    expiring.complete(entry, 200, [], b'')
+    assert expiring.begin('k', 'otra huella')[0] == 'execute'
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Pruebas de las operaciones con enteros de tamaño arbitrario (combinatoria y
+teoría de números).
+"""
+
+import math
+from decimal import Decimal
+
+import pytest
+
+from src.models.errors import ErrorCode
+from src.models.integers import (MAX_OPERAND_DIGITS, MAX_RESULT_DIGITS, abbreviate,
+                                 check_result_size, evaluate_integer, parse_integer,
+                                 to_decimal_string)
+
+
+def exact(operation, *operands):
+    """Resultado en decimal de una operación entera."""
+    outcome = evaluate_integer(operation, *operands)
+    assert not isinstance(outcome, str), outcome
+    return outcome[0]
+
+
+@pytest.mark.parametrize('operation, operands, expected', [
+    ('factorial', (0,), 1),
+    ('factorial', (20,), math.factorial(20)),
+    ('factorial', (300,), math.factorial(300)),
+    ('ncr', (1000, 500), math.comb(1000, 500)),
+    ('ncr', (5, 7), 0),
+    ('npr', (50, 20), math.perm(50, 20)),
+    ('gcd', (2 ** 100 * 3, 2 ** 90 * 9), 2 ** 90 * 3),
+    ('lcm', (4, 6), 12),
+    ('modpow', (3, 200, 1009), pow(3, 200, 1009)),
+    ('modpow', (3, -1, 7), 5),
+    ('iroot', (10 ** 40 + 5, 2), 10 ** 20),
+    ('iroot', (-8, 3), -2),
+    ('ipow', (-3, 41), (-3) ** 41)
+])
+def test_results_match_the_standard_library(operation, operands, expected):
+    assert exact(operation, *operands) == str(expected)
+
+
+def test_results_beyond_str_limit():
+    expected = math.factorial(2000)
+    text = exact('factorial', 2000)
+
+    # int(str) también tiene límite: la comprobación pasa por Decimal
+    assert len(text) > 4300
+    assert int(Decimal(text)) == expected
+    assert int(Decimal(to_decimal_string(-7 ** 9000))) == -7 ** 9000
+
+
+@pytest.mark.parametrize('operation, operands, code', [
+    ('factorial', (-1,), ErrorCode.DOMAIN_ERROR),
+    ('npr', (5, -1), ErrorCode.DOMAIN_ERROR),
+    ('modpow', (3, -1, 6), ErrorCode.DOMAIN_ERROR),
+    ('modpow', (2, 3, 0), ErrorCode.DIVISION_BY_ZERO),
+    ('iroot', (-8, 2), ErrorCode.NEGATIVE_SQRT),
+    ('iroot', (8, 0), ErrorCode.DOMAIN_ERROR),
+    ('ipow', (2, -1), ErrorCode.DOMAIN_ERROR)
+])
+def test_domain_errors(operation, operands, code):
+    assert evaluate_integer(operation, *operands) == code
+
+
+def test_result_size_is_checked_before_computing():
+    assert check_result_size('factorial', 10 ** 6) == ErrorCode.RESULT_TOO_LARGE
+    assert check_result_size('ipow', 10, MAX_RESULT_DIGITS + 5) == ErrorCode.RESULT_TOO_LARGE
+    assert check_result_size('ipow', 10, MAX_RESULT_DIGITS - 5) is None
+
+
+@pytest.mark.parametrize('value, expected', [
+    (12, 12), (12.0, 12), (' -42 ', -42), ('1' * MAX_OPERAND_DIGITS, int('1' * MAX_OPERAND_DIGITS)),
+    (1.5, None), (True, None), ('1e3', None), ('1' * (MAX_OPERAND_DIGITS + 1), None), (None, None)
+])
+def test_parse_integer(value, expected):
+    assert parse_integer(value) == expected
+
+
+def test_abbreviate_long_results():
+    text = str(3 ** 200)
+
+    assert abbreviate('123', 3) == '123'
+    assert abbreviate(text, len(text)) == f'{text[:10]}…{text[-10:]} ({len(text)} dígitos)'
+
+
+def test_calculate_returns_exact_string(client):
+    body = client.post('/calculate', json={'num1': 1000, 'num2': 500, 'operation': 'ncr'}).get_json()
+
+    assert body['result'] == str(math.comb(1000, 500))
+    assert body['exact'] is True
+    assert body['digits'] == 300
+    assert '…' in body['expression'] and '(300 dígitos)' in body['expression']
+
+
+def test_calculate_modpow_uses_num3(client):
+    body = client.post('/calculate', json={'num1': '123456789', 'num2': 65537, 'num3': 1000003,
+                                           'operation': 'modpow'}).get_json()
+
+    assert body['result'] == str(pow(123456789, 65537, 1000003))
+
+
+def test_calculate_rejects_non_integers(client):
+    response = client.post('/calculate', json={'num1': 2.5, 'operation': 'factorial'})
+
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body['error_code'] == ErrorCode.INTEGER_REQUIRED
+    assert body['operand'] == 1
+
+
+def test_history_abbreviates_long_results(client):
+    client.post('/calculate', json={'num1': 500, 'operation': 'factorial'})
+
+    entry = client.get('/history').get_json()['history'][0]
+
+    assert entry['operation'] == 'factorial'
+    assert '…' in entry['expression']
+
+
+BEYOND_FLOAT = 10 ** 400
+
+
+@pytest.mark.parametrize('operation, operands', [
+    ('factorial', (BEYOND_FLOAT,)),
+    ('npr', (BEYOND_FLOAT, BEYOND_FLOAT // 2)),
+    ('ncr', (BEYOND_FLOAT, BEYOND_FLOAT // 2)),
+    ('ipow', (2, BEYOND_FLOAT))
+])
+def test_operands_beyond_float_range_are_too_large(operation, operands):
+    assert check_result_size(operation, *operands) == ErrorCode.RESULT_TOO_LARGE
+
+
+@pytest.mark.parametrize('operation, operands, expected', [
+    ('ncr', (BEYOND_FLOAT, 2), BEYOND_FLOAT * (BEYOND_FLOAT - 1) // 2),
+    ('ncr', (BEYOND_FLOAT, BEYOND_FLOAT - 1), BEYOND_FLOAT),
+    ('npr', (BEYOND_FLOAT, 2), BEYOND_FLOAT * (BEYOND_FLOAT - 1)),
+    ('ipow', (1, BEYOND_FLOAT), 1)
+])
+def test_small_results_with_operands_beyond_float_range(operation, operands, expected):
+    assert check_result_size(operation, *operands) is None
+    assert exact(operation, *operands) == str(expected)
+
+
+@pytest.mark.parametrize('payload', [
+    {'num1': str(BEYOND_FLOAT), 'operation': 'factorial'},
+    {'num1': str(BEYOND_FLOAT), 'num2': str(BEYOND_FLOAT // 3), 'operation': 'ncr'},
+    {'num1': str(BEYOND_FLOAT), 'num2': str(BEYOND_FLOAT // 3), 'operation': 'npr'},
+    {'num1': 3, 'num2': str(BEYOND_FLOAT), 'operation': 'ipow'}
+])
+def test_calculate_with_operands_beyond_float_range(client, payload):
+    response = client.post('/calculate', json=payload)
+
+    assert response.status_code == 200
+    assert response.get_json()['error_code'] == ErrorCode.RESULT_TOO_LARGE
+    assert response.get_json()['max_digits'] == MAX_RESULT_DIGITS
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Pruebas de las operaciones con vectores y matrices.
+"""
+
+import pytest
+
+from src.models import linalg
+from src.models.errors import ErrorCode
+from src.models.linalg import check_shapes, evaluate_array, parse_array
+
+
+def calculate(client, num1, num2=None, operation='dot'):
+    """Envía una operación con arrays a POST /calculate."""
+    return client.post('/calculate', json={'num1': num1, 'num2': num2, 'operation': operation})
+
+
+def approx(expected):
+    """pytest.approx para escalares, vectores y matrices (por filas)."""
+    if isinstance(expected, list) and isinstance(expected[0], list):
+        return [pytest.approx(row) for row in expected]
+    return pytest.approx(expected)
+
+
+@pytest.mark.parametrize('operation, a, b, expected', [
+    ('array_add', [1, 2], [3, 4], [4.0, 6.0]),
+    ('array_subtract', [[5, 5], [5, 5]], 1, [[4.0, 4.0], [4.0, 4.0]]),
+    ('array_multiply', 2, [[1, 2], [3, 4]], [[2.0, 4.0], [6.0, 8.0]]),
+    ('array_divide', [1, 2], [2, 4], [0.5, 0.5]),
+    ('dot', [1, 2, 3], [4, 5, 6], 32.0),
+    ('matmul', [[1, 2], [3, 4]], [[5, 6], [7, 8]], [[19.0, 22.0], [43.0, 50.0]]),
+    ('matmul', [1, 1], [[1, 2], [3, 4]], [4.0, 6.0]),
+    ('matmul', [[1, 2], [3, 4]], [1, 1], [3.0, 7.0]),
+    ('transpose', [[1, 2, 3], [4, 5, 6]], None, [[1.0, 4.0], [2.0, 5.0], [3.0, 6.0]]),
+    ('determinant', [[0, 1], [1, 0]], None, -1.0),
+    ('determinant', [[2, 0, 0], [0, 3, 0], [0, 0, 4]], None, 24.0),
+    ('solve', [[2, 1], [1, 3]], [3, 5], [0.8, 1.4])
+])
+def test_operations(operation, a, b, expected):
+    a = parse_array(a, allow_scalar=True)
+    b = None if b is None else parse_array(b, allow_scalar=True)
+
+    assert evaluate_array(operation, a, b) == approx(expected)
+
+
+def test_matmul_across_column_blocks(monkeypatch):
+    monkeypatch.setattr(linalg, 'MATMUL_BLOCK_SIZE', 2)
+    a = [[float(row + column) for column in range(3)] for row in range(4)]
+    b = [[float(row * column) for column in range(5)] for row in range(3)]
+
+    expected = [[sum(a[i][k] * b[k][j] for k in range(3)) for j in range(5)] for i in range(4)]
+    assert evaluate_array('matmul', a, b) == expected
+
+
+def test_solve_with_several_right_hand_sides():
+    a = [[0.0, 2.0], [1.0, 1.0]]
+    b = [[2.0, 4.0], [3.0, 3.0]]
+
+    assert evaluate_array('solve', a, b) == approx([[2.0, 1.0], [1.0, 2.0]])
+
+
+@pytest.mark.parametrize('operation, a, b, code', [
+    ('solve', [[1.0, 2.0], [2.0, 4.0]], [1.0, 1.0], ErrorCode.SINGULAR_MATRIX),
+    ('array_divide', [1.0, 2.0], [0.0, 1.0], ErrorCode.DIVISION_BY_ZERO),
+    ('array_divide', [1.0, 2.0], 0.0, ErrorCode.DIVISION_BY_ZERO),
+    ('array_multiply', [1e200], 1e200, ErrorCode.OVERFLOW)
+])
+def test_math_errors(operation, a, b, code):
+    assert evaluate_array(operation, a, b) == code
+
+
+def test_singular_determinant_is_zero():
+    assert evaluate_array('determinant', [[1.0, 2.0], [2.0, 4.0]]) == 0.0
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('[[1, 2], [3, 4]]', [[1.0, 2.0], [3.0, 4.0]]),
+    ([1, 2.5], [1.0, 2.5]),
+    ([], None), ([[]], None), ([[1, 2], [3]], None), ([1, True], None),
+    ([1, float('inf')], None), (['x'], None), ('[1, ', None), (3, None)
+])
+def test_parse_array(value, expected):
+    assert parse_array(value) == expected
+
+
+def test_parse_array_limits_elements():
+    assert parse_array([1, 2, 3], max_elements=2) is None
+    assert parse_array([[1, 2], [3, 4]], max_elements=3) is None
+    assert parse_array(2, allow_scalar=True) == 2.0
+
+
+@pytest.mark.parametrize('operation, a, b', [
+    ('array_add', [1.0, 2.0], [1.0, 2.0, 3.0]),
+    ('dot', [[1.0]], [[1.0]]),
+    ('matmul', [[1.0, 2.0]], [[1.0, 2.0]]),
+    ('determinant', [[1.0, 2.0]], None),
+    ('solve', [[1.0, 0.0], [0.0, 1.0]], [1.0, 2.0, 3.0])
+])
+def test_shape_mismatch(operation, a, b):
+    assert check_shapes(operation, a, b)['error_code'] == ErrorCode.SHAPE_MISMATCH
+
+
+def test_calculate_returns_result_and_shape(client):
+    body = calculate(client, [[1, 2], [3, 4]], [[5, 6], [7, 8]], 'matmul').get_json()
+
+    assert body['result'] == [[19.0, 22.0], [43.0, 50.0]]
+    assert body['shape'] == [2, 2]
+    assert body['expression'] == 'matriz 2×2 × matriz 2×2 = matriz 2×2'
+
+
+def test_calculate_scalar_result(client):
+    body = calculate(client, [[1, 2], [3, 4]], operation='determinant').get_json()
+
+    assert body['result'] == pytest.approx(-2.0)
+    assert body['shape'] == []
+
+
+def test_calculate_validation_errors(client):
+    response = calculate(client, [1, 2], [1, 2, 3])
+    assert response.status_code == 400
+    assert response.get_json()['shapes'] == [[2], [3]]
+
+    response = calculate(client, [1, 'x'], 2, 'array_add')
+    assert response.status_code == 400
+    assert response.get_json()['error_code'] == ErrorCode.INVALID_ARRAY
+    assert response.get_json()['operand'] == 1
+
+    response = calculate(client, [1, 2])
+    assert response.get_json()['error_code'] == ErrorCode.MISSING_OPERAND
+
+
+def test_calculate_singular_matrix(client):
+    body = calculate(client, [[1, 2], [2, 4]], [1, 1], 'solve').get_json()
+
+    assert body['error_code'] == ErrorCode.SINGULAR_MATRIX
+    assert body['error'] == 'Error en el cálculo: La matriz es singular'
+
+
+def test_get_calculate_with_arrays(client):
+    response = client.get('/calculate?num1=[1,2]&num2=[3,4]&operation=dot')
+    assert response.status_code == 301
+
+    response = client.get(response.headers['Location'])
+    assert response.status_code == 200
+    assert response.get_json()['result'] == 11.0
+
+
+def test_history_describes_large_arrays(client):
+    large = [1.0] * 200
+    calculate(client, large, large, 'array_add')
+    calculate(client, [1, 2], [3, 4], 'dot')
+
+    history = client.get('/history').get_json()['history']
+
+    assert history[0]['num1'] == 'vector(200)'
+    assert history[0]['result'] == 'vector(200)'
+    assert history[1]['num1'] == [1.0, 2.0]
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Pruebas del pool de procesos para operaciones costosas y de cómo se
+responden sus errores transitorios (TIMEOUT, BUSY).
+"""
+
+import threading
+import time
+
+import pytest
+import requests
+
+from src.client import CalculatorClient
+from src.models.errors import ErrorCode
+from src.models.offload import OffloadBusy, OffloadExecutor, OffloadTimeout
+
+
+@pytest.fixture
+def executor():
+    """Ejecutor con dos procesos; se detiene al terminar la prueba."""
+    offload = OffloadExecutor(max_workers=2, max_pending=4, timeout=5)
+    yield offload
+    offload.shutdown()
+
+
+def test_run_returns_result(executor):
+    assert executor.run(abs, -3) == 3
+    assert executor.stats()['completed'] == 1
+
+
+def test_timeout_does_not_break_sibling_evaluations(executor):
+    """Regresión: el pool retirado se termina cuando acaban las evaluaciones vecinas."""
+    executor.run(abs, 0)  # arranca el pool antes de medir tiempos
+    outcomes = {}
+
+    def sibling():
+        try:
+            outcomes['sibling'] = executor.run(time.sleep, 2, timeout=10)
+        except Exception as e:
+            outcomes['sibling'] = e
+
+    thread = threading.Thread(target=sibling)
+    thread.start()
+    time.sleep(0.2)
+    with pytest.raises(OffloadTimeout):
+        executor.run(time.sleep, 30, timeout=0.5)
+    assert executor.stats()['retired_pools'] == 1
+
+    thread.join()
+    assert outcomes['sibling'] is None
+    stats = executor.stats()
+    assert stats['timeouts'] == 1 and stats['recycled'] == 1
+    assert stats['retired_pools'] == 0
+
+    # Las evaluaciones siguientes usan un pool nuevo
+    assert executor.run(abs, -5) == 5
+
+
+def test_full_queue_is_busy():
+    offload = OffloadExecutor(max_workers=1, max_pending=0)
+    with pytest.raises(OffloadBusy):
+        offload.run(abs, -1)
+    assert offload.stats()['rejected'] == 1
+
+
+@pytest.fixture
+def busy_client(make_app):
+    """Cliente de una aplicación cuyo pool rechaza todas las operaciones (BUSY)."""
+    app = make_app(OFFLOAD_MAX_PENDING=0, OFFLOAD_COST_THRESHOLD=0)
+    return app.test_client()
+
+
+def test_transient_error_is_503_without_cache(busy_client):
+    response = busy_client.post('/calculate', json={'num1': 1, 'num2': 2, 'operation': 'add'})
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert response.headers['Cache-Control'] == 'no-store'
+    assert response.get_json()['error_code'] == ErrorCode.BUSY
+
+    # El error no se guarda en el historial
+    assert busy_client.get('/history').get_json()['history'] == []
+
+
+def test_transient_error_is_not_replayed(busy_client):
+    headers = {'Idempotency-Key': 'busy-1'}
+    payload = {'num1': 1, 'num2': 2, 'operation': 'add'}
+    busy_client.post('/calculate', json=payload, headers=headers)
+    response = busy_client.post('/calculate', json=payload, headers=headers)
+    assert response.status_code == 503
+    assert 'Idempotent-Replayed' not in response.headers
+
+
+def test_batch_with_transient_item_is_not_replayed(busy_client):
+    headers = {'Idempotency-Key': 'busy-batch'}
+    payload = {'calculations': [{'num1': 1, 'num2': 0, 'operation': 'divide'},
+                                {'num1': 1, 'num2': 2, 'operation': 'add'}]}
+    response = busy_client.post('/calculate/batch', json=payload, headers=headers)
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'no-store'
+    assert [item['status'] for item in response.get_json()['results']] == [503, 503]
+
+    response = busy_client.post('/calculate/batch', json=payload, headers=headers)
+    assert 'Idempotent-Replayed' not in response.headers
+
+
+def test_client_reports_persistent_503_as_transient_outcome():
+    """Tras agotar los reintentos, un 503 con BUSY es un error transitorio, no ClientError."""
+    response = requests.Response()
+    response.status_code = 503
+    response._content = b'{"error": "Servidor ocupado", "error_code": "BUSY"}'
+    body = CalculatorClient()._json(response)
+    assert body['error_code'] == ErrorCode.BUSY
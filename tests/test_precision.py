@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Pruebas de los modos de precisión exacta ('decimal' y 'fraction').
+"""
+
+from decimal import Decimal
+from fractions import Fraction
+from urllib.parse import urlencode
+
+import pytest
+
+from src.models.errors import ErrorCode
+from src.models.precision import DECIMAL_PRECISION, evaluate_exact, format_exact, parse_exact
+
+# Operando con más dígitos que DECIMAL_PRECISION (y menos que MAX_OPERAND_DIGITS)
+LONG_OPERAND = '1.2345678901234567890123456789012345678901'
+LONG_SUM = str(Fraction('1.3345678901234567890123456789012345678901'))
+
+
+def test_format_exact_does_not_round_long_operands():
+    """Regresión: format_exact no redondea a DECIMAL_PRECISION dígitos."""
+    assert len(LONG_OPERAND) - 2 > DECIMAL_PRECISION
+    assert format_exact(parse_exact(LONG_OPERAND)) == LONG_OPERAND
+    assert format_exact(Decimal('12.500')) == '12.5'
+    assert format_exact(Decimal('1E+3')) == '1000'
+
+
+def test_get_keeps_long_operand_in_canonical_query(client):
+    """La forma canónica de GET /calculate conserva todos los dígitos."""
+    query = urlencode([('num1', LONG_OPERAND), ('num2', '0.1'),
+                       ('operation', 'add'), ('precision', 'fraction')])
+    response = client.get(f'/calculate?{query}')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['result'] == LONG_SUM
+    assert body['exact'] is True
+
+
+def test_post_expression_shows_long_operand(client):
+    """La expresión muestra el operando tal como se recibió."""
+    response = client.post('/calculate', json={'num1': LONG_OPERAND, 'num2': '0.1',
+                                               'operation': 'add', 'precision': 'fraction'})
+    body = response.get_json()
+    assert body['result'] == LONG_SUM
+    assert body['expression'] == f'{LONG_OPERAND} + 0.1 = {LONG_SUM}'
+
+
+def test_decimal_mode_rounds_results_only(client):
+    """El modo decimal redondea el resultado a DECIMAL_PRECISION dígitos y lo indica."""
+    response = client.post('/calculate', json={'num1': LONG_OPERAND, 'num2': '0.1',
+                                               'operation': 'add', 'precision': 'decimal'})
+    body = response.get_json()
+    assert body['exact'] is False
+    assert len(body['result'].replace('.', '')) == DECIMAL_PRECISION
+    assert body['expression'].startswith(LONG_OPERAND)
+
+
+@pytest.mark.parametrize('payload, result, exact', [
+    ({'num1': 0.1, 'num2': 0.2, 'operation': 'add', 'precision': 'decimal'}, '0.3', True),
+    ({'num1': 0.1, 'num2': 0.2, 'operation': 'add', 'precision': 'fraction'}, '3/10', True),
+    ({'num1': '19.99', 'num2': 15, 'operation': 'percentage', 'precision': 'decimal'}, '2.9985', True),
+    ({'num1': 1, 'num2': 3, 'operation': 'divide', 'precision': 'fraction'}, '1/3', True),
+    ({'num1': 1, 'num2': 3, 'operation': 'divide', 'precision': 'decimal'},
+     '0.' + '3' * DECIMAL_PRECISION, False),
+    ({'num1': 2, 'operation': 'sqrt', 'precision': 'fraction'}, None, False)
+])
+def test_exact_modes(client, payload, result, exact):
+    body = client.post('/calculate', json=payload).get_json()
+
+    assert body['precision'] == payload['precision']
+    assert body['exact'] is exact
+    if result is not None:
+        assert body['result'] == result
+
+
+def test_float_mode_is_the_default(client):
+    body = client.post('/calculate', json={'num1': 0.1, 'num2': 0.2, 'operation': 'add'}).get_json()
+
+    assert body['result'] == 0.1 + 0.2
+    assert 'precision' not in body
+
+
+def test_integer_fast_path_skips_decimal():
+    assert parse_exact(6.0) == 6 and type(parse_exact(6.0)) is int
+    assert evaluate_exact('divide', 12, 4, 'decimal') == ('3', True)
+    assert evaluate_exact('divide', 1, 4, 'decimal') == ('0.25', True)
+
+
+@pytest.mark.parametrize('value', ['abc', 'NaN', 'Infinity', float('inf'), None, '1' * 101])
+def test_invalid_exact_operands(value):
+    assert parse_exact(value) is None
+
+
+def test_exact_errors_use_model_codes(client):
+    body = client.post('/calculate', json={'num1': 1, 'num2': 0, 'operation': 'divide',
+                                           'precision': 'fraction'}).get_json()
+
+    assert body['error_code'] == ErrorCode.DIVISION_BY_ZERO
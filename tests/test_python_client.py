@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Pruebas del cliente Python (src.client) contra la aplicación Flask, sin red:
+un adaptador de requests entrega cada petición al cliente de pruebas y puede
+simular fallos (respuestas forzadas o errores de conexión) antes de llegar a
+la aplicación.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from src.client import (AsyncCalculatorClient, CalculationError, CalculationResult,
+                        CalculatorClient, ClientError)
+from src.client.results import parse_outcome
+from src.models.errors import ErrorCode
+
+BASE_URL = 'http://calculadora.test'
+
+
+class FlaskAdapter(BaseAdapter):
+    """Adaptador de requests que envía las peticiones a la aplicación Flask."""
+
+    def __init__(self, app):
+        super().__init__()
+        self.client = app.test_client()
+        # Respuestas (status, cabeceras, cuerpo) o excepciones de las próximas peticiones
+        self.failures = []
+        # Rutas que responden 404 (servidor sin ese endpoint)
+        self.missing = set()
+        self.sent = []
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        url = urlsplit(request.url)
+        headers = {name: value for name, value in request.headers.items()
+                   if name.lower() not in ('content-length', 'host')}
+        with self._lock:
+            self.sent.append({'method': request.method, 'path': url.path, 'headers': headers,
+                              'json': json.loads(request.body) if request.body else None})
+            if self.failures:
+                failure = self.failures.pop(0)
+                if isinstance(failure, Exception):
+                    raise failure
+                return self.build(request, *failure)
+            if url.path in self.missing:
+                return self.build(request, 404, {}, b'{"error": "No encontrado"}')
+            response = self.client.open(url.path, method=request.method, query_string=url.query,
+                                        headers=headers, data=request.body)
+        return self.build(request, response.status_code, response.headers, response.get_data())
+
+    @staticmethod
+    def build(request, status, headers, body):
+        """Construye la respuesta de requests."""
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = body if isinstance(body, bytes) else json.dumps(body).encode()
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+    def paths(self):
+        """Rutas de las peticiones enviadas, en orden."""
+        return [(item['method'], item['path']) for item in self.sent]
+
+
+@pytest.fixture
+def adapter(app):
+    return FlaskAdapter(app)
+
+
+@pytest.fixture
+def session(adapter):
+    """Sesión de requests conectada a la aplicación (prefijo más largo que 'http://')."""
+    session = requests.Session()
+    session.mount(BASE_URL, adapter)
+    return session
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Esperas entre reintentos (sin dormir de verdad)."""
+    delays = []
+    monkeypatch.setattr(time, 'sleep', delays.append)
+    return delays
+
+
+@pytest.fixture
+def calculator(session, sleeps):
+    client = CalculatorClient(BASE_URL, session=session, backoff=0.01, max_backoff=0.05)
+    yield client
+    client.close()
+
+
+def busy(status=503, retry_after=None):
+    """Respuesta forzada de un servidor ocupado."""
+    headers = {'Content-Type': 'application/json'}
+    if retry_after is not None:
+        headers['Retry-After'] = retry_after
+    return status, headers, {'error': 'Error: Servidor ocupado', 'error_code': ErrorCode.BUSY}
+
+
+def test_calculate_returns_typed_results(calculator):
+    assert calculator.calculate(10, 4, 'divide') == CalculationResult(2.5, '10.0 ÷ 4.0 = 2.5')
+
+    outcome = calculator.calculate(1, 3, 'divide', precision='fraction')
+    assert outcome.ok and outcome.result == '1/3' and outcome.exact is True
+
+
+def test_calculation_errors_are_values(calculator):
+    math_error = calculator.calculate(1, 0, 'divide')
+    assert not math_error.ok and math_error.is_math_error
+    assert math_error.code == ErrorCode.DIVISION_BY_ZERO and math_error.status == 200
+
+    invalid = calculator.calculate('abc', 1, 'add')
+    assert invalid.is_validation_error and invalid.status == 400
+    assert invalid.details == {'operand': 1}
+
+
+@pytest.mark.parametrize('status', [409, 429, 503])
+def test_transient_statuses_are_retried_with_the_same_key(calculator, adapter, status):
+    adapter.failures = [busy(status), busy(status)]
+
+    outcome = calculator.calculate(2, 3, 'add')
+
+    assert outcome.ok and outcome.result == 5
+    keys = {item['headers']['Idempotency-Key'] for item in adapter.sent}
+    assert len(adapter.sent) == 3 and len(keys) == 1
+    assert len(calculator.history()) == 1
+
+
+def test_lost_response_is_not_recorded_twice(calculator, adapter):
+    """La primera ejecución llega al servidor pero su respuesta se pierde."""
+    original = adapter.send
+
+    def lose_first_response(request, **kwargs):
+        adapter.send = original
+        original(request, **kwargs)
+        raise requests.ConnectionError('conexión cerrada')
+
+    adapter.send = lose_first_response
+
+    outcome = calculator.calculate(6, 7, 'multiply')
+
+    assert outcome.result == 42
+    assert len(calculator.history()) == 1
+
+
+def test_retry_after_is_honoured_and_capped(calculator, adapter, sleeps):
+    adapter.failures = [busy(429, '0.2'), busy(429, '3600'), busy(429, 'pronto')]
+
+    assert calculator.calculate(1, 1, 'add').ok
+
+    assert sleeps[0] == 0.2
+    assert sleeps[1] == calculator.max_backoff * 5
+    # Un Retry-After no numérico usa el backoff con jitter
+    assert 0 < sleeps[2] <= calculator.max_backoff
+
+
+def test_post_without_key_is_not_retried(calculator, adapter):
+    adapter.failures = [busy()]
+
+    response = calculator.request('POST', '/calculate', json={'num1': 1, 'num2': 1, 'operation': 'add'})
+
+    assert response.status_code == 503
+    assert len(adapter.sent) == 1
+    assert 'Idempotency-Key' not in adapter.sent[0]['headers']
+
+
+def test_idempotent_methods_are_retried_without_key(calculator, adapter):
+    adapter.failures = [requests.ConnectionError('reinicio'), busy(502)]
+
+    assert calculator.health()['status'] == 'healthy'
+    assert adapter.paths() == [('GET', '/health')] * 3
+
+
+def test_connection_errors_exhaust_the_retries(calculator, adapter):
+    adapter.failures = [requests.ConnectionError('caído')] * (calculator.max_retries + 1)
+
+    with pytest.raises(ClientError, match='Error de conexión'):
+        calculator.calculate(1, 1, 'add')
+    assert len(adapter.sent) == calculator.max_retries + 1
+
+
+def test_persistent_busy_becomes_a_transient_error(calculator, adapter):
+    adapter.failures = [busy()] * (calculator.max_retries + 1)
+
+    outcome = calculator.calculate(1, 1, 'add')
+
+    assert isinstance(outcome, CalculationError)
+    assert outcome.is_transient and outcome.status == 503
+
+
+@pytest.mark.parametrize('failure, status', [
+    ((500, {}, b'<html>error</html>'), 500),
+    ((503, {}, {'error': 'Error: Servicio sobrecargado', 'status_code': 503}), 503),
+    ((200, {}, b'no es json'), 200)
+])
+def test_server_failures_raise_client_error(calculator, adapter, failure, status):
+    adapter.failures = [failure] * (calculator.max_retries + 1)
+
+    with pytest.raises(ClientError) as raised:
+        calculator.calculate(1, 1, 'add')
+    assert raised.value.status == status
+
+
+@pytest.mark.parametrize('body, status, expected', [
+    ({'result': 4.0, 'expression': '2.0 + 2.0 = 4.0'}, 200, CalculationResult(4.0, '2.0 + 2.0 = 4.0')),
+    ({'result': '1/2', 'expression': 'x', 'precision': 'fraction', 'exact': True}, 200,
+     CalculationResult('1/2', 'x', 'fraction', True)),
+    ({'error': 'Error: El segundo número debe ser válido', 'error_code': 'INVALID_OPERAND',
+      'operand': 2, 'status': 400}, 400,
+     CalculationError('INVALID_OPERAND', 'Error: El segundo número debe ser válido', 400, {'operand': 2})),
+    ({'error': 'Error: Datos JSON requeridos'}, 400,
+     CalculationError(None, 'Error: Datos JSON requeridos', 400)),
+    ({}, 500, CalculationError(None, 'Error desconocido', 500))
+])
+def test_parse_outcome(body, status, expected):
+    assert parse_outcome(body, status) == expected
+
+
+def test_error_without_code_is_a_validation_error():
+    assert parse_outcome({'error': 'Error'}, 400).is_validation_error
+    assert not parse_outcome({'error': 'Error'}, 404).is_validation_error
+
+
+def test_calculate_many_uses_batches_in_order(session, adapter, sleeps):
+    client = CalculatorClient(BASE_URL, session=session, max_batch_size=2)
+    calculations = [{'num1': value, 'num2': 2, 'operation': 'multiply'} for value in range(5)]
+
+    outcomes = client.calculate_many(calculations)
+
+    assert [outcome.result for outcome in outcomes] == [0, 2, 4, 6, 8]
+    assert adapter.paths() == [('GET', '/api/info')] + [('POST', '/calculate/batch')] * 3
+    assert [len(item['json']['calculations']) for item in adapter.sent[1:]] == [2, 2, 1]
+
+
+def test_calculate_many_without_batch_endpoint(session, adapter, sleeps):
+    adapter.missing.add('/api/info')
+    client = CalculatorClient(BASE_URL, session=session)
+
+    outcomes = client.calculate_many([{'num1': 9, 'operation': 'sqrt'},
+                                      {'num1': 1, 'num2': 0, 'operation': 'divide'}])
+
+    assert outcomes[0].result == 3 and outcomes[1].is_math_error
+    assert adapter.paths() == [('GET', '/api/info'), ('POST', '/calculate'), ('POST', '/calculate')]
+    assert not client.supports_batch()
+
+
+def test_rejected_batch_raises_client_error(calculator, adapter):
+    with pytest.raises(ClientError) as raised:
+        calculator.send_batch('no es una lista')
+    assert raised.value.status == 400
+
+
+def make_async_client(session, **options):
+    """Cliente asyncio sobre la sesión conectada a la aplicación."""
+    client = AsyncCalculatorClient(BASE_URL, session=session, backoff=0.01, **options)
+    return client
+
+
+def test_async_calls_are_coalesced_into_batches(session, adapter, sleeps):
+    async def scenario():
+        async with make_async_client(session, max_batch_size=4, batch_window=0.05) as client:
+            return await asyncio.gather(*(client.calculate(value, 10, 'add') for value in range(10)))
+
+    outcomes = asyncio.run(scenario())
+
+    assert [outcome.result for outcome in outcomes] == [value + 10.0 for value in range(10)]
+    batches = [item['json']['calculations'] for item in adapter.sent if item['path'] == '/calculate/batch']
+    assert adapter.paths().count(('GET', '/api/info')) == 1
+    assert sorted(len(batch) for batch in batches) == [2, 4, 4]
+    assert sorted(payload['num1'] for batch in batches for payload in batch) == list(range(10))
+
+
+def test_async_calculate_many_keeps_order(session, adapter, sleeps):
+    calculations = [{'num1': value, 'operation': 'sqrt'} for value in (16, 9, -1, 4)]
+
+    async def scenario():
+        async with make_async_client(session) as client:
+            return await client.calculate_many(calculations)
+
+    outcomes = asyncio.run(scenario())
+
+    assert [outcome.result if outcome.ok else outcome.code for outcome in outcomes] == [
+        4.0, 3.0, ErrorCode.NEGATIVE_SQRT, 2.0]
+    assert adapter.paths().count(('POST', '/calculate/batch')) == 1
+
+
+def test_async_without_batch_endpoint_sends_single_calculations(session, adapter, sleeps):
+    adapter.missing.add('/api/info')
+
+    async def scenario():
+        async with make_async_client(session) as client:
+            return await asyncio.gather(*(client.calculate(value, 1, 'subtract') for value in range(3)))
+
+    outcomes = asyncio.run(scenario())
+
+    assert [outcome.result for outcome in outcomes] == [-1.0, 0.0, 1.0]
+    assert sorted(adapter.paths()) == [('GET', '/api/info')] + [('POST', '/calculate')] * 3
+
+
+def test_async_batch_failure_reaches_every_caller(session, adapter, sleeps):
+    async def scenario():
+        async with make_async_client(session, max_retries=0) as client:
+            assert await client.supports_batch()
+            adapter.failures = [(500, {}, b'error')]
+            return await asyncio.gather(*(client.calculate(value, 1, 'add') for value in range(3)),
+                                        return_exceptions=True)
+
+    outcomes = asyncio.run(scenario())
+
+    assert all(isinstance(outcome, ClientError) and outcome.status == 500 for outcome in outcomes)
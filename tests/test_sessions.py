@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Pruebas de los modelos por sesión (SessionModelStore) y del aislamiento
+del historial entre sesiones.
+"""
+
+from src.models.calculator import CalculatorModel
+from src.models.sessions import SessionModelStore
+from src.models.variables import VariableGraph
+
+
+def fill_history(model: CalculatorModel, operations: int = 100):
+    for index in range(operations):
+        model.perform_calculation(float(index), 2.0, 'multiply')
+
+
+def test_lru_eviction_by_count():
+    store = SessionModelStore(CalculatorModel, max_sessions=2)
+    first = store.get('a')
+    store.get('b')
+    assert store.get('a') is first  # 'a' pasa a ser la más reciente
+    store.get('c')
+    assert store.get('b', create=False) is None
+    assert store.get('a', create=False) is first
+    assert store.stats()['evicted_lru'] == 1
+
+
+def test_idle_sessions_expire():
+    store = SessionModelStore(CalculatorModel, idle_ttl=0)
+    store.get('a')
+    assert store.get('a', create=False) is None
+    assert store.stats()['evicted_idle'] == 1
+
+
+def test_memory_budget_evicts_least_recent_sessions():
+    """El presupuesto se aplica con el tamaño medido después de usar la sesión."""
+    full = CalculatorModel()
+    fill_history(full)
+    session_bytes = full.estimated_bytes()
+    store = SessionModelStore(CalculatorModel, max_bytes=int(session_bytes * 3.5))
+
+    for session_id in 'abcdef':
+        fill_history(store.get(session_id))
+        store.measure(session_id)
+
+    stats = store.stats()
+    assert stats['estimated_bytes'] <= stats['max_bytes']
+    assert len(store) == 3 and stats['evicted_memory'] == 3
+    assert store.get('a', create=False) is None
+    assert store.get('f', create=False) is not None
+
+
+def test_measured_session_is_never_evicted():
+    store = SessionModelStore(CalculatorModel, max_bytes=1)
+    fill_history(store.get('a'))
+    store.measure('a')
+    assert store.get('a', create=False) is not None
+
+
+def test_estimated_bytes_follow_removals():
+    store = SessionModelStore(CalculatorModel, max_sessions=1)
+    fill_history(store.get('a'))
+    store.measure('a')
+    store.get('b')
+    assert store.stats()['estimated_bytes'] == CalculatorModel().estimated_bytes()
+    store.discard('b')
+    assert store.stats()['estimated_bytes'] == 0
+
+
+def test_estimated_bytes_grow_with_history_and_variables():
+    model = CalculatorModel()
+    empty = model.estimated_bytes()
+    fill_history(model, 10)
+    assert model.estimated_bytes() == empty + 10 * CalculatorModel.HISTORY_ENTRY_BYTES
+
+    model.variables = VariableGraph(model)
+    model.variables.set('x', value=1)
+    assert model.estimated_bytes() == (empty + 10 * CalculatorModel.HISTORY_ENTRY_BYTES +
+                                       CalculatorModel.VARIABLE_BYTES)
+
+
+def test_sessions_have_separate_histories(app):
+    first, second = app.test_client(), app.test_client()
+    first.post('/calculate', json={'num1': 1, 'num2': 2, 'operation': 'add'})
+    assert len(first.get('/history').get_json()['history']) == 1
+    assert second.get('/history').get_json()['history'] == []
+
+
+def test_app_applies_session_memory_budget(make_app):
+    budget = 3 * (CalculatorModel.MODEL_BASE_BYTES + 100 * CalculatorModel.HISTORY_ENTRY_BYTES)
+    app = make_app(SESSION_MAX_BYTES=budget)
+    batch = {'calculations': [{'num1': index, 'num2': 2, 'operation': 'add'} for index in range(100)]}
+    for _ in range(6):
+        assert app.test_client().post('/calculate/batch', json=batch).status_code == 200
+
+    stats = app.test_client().get('/metrics').get_json()['sessions']
+    assert stats['estimated_bytes'] <= budget
+    assert stats['evicted_memory'] >= 3
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Pruebas de POST /statistics y de los agregados en una pasada.
+"""
+
+import json
+import random
+import statistics as reference
+import struct
+
+import pytest
+
+from src.models.errors import ErrorCode
+from src.models.statistics import QuantileSketch, RunningStatistics
+
+VALUES = [random.Random(7).uniform(-100, 100) for _ in range(1000)]
+
+
+def post(client, body: bytes, content_type: str, query: str = ''):
+    return client.post(f'/statistics{query}', data=body, content_type=content_type)
+
+
+def check_aggregates(body, values):
+    """Compara los agregados con el módulo statistics de la biblioteca estándar."""
+    assert body['count'] == len(values)
+    assert body['sum'] == pytest.approx(sum(values))
+    assert body['mean'] == pytest.approx(reference.fmean(values))
+    assert body['variance'] == pytest.approx(reference.variance(values))
+    assert body['min'] == min(values) and body['max'] == max(values)
+
+
+@pytest.mark.parametrize('content_type, encode', [
+    ('application/json', lambda values: json.dumps(values).encode()),
+    ('application/x-ndjson', lambda values: ''.join(f'{v!r}\n' for v in values).encode()),
+    ('text/csv', lambda values: ('valor\n' + '\n'.join(map(repr, values))).encode()),
+    ('application/octet-stream', lambda values: struct.pack(f'<{len(values)}d', *values))
+])
+def test_formats_give_the_same_aggregates(client, content_type, encode):
+    response = post(client, encode(VALUES), content_type)
+    assert response.status_code == 200
+    check_aggregates(response.get_json(), VALUES)
+
+
+def test_percentiles_within_relative_accuracy(client):
+    values = list(range(1, 1001))
+    response = post(client, json.dumps(values).encode(), 'application/json', '?percentiles=50,99')
+    percentiles = response.get_json()['percentiles']
+    assert percentiles['p50'] == pytest.approx(500, rel=0.02)
+    assert percentiles['p99'] == pytest.approx(990, rel=0.02)
+
+
+def test_empty_array(client):
+    body = post(client, b'[]', 'application/json').get_json()
+    assert body['count'] == 0 and body['mean'] is None
+
+
+@pytest.mark.parametrize('body, position', [
+    (b'[1, 2, "x"]', 2),
+    (b'[1, true]', 1),
+    (b'[1, 2,]', 2),
+    (b'{"a": 1}', 0)
+])
+def test_invalid_json_value_reports_position(client, body, position):
+    response = post(client, body, 'application/json')
+    assert response.status_code == 400
+    assert response.get_json()['error_code'] == ErrorCode.INVALID_VALUE
+    assert response.get_json()['position'] == position
+
+
+@pytest.mark.parametrize('content_type, body', [
+    ('application/json', b'\xff\xfe[1]'),
+    ('application/json', b'[1, 2, \xff]'),
+    ('application/x-ndjson', b'1\n\xff\n'),
+    ('text/csv', b'1\n2\n\xff\n')
+])
+def test_invalid_utf8_is_a_400(client, content_type, body):
+    """Regresión: los bytes que no son UTF-8 no producen un 500."""
+    response = post(client, body, content_type)
+    assert response.status_code == 400
+    assert response.get_json()['error_code'] == ErrorCode.INVALID_VALUE
+
+
+def test_truncated_float64_buffer(client):
+    response = post(client, struct.pack('<2d', 1, 2) + b'\x00', 'application/octet-stream')
+    assert response.status_code == 400
+    assert response.get_json()['position'] == 2
+
+
+def test_too_many_values(make_app):
+    client = make_app(STATISTICS_MAX_VALUES=3).test_client()
+    response = post(client, b'[1, 2, 3, 4]', 'application/json')
+    body = response.get_json()
+    assert response.status_code == 400
+    assert (body['error_code'], body['max_values']) == (ErrorCode.TOO_MANY_VALUES, 3)
+
+
+def test_unsupported_media_type(client):
+    response = post(client, b'1 2 3', 'text/plain')
+    assert response.status_code == 415
+    assert response.get_json()['error_code'] == ErrorCode.UNSUPPORTED_MEDIA_TYPE
+
+
+def test_invalid_percentiles(client):
+    response = post(client, b'[1]', 'application/json', '?percentiles=150')
+    assert response.status_code == 400
+    assert response.get_json()['error_code'] == ErrorCode.INVALID_PERCENTILE
+
+
+def test_running_statistics_is_numerically_stable():
+    """Welford y la suma compensada no pierden precisión con un desplazamiento grande."""
+    running = RunningStatistics()
+    for value in (1e9 + 4, 1e9 + 7, 1e9 + 13, 1e9 + 16):
+        running.add(value)
+    result = running.result((50,))
+    assert result['mean'] == 1e9 + 10
+    assert result['variance'] == pytest.approx(30.0)
+
+
+def test_sketch_collapses_below_the_floor_in_amortized_time(monkeypatch):
+    """Valores cada vez menores con los buckets llenos no reordenan las claves en cada valor."""
+    sketch = QuantileSketch(max_buckets=64)
+    collapses = []
+    collapse = sketch._collapse
+    monkeypatch.setattr(sketch, '_collapse', lambda store: collapses.append(1) or collapse(store))
+    for exponent in range(200):
+        sketch.add(1.05 ** exponent)
+    values = [0.99 ** index for index in range(5000)]
+
+    for value in values:
+        sketch.add(value)
+
+    assert len(sketch._positive) <= 64
+    assert sum(sketch._positive.values()) == sketch.count == 5200
+    assert len(collapses) <= 200 // (64 // 16)
+    # Los cuantiles altos conservan la precisión relativa
+    assert sketch.quantile(1.0) == pytest.approx(1.05 ** 199, rel=0.01)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Pruebas del logging estructurado: formato JSON, cola sin bloqueo y log de
+acceso muestreado.
+"""
+
+import json
+import logging
+import queue
+import sys
+
+from src.utils.structured_logging import JsonFormatter, NonBlockingQueueHandler
+
+
+def make_record(message='%s %s', args=('GET', '/calculate'), **extra):
+    """Crea un registro de log con campos estructurados opcionales."""
+    record = logging.LogRecord('src.app', logging.INFO, 'app.py', 10, message, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_interpolates_and_keeps_structured_fields():
+    record = make_record(route='/calculate', status=200, latency_ms=1.5, operation=None)
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry['message'] == 'GET /calculate'
+    assert entry['level'] == 'INFO'
+    assert entry['source'] == 'app.py:10'
+    assert entry['route'] == '/calculate' and entry['status'] == 200
+    assert 'operation' not in entry
+
+
+def test_json_formatter_includes_exceptions():
+    try:
+        raise ValueError('fallo')
+    except ValueError:
+        record = logging.LogRecord('src.app', logging.ERROR, 'app.py', 1, 'error', (), sys.exc_info())
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert 'ValueError: fallo' in entry['exception']
+
+
+def test_queue_handler_drops_instead_of_blocking():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+
+    handler.handle(make_record())
+    handler.handle(make_record())
+
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 1
+
+
+def test_queue_handler_defers_formatting():
+    handler = NonBlockingQueueHandler(queue.Queue())
+    record = make_record()
+
+    handler.handle(record)
+
+    queued = handler.queue.get_nowait()
+    assert queued is record
+    assert queued.args == ('GET', '/calculate')
+
+
+def test_access_log_is_sampled_and_always_logs_server_errors(make_app, caplog):
+    app = make_app(ACCESS_LOG_SAMPLE_RATE=0)
+    client = app.test_client()
+
+    @app.route('/falla')
+    def fails():
+        return 'fallo', 500
+
+    with caplog.at_level(logging.INFO, logger=app.logger.name):
+        client.get('/health')
+        client.get('/falla')
+
+    access = [record for record in caplog.records if hasattr(record, 'status')]
+    assert [record.status for record in access] == [500]
+    assert access[0].route == '/falla'
+
+
+def test_access_log_records_route_and_operation(make_app, caplog):
+    client = make_app(ACCESS_LOG_SAMPLE_RATE=1).test_client()
+
+    with caplog.at_level(logging.INFO):
+        client.post('/calculate', json={'num1': 1, 'num2': 2, 'operation': 'add'})
+
+    record = next(record for record in caplog.records if hasattr(record, 'status'))
+    assert record.route == '/calculate'
+    assert record.method == 'POST'
+    assert record.operation == 'add'
+    assert record.latency_ms >= 0
+
+
+def test_metrics_report_logging_overhead(make_app):
+    client = make_app(ACCESS_LOG_SAMPLE_RATE=1, LOG_OVERHEAD_BUDGET_US=1e9).test_client()
+    client.get('/health')
+
+    logging_stats = client.get('/metrics').get_json()['logging']
+
+    assert logging_stats['requests'] >= 1
+    assert logging_stats['over_budget'] == 0
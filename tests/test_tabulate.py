@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Pruebas de POST /tabulate: rangos, fórmulas, formatos de salida y límites.
+"""
+
+import pytest
+
+from src.models.calculator import CalculatorModel
+from src.models.errors import ErrorCode
+from src.models.tabulate import CHUNK_SIZE
+
+
+def tabulate(client, payload, **kwargs):
+    """Envía una tabulación y devuelve la respuesta."""
+    return client.post('/tabulate', json=payload, **kwargs)
+
+
+def test_formula_over_range(client):
+    body = tabulate(client, {'formula': 'divide(12, x)',
+                             'range': {'start': -1, 'stop': 1, 'step': 1}}).get_json()
+
+    assert body['count'] == 3
+    assert body['points'] == [{'x': -1.0, 'result': -12.0},
+                              {'x': 0.0, 'error_code': ErrorCode.DIVISION_BY_ZERO},
+                              {'x': 1.0, 'result': 12.0}]
+    assert body['errors'][ErrorCode.DIVISION_BY_ZERO]['count'] == 1
+
+
+def test_points_match_calculate(client):
+    model = CalculatorModel()
+    values = [-2.5, -1.0, 0.0, 0.5, 3.0, 1e200]
+
+    body = tabulate(client, {'operation': 'power', 'num1': 'x', 'num2': 2.5, 'range': values}).get_json()
+
+    for point, value in zip(body['points'], values):
+        expected = model.perform_calculation(value, 2.5, 'power', record_history=False)
+        if 'error_code' in expected:
+            assert point['error_code'] == expected['error_code']
+        else:
+            assert point['result'] == expected['result']
+
+
+def test_stop_is_included_when_on_the_grid(client):
+    body = tabulate(client, {'formula': 'multiply(x, 10)',
+                             'range': {'start': 0, 'stop': 1, 'step': 0.1}}).get_json()
+
+    assert body['count'] == 11
+    assert body['points'][-1]['x'] == pytest.approx(1.0)
+
+
+def test_session_variables_are_constants(client):
+    client.put('/variables/iva', json={'value': 21})
+
+    body = tabulate(client, {'formula': 'percentage(x, iva)', 'variable': 'x',
+                             'range': [100, 200]}).get_json()
+
+    assert [point['result'] for point in body['points']] == [21.0, 42.0]
+
+
+def test_csv_output(client):
+    response = tabulate(client, {'formula': 'sqrt(x)', 'range': [4, -1]},
+                        headers={'Accept': 'text/csv'})
+
+    assert response.mimetype == 'text/csv'
+    assert response.get_data(as_text=True).splitlines() == [
+        'x,result,error_code', '4.0,2.0,', '-1.0,,NEGATIVE_SQRT']
+
+
+@pytest.mark.parametrize('payload, code', [
+    ({'formula': 'add(x', 'range': [1]}, ErrorCode.INVALID_FORMULA),
+    ({'formula': 'add(1, 2)', 'range': [1]}, ErrorCode.UNUSED_VARIABLE),
+    ({'formula': 'add(x, y)', 'range': [1]}, ErrorCode.UNDEFINED_VARIABLE),
+    ({'formula': 'add(result, 1)', 'variable': 'result', 'range': [1]}, ErrorCode.INVALID_NAME),
+    ({'operation': 'modulo', 'num1': 'x', 'num2': 1, 'range': [1]}, ErrorCode.INVALID_OPERATION),
+    ({'formula': 'add(x, 1)', 'range': {'start': 0, 'stop': 1, 'step': -1}}, ErrorCode.INVALID_RANGE),
+    ({'formula': 'add(x, 1)', 'range': {'start': 0, 'stop': 1, 'step': 0}}, ErrorCode.INVALID_RANGE)
+])
+def test_invalid_tables(client, payload, code):
+    response = tabulate(client, payload)
+
+    assert response.status_code == 400
+    assert response.get_json()['error_code'] == code
+
+
+def test_points_are_limited_before_evaluating(make_app):
+    client = make_app(TABULATE_MAX_POINTS=10).test_client()
+
+    response = tabulate(client, {'formula': 'add(x, 1)', 'range': {'start': 0, 'stop': 10}})
+
+    assert response.status_code == 400
+    assert response.get_json()['error_code'] == ErrorCode.TOO_MANY_POINTS
+
+
+def test_table_spanning_several_chunks(client):
+    assert CHUNK_SIZE < 10000
+    response = tabulate(client, {'formula': 'multiply(x, 2)', 'range': {'start': 0, 'stop': 9999}})
+
+    body = response.get_json()
+    assert body['count'] == len(body['points']) == 10000
+    assert body['points'][CHUNK_SIZE] == {'x': float(CHUNK_SIZE), 'result': 2.0 * CHUNK_SIZE}
+    assert body['points'][-1] == {'x': 9999.0, 'result': 19998.0}
+
+
+def test_invalid_format(client):
+    assert tabulate(client, {'formula': 'sqrt(x)', 'range': [1]},
+                    query_string={'format': 'xml'}).status_code == 400
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Pruebas del trazador: propagación de traceparent, límite de trazas forzadas
+por el cliente y rotación del fichero de exportación.
+"""
+
+import json
+
+from src.utils.tracing import BufferedSpanExporter, Span, Tracer, _current_trace
+
+SAMPLED_PARENT = '00-' + 'a' * 32 + '-' + 'b' * 16 + '-01'
+
+
+def finish(tracer, traceparent=None):
+    """Abre y cierra una traza; devuelve si quedó muestreada."""
+    tracer.start_trace('GET /', traceparent)
+    sampled = _current_trace.get().sampled
+    tracer.end_trace()
+    return sampled
+
+
+def test_traceparent_is_propagated(make_app, tmp_path):
+    app = make_app(TRACE_ENABLED='true', TRACE_EXPORT_PATH=str(tmp_path / 'traces.jsonl'))
+    response = app.test_client().get('/health', headers={'traceparent': SAMPLED_PARENT})
+
+    trace_id = response.headers['traceparent'].split('-')[1]
+    assert trace_id == 'a' * 32
+
+
+def test_client_forced_sampling_is_rate_limited():
+    tracer = Tracer(None, sample_rate=0.0, slow_threshold_ms=1e9, forced_per_second=3)
+
+    sampled = [finish(tracer, SAMPLED_PARENT) for _ in range(50)]
+
+    assert sum(sampled) <= 4
+    assert tracer.forced_limited >= 46
+    assert tracer.stats()['forced_limited'] == tracer.forced_limited
+
+
+def test_client_forced_sampling_can_be_ignored():
+    tracer = Tracer(None, sample_rate=0.0, slow_threshold_ms=1e9, forced_per_second=0)
+
+    assert not any(finish(tracer, SAMPLED_PARENT) for _ in range(10))
+
+
+def test_exporter_rotates_at_max_bytes(tmp_path):
+    path = tmp_path / 'traces.jsonl'
+    exporter = BufferedSpanExporter(str(path), max_bytes=2000, backup_count=2)
+    span = Span('c' * 32, None, 'GET /')
+    span.end_ns = span.start_ns
+
+    for _ in range(40):
+        exporter._write([[span]])
+
+    assert exporter.rotations > 0
+    assert exporter.exported == 40
+    assert path.stat().st_size <= 2000
+    assert (tmp_path / 'traces.jsonl.1').exists()
+    assert (tmp_path / 'traces.jsonl.2').exists()
+    assert not (tmp_path / 'traces.jsonl.3').exists()
+    for line in path.read_text(encoding='utf-8').splitlines():
+        assert json.loads(line)['resourceSpans']
+
+
+def test_exporter_without_backups_truncates(tmp_path):
+    path = tmp_path / 'traces.jsonl'
+    exporter = BufferedSpanExporter(str(path), max_bytes=1000, backup_count=0)
+    span = Span('d' * 32, None, 'GET /')
+
+    for _ in range(20):
+        exporter._write([[span]])
+
+    assert path.stat().st_size <= 1000
+    assert list(tmp_path.iterdir()) == [path]
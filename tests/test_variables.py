@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Pruebas de las variables y fórmulas por sesión (/variables) y de su
+recálculo incremental.
+"""
+
+import pytest
+
+from src.models.errors import ErrorCode
+
+
+def put(client, name, **definition):
+    """Define una variable y devuelve la respuesta."""
+    return client.put(f'/variables/{name}', json=definition)
+
+
+@pytest.fixture
+def invoice(client):
+    """Sesión con subtotal → tax → total."""
+    put(client, 'subtotal', value=100)
+    put(client, 'tax', formula='percentage(subtotal, 21)')
+    put(client, 'total', formula='add(subtotal, tax)')
+    return client
+
+
+def test_formulas_are_evaluated(invoice):
+    body = invoice.get('/variables/total').get_json()
+
+    assert body['value'] == 121
+    assert body['depends_on'] == ['subtotal', 'tax']
+
+
+def test_change_recomputes_dependents_in_topological_order(invoice):
+    body = put(invoice, 'subtotal', value=200).get_json()
+
+    assert body['recomputed'] == ['subtotal', 'tax', 'total']
+    assert invoice.get('/variables/total').get_json()['value'] == 242
+
+
+def test_unchanged_value_stops_propagation(invoice):
+    put(invoice, 'rate', value=21)
+    put(invoice, 'tax', formula='percentage(subtotal, rate)')
+
+    body = put(invoice, 'rate', value=21).get_json()
+
+    assert body['recomputed'] == ['rate', 'tax']
+
+
+def test_cycles_are_rejected(invoice):
+    response = put(invoice, 'subtotal', formula='add(total, 1)')
+
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body['error_code'] == ErrorCode.DEPENDENCY_CYCLE
+    assert body['cycle'][0] == body['cycle'][-1] == 'subtotal'
+    assert invoice.get('/variables/subtotal').get_json()['value'] == 100
+
+
+def test_errors_propagate_to_dependents(client):
+    put(client, 'ratio', formula='divide(1, 0)')
+    body = put(client, 'double', formula='multiply(ratio, 2)').get_json()
+
+    assert body['value'] is None
+    assert body['error_code'] == ErrorCode.DIVISION_BY_ZERO
+
+
+def test_delete_turns_dependents_into_errors(invoice):
+    response = invoice.delete('/variables/subtotal')
+
+    assert response.get_json()['recomputed'] == ['tax', 'total']
+    total = invoice.get('/variables/total').get_json()
+    assert total['error_code'] == ErrorCode.UNDEFINED_VARIABLE
+    assert total['variable'] == 'subtotal'
+    assert invoice.delete('/variables/subtotal').status_code == 404
+
+
+def test_get_many_reports_missing_names(invoice):
+    body = invoice.get('/variables?names=tax, nada').get_json()
+
+    assert list(body['variables']) == ['tax']
+    assert body['missing'] == ['nada']
+
+
+@pytest.mark.parametrize('name, definition, code', [
+    ('9a', {'value': 1}, ErrorCode.INVALID_NAME),
+    ('a', {'value': 1, 'formula': 'add(1, 2)'}, ErrorCode.INVALID_DEFINITION),
+    ('a', {}, ErrorCode.INVALID_DEFINITION),
+    ('a', {'formula': 'add(1'}, ErrorCode.INVALID_FORMULA)
+])
+def test_invalid_definitions(client, name, definition, code):
+    response = put(client, name, **definition)
+
+    assert response.status_code == 400
+    assert response.get_json()['error_code'] == code
+
+
+def test_variables_are_per_session(app):
+    first, second = app.test_client(), app.test_client()
+    put(first, 'a', value=1)
+
+    assert second.get('/variables/a').status_code == 404
+    assert second.get('/variables').get_json() == {'variables': {}}
+
+
+def test_variable_limit_per_session(make_app):
+    client = make_app(VARIABLES_MAX_PER_SESSION=2).test_client()
+    put(client, 'a', value=1)
+    put(client, 'b', value=2)
+
+    response = put(client, 'c', value=3)
+
+    assert response.status_code == 400
+    assert response.get_json()['error_code'] == ErrorCode.TOO_MANY_VARIABLES
+    assert put(client, 'a', value=5).status_code == 200
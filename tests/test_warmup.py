@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Pruebas del calentamiento del worker y de GET /ready.
+"""
+
+import threading
+
+from src.utils.warmup import Warmup
+
+
+def test_sync_warmup_is_ready_before_serving(make_app):
+    app = make_app(WARMUP_MODE='sync', WARMUP_ITERATIONS=1)
+    extension = app.extensions['calculator']
+
+    response = app.test_client().get('/ready')
+
+    assert response.status_code == 200
+    warmup = response.get_json()['warmup']
+    assert warmup['state'] == 'ready'
+    assert set(warmup['steps']) == {'templates', 'calculations', 'requests'}
+    assert 'errors' not in warmup
+    assert extension['responses'].stats()['built'] == extension['responses'].stats()['registered']
+
+
+def test_warmup_leaves_no_history_or_sessions(make_app):
+    app = make_app(WARMUP_MODE='sync', WARMUP_ITERATIONS=1)
+    extension = app.extensions['calculator']
+
+    assert len(extension['model'].get_history()) == 0
+    assert len(extension['sessions']) == 0
+    assert extension['model'].get_history_stats()['total'] == 0
+
+
+def test_skipped_warmup_is_ready(client):
+    body = client.get('/ready').get_json()
+
+    assert body['status'] == 'ready'
+    assert body['warmup']['state'] == 'skipped'
+
+
+def test_background_warmup_reports_503_until_done():
+    release = threading.Event()
+    warmup = Warmup()
+    warmup.add_step('lento', release.wait)
+
+    warmup.start('background')
+    assert not warmup.ready
+    release.set()
+
+    assert warmup.wait(5)
+    assert warmup.stats()['state'] == 'ready'
+
+
+def test_ready_endpoint_while_warming_up(app):
+    warmup = Warmup()
+    app.extensions['calculator']['warmup'] = warmup
+
+    response = app.test_client().get('/ready')
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert response.headers['Cache-Control'] == 'no-store'
+    assert response.get_json()['status'] == 'warming_up'
+
+
+def test_failed_step_does_not_block_readiness():
+    warmup = Warmup()
+    warmup.add_step('roto', lambda: 1 / 0)
+    warmup.add_step('bien', lambda: None)
+
+    warmup.start('sync')
+
+    assert warmup.ready
+    assert warmup.stats()['errors'] == {'roto': 'ZeroDivisionError: division by zero'}
+    assert set(warmup.stats()['steps']) == {'roto', 'bien'}